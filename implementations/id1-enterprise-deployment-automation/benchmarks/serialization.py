@@ -0,0 +1,132 @@
+"""Compare the binary record encoding against pydantic JSON.
+
+Run from the project root:
+
+    python -m benchmarks.serialization [record_count]
+
+For each record type, reports payload size and encode/decode throughput
+for single records (how the state store and spill segments use them) and
+for one payload holding the whole list.
+"""
+
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from pydantic import BaseModel
+
+from src.models.deployment import (
+    ComponentChange,
+    Deployment,
+    DeploymentManifest,
+    DeploymentStatus,
+    ManifestDelta
+)
+from src.models.rollback import RollbackRecord, RollbackStatus
+from src.utils.codec import decode, encode
+
+
+def manifests(count: int) -> List[DeploymentManifest]:
+    return [
+        DeploymentManifest(
+            id=f"manifest-{index:06d}",
+            version="1.0.0",
+            platform_version="2.0.0",
+            suites={"commerce": "1.5.0", "mlas": "1.2.0"},
+            capabilities={"reporting": "1.0.0", "content_management": "1.1.0"},
+            configuration={"environment": "production", "replicas": 3, "features": {"beta_checkout": index % 2 == 0}},
+            metadata={"compiler_version": "1.0.0", "content_hash": f"{index:064x}"}
+        )
+        for index in range(count)
+    ]
+
+
+def deployments(count: int) -> List[Deployment]:
+    return [
+        Deployment(
+            id=f"deploy-{index:06d}",
+            manifest_id="manifest-000001",
+            instance_id=f"instance-prod-{index:05d}",
+            manifest_hash=f"{index:064x}",
+            status=DeploymentStatus.DEPLOYED,
+            started_at=datetime.utcnow(),
+            completed_at=datetime.now(timezone.utc),
+            completed_steps=["compile", "validate", "deploy", "health_check"],
+            delta=ManifestDelta(
+                changes=[ComponentChange(component="suite:commerce", from_version="1.5.0", to_version="1.6.0")],
+                configuration_set={"replicas": 3}
+            ),
+            logs=[
+                "Starting manifest compilation",
+                "Validating compiled manifest",
+                "Updating suite:commerce 1.5.0 -> 1.6.0",
+                "Health check passed"
+            ]
+        )
+        for index in range(count)
+    ]
+
+
+def rollbacks(count: int) -> List[RollbackRecord]:
+    return [
+        RollbackRecord(
+            id=f"rollback-{index:06d}",
+            instance_id=f"instance-prod-{index:05d}",
+            from_manifest_id="manifest-000002",
+            to_manifest_id="manifest-000001",
+            status=RollbackStatus.COMPLETED,
+            reason="Health check failed after update",
+            started_at=datetime.utcnow(),
+            completed_at=datetime.utcnow(),
+            logs=["Rollback initiated", "Rollback completed"]
+        )
+        for index in range(count)
+    ]
+
+
+def timed(action: Callable[[], object], count: int) -> str:
+    started = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - started
+    return f"{count / elapsed:>10,.0f}/s"
+
+
+def compare(name: str, records: List[BaseModel]) -> None:
+    model = type(records[0])
+    count = len(records)
+
+    json_items = [record.model_dump_json() for record in records]
+    binary_items = [encode(record) for record in records]
+    binary_list = encode(records)
+    json_size = sum(len(item) for item in json_items)
+
+    print(f"\n{name} x {count}")
+    print(f"  {'format':<16}{'bytes':>12}{'size':>8}{'encode':>14}{'decode':>14}")
+    print(
+        f"  {'json':<16}{json_size:>12,}{'100%':>8}"
+        f"{timed(lambda: [record.model_dump_json() for record in records], count):>14}"
+        f"{timed(lambda: [model.model_validate_json(item) for item in json_items], count):>14}"
+    )
+    binary_size = sum(len(item) for item in binary_items)
+    print(
+        f"  {'binary (each)':<16}{binary_size:>12,}{binary_size / json_size:>8.0%}"
+        f"{timed(lambda: [encode(record) for record in records], count):>14}"
+        f"{timed(lambda: [decode(item, model) for item in binary_items], count):>14}"
+    )
+    print(
+        f"  {'binary (list)':<16}{len(binary_list):>12,}{len(binary_list) / json_size:>8.0%}"
+        f"{timed(lambda: encode(records), count):>14}"
+        f"{timed(lambda: decode(binary_list, model), count):>14}"
+    )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    compare("DeploymentManifest", manifests(count))
+    compare("Deployment", deployments(count))
+    compare("RollbackRecord", rollbacks(count))
+
+
+if __name__ == "__main__":
+    main()
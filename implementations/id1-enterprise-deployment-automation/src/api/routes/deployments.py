@@ -1,30 +1,143 @@
 """Deployment API routes."""
 
 import logging
-from fastapi import APIRouter, HTTPException, status
+import os
+import time
+from datetime import datetime
+from typing import List
+from fastapi import APIRouter, HTTPException, Query, Response, status
 
 from ...models.deployment import (
     Deployment,
+    DeploymentStatus,
     DeploymentRequest,
     DeploymentResponse,
-    DeploymentManifest
+    DeploymentManifest,
+    RolloutRequest,
+    RolloutResponse,
+    RolloutPlan,
+    RolloutPlanRequest,
+    RolloutPreflightRequest,
+    RolloutPreflightResponse,
+    InstanceReadiness
 )
+from ...core.admission import AdmissionController
 from ...core.deployment_engine import DeploymentEngine
+from ...core.manifest_compiler import ManifestCompiler
+from ...core.pipeline import DeploymentPipeline
+from ...core.readiness import ReadinessProber
+from ...core.retention import DeploymentRetentionStore
+from ...core.rollout_scheduler import failure_rate_gate
+from ...core.validator import DeploymentValidator
+from ...policies.auto_updates import AutoUpdateScheduler
+from ...policies.maintenance_windows import MaintenanceWindowIndex
+from ...policies.policy_enforcer import PolicyEnforcer
+from ..state import event_bus, state_writer
+from .policies import policy_manager
+from .rollback import rollback_manager
+from .versions import version_pinner, version_resolver
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Compiles manifests and resolves their dependencies against the version catalog
+manifest_compiler = ManifestCompiler(
+    resolver=version_resolver,
+    max_workers=int(os.getenv("MANIFEST_COMPILE_WORKERS", "0")) or None
+)
+
+# Probes instance agents before deployments; disabled unless an agent URL is configured
+readiness_prober = ReadinessProber(
+    agent_url=os.environ["INSTANCE_AGENT_URL"],
+    probe_timeout=float(os.getenv("INSTANCE_PROBE_TIMEOUT", "2.0")),
+    cache_ttl=float(os.getenv("INSTANCE_READINESS_TTL", "30")),
+    min_free_disk_bytes=int(os.getenv("INSTANCE_MIN_FREE_DISK_MB", "1024")) * 1024 * 1024
+) if os.getenv("INSTANCE_AGENT_URL") else None
+
+# Maintenance windows of every policy, kept current through policy change notifications
+maintenance_windows = MaintenanceWindowIndex(policy_manager)
+
+# Decides deployments and plans against instance policies and their maintenance windows
+policy_enforcer = PolicyEnforcer(policy_manager, windows=maintenance_windows)
+
+# Priority admission in front of deployment executions
+deployment_admission = AdmissionController(
+    max_concurrent=int(os.getenv("DEPLOYMENT_ADMISSION_MAX_CONCURRENT", "64")),
+    max_queue=int(os.getenv("DEPLOYMENT_ADMISSION_MAX_QUEUE", "1000"))
+)
+
 # In-memory storage for demo purposes
-deployment_engine = DeploymentEngine()
+deployment_engine = DeploymentEngine(
+    compiler=manifest_compiler,
+    validator=DeploymentValidator(prober=readiness_prober),
+    retention=DeploymentRetentionStore(
+        hot_size=int(os.getenv("DEPLOYMENT_HOT_SET_SIZE", "10000")),
+        spill_dir=os.getenv("DEPLOYMENT_SPILL_DIR"),
+        cold_size=int(os.getenv("DEPLOYMENT_COLD_SIZE", "100000"))
+    ),
+    state=state_writer,
+    events=event_bus,
+    rollback_manager=rollback_manager,
+    enforcer=policy_enforcer,
+    pin_lookup=version_pinner.get_active_pins,
+    admission=deployment_admission
+)
+
+# Stage-parallel executor used for fleet rollouts
+deployment_pipeline = DeploymentPipeline(
+    deployment_engine,
+    default_workers=int(os.getenv("DEPLOYMENT_PIPELINE_WORKERS", "4")),
+    queue_size=int(os.getenv("DEPLOYMENT_PIPELINE_QUEUE_SIZE", "100"))
+)
+
+
+# Rolled out on auto-update policies' cron schedules; the scheduler is disabled unless set
+AUTO_UPDATE_MANIFEST_ID = os.getenv("AUTO_UPDATE_MANIFEST_ID")
+
+
+async def run_auto_update(instance_ids: List[str], tick: datetime) -> None:
+    """Roll the auto-update manifest out to the instances due in a tick.
+    
+    The scheduler only passes instances whose maintenance window is open,
+    and the engine's policy enforcer checks each window again before
+    deploying.
+    
+    Args:
+        instance_ids: Instances whose auto-update schedule fired
+        tick: Time of the tick
+    """
+    manifest = manifest_compiler.get_manifest(AUTO_UPDATE_MANIFEST_ID)
+    if not manifest:
+        logger.warning(f"Skipping auto-update of {len(instance_ids)} instances: manifest {AUTO_UPDATE_MANIFEST_ID} not found")
+        return
+    
+    report = await deployment_engine.rollout(
+        manifest=manifest,
+        instance_selector=instance_ids,
+        policy_lookup=policy_manager.get_instance_policy,
+        pipeline=deployment_pipeline
+    )
+    logger.info(f"Auto-update rollout for tick {tick.isoformat()} finished: {report.summary()}")
+
+
+auto_update_scheduler = AutoUpdateScheduler(
+    run_auto_update,
+    policy_manager=policy_manager,
+    windows=maintenance_windows
+) if AUTO_UPDATE_MANIFEST_ID else None
 
 
 @router.post("/deployments", response_model=DeploymentResponse, status_code=status.HTTP_201_CREATED)
-async def create_deployment(request: DeploymentRequest):
+async def create_deployment(request: DeploymentRequest, response: Response):
     """Create a new deployment.
     
+    A dry run answers 200 with ``dry_run`` set, no ID and the checks it
+    performed, since nothing is stored.
+    
     Args:
         request: Deployment request
+        response: Response, whose status code a dry run changes
         
     Returns:
         Created deployment response
@@ -42,9 +155,25 @@ async def create_deployment(request: DeploymentRequest):
         deployment = await deployment_engine.create_deployment(
             manifest=manifest,
             instance_id=request.instance_id,
-            dry_run=request.dry_run
+            dry_run=request.dry_run,
+            priority=request.priority
         )
         
+        if request.dry_run:
+            response.status_code = status.HTTP_200_OK
+            return DeploymentResponse(
+                id=None,
+                status=deployment.status,
+                manifest_id=deployment.manifest_id,
+                instance_id=deployment.instance_id,
+                created_at=deployment.created_at,
+                started_at=None,
+                completed_at=None,
+                error_message=deployment.error_message,
+                dry_run=True,
+                logs=deployment.logs
+            )
+        
         return DeploymentResponse(
             id=deployment.id,
             status=deployment.status,
@@ -62,6 +191,53 @@ async def create_deployment(request: DeploymentRequest):
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
 
 
+@router.get("/deployments/retention/stats")
+async def get_retention_stats():
+    """Get deployment retention counters.
+    
+    Returns:
+        Hot/cold deployment counts and spill/rehydrate totals
+    """
+    return deployment_engine.retention_stats()
+
+
+@router.get("/deployments/admission/stats")
+async def get_admission_stats():
+    """Get deployment admission queue statistics.
+    
+    Returns:
+        Queue depth, running counts and wait-time percentiles per priority
+    """
+    return deployment_admission.stats()
+
+
+@router.get("/deployments/pipeline/stats")
+async def get_pipeline_stats():
+    """Get per-stage deployment pipeline statistics.
+    
+    Returns:
+        Worker occupancy, throughput and queue-wait figures for each stage
+    """
+    return {
+        "running": deployment_pipeline.running,
+        "stages": deployment_pipeline.summary()
+    }
+
+
+@router.get("/deployments/validation/stats")
+async def get_validation_stats():
+    """Get manifest validation rule timings.
+    
+    Returns:
+        Per-rule execution time, slowest first, and batch cache counters
+    """
+    validator = deployment_engine.validator
+    return {
+        **validator.rules.report(),
+        "cache": validator.cache_stats()
+    }
+
+
 @router.get("/deployments/{deployment_id}", response_model=DeploymentResponse)
 async def get_deployment(deployment_id: str):
     """Get deployment by ID.
@@ -72,7 +248,7 @@ async def get_deployment(deployment_id: str):
     Returns:
         Deployment response
     """
-    deployment = deployment_engine.get_deployment(deployment_id)
+    deployment = await deployment_engine.get_deployment(deployment_id)
     
     if not deployment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deployment not found")
@@ -90,16 +266,26 @@ async def get_deployment(deployment_id: str):
 
 
 @router.get("/deployments", response_model=list[DeploymentResponse])
-async def list_deployments(instance_id: str = None):
+async def list_deployments(
+    instance_id: str = None,
+    deployment_status: DeploymentStatus = Query(None, alias="status"),
+    limit: int = Query(None, ge=1)
+):
     """List deployments.
     
     Args:
         instance_id: Optional instance ID to filter by
+        deployment_status: Optional deployment status to filter by
+        limit: Optional maximum number of most recent deployments
         
     Returns:
         List of deployment responses
     """
-    deployments = deployment_engine.list_deployments(instance_id)
+    deployments = await deployment_engine.list_deployments(
+        instance_id,
+        status=deployment_status,
+        limit=limit
+    )
     
     return [
         DeploymentResponse(
@@ -114,3 +300,120 @@ async def list_deployments(instance_id: str = None):
         )
         for d in deployments
     ]
+
+
+@router.post("/rollouts", response_model=RolloutResponse, status_code=status.HTTP_201_CREATED)
+async def create_rollout(request: RolloutRequest):
+    """Roll a manifest out to a fleet of instances.
+    
+    Args:
+        request: Rollout request
+        
+    Returns:
+        Rollout summary with throughput and latency statistics
+    """
+    try:
+        # Create a sample manifest for demo
+        manifest = DeploymentManifest(
+            id=request.manifest_id,
+            version="1.0.0",
+            platform_version="2.0.0",
+            suites={"commerce": "1.5.0"},
+            capabilities={"reporting": "1.0.0"}
+        )
+        
+        wave_sizes = [int(size) if size >= 1 else size for size in request.wave_sizes]
+        
+        report = await deployment_engine.rollout(
+            manifest=manifest,
+            instance_selector=request.instance_ids,
+            max_in_flight=request.max_in_flight,
+            wave_sizes=wave_sizes,
+            health_gate=failure_rate_gate(request.max_failure_rate),
+            policy_lookup=policy_manager.get_instance_policy,
+            pipeline=deployment_pipeline
+        )
+        
+        return RolloutResponse(**report.summary())
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error running rollout: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
+@router.post("/rollouts/plan", response_model=RolloutPlan)
+async def plan_rollout(request: RolloutPlanRequest):
+    """Compute a dry-run plan for rolling a manifest out to a fleet.
+    
+    Nothing is deployed; the plan reports which instances would change,
+    which components change, what blocks each instance and how long the
+    rollout would take.
+    
+    Args:
+        request: Rollout plan request
+        
+    Returns:
+        Plan grouped by effective instance state
+    """
+    try:
+        # Create a sample manifest for demo
+        manifest = DeploymentManifest(
+            id=request.manifest_id,
+            version="1.0.0",
+            platform_version="2.0.0",
+            suites={"commerce": "1.5.0"},
+            capabilities={"reporting": "1.0.0"}
+        )
+        
+        return await deployment_engine.plan_rollout(
+            manifest=manifest,
+            instance_selector=request.instance_ids,
+            policy_lookup=policy_manager.get_instance_policies,
+            max_in_flight=request.max_in_flight
+        )
+    except Exception as e:
+        logger.error(f"Error planning rollout: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
+@router.post("/rollouts/preflight", response_model=RolloutPreflightResponse)
+async def preflight_rollout(request: RolloutPreflightRequest):
+    """Probe every instance of a rollout wave for deployment readiness.
+    
+    Args:
+        request: Rollout pre-flight request
+        
+    Returns:
+        Per-instance readiness
+    """
+    manifest = manifest_compiler.get_manifest(request.manifest_id)
+    
+    if not manifest:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Manifest not found")
+    
+    try:
+        started = time.perf_counter()
+        results = await deployment_engine.validator.validate_readiness_many(request.instance_ids, manifest)
+        
+        instances = [
+            InstanceReadiness(
+                instance_id=instance_id,
+                is_ready=result.is_valid,
+                errors=result.errors,
+                warnings=result.warnings
+            )
+            for instance_id, result in results.items()
+        ]
+        ready = sum(1 for instance in instances if instance.is_ready)
+        
+        return RolloutPreflightResponse(
+            manifest_id=manifest.id,
+            ready=ready,
+            not_ready=len(instances) - ready,
+            duration_seconds=round(time.perf_counter() - started, 6),
+            instances=instances
+        )
+    except Exception as e:
+        logger.error(f"Error probing rollout readiness: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
@@ -0,0 +1,140 @@
+"""Event streaming API routes."""
+
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, List, Optional
+
+from fastapi import APIRouter, Query, Request, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+
+from ...events import Subscription, TopicFilter
+from ..state import event_bus
+
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Idle streams send a heartbeat this often so dead clients are noticed
+HEARTBEAT_SECONDS = 15.0
+
+
+def _subscribe(
+    instance_ids: Optional[List[str]],
+    rollout_ids: Optional[List[str]],
+    statuses: Optional[List[str]]
+) -> Subscription:
+    """Open a filtered subscription on the shared bus."""
+    return event_bus.subscribe(TopicFilter.build(instance_ids, rollout_ids, statuses))
+
+
+@router.get("/events/stream")
+async def stream_events(
+    request: Request,
+    instance_id: Optional[List[str]] = Query(None),
+    rollout_id: Optional[List[str]] = Query(None),
+    status_filter: Optional[List[str]] = Query(None, alias="status")
+):
+    """Stream status events as Server-Sent Events.
+
+    Args:
+        request: Incoming request
+        instance_id: Optional instance IDs to filter by
+        rollout_id: Optional rollout IDs to filter by
+        status_filter: Optional statuses to filter by
+
+    Returns:
+        ``text/event-stream`` response
+    """
+    subscription = _subscribe(instance_id, rollout_id, status_filter)
+
+    async def stream() -> AsyncIterator[str]:
+        try:
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=HEARTBEAT_SECONDS)
+
+                dropped = subscription.take_dropped()
+                if dropped:
+                    yield f"event: dropped\ndata: {json.dumps({'count': dropped})}\n\n"
+
+                if event is None:
+                    if subscription.closed:
+                        yield f"event: closed\ndata: {json.dumps({'reason': subscription.close_reason})}\n\n"
+                        break
+                    yield ": heartbeat\n\n"
+                    continue
+
+                yield f"id: {event.sequence}\nevent: {event.type.value}\ndata: {event.model_dump_json()}\n\n"
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/events/ws")
+async def websocket_events(
+    websocket: WebSocket,
+    instance_id: Optional[List[str]] = Query(None),
+    rollout_id: Optional[List[str]] = Query(None),
+    status_filter: Optional[List[str]] = Query(None, alias="status")
+):
+    """Stream status events over a WebSocket as JSON messages.
+
+    Args:
+        websocket: WebSocket connection
+        instance_id: Optional instance IDs to filter by
+        rollout_id: Optional rollout IDs to filter by
+        status_filter: Optional statuses to filter by
+    """
+    await websocket.accept()
+    subscription = _subscribe(instance_id, rollout_id, status_filter)
+
+    async def watch_disconnect() -> None:
+        # Clients only send to close; closing the subscription wakes the sender loop
+        try:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        finally:
+            subscription.close("client disconnected")
+
+    watcher = asyncio.create_task(watch_disconnect())
+
+    try:
+        while True:
+            event = await subscription.get(timeout=HEARTBEAT_SECONDS)
+
+            dropped = subscription.take_dropped()
+            if dropped:
+                await websocket.send_json({"type": "dropped", "count": dropped})
+
+            if event is None:
+                if subscription.closed:
+                    if not watcher.done():
+                        await websocket.close(
+                            code=status.WS_1008_POLICY_VIOLATION,
+                            reason=subscription.close_reason or ""
+                        )
+                    break
+                await websocket.send_json({"type": "heartbeat"})
+                continue
+
+            await websocket.send_text(event.model_dump_json())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        watcher.cancel()
+        subscription.close()
+
+
+@router.get("/events/stats")
+async def get_event_stats():
+    """Get event bus counters.
+
+    Returns:
+        Published events, open subscriptions and slow-consumer disconnects
+    """
+    return event_bus.stats()
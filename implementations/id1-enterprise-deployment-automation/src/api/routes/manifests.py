@@ -0,0 +1,57 @@
+"""Manifest API routes."""
+
+import logging
+from typing import AsyncIterator
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from ...models.deployment import DeploymentManifest, ManifestBatchRequest
+from .deployments import manifest_compiler
+
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+@router.post("/manifests:batch")
+async def compile_manifests(request: ManifestBatchRequest):
+    """Compile many manifests in one call.
+    
+    Results stream back as newline-delimited JSON in the order they
+    finish, one line per item, tagged with the item's index. Items that
+    fail report an ``error`` without failing the batch.
+    
+    Args:
+        request: Batch compile request
+        
+    Returns:
+        ``application/x-ndjson`` response
+    """
+    async def stream() -> AsyncIterator[str]:
+        try:
+            async for result in manifest_compiler.compile_many(request.items):
+                yield result.model_dump_json() + "\n"
+        except Exception as e:
+            # Headers are already sent, so report the failure in-band
+            logger.error(f"Error compiling manifest batch: {str(e)}")
+            yield '{"error": "Internal server error"}\n'
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.get("/manifests/{manifest_id}", response_model=DeploymentManifest)
+async def get_manifest(manifest_id: str):
+    """Get compiled manifest by ID.
+    
+    Args:
+        manifest_id: Manifest ID
+        
+    Returns:
+        Compiled manifest
+    """
+    manifest = manifest_compiler.get_manifest(manifest_id)
+    
+    if not manifest:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Manifest not found")
+    
+    return manifest
@@ -10,23 +10,25 @@ from ...models.policy import (
     PolicyResponse
 )
 from ...policies.policy_manager import PolicyManager
+from ..state import state_writer
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # In-memory storage for demo purposes
-policy_manager = PolicyManager()
+policy_manager = PolicyManager(state=state_writer)
 
 
 @router.post("/policies", response_model=PolicyResponse, status_code=status.HTTP_201_CREATED)
-async def create_policy(instance_id: str, policy_type: PolicyType, description: str = None):
+async def create_policy(instance_id: str, policy_type: PolicyType, description: str = None, priority: int = 0):
     """Create a new update channel policy.
     
     Args:
         instance_id: Instance ID
         policy_type: Type of policy
         description: Policy description
+        priority: Precedence among the instance's policies
         
     Returns:
         Created policy response
@@ -35,7 +37,8 @@ async def create_policy(instance_id: str, policy_type: PolicyType, description:
         policy = await policy_manager.create_policy(
             instance_id=instance_id,
             policy_type=policy_type,
-            description=description
+            description=description,
+            priority=priority
         )
         
         return PolicyResponse(
@@ -43,6 +46,7 @@ async def create_policy(instance_id: str, policy_type: PolicyType, description:
             instance_id=policy.instance_id,
             policy_type=policy.policy_type,
             enabled=policy.enabled,
+            priority=policy.priority,
             description=policy.description,
             created_at=policy.created_at,
             updated_at=policy.updated_at
@@ -72,6 +76,7 @@ async def get_policy(policy_id: str):
         instance_id=policy.instance_id,
         policy_type=policy.policy_type,
         enabled=policy.enabled,
+        priority=policy.priority,
         description=policy.description,
         created_at=policy.created_at,
         updated_at=policy.updated_at
@@ -96,6 +101,7 @@ async def list_policies(instance_id: str = None):
             instance_id=p.instance_id,
             policy_type=p.policy_type,
             enabled=p.enabled,
+            priority=p.priority,
             description=p.description,
             created_at=p.created_at,
             updated_at=p.updated_at
@@ -116,7 +122,10 @@ async def update_policy(policy_id: str, request: PolicyUpdateRequest):
         Updated policy response
     """
     updates = request.dict(exclude_unset=True)
-    policy = await policy_manager.update_policy(policy_id, **updates)
+    try:
+        policy = await policy_manager.update_policy(policy_id, **updates)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
     if not policy:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Policy not found")
@@ -126,6 +135,7 @@ async def update_policy(policy_id: str, request: PolicyUpdateRequest):
         instance_id=policy.instance_id,
         policy_type=policy.policy_type,
         enabled=policy.enabled,
+        priority=policy.priority,
         description=policy.description,
         created_at=policy.created_at,
         updated_at=policy.updated_at
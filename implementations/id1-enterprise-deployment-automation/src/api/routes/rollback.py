@@ -10,13 +10,14 @@ from ...models.rollback import (
     RollbackHistory
 )
 from ...rollback.rollback_manager import RollbackManager
+from ..state import event_bus, state_writer
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # In-memory storage for demo purposes
-rollback_manager = RollbackManager()
+rollback_manager = RollbackManager(state=state_writer, events=event_bus)
 
 
 @router.post("/rollback", response_model=RollbackResponse, status_code=status.HTTP_201_CREATED)
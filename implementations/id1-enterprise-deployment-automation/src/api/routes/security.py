@@ -10,13 +10,14 @@ from ...models.security import (
     PatchStatusResponse
 )
 from ...security.patch_manager import PatchManager
+from ..state import state_writer
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # In-memory storage for demo purposes
-patch_manager = PatchManager()
+patch_manager = PatchManager(state=state_writer)
 
 
 @router.get("/security/patches", response_model=list[SecurityPatch])
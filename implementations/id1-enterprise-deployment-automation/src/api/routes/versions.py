@@ -1,5 +1,6 @@
 """Version API routes."""
 
+import asyncio
 import logging
 from fastapi import APIRouter, HTTPException, status
 
@@ -8,18 +9,23 @@ from ...models.version import (
     VersionPin,
     VersionPinRequest,
     VersionCompatibilityCheck,
-    VersionCompatibilityResult
+    VersionCompatibilityResult,
+    VersionConstraint,
+    ResolutionResult
 )
+from ...versioning.resolver import ConstraintError, DependencyResolver
 from ...versioning.version_manager import VersionManager
 from ...versioning.version_pinner import VersionPinner
+from ..state import state_writer
 
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # In-memory storage for demo purposes
-version_manager = VersionManager()
-version_pinner = VersionPinner()
+version_manager = VersionManager(state=state_writer)
+version_pinner = VersionPinner(state=state_writer)
+version_resolver = DependencyResolver(version_manager)
 
 
 @router.get("/versions", response_model=list[Version])
@@ -61,6 +67,8 @@ async def pin_version(instance_id: str, request: VersionPinRequest):
         )
         
         return pin
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error pinning version: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
@@ -118,3 +126,22 @@ async def check_compatibility(request: VersionCompatibilityCheck):
     except Exception as e:
         logger.error(f"Error checking compatibility: {str(e)}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
+
+
+@router.post("/versions/resolve", response_model=ResolutionResult)
+async def resolve_versions(constraints: list[VersionConstraint]):
+    """Resolve constraints to the newest consistent set of versions.
+    
+    Args:
+        constraints: Root version constraints
+        
+    Returns:
+        Resolution result; ``conflicts`` explains why no solution exists
+    """
+    try:
+        return await asyncio.to_thread(version_resolver.resolve, constraints)
+    except ConstraintError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error resolving versions: {str(e)}")
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Internal server error")
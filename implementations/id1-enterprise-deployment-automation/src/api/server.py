@@ -1,21 +1,65 @@
 """FastAPI server setup for Enterprise Deployment Automation."""
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .routes import (
     deployments,
+    manifests,
     policies,
     versions,
     security,
-    rollback
+    rollback,
+    events
 )
+from .state import state_writer
 
 
 logger = logging.getLogger(__name__)
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load persisted state and resume interrupted deployments on startup;
+    drain workers and flush writes on shutdown.
+    
+    Args:
+        app: FastAPI application
+    """
+    if state_writer:
+        await deployments.deployment_engine.load_state()
+        await policies.policy_manager.load_state()
+        await versions.version_manager.load_state()
+        await versions.version_pinner.load_state()
+        await security.patch_manager.load_state()
+        await rollback.rollback_manager.load_state()
+        await state_writer.start()
+        # Finish deployments interrupted by the previous shutdown in the background
+        resume_task = asyncio.create_task(
+            deployments.deployment_engine.resume_deployments(deployments.deployment_pipeline)
+        )
+    await deployments.manifest_compiler.start()
+    if deployments.auto_update_scheduler:
+        await deployments.auto_update_scheduler.start()
+    
+    yield
+    
+    if deployments.auto_update_scheduler:
+        await deployments.auto_update_scheduler.stop()
+    await deployments.deployment_pipeline.stop()
+    await deployments.manifest_compiler.stop()
+    if deployments.readiness_prober:
+        await deployments.readiness_prober.aclose()
+    
+    if state_writer:
+        await asyncio.gather(resume_task, return_exceptions=True)
+        await state_writer.stop()
+        state_writer.store.close()
+
+
 def create_app() -> FastAPI:
     """Create and configure FastAPI application.
     
@@ -25,7 +69,8 @@ def create_app() -> FastAPI:
     app = FastAPI(
         title="Enterprise Deployment Automation API",
         description="API for managing enterprise deployments with policy enforcement, version pinning, and security patches",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan
     )
     
     # Add CORS middleware
@@ -39,10 +84,12 @@ def create_app() -> FastAPI:
     
     # Include routers
     app.include_router(deployments.router, prefix="/api/v1", tags=["Deployments"])
+    app.include_router(manifests.router, prefix="/api/v1", tags=["Manifests"])
     app.include_router(policies.router, prefix="/api/v1", tags=["Policies"])
     app.include_router(versions.router, prefix="/api/v1", tags=["Versions"])
     app.include_router(security.router, prefix="/api/v1", tags=["Security"])
     app.include_router(rollback.router, prefix="/api/v1", tags=["Rollback"])
+    app.include_router(events.router, prefix="/api/v1", tags=["Events"])
     
     # Health check endpoint
     @app.get("/health", tags=["Health"])
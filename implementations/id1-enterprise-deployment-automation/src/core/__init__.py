@@ -2,10 +2,23 @@
 
 from .deployment_engine import DeploymentEngine
 from .manifest_compiler import ManifestCompiler
+from .overlays import ManifestOverlayStore
 from .validator import DeploymentValidator
+from .validation_rules import ValidationRule, ValidationRuleEngine
+from .rollout_scheduler import RolloutScheduler, RolloutReport
+from .pipeline import DeploymentPipeline
+from .admission import AdmissionController, AdmissionRejected
 
 __all__ = [
     "DeploymentEngine",
     "ManifestCompiler",
+    "ManifestOverlayStore",
     "DeploymentValidator",
+    "ValidationRule",
+    "ValidationRuleEngine",
+    "RolloutScheduler",
+    "RolloutReport",
+    "DeploymentPipeline",
+    "AdmissionController",
+    "AdmissionRejected",
 ]
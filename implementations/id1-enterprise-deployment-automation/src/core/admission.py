@@ -0,0 +1,264 @@
+"""Priority admission control for deployment submissions."""
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Deque, Dict, Optional
+
+from ..models.deployment import DeploymentManifest, DeploymentPriority
+from ..models.policy import PolicyType, UpdateChannelPolicy
+from .rollout_scheduler import percentile
+
+
+logger = logging.getLogger(__name__)
+
+
+# Highest priority first
+PRIORITY_ORDER = (
+    DeploymentPriority.CRITICAL_PATCH,
+    DeploymentPriority.MANUAL,
+    DeploymentPriority.AUTO_UPDATE,
+)
+
+DEFAULT_PRIORITY_CAPS: Dict[DeploymentPriority, int] = {
+    DeploymentPriority.CRITICAL_PATCH: 64,
+    DeploymentPriority.MANUAL: 16,
+    DeploymentPriority.AUTO_UPDATE: 8,
+}
+
+# Manifest metadata flag marking a security patch deployment
+SECURITY_PATCH_METADATA_KEY = "security_patch"
+
+
+def deployment_priority(
+    manifest: DeploymentManifest,
+    policy: Optional[UpdateChannelPolicy] = None,
+    requested: Optional[DeploymentPriority] = None
+) -> DeploymentPriority:
+    """Derive the admission priority of a deployment from what it deploys.
+
+    Security patch manifests are critical, deployments to instances on an
+    auto-update policy are routine and everything else is manual. A
+    requested priority can lower the result but never raise it.
+
+    Args:
+        manifest: Deployment manifest
+        policy: Update channel policy of the target instance
+        requested: Priority asked for by the client
+
+    Returns:
+        Admission priority
+    """
+    if manifest.metadata.get(SECURITY_PATCH_METADATA_KEY):
+        derived = DeploymentPriority.CRITICAL_PATCH
+    elif policy is not None and policy.policy_type == PolicyType.AUTO_UPDATE:
+        derived = DeploymentPriority.AUTO_UPDATE
+    else:
+        derived = DeploymentPriority.MANUAL
+
+    if requested is None:
+        return derived
+    return max(derived, requested, key=PRIORITY_ORDER.index)
+
+
+class AdmissionRejected(Exception):
+    """Raised when the admission queue is full."""
+
+    def __init__(self, priority: DeploymentPriority, retry_after: int):
+        """Initialize the rejection.
+
+        Args:
+            priority: Priority of the rejected submission
+            retry_after: Suggested seconds before retrying
+        """
+        super().__init__(f"Deployment queue is full for {priority.value} submissions")
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Bounded, priority-ordered admission in front of the deployment engine.
+
+    Work runs immediately while there is capacity. Otherwise it waits in a
+    FIFO queue per priority, and freed slots always go to the highest
+    priority that is under its own cap, so critical patches never wait
+    behind routine updates. Once ``max_queue`` submissions are waiting,
+    new ones are rejected with a retry hint instead of queueing unboundedly.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = 64,
+        priority_caps: Optional[Dict[DeploymentPriority, int]] = None,
+        max_queue: int = 1000,
+        sample_size: int = 1000
+    ):
+        """Initialize the admission controller.
+
+        Args:
+            max_concurrent: Maximum submissions running across all priorities
+            priority_caps: Maximum submissions running per priority
+            max_queue: Maximum submissions waiting across all priorities
+            sample_size: Number of recent wait times kept per priority
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+
+        self.max_concurrent = max_concurrent
+        self.priority_caps = {**DEFAULT_PRIORITY_CAPS, **(priority_caps or {})}
+        self.max_queue = max_queue
+
+        self._waiting: Dict[DeploymentPriority, Deque[asyncio.Future]] = {
+            priority: deque() for priority in PRIORITY_ORDER
+        }
+        self._running: Dict[DeploymentPriority, int] = {priority: 0 for priority in PRIORITY_ORDER}
+        self._waits: Dict[DeploymentPriority, Deque[float]] = {
+            priority: deque(maxlen=sample_size) for priority in PRIORITY_ORDER
+        }
+        self._service_seconds = 0.0
+        self._served = 0
+
+        self.admitted: Dict[DeploymentPriority, int] = {priority: 0 for priority in PRIORITY_ORDER}
+        self.rejected: Dict[DeploymentPriority, int] = {priority: 0 for priority in PRIORITY_ORDER}
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of submissions waiting for a slot."""
+        return sum(len(waiting) for waiting in self._waiting.values())
+
+    @property
+    def running(self) -> int:
+        """Number of submissions holding a slot."""
+        return sum(self._running.values())
+
+    @asynccontextmanager
+    async def slot(self, priority: DeploymentPriority) -> AsyncIterator[None]:
+        """Hold an admission slot for the duration of the block.
+
+        Args:
+            priority: Submission priority
+
+        Raises:
+            AdmissionRejected: If the queue is full
+        """
+        await self._acquire(priority)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._service_seconds += time.perf_counter() - started
+            self._served += 1
+            self._release(priority)
+
+    def retry_after(self) -> int:
+        """Estimate how long until a queued submission would be admitted.
+
+        Returns:
+            Whole seconds, at least 1
+        """
+        if not self._served:
+            return 1
+        average = self._service_seconds / self._served
+        return max(1, math.ceil(average * (self.queue_depth + 1) / self.max_concurrent))
+
+    def stats(self) -> Dict[str, object]:
+        """Get queue depth, concurrency and wait-time figures.
+
+        Returns:
+            Totals plus a breakdown per priority
+        """
+        priorities = {}
+        for priority in PRIORITY_ORDER:
+            waits = list(self._waits[priority])
+            priorities[priority.value] = {
+                "cap": self.priority_caps[priority],
+                "running": self._running[priority],
+                "queued": len(self._waiting[priority]),
+                "admitted": self.admitted[priority],
+                "rejected": self.rejected[priority],
+                "wait_p50_seconds": round(percentile(waits, 50), 6),
+                "wait_p99_seconds": round(percentile(waits, 99), 6),
+                "wait_max_seconds": round(max(waits, default=0.0), 6),
+            }
+
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "retry_after_seconds": self.retry_after(),
+            "priorities": priorities,
+        }
+
+    async def _acquire(self, priority: DeploymentPriority) -> None:
+        """Wait for a slot, or reject when the queue is full."""
+        enqueued = time.perf_counter()
+
+        if self._can_run(priority) and not self._has_waiters_at_or_above(priority):
+            self._grant(priority, enqueued)
+            return
+
+        if self.queue_depth >= self.max_queue:
+            self.rejected[priority] += 1
+            retry_after = self.retry_after()
+            logger.warning(f"Rejecting {priority.value} deployment submission, retry after {retry_after}s")
+            raise AdmissionRejected(priority, retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiting[priority].append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just before cancellation; hand the slot back
+                self._release(priority)
+            elif waiter in self._waiting[priority]:
+                # A dispatch may already have dropped the cancelled waiter
+                self._waiting[priority].remove(waiter)
+            raise
+
+        self._waits[priority].append(time.perf_counter() - enqueued)
+
+    def _grant(self, priority: DeploymentPriority, enqueued: float) -> None:
+        """Give a slot to a submission that did not have to wait."""
+        self._running[priority] += 1
+        self.admitted[priority] += 1
+        self._waits[priority].append(time.perf_counter() - enqueued)
+
+    def _release(self, priority: DeploymentPriority) -> None:
+        """Free a slot and hand it to the highest-priority eligible waiter."""
+        self._running[priority] -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        """Admit waiters in priority order while capacity allows."""
+        for priority in PRIORITY_ORDER:
+            waiting = self._waiting[priority]
+            while waiting and self._can_run(priority):
+                waiter = waiting.popleft()
+                if waiter.done():
+                    continue
+                self._running[priority] += 1
+                self.admitted[priority] += 1
+                waiter.set_result(None)
+            if self.running >= self.max_concurrent:
+                return
+
+    def _can_run(self, priority: DeploymentPriority) -> bool:
+        """Check global and per-priority capacity."""
+        return (
+            self.running < self.max_concurrent
+            and self._running[priority] < self.priority_caps[priority]
+        )
+
+    def _has_waiters_at_or_above(self, priority: DeploymentPriority) -> bool:
+        """Check whether anyone of equal or higher priority is already queued."""
+        for candidate in PRIORITY_ORDER:
+            if self._waiting[candidate]:
+                return True
+            if candidate == priority:
+                return False
+        return False
@@ -1,45 +1,146 @@
 """Core deployment engine for executing deployments."""
 
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+from collections import OrderedDict, deque
+from typing import TYPE_CHECKING, Optional, Dict, Any, Awaitable, Callable, List, Sequence, Tuple, Union
 from datetime import datetime
 from enum import Enum
 
-from ..models.deployment import Deployment, DeploymentStatus, DeploymentManifest
-from ..models.policy import UpdateChannelPolicy, PolicyType
+from ..models.deployment import (
+    Deployment,
+    DeploymentManifest,
+    DeploymentPriority,
+    DeploymentRef,
+    DeploymentStatus,
+    RolloutPlan,
+)
+from ..models.policy import UpdateChannelPolicy
+from ..models.event import EventType
+from ..events.bus import EventBus
+from ..persistence.write_behind import StateWriter
+from ..policies.policy_enforcer import PolicyEnforcer
+from ..rollback.rollback_manager import RollbackManager
+from ..utils.hashing import manifest_hash
+from ..utils.id_generator import new_id
+from ..utils.single_flight import SingleFlight
+from .admission import AdmissionController, deployment_priority
+from .manifest_compiler import ManifestCompiler
 from .validator import DeploymentValidator
+from .deployment_index import DeploymentIndex
+from .retention import TERMINAL_STATUSES, DeploymentRetentionStore
+from .planner import FleetPlanner, PinLookup, PolicyBatchLookup, deployment_blockers, pin_key
+from .rollout_scheduler import (
+    DEFAULT_WAVE_SIZES,
+    HealthGate,
+    InstanceSelector,
+    PolicyLookup,
+    RolloutReport,
+    RolloutScheduler,
+)
+
+if TYPE_CHECKING:
+    from .pipeline import DeploymentPipeline
 
 
 logger = logging.getLogger(__name__)
 
 
+# Ordered steps of a deployment; each can run as its own pipeline stage
+DEPLOYMENT_STEPS = ("compile", "validate", "deploy", "health_check")
+
+StepHandler = Callable[[Deployment, DeploymentManifest], Awaitable[None]]
+
+
 class DeploymentEngine:
     """Main deployment engine for orchestrating deployment operations."""
     
-    def __init__(self, validator: Optional[DeploymentValidator] = None):
+    def __init__(
+        self,
+        validator: Optional[DeploymentValidator] = None,
+        retention: Optional[DeploymentRetentionStore] = None,
+        state: Optional[StateWriter] = None,
+        step_handlers: Optional[Dict[str, StepHandler]] = None,
+        events: Optional[EventBus] = None,
+        compiler: Optional[ManifestCompiler] = None,
+        rollback_manager: Optional[RollbackManager] = None,
+        max_manifests: int = 1024,
+        enforcer: Optional[PolicyEnforcer] = None,
+        pin_lookup: Optional[PinLookup] = None,
+        admission: Optional[AdmissionController] = None
+    ):
         """Initialize the deployment engine.
         
         Args:
             validator: Optional deployment validator instance
+            retention: Optional retention store bounding in-memory deployments
+            state: Optional write-behind writer for durable state
+            step_handlers: Optional per-step coroutines doing the step's actual work
+            events: Optional event bus notified of status transitions
+            compiler: Optional manifest compiler used to compute deployment deltas
+            rollback_manager: Optional rollback manager whose manifest history
+                records what each instance currently runs
+            max_manifests: Distinct manifests kept in memory, least
+                recently deployed dropped first
+            enforcer: Optional policy enforcer deciding deployments and plans
+            pin_lookup: Optional callable returning active pins for an
+                instance; pinned components block deployments and plans
+            admission: Optional admission controller every execution,
+                however it is started, holds a slot from
         """
         self.validator = validator or DeploymentValidator()
-        self.deployments: Dict[str, Deployment] = {}
-        self.deployment_history: list[Deployment] = []
+        self.compiler = compiler or ManifestCompiler()
+        self.rollback_manager = rollback_manager
+        self.enforcer = enforcer or PolicyEnforcer()
+        self.pin_lookup = pin_lookup
+        self.admission = admission
+        self.state = state
+        self.events = events
+        self.step_handlers: Dict[str, StepHandler] = dict(step_handlers or {})
+        self.deployments: DeploymentRetentionStore = retention if retention is not None else DeploymentRetentionStore()
+        # Most recently executed deployment IDs; full history lives in the index
+        self.deployment_history: deque[str] = deque(maxlen=self.deployments.hot_size)
+        self.index = DeploymentIndex()
+        # Deployments dropped from the cold tier leave the indexes too
+        self.deployments.add_evict_listener(self.index.discard_many)
+        # (manifest hash, instance ID) -> ID of the unfinished deployment for it
+        self._active: Dict[Tuple[str, str], str] = {}
+        self._flights = SingleFlight()
+        self.coalesced_count = 0
+        # Manifests by content hash, least recently deployed first, and the
+        # hash last deployed to each instance
+        self.max_manifests = max_manifests
+        self.manifests: "OrderedDict[str, DeploymentManifest]" = OrderedDict()
+        self.current_manifests: Dict[str, str] = {}
+        # Deployments that were executing when state was last saved
+        self._interrupted: List[str] = []
     
     async def create_deployment(
         self,
         manifest: DeploymentManifest,
         instance_id: str,
         policy: Optional[UpdateChannelPolicy] = None,
-        dry_run: bool = False
+        dry_run: bool = False,
+        rollout_id: Optional[str] = None,
+        priority: Optional[DeploymentPriority] = None
     ) -> Deployment:
         """Create and prepare a new deployment.
         
+        Requests are deduplicated on (manifest content hash, instance): while
+        a deployment of the same manifest to the same instance is unfinished,
+        or still being created, duplicates return that deployment instead of
+        being validated and created again. A dry run validates and checks
+        policy but returns a record that is never stored or executed.
+        
         Args:
             manifest: Deployment manifest
             instance_id: Target instance ID
             policy: Update channel policy
             dry_run: Whether to run in dry-run mode
+            rollout_id: Optional ID of the fleet rollout creating the deployment
+            priority: Optional requested admission priority; it can lower,
+                but never raise, the priority derived from the manifest and
+                policy
             
         Returns:
             Created deployment record
@@ -47,6 +148,51 @@ class DeploymentEngine:
         Raises:
             ValueError: If deployment validation fails
         """
+        key = (manifest_hash(manifest), instance_id)
+        priority = deployment_priority(manifest, policy, priority)
+        
+        if dry_run:
+            return await self._create_deployment(
+                manifest, instance_id, key[0], policy, rollout_id, priority, dry_run=True
+            )
+        
+        existing = self._active_deployment(key)
+        if existing is not None:
+            self.coalesced_count += 1
+            logger.info(f"Attaching duplicate request to deployment {existing.id}")
+            return existing
+        
+        if self._flights.in_flight(("create", key)):
+            self.coalesced_count += 1
+        return await self._flights.do(
+            ("create", key),
+            lambda: self._create_deployment(manifest, instance_id, key[0], policy, rollout_id, priority)
+        )
+    
+    async def _create_deployment(
+        self,
+        manifest: DeploymentManifest,
+        instance_id: str,
+        content_hash: str,
+        policy: Optional[UpdateChannelPolicy],
+        rollout_id: Optional[str],
+        priority: DeploymentPriority,
+        dry_run: bool = False
+    ) -> Deployment:
+        """Validate a manifest and create its deployment record.
+        
+        Args:
+            manifest: Deployment manifest
+            instance_id: Target instance ID
+            content_hash: Content hash of the manifest
+            policy: Update channel policy
+            rollout_id: Optional fleet rollout ID
+            priority: Admission priority of the execution
+            dry_run: Whether to skip storing the record
+            
+        Returns:
+            Created deployment record
+        """
         logger.info(f"Creating deployment for instance {instance_id}")
         
         # Validate manifest
@@ -55,20 +201,32 @@ class DeploymentEngine:
             raise ValueError(f"Manifest validation failed: {validation_result.errors}")
         
         # Check policy compliance
-        if policy:
-            policy_result = await self._check_policy_compliance(manifest, policy)
-            if not policy_result:
-                raise ValueError("Deployment does not comply with update channel policy")
+        blockers = await self._check_policy_compliance(manifest, content_hash, instance_id, policy)
+        if blockers:
+            raise ValueError(f"Deployment does not comply with update channel policy: {'; '.join(blockers)}")
         
         # Create deployment record
         deployment = Deployment(
-            id=f"deploy-{datetime.utcnow().timestamp()}",
+            id=new_id("deploy"),
             manifest_id=manifest.id,
             instance_id=instance_id,
+            manifest_hash=content_hash,
+            rollout_id=rollout_id,
+            priority=priority,
             status=DeploymentStatus.PENDING
         )
         
+        if dry_run:
+            deployment.logs.append("Dry run: validation and policy checks passed, nothing was deployed")
+            logger.info(f"Dry run for instance {instance_id} passed")
+            return deployment
+        
+        self._remember_manifest(content_hash, manifest)
         self.deployments[deployment.id] = deployment
+        self.index.add(deployment)
+        self._active[(content_hash, instance_id)] = deployment.id
+        self._persist(deployment)
+        self._publish(deployment)
         logger.info(f"Deployment {deployment.id} created successfully")
         
         return deployment
@@ -80,6 +238,75 @@ class DeploymentEngine:
     ) -> Deployment:
         """Execute a deployment operation.
         
+        Concurrent calls for the same deployment share one execution, and a
+        deployment that has already finished is returned as it is.
+        
+        Args:
+            deployment: Deployment record
+            manifest: Deployment manifest
+            
+        Returns:
+            Updated deployment record
+        """
+        return await self.coalesce_execution(deployment, lambda: self._execute_deployment(deployment, manifest))
+    
+    async def coalesce_execution(
+        self,
+        deployment: Deployment,
+        execute: Callable[[], Awaitable[Deployment]]
+    ) -> Deployment:
+        """Run one execution of a deployment at a time, however it is executed.
+        
+        ``execute_deployment`` and the stage-parallel pipeline both start
+        executions through here, so a deployment already running on one
+        path is joined rather than started again on the other. With an
+        admission controller, the execution holds a slot at the
+        deployment's priority while it runs.
+        
+        Args:
+            deployment: Deployment record
+            execute: Coroutine function running the deployment to completion
+            
+        Returns:
+            Updated deployment record
+            
+        Raises:
+            AdmissionRejected: If the admission queue is full
+        """
+        if deployment.status in TERMINAL_STATUSES:
+            self.coalesced_count += 1
+            return deployment
+        
+        if self._flights.in_flight(("execute", deployment.id)):
+            self.coalesced_count += 1
+        return await self._flights.do(("execute", deployment.id), lambda: self._admitted(deployment, execute))
+    
+    async def _admitted(
+        self,
+        deployment: Deployment,
+        execute: Callable[[], Awaitable[Deployment]]
+    ) -> Deployment:
+        """Run an execution inside an admission slot, when admission is configured.
+        
+        Args:
+            deployment: Deployment record
+            execute: Coroutine function running the deployment to completion
+            
+        Returns:
+            Updated deployment record
+        """
+        if self.admission is None:
+            return await execute()
+        async with self.admission.slot(deployment.priority):
+            return await execute()
+    
+    async def _execute_deployment(
+        self,
+        deployment: Deployment,
+        manifest: DeploymentManifest
+    ) -> Deployment:
+        """Run every deployment step not yet checkpointed, in order.
+        
         Args:
             deployment: Deployment record
             manifest: Deployment manifest
@@ -87,78 +314,536 @@ class DeploymentEngine:
         Returns:
             Updated deployment record
         """
+        if deployment.started_at is None:
+            self.begin_deployment(deployment)
+        
+        try:
+            for step in DEPLOYMENT_STEPS:
+                if step not in deployment.completed_steps:
+                    await self.run_step(step, deployment, manifest)
+            self.complete_deployment(deployment, manifest)
+        except Exception as e:
+            self.fail_deployment(deployment, e)
+        
+        self.finish_deployment(deployment)
+        return deployment
+    
+    def begin_deployment(self, deployment: Deployment) -> None:
+        """Mark a deployment as started.
+        
+        Args:
+            deployment: Deployment record
+        """
         logger.info(f"Executing deployment {deployment.id}")
         
-        deployment.status = DeploymentStatus.COMPILING
+        self._set_status(deployment, DeploymentStatus.COMPILING)
         deployment.started_at = datetime.utcnow()
+    
+    async def run_step(
+        self,
+        step: str,
+        deployment: Deployment,
+        manifest: DeploymentManifest
+    ) -> None:
+        """Run one deployment step.
         
-        try:
-            # Step 1: Compile manifest
+        Args:
+            step: Step name from DEPLOYMENT_STEPS
+            deployment: Deployment record
+            manifest: Deployment manifest
+            
+        The step is checkpointed once it succeeds. A step interrupted by a
+        crash is run again on resume, so step handlers must be idempotent.
+        
+        The compile step diffs the manifest against the instance's current
+        manifest and stores the result in ``deployment.delta``; the deploy
+        step, and its handler, only apply the components and configuration
+        keys in that delta.
+        
+        Raises:
+            Exception: Propagated from the step handler when the step fails
+        """
+        if step == "compile":
             logger.info(f"Compiling manifest {manifest.id}")
             deployment.logs.append("Starting manifest compilation")
-            
-            # Step 2: Validate compiled manifest
+            await self._compute_delta(deployment, manifest)
+        
+        elif step == "validate":
             logger.info("Validating compiled manifest")
             deployment.logs.append("Validating compiled manifest")
-            
-            # Step 3: Deploy to instance
-            deployment.status = DeploymentStatus.DEPLOYING
-            logger.info(f"Deploying to instance {deployment.instance_id}")
+        
+        elif step == "deploy":
+            self._set_status(deployment, DeploymentStatus.DEPLOYING)
+            if deployment.delta is None:
+                # Checkpointed before deltas were recorded
+                await self._compute_delta(deployment, manifest)
+            logger.info(f"Deploying {deployment.delta.size} changes to instance {deployment.instance_id}")
             deployment.logs.append(f"Deploying to instance {deployment.instance_id}")
-            
-            # Step 4: Health checks
+            self._log_delta(deployment)
+        
+        elif step == "health_check":
             logger.info("Running health checks")
             deployment.logs.append("Running health checks")
+        
+        else:
+            raise ValueError(f"Unknown deployment step: {step}")
+        
+        handler = self.step_handlers.get(step)
+        if handler:
+            await handler(deployment, manifest)
+        
+        deployment.completed_steps.append(step)
+        self._persist(deployment)
+    
+    def complete_deployment(self, deployment: Deployment, manifest: DeploymentManifest) -> None:
+        """Mark a deployment as successfully deployed.
+        
+        The manifest is passed in by the execution rather than looked up, so
+        rollback history is recorded even if the manifest left the
+        in-memory cache while the deployment ran; it becomes the most
+        recently deployed manifest again.
+        
+        Args:
+            deployment: Deployment record
+            manifest: Deployed manifest
+        """
+        self._set_status(deployment, DeploymentStatus.DEPLOYED)
+        deployment.completed_at = datetime.utcnow()
+        deployment.logs.append("Deployment completed successfully")
+        if deployment.manifest_hash:
+            self._remember_manifest(deployment.manifest_hash, manifest)
+            self.current_manifests[deployment.instance_id] = deployment.manifest_hash
+        if self.rollback_manager:
+            self.rollback_manager.add_manifest_version(
+                deployment.instance_id,
+                manifest,
+                deployment.id,
+                DeploymentStatus.DEPLOYED.value
+            )
+        
+        logger.info(f"Deployment {deployment.id} completed successfully")
+    
+    def fail_deployment(self, deployment: Deployment, error: Exception) -> None:
+        """Mark a deployment as failed.
+        
+        Args:
+            deployment: Deployment record
+            error: Failure cause
+        """
+        deployment.error_message = str(error)
+        deployment.completed_at = datetime.utcnow()
+        self._set_status(deployment, DeploymentStatus.FAILED)
+        deployment.logs.append(f"Deployment failed: {str(error)}")
+        logger.error(f"Deployment {deployment.id} failed: {str(error)}")
+    
+    def finish_deployment(self, deployment: Deployment) -> None:
+        """Record a finished deployment in storage and history.
+        
+        Args:
+            deployment: Deployment record
+        """
+        self.deployments[deployment.id] = deployment
+        self.index.add(deployment)
+        self.deployment_history.append(deployment.id)
+        self._release_active(deployment)
+        self._persist(deployment)
+    
+    async def rollout(
+        self,
+        manifest: DeploymentManifest,
+        instance_selector: InstanceSelector,
+        max_in_flight: int = 50,
+        wave_sizes: Sequence[Union[int, float]] = DEFAULT_WAVE_SIZES,
+        health_gate: Optional[HealthGate] = None,
+        policy_lookup: Optional[PolicyLookup] = None,
+        pipeline: Optional["DeploymentPipeline"] = None
+    ) -> RolloutReport:
+        """Deploy a manifest across a fleet of instances.
+        
+        Instances are deployed concurrently (at most ``max_in_flight`` at a
+        time) in waves; the health gate runs between waves and halts the
+        rollout when it fails.
+        
+        Args:
+            manifest: Deployment manifest
+            instance_selector: Instance IDs, or a callable returning them
+            max_in_flight: Maximum concurrent deployments
+            wave_sizes: Wave sizes as instance counts (int) or fleet fractions (float)
+            health_gate: Optional gate evaluated after each wave
+            policy_lookup: Optional callable returning the policy for an instance
+            pipeline: Optional stage-parallel pipeline; deployments run
+                step-by-step in a single task when omitted
             
-            # Mark as deployed
-            deployment.status = DeploymentStatus.DEPLOYED
-            deployment.completed_at = datetime.utcnow()
-            deployment.logs.append("Deployment completed successfully")
+        Returns:
+            Rollout report with throughput and latency statistics
+        """
+        scheduler = RolloutScheduler(
+            engine=self,
+            max_in_flight=max_in_flight,
+            wave_sizes=wave_sizes,
+            health_gate=health_gate,
+            policy_lookup=policy_lookup,
+            pipeline=pipeline
+        )
+        return await scheduler.run(manifest, instance_selector)
+    
+    async def plan_rollout(
+        self,
+        manifest: DeploymentManifest,
+        instance_selector: InstanceSelector,
+        policy_lookup: Optional[PolicyBatchLookup] = None,
+        pin_lookup: Optional[PinLookup] = None,
+        max_in_flight: int = 50
+    ) -> RolloutPlan:
+        """Compute a dry-run plan for deploying a manifest across a fleet.
+        
+        Args:
+            manifest: Deployment manifest
+            instance_selector: Instance IDs, or a callable returning them
+            policy_lookup: Optional callable mapping instance IDs to their policies
+            pin_lookup: Optional callable returning active pins for an
+                instance (defaults to the engine's)
+            max_in_flight: Concurrency used for the total duration estimate
             
-            logger.info(f"Deployment {deployment.id} completed successfully")
+        Returns:
+            Plan grouped by effective instance state
+        """
+        planner = FleetPlanner(
+            engine=self,
+            policy_lookup=policy_lookup,
+            pin_lookup=pin_lookup or self.pin_lookup,
+            enforcer=self.enforcer
+        )
+        return await planner.plan(manifest, instance_selector, max_in_flight=max_in_flight)
+    
+    def current_manifest(self, instance_id: str) -> Optional[DeploymentManifest]:
+        """Get the manifest last deployed successfully to an instance.
+        
+        Args:
+            instance_id: Instance ID
             
-        except Exception as e:
-            deployment.status = DeploymentStatus.FAILED
-            deployment.error_message = str(e)
-            deployment.completed_at = datetime.utcnow()
-            deployment.logs.append(f"Deployment failed: {str(e)}")
-            logger.error(f"Deployment {deployment.id} failed: {str(e)}")
+        Returns:
+            Deployed manifest or None if unknown
+        """
+        content_hash = self.current_manifests.get(instance_id)
+        return self.manifests.get(content_hash) if content_hash else None
+    
+    async def _baseline_manifest(self, instance_id: str) -> Optional[DeploymentManifest]:
+        """Get the manifest an instance currently runs, for computing deltas.
         
-        self.deployments[deployment.id] = deployment
-        self.deployment_history.append(deployment)
+        The rollback manager's manifest history is authoritative when one is
+        configured; otherwise the engine's own record of completed deployments
+        is used.
+        
+        Args:
+            instance_id: Instance ID
+            
+        Returns:
+            Current manifest or None if unknown
+        """
+        if self.rollback_manager:
+            version = self.rollback_manager.current_version(instance_id)
+            if version is not None:
+                previous = await self.get_deployment(version.deployment_id)
+                if previous is not None and previous.manifest_hash in self.manifests:
+                    return self.manifests[previous.manifest_hash]
+        return self.current_manifest(instance_id)
+    
+    async def _compute_delta(self, deployment: Deployment, manifest: DeploymentManifest) -> None:
+        """Diff a deployment's manifest against what its instance runs now.
         
+        Args:
+            deployment: Deployment record
+            manifest: Target manifest
+        """
+        base = await self._baseline_manifest(deployment.instance_id)
+        deployment.delta = self.compiler.compute_delta(manifest, base)
+        
+        if base is None:
+            deployment.logs.append(f"No current manifest known; deploying all {deployment.delta.size} changes")
+        else:
+            deployment.previous_manifest_id = base.id
+            deployment.logs.append(
+                f"Computed delta against manifest {base.id}: {len(deployment.delta.changes)} components, "
+                f"{len(deployment.delta.configuration_set) + len(deployment.delta.configuration_removed)} "
+                f"configuration keys, {deployment.delta.unchanged_components} components unchanged"
+            )
+    
+    @staticmethod
+    def _log_delta(deployment: Deployment) -> None:
+        """Record the changes a deploy step applies.
+        
+        Args:
+            deployment: Deployment record with a computed delta
+        """
+        delta = deployment.delta
+        if delta.is_empty:
+            deployment.logs.append("Instance already runs this manifest; nothing to deploy")
+            return
+        
+        for change in delta.changes:
+            if change.to_version is None:
+                deployment.logs.append(f"Removing {change.component} {change.from_version}")
+            elif change.from_version is None:
+                deployment.logs.append(f"Installing {change.component} {change.to_version}")
+            else:
+                deployment.logs.append(f"Updating {change.component} {change.from_version} -> {change.to_version}")
+        
+        if delta.configuration_set:
+            deployment.logs.append(f"Setting configuration keys: {', '.join(sorted(delta.configuration_set))}")
+        if delta.configuration_removed:
+            deployment.logs.append(f"Removing configuration keys: {', '.join(sorted(delta.configuration_removed))}")
+    
+    def _remember_manifest(self, content_hash: str, manifest: DeploymentManifest) -> None:
+        """Keep one copy of each distinct manifest.
+        
+        Args:
+            content_hash: Content hash of the manifest
+            manifest: Deployment manifest
+        """
+        if content_hash in self.manifests:
+            self.manifests.move_to_end(content_hash)
+            return
+        
+        self.manifests[content_hash] = manifest
+        if self.state:
+            self.state.put("manifest", manifest, key=content_hash)
+        while len(self.manifests) > self.max_manifests:
+            self.manifests.popitem(last=False)
+    
+    def _set_status(self, deployment: Deployment, status: DeploymentStatus) -> None:
+        """Transition a deployment to a new status and keep indexes current.
+        
+        Args:
+            deployment: Deployment record
+            status: New status
+        """
+        deployment.status = status
+        self.index.update_status(deployment.id, status)
+        self._persist(deployment)
+        self._publish(deployment)
+    
+    def _active_deployment(self, key: Tuple[str, str]) -> Optional[Deployment]:
+        """Get the unfinished deployment registered for a dedup key.
+        
+        Args:
+            key: (manifest hash, instance ID)
+            
+        Returns:
+            Unfinished deployment or None
+        """
+        deployment_id = self._active.get(key)
+        if deployment_id is None:
+            return None
+        
+        deployment = self.deployments.get(deployment_id)
+        if deployment is None or deployment.status in TERMINAL_STATUSES:
+            self._active.pop(key, None)
+            return None
         return deployment
     
+    def _release_active(self, deployment: Deployment) -> None:
+        """Stop routing duplicate requests to a finished deployment.
+        
+        Args:
+            deployment: Deployment record
+        """
+        key = (deployment.manifest_hash, deployment.instance_id)
+        if self._active.get(key) == deployment.id:
+            del self._active[key]
+    
+    def _publish(self, deployment: Deployment) -> None:
+        """Announce a deployment's current status on the event bus.
+        
+        Args:
+            deployment: Deployment record
+        """
+        if self.events:
+            self.events.publish(
+                EventType.DEPLOYMENT_STATUS,
+                subject_id=deployment.id,
+                instance_id=deployment.instance_id,
+                status=deployment.status.value,
+                rollout_id=deployment.rollout_id,
+                manifest_id=deployment.manifest_id,
+                error_message=deployment.error_message
+            )
+    
+    def _persist(self, deployment: Deployment) -> None:
+        """Schedule a deployment record for durable storage.
+        
+        Unfinished deployments are also referenced under ``active_deployment``
+        and each instance's last successful deployment under
+        ``instance_deployment``, so a restart finds them however old they are.
+        
+        Args:
+            deployment: Deployment record
+        """
+        if not self.state:
+            return
+        self.state.put("deployment", deployment)
+        if deployment.status not in TERMINAL_STATUSES:
+            self.state.put("active_deployment", DeploymentRef(id=deployment.id, deployment_id=deployment.id))
+            return
+        self.state.delete("active_deployment", deployment.id)
+        if deployment.status == DeploymentStatus.DEPLOYED and deployment.manifest_hash:
+            self.state.put("instance_deployment", DeploymentRef(
+                id=deployment.instance_id,
+                deployment_id=deployment.id,
+                manifest_hash=deployment.manifest_hash
+            ))
+    
+    async def load_state(self, limit: Optional[int] = None) -> int:
+        """Load the most recent deployments from durable storage.
+        
+        The hot working set is loaded together with every unfinished
+        deployment, and each instance's current manifest is restored from
+        its last successful deployment however old; other deployments are
+        read from the store on demand by ``get_deployment``.
+        
+        Args:
+            limit: Maximum recent deployments to load (defaults to the hot-set size)
+            
+        Returns:
+            Number of deployments loaded
+        """
+        if not self.state:
+            return 0
+        
+        deployments, current = await asyncio.to_thread(
+            self._read_deployments,
+            limit or self.deployments.hot_size
+        )
+        # Only manifests the loaded working set refers to are read, most recently deployed first
+        hashes = list(dict.fromkeys(
+            [deployment.manifest_hash for deployment in reversed(deployments) if deployment.manifest_hash]
+            + list(current.values())
+        ))[:self.max_manifests]
+        manifests = await asyncio.to_thread(self._read_manifests, hashes)
+        for content_hash in reversed(hashes):
+            if content_hash in manifests:
+                self.manifests[content_hash] = manifests[content_hash]
+        
+        for deployment in deployments:
+            self.deployments[deployment.id] = deployment
+            self.index.add(deployment)
+            if deployment.status not in TERMINAL_STATUSES and deployment.started_at is not None:
+                self._interrupted.append(deployment.id)
+            if not deployment.manifest_hash:
+                continue
+            if deployment.status == DeploymentStatus.DEPLOYED:
+                self.current_manifests[deployment.instance_id] = deployment.manifest_hash
+            elif deployment.status not in TERMINAL_STATUSES:
+                self._active[(deployment.manifest_hash, deployment.instance_id)] = deployment.id
+        self.current_manifests.update(current)
+        
+        logger.info(f"Loaded {len(deployments)} deployments from state store")
+        return len(deployments)
+    
+    def _read_deployments(self, limit: int) -> Tuple[List[Deployment], Dict[str, str]]:
+        """Read recent and unfinished deployments and the current manifest of each instance.
+        
+        Args:
+            limit: Maximum recent deployments to read
+            
+        Returns:
+            Deployments oldest first, and instance ID -> current manifest hash
+        """
+        deployments = {deployment.id: deployment for deployment in self.state.load("deployment", Deployment, limit)}
+        for ref in self.state.load("active_deployment", DeploymentRef):
+            if ref.deployment_id not in deployments:
+                deployment = self.state.get("deployment", ref.deployment_id, Deployment)
+                if deployment is not None:
+                    deployments[deployment.id] = deployment
+        
+        current = {ref.id: ref.manifest_hash for ref in self.state.load("instance_deployment", DeploymentRef)}
+        return sorted(deployments.values(), key=lambda deployment: deployment.id), current
+    
+    def _read_manifests(self, hashes: List[str]) -> Dict[str, DeploymentManifest]:
+        """Read stored manifests by content hash.
+        
+        Args:
+            hashes: Manifest content hashes
+            
+        Returns:
+            Manifests found in the store, by content hash
+        """
+        manifests = {}
+        for content_hash in hashes:
+            manifest = self.state.get("manifest", content_hash, DeploymentManifest)
+            if manifest is not None:
+                manifests[content_hash] = manifest
+        return manifests
+    
+    async def resume_deployments(
+        self,
+        pipeline: Optional["DeploymentPipeline"] = None
+    ) -> List[Deployment]:
+        """Finish deployments that were interrupted by a restart.
+        
+        Each deployment continues from the step after its last checkpoint.
+        Call after ``load_state``.
+        
+        Args:
+            pipeline: Optional stage-parallel pipeline to resume on
+            
+        Returns:
+            Resumed deployments in their final state
+        """
+        interrupted, self._interrupted = self._interrupted, []
+        runs = []
+        
+        for deployment_id in interrupted:
+            deployment = self.deployments.get(deployment_id)
+            if deployment is None or deployment.status in TERMINAL_STATUSES:
+                continue
+            
+            manifest = self.manifests.get(deployment.manifest_hash) if deployment.manifest_hash else None
+            if manifest is None:
+                self.fail_deployment(deployment, RuntimeError("Cannot resume deployment: manifest is unavailable"))
+                self.finish_deployment(deployment)
+                continue
+            
+            deployment.logs.append(
+                f"Resuming after restart; completed steps: {', '.join(deployment.completed_steps) or 'none'}"
+            )
+            logger.info(f"Resuming deployment {deployment.id} after {deployment.completed_steps}")
+            if pipeline is not None:
+                runs.append(pipeline.submit(deployment, manifest))
+            else:
+                runs.append(self.execute_deployment(deployment, manifest))
+        
+        return list(await asyncio.gather(*runs))
+    
     async def _check_policy_compliance(
         self,
         manifest: DeploymentManifest,
-        policy: UpdateChannelPolicy
-    ) -> bool:
-        """Check if deployment complies with update channel policy.
+        content_hash: str,
+        instance_id: str,
+        policy: Optional[UpdateChannelPolicy]
+    ) -> List[str]:
+        """Check if deployment complies with update channel policy and pins.
+        
+        Decides exactly as ``FleetPlanner`` does: an instance already
+        running the manifest is never blocked, otherwise the policy and
+        active pins are checked by ``deployment_blockers``.
         
         Args:
             manifest: Deployment manifest
+            content_hash: Content hash of the manifest
+            instance_id: Target instance ID
             policy: Update channel policy
             
         Returns:
-            True if compliant, False otherwise
+            Blocking pins and policies; empty when compliant
         """
-        if policy.policy_type == PolicyType.AUTO_UPDATE:
-            # Auto-update policy allows all deployments
-            return True
-        
-        elif policy.policy_type == PolicyType.MANUAL_APPROVAL:
-            # Manual approval policy requires approval (checked elsewhere)
-            return True
+        if self.current_manifests.get(instance_id) == content_hash:
+            return []
         
-        elif policy.policy_type == PolicyType.FROZEN:
-            # Frozen policy only allows security patches
-            # Check if this is a security patch deployment
-            return True
-        
-        return False
+        pins = pin_key(self.pin_lookup(instance_id)) if self.pin_lookup else ()
+        return await deployment_blockers(self.enforcer, manifest, policy, pins)
     
-    def get_deployment(self, deployment_id: str) -> Optional[Deployment]:
+    async def get_deployment(self, deployment_id: str) -> Optional[Deployment]:
         """Get deployment by ID.
         
         Args:
@@ -167,17 +852,63 @@ class DeploymentEngine:
         Returns:
             Deployment record or None if not found
         """
-        return self.deployments.get(deployment_id)
+        deployment = await self.deployments.aget(deployment_id)
+        
+        if deployment is None and self.state:
+            # Not part of the loaded working set; fall back to the store
+            deployment = await asyncio.to_thread(self.state.get, "deployment", deployment_id, Deployment)
+            if deployment is not None:
+                self.deployments[deployment.id] = deployment
+                self.index.add(deployment)
+        
+        return deployment
     
-    def list_deployments(self, instance_id: Optional[str] = None) -> list[Deployment]:
+    async def list_deployments(
+        self,
+        instance_id: Optional[str] = None,
+        status: Optional[DeploymentStatus] = None,
+        limit: Optional[int] = None
+    ) -> list[Deployment]:
         """List deployments.
         
+        Lookups go through the secondary indexes, so the cost is proportional
+        to the number of matching deployments rather than total history.
+        
         Args:
             instance_id: Optional instance ID to filter by
+            status: Optional status to filter by
+            limit: Optional maximum number of most recent deployments to return
             
         Returns:
-            List of deployments
+            List of deployments, oldest first
+        """
+        if instance_id and status:
+            ids = self.index.ids_for_instance(instance_id, limit, status=status)
+        elif instance_id:
+            ids = self.index.ids_for_instance(instance_id, limit)
+        elif status:
+            ids = self.index.ids_with_status(status, limit)
+        else:
+            ids = self.index.latest_ids(limit)
+        
+        # Peek so that listing old history does not evict the hot working set
+        return await self.deployments.peek_many(ids)
+    
+    def count_deployments(self, status: DeploymentStatus) -> int:
+        """Count deployments currently in a status.
+        
+        Args:
+            status: Deployment status
+            
+        Returns:
+            Number of deployments
+        """
+        return self.index.count_with_status(status)
+    
+    def retention_stats(self) -> Dict[str, int]:
+        """Get deployment retention counters.
+        
+        Returns:
+            Hot/cold sizes and spill/rehydrate counts
         """
-        if instance_id:
-            return [d for d in self.deployments.values() if d.instance_id == instance_id]
-        return list(self.deployments.values())
+        return self.deployments.stats()
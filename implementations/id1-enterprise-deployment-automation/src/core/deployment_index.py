@@ -0,0 +1,231 @@
+"""Secondary indexes over deployment records."""
+
+import bisect
+import itertools
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from ..models.deployment import Deployment, DeploymentStatus
+from ..utils.id_generator import id_lower_bound
+
+
+class DeploymentIndex:
+    """Maintains instance, status and time-ordered indexes of deployment IDs.
+
+    Deployment IDs are time-ordered, so each per-instance list and the global
+    ID list stay sorted by creation time simply by appending (out-of-order
+    inserts fall back to a bisect insert). Every query touches only the IDs it
+    returns rather than the whole deployment history.
+    """
+
+    def __init__(self):
+        """Initialize empty indexes."""
+        self._ordered_ids: List[str] = []
+        self._by_instance: Dict[str, List[str]] = {}
+        # Dicts used as insertion-ordered sets
+        self._by_status: Dict[DeploymentStatus, Dict[str, None]] = {}
+        self._status: Dict[str, DeploymentStatus] = {}
+        self._instance: Dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._ordered_ids)
+
+    def __contains__(self, deployment_id: str) -> bool:
+        return deployment_id in self._status
+
+    def add(self, deployment: Deployment) -> None:
+        """Index a new deployment.
+
+        Args:
+            deployment: Deployment record
+        """
+        if deployment.id in self._status:
+            self.update_status(deployment.id, deployment.status)
+            return
+
+        self._insert_sorted(self._ordered_ids, deployment.id)
+        self._insert_sorted(self._by_instance.setdefault(deployment.instance_id, []), deployment.id)
+        self._by_status.setdefault(deployment.status, {})[deployment.id] = None
+        self._status[deployment.id] = deployment.status
+        self._instance[deployment.id] = deployment.instance_id
+
+    def update_status(self, deployment_id: str, status: DeploymentStatus) -> None:
+        """Move a deployment to a new status bucket.
+
+        Args:
+            deployment_id: Deployment ID
+            status: New status
+        """
+        previous = self._status.get(deployment_id)
+        if previous is None or previous == status:
+            return
+
+        self._by_status[previous].pop(deployment_id, None)
+        self._by_status.setdefault(status, {})[deployment_id] = None
+        self._status[deployment_id] = status
+
+    def remove(self, deployment: Deployment) -> None:
+        """Drop a deployment from every index.
+
+        Args:
+            deployment: Deployment record
+        """
+        status = self._status.pop(deployment.id, None)
+        if status is None:
+            return
+
+        self._by_status[status].pop(deployment.id, None)
+        self._instance.pop(deployment.id, None)
+        self._remove_sorted(self._ordered_ids, deployment.id)
+
+        instance_ids = self._by_instance.get(deployment.instance_id)
+        if instance_ids is not None:
+            self._remove_sorted(instance_ids, deployment.id)
+            if not instance_ids:
+                del self._by_instance[deployment.instance_id]
+
+    def discard_many(self, deployment_ids: Iterable[str]) -> None:
+        """Drop a batch of deployments from every index by ID.
+
+        Each affected list is rebuilt once, rather than shifted once per
+        removed ID.
+
+        Args:
+            deployment_ids: Deployment IDs, e.g. records dropped from retention
+        """
+        removed = set()
+        instances = set()
+        for deployment_id in deployment_ids:
+            status = self._status.pop(deployment_id, None)
+            if status is None:
+                continue
+            self._by_status[status].pop(deployment_id, None)
+            instances.add(self._instance.pop(deployment_id))
+            removed.add(deployment_id)
+        if not removed:
+            return
+
+        self._ordered_ids = [i for i in self._ordered_ids if i not in removed]
+        for instance_id in instances:
+            remaining = [i for i in self._by_instance[instance_id] if i not in removed]
+            if remaining:
+                self._by_instance[instance_id] = remaining
+            else:
+                del self._by_instance[instance_id]
+
+    def status_of(self, deployment_id: str) -> Optional[DeploymentStatus]:
+        """Get the indexed status of a deployment.
+
+        Args:
+            deployment_id: Deployment ID
+
+        Returns:
+            Status or None if not indexed
+        """
+        return self._status.get(deployment_id)
+
+    def ids_for_instance(
+        self,
+        instance_id: str,
+        limit: Optional[int] = None,
+        status: Optional[DeploymentStatus] = None
+    ) -> List[str]:
+        """Get deployment IDs for an instance in creation order.
+
+        Args:
+            instance_id: Instance ID
+            limit: Optional maximum number of (most recent) IDs
+            status: Optional status the deployments must currently have
+
+        Returns:
+            Deployment IDs, oldest first
+        """
+        ids = self._by_instance.get(instance_id, [])
+        if status is None:
+            return self._tail(ids, limit)
+
+        # Walk newest first so a limit stops the scan early
+        newest_first = (
+            deployment_id for deployment_id in reversed(ids)
+            if self._status[deployment_id] == status
+        )
+        if limit is not None:
+            newest_first = itertools.islice(newest_first, max(limit, 0))
+        matches = list(newest_first)
+        matches.reverse()
+        return matches
+
+    def ids_with_status(self, status: DeploymentStatus, limit: Optional[int] = None) -> List[str]:
+        """Get deployment IDs currently in a status.
+
+        Args:
+            status: Deployment status
+            limit: Optional maximum number of IDs that most recently entered the status
+
+        Returns:
+            Deployment IDs in the order they entered the status
+        """
+        bucket = self._by_status.get(status, {})
+        if limit is None:
+            return list(bucket)
+        recent = list(itertools.islice(reversed(bucket), max(limit, 0)))
+        recent.reverse()
+        return recent
+
+    def count_with_status(self, status: DeploymentStatus) -> int:
+        """Count deployments currently in a status.
+
+        Args:
+            status: Deployment status
+
+        Returns:
+            Number of deployments
+        """
+        return len(self._by_status.get(status, {}))
+
+    def latest_ids(self, limit: Optional[int] = None) -> List[str]:
+        """Get deployment IDs in creation order.
+
+        Args:
+            limit: Optional maximum number of (most recent) IDs
+
+        Returns:
+            Deployment IDs, oldest first
+        """
+        return self._tail(self._ordered_ids, limit)
+
+    def ids_since(self, since: datetime) -> List[str]:
+        """Get deployment IDs created at or after a point in time.
+
+        Args:
+            since: Lower time bound (naive values are treated as UTC)
+
+        Returns:
+            Deployment IDs, oldest first
+        """
+        start = bisect.bisect_left(self._ordered_ids, id_lower_bound("deploy", since))
+        return self._ordered_ids[start:]
+
+    @staticmethod
+    def _tail(ids: List[str], limit: Optional[int]) -> List[str]:
+        """Return the last ``limit`` IDs (all IDs when limit is None)."""
+        if limit is None:
+            return list(ids)
+        if limit <= 0:
+            return []
+        return ids[-limit:]
+
+    @staticmethod
+    def _insert_sorted(ids: List[str], deployment_id: str) -> None:
+        """Insert an ID keeping the list sorted; O(1) for in-order IDs."""
+        if not ids or ids[-1] < deployment_id:
+            ids.append(deployment_id)
+        else:
+            bisect.insort(ids, deployment_id)
+
+    @staticmethod
+    def _remove_sorted(ids: List[str], deployment_id: str) -> None:
+        """Remove an ID from a sorted list if present."""
+        position = bisect.bisect_left(ids, deployment_id)
+        if position < len(ids) and ids[position] == deployment_id:
+            del ids[position]
@@ -1,29 +1,141 @@
 """Manifest compiler for generating deployment configurations."""
 
+import asyncio
+import copy
 import logging
-from typing import Dict, Any, Optional
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Dict, Any, List, Mapping, Optional, Sequence, Union
 from datetime import datetime
 
-from ..models.deployment import DeploymentManifest
-from ..models.version import Version
+from ..models.deployment import (
+    ComponentChange,
+    DeploymentManifest,
+    ManifestCompileRequest,
+    ManifestCompileResult,
+    ManifestDelta
+)
+from ..models.version import ResolutionResult, Version
+from ..utils.hashing import payload_hash
+from ..utils.id_generator import new_id
+from ..versioning.resolver import DependencyResolver, StaticCatalog
 
 
 logger = logging.getLogger(__name__)
 
+COMPILER_VERSION = "1.0.0"
+
+# Catalog key of the platform component
+PLATFORM_COMPONENT = "platform:webwaka-platform"
+
+
+# Resolver over the catalog snapshot a compile worker process was started with
+_worker_resolver: Optional[DependencyResolver] = None
+
+
+def _init_compile_worker(versions: Dict[str, List[Version]], stable_only: bool) -> None:
+    """Install the catalog snapshot in a compile worker process."""
+    global _worker_resolver
+    _worker_resolver = DependencyResolver(StaticCatalog(versions), stable_only=stable_only)
+
+
+def _resolve_in_worker(requirements: Dict[str, str]) -> ResolutionResult:
+    """Resolve requirements against the worker's catalog snapshot."""
+    return _worker_resolver.resolve_requirements(requirements)
+
+
+def manifest_components(manifest: Union[DeploymentManifest, ManifestCompileRequest]) -> Dict[str, str]:
+    """Flatten a manifest into component key -> version.
+    
+    Args:
+        manifest: Deployment manifest or compile request
+        
+    Returns:
+        Mapping using ``platform``, ``suite:<name>`` and ``capability:<name>`` keys
+    """
+    components = {"platform": manifest.platform_version}
+    components.update({f"suite:{name}": version for name, version in manifest.suites.items()})
+    components.update({f"capability:{name}": version for name, version in manifest.capabilities.items()})
+    return components
+
+
+def component_changes(current: Dict[str, str], target: Dict[str, str]) -> List[ComponentChange]:
+    """List the component changes needed to go from one component set to another.
+    
+    Args:
+        current: Currently deployed components, from ``manifest_components``
+        target: Target components, from ``manifest_components``
+        
+    Returns:
+        Changed and added components, followed by removed ones
+    """
+    changes = [
+        ComponentChange(component=component, from_version=current.get(component), to_version=version)
+        for component, version in target.items()
+        if current.get(component) != version
+    ]
+    changes.extend(
+        ComponentChange(component=component, from_version=version, to_version=None)
+        for component, version in current.items()
+        if component not in target
+    )
+    return changes
+
 
 class ManifestCompiler:
-    """Compiles deployment manifests from version specifications."""
+    """Compiles deployment manifests from version specifications.
+    
+    Compiled manifests are content-addressed: the inputs are canonicalized
+    and hashed, and compiling the same platform, suites, capabilities and
+    configuration again returns the manifest already compiled for them.
+    Returned manifests are shared and must not be mutated.
     
-    def __init__(self):
-        """Initialize the manifest compiler."""
+    When the resolver's catalog has versions, batches, and single compiles
+    that ask for it, resolve the manifest's dependencies first and record
+    the result in the manifest's ``resolved_versions`` metadata; batches
+    resolve in a long-lived pool of worker processes holding a snapshot of
+    the catalog. Resolved manifests are addressed by their inputs and the
+    catalog generation, so a catalog change compiles them again.
+    """
+    
+    def __init__(self, resolver: Optional[DependencyResolver] = None, max_workers: Optional[int] = None):
+        """Initialize the manifest compiler.
+        
+        Args:
+            resolver: Optional dependency resolver over the version catalog
+            max_workers: Optional worker process limit for batch compiles,
+                defaults to the CPU count
+        """
+        self.resolver = resolver
+        self.max_workers = max_workers or os.cpu_count() or 1
         self.compiled_manifests: Dict[str, DeploymentManifest] = {}
+        self._by_hash: Dict[str, str] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Catalog generation the pool's workers were started with
+        self._pool_generation: Optional[int] = None
+    
+    async def start(self) -> None:
+        """Start the batch worker pool with the current catalog."""
+        if self._catalog() is not None:
+            self._worker_pool()
+    
+    async def stop(self) -> None:
+        """Shut the batch worker pool down without blocking the event loop."""
+        pool, self._pool = self._pool, None
+        self._pool_generation = None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
     
     async def compile_manifest(
         self,
         platform_version: str,
         suites: Dict[str, str],
         capabilities: Dict[str, str],
-        configuration: Optional[Dict[str, Any]] = None
+        configuration: Optional[Dict[str, Any]] = None,
+        resolve: bool = False
     ) -> DeploymentManifest:
         """Compile a deployment manifest.
         
@@ -32,32 +144,181 @@ class ManifestCompiler:
             suites: Suite versions mapping
             capabilities: Capability versions mapping
             configuration: Optional deployment configuration
+            resolve: Whether to resolve dependencies against the resolver's
+                catalog, when it has versions
             
         Returns:
             Compiled deployment manifest
+            
+        Raises:
+            ValueError: If resolving and no consistent set of versions exists
         """
+        configuration = configuration or {}
+        generation = self._catalog_generation() if resolve else None
+        key = self.input_hash(platform_version, suites, capabilities, configuration, generation)
+        
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        
+        resolved_versions = None
+        if generation is not None:
+            components = manifest_components(
+                ManifestCompileRequest(platform_version=platform_version, suites=suites, capabilities=capabilities)
+            )
+            result = await asyncio.to_thread(self.resolver.resolve_requirements, self._requirements(components))
+            resolved_versions = self._resolved_versions(result)
+        
+        return self._store(key, platform_version, suites, capabilities, configuration, resolved_versions)
+    
+    def _cached(self, key: str) -> Optional[DeploymentManifest]:
+        """Get the manifest compiled for a content hash, counting the lookup."""
+        cached_id = self._by_hash.get(key)
+        if cached_id is None:
+            return None
+        self.cache_hits += 1
+        logger.debug(f"Reusing compiled manifest {cached_id}")
+        return self.compiled_manifests[cached_id]
+    
+    def _store(
+        self,
+        key: str,
+        platform_version: str,
+        suites: Dict[str, str],
+        capabilities: Dict[str, str],
+        configuration: Dict[str, Any],
+        resolved_versions: Optional[Dict[str, str]]
+    ) -> DeploymentManifest:
+        """Build and cache a manifest whose dependencies are resolved."""
+        # A concurrent compile of the same inputs may have finished first
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+        
+        self.cache_misses += 1
         logger.info(f"Compiling manifest for platform {platform_version}")
         
-        manifest_id = f"manifest-{datetime.utcnow().timestamp()}"
+        manifest_id = new_id("manifest")
+        metadata = {
+            "compiled_at": datetime.utcnow().isoformat(),
+            "compiler_version": COMPILER_VERSION,
+            "content_hash": key
+        }
+        if resolved_versions is not None:
+            metadata["resolved_versions"] = resolved_versions
         
+        # Copy the inputs so later changes by the caller cannot alter the cached manifest
         manifest = DeploymentManifest(
             id=manifest_id,
             version="1.0.0",
             platform_version=platform_version,
-            suites=suites,
-            capabilities=capabilities,
-            configuration=configuration or {},
-            metadata={
-                "compiled_at": datetime.utcnow().isoformat(),
-                "compiler_version": "1.0.0"
-            }
+            suites=dict(suites),
+            capabilities=dict(capabilities),
+            configuration=copy.deepcopy(configuration),
+            metadata=metadata
         )
         
         self.compiled_manifests[manifest_id] = manifest
+        self._by_hash[key] = manifest_id
         logger.info(f"Manifest {manifest_id} compiled successfully")
         
         return manifest
     
+    def compute_delta(
+        self,
+        manifest: DeploymentManifest,
+        base: Optional[DeploymentManifest] = None
+    ) -> ManifestDelta:
+        """Compute what deploying a manifest over another one changes.
+        
+        Components are compared by version and configuration by top-level
+        key, so the delta is as small as the actual change.
+        
+        Args:
+            manifest: Target manifest
+            base: Manifest currently deployed, or None for a full deploy
+            
+        Returns:
+            Structured delta; every component and key is included without a base
+        """
+        target = manifest_components(manifest)
+        current = manifest_components(base) if base else {}
+        changes = component_changes(current, target)
+        
+        base_configuration = base.configuration if base else {}
+        configuration_set = {
+            key: value
+            for key, value in manifest.configuration.items()
+            if key not in base_configuration or base_configuration[key] != value
+        }
+        configuration_removed = [key for key in base_configuration if key not in manifest.configuration]
+        
+        return ManifestDelta(
+            base_manifest_id=base.id if base else None,
+            changes=changes,
+            configuration_set=configuration_set,
+            configuration_removed=configuration_removed,
+            unchanged_components=sum(1 for component, version in target.items() if current.get(component) == version)
+        )
+    
+    @staticmethod
+    def input_hash(
+        platform_version: str,
+        suites: Dict[str, str],
+        capabilities: Dict[str, str],
+        configuration: Optional[Dict[str, Any]] = None,
+        catalog_generation: Optional[int] = None
+    ) -> str:
+        """Compute the content address of a set of compiler inputs.
+        
+        Args:
+            platform_version: Platform version
+            suites: Suite versions mapping
+            capabilities: Capability versions mapping
+            configuration: Optional deployment configuration
+            catalog_generation: Catalog generation the dependencies are
+                resolved against, or None for an unresolved compile
+            
+        Returns:
+            Hex-encoded digest, independent of mapping order
+        """
+        inputs = {
+            "compiler_version": COMPILER_VERSION,
+            "platform_version": platform_version,
+            "suites": suites,
+            "capabilities": capabilities,
+            "configuration": configuration or {},
+        }
+        if catalog_generation is not None:
+            inputs["catalog_generation"] = catalog_generation
+        return payload_hash(inputs)
+    
+    def get_manifest_by_hash(self, content_hash: str) -> Optional[DeploymentManifest]:
+        """Get compiled manifest by the content hash of its inputs.
+        
+        Args:
+            content_hash: Digest returned by ``input_hash``
+            
+        Returns:
+            Manifest or None if not compiled
+        """
+        manifest_id = self._by_hash.get(content_hash)
+        return self.compiled_manifests.get(manifest_id) if manifest_id else None
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get compile cache counters.
+        
+        Returns:
+            Hits, misses, hit rate and number of distinct manifests
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+            "manifests": len(self.compiled_manifests),
+        }
+    
     async def validate_manifest_syntax(self, manifest: DeploymentManifest) -> bool:
         """Validate manifest syntax.
         
@@ -82,35 +343,189 @@ class ManifestCompiler:
     async def resolve_dependencies(
         self,
         manifest: DeploymentManifest,
-        available_versions: Dict[str, list[Version]]
+        available_versions: Optional[Dict[str, list[Version]]] = None
     ) -> Dict[str, str]:
-        """Resolve version dependencies.
+        """Resolve a manifest's components and everything they depend on.
+        
+        The manifest's own versions are exact requirements; components they
+        depend on resolve to the newest versions consistent with every
+        constraint.
         
         Args:
             manifest: Deployment manifest
-            available_versions: Available versions by component
+            available_versions: Optional catalog by ``<type>:<name>`` key;
+                the compiler's resolver catalog is used when omitted
             
         Returns:
-            Resolved version mappings
+            Resolved version mappings, keyed like ``manifest_components``
+            for the manifest's components and by catalog key for dependencies
+            
+        Raises:
+            ValueError: If no consistent set of versions exists
         """
         logger.info(f"Resolving dependencies for manifest {manifest.id}")
         
-        resolved_versions = {}
-        
-        # Resolve platform dependencies
-        resolved_versions["platform"] = manifest.platform_version
+        components = manifest_components(manifest)
+        if available_versions is not None:
+            resolver = DependencyResolver(StaticCatalog(available_versions))
+        elif self._catalog() is not None:
+            resolver = self.resolver
+        else:
+            logger.warning(f"No version catalog available; using manifest {manifest.id} versions as resolved")
+            return components
         
-        # Resolve suite dependencies
-        for suite_name, suite_version in manifest.suites.items():
-            resolved_versions[f"suite:{suite_name}"] = suite_version
-        
-        # Resolve capability dependencies
-        for cap_name, cap_version in manifest.capabilities.items():
-            resolved_versions[f"capability:{cap_name}"] = cap_version
+        result = await asyncio.to_thread(resolver.resolve_requirements, self._requirements(components))
+        resolved_versions = self._resolved_versions(result)
         
         logger.info(f"Dependencies resolved for manifest {manifest.id}")
         return resolved_versions
     
+    async def compile_many(
+        self,
+        requests: Sequence[ManifestCompileRequest]
+    ) -> AsyncIterator[ManifestCompileResult]:
+        """Compile many manifests, resolving dependencies in worker processes.
+        
+        Dependency resolution is CPU-bound, so it is spread across the
+        compiler's worker pool; items already compiled are answered from
+        the cache and identical items are resolved once. Results are
+        yielded as they finish, in no particular order. A failing item
+        yields a result with ``error`` set and does not affect the rest of
+        the batch. Closing the iterator early cancels resolutions that
+        have not started.
+        
+        Args:
+            requests: Manifests to compile; they compile without resolution
+                if the resolver's catalog has no versions
+            
+        Yields:
+            One result per request, tagged with its index
+        """
+        generation = self._catalog_generation()
+        
+        # Content hash -> indices of the requests that compile to it
+        pending: Dict[str, List[int]] = {}
+        for index, request in enumerate(requests):
+            if not request.platform_version:
+                yield ManifestCompileResult(index=index, error="Platform version is required")
+                continue
+            
+            key = self.input_hash(
+                request.platform_version, request.suites, request.capabilities, request.configuration, generation
+            )
+            manifest = self._cached(key) if key not in pending else None
+            if manifest is None and generation is None:
+                manifest = self._store_request(key, request, None)
+            if manifest is not None:
+                yield self._compile_result(index, manifest)
+            else:
+                pending.setdefault(key, []).append(index)
+        
+        if not pending:
+            return
+        
+        logger.info(f"Compiling {len(pending)} distinct manifests in worker processes")
+        
+        loop = asyncio.get_running_loop()
+        pool = self._worker_pool()
+        futures = {}
+        for key, indices in pending.items():
+            requirements = self._requirements(manifest_components(requests[indices[0]]))
+            futures[loop.run_in_executor(pool, _resolve_in_worker, requirements)] = key
+        
+        waiting = set(futures)
+        try:
+            while waiting:
+                done, waiting = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    key = futures[future]
+                    indices = pending[key]
+                    try:
+                        resolved_versions = self._resolved_versions(future.result())
+                    except Exception as e:
+                        for index in indices:
+                            yield ManifestCompileResult(index=index, error=str(e))
+                        continue
+                    
+                    manifest = self._store_request(key, requests[indices[0]], resolved_versions)
+                    self.cache_hits += len(indices) - 1
+                    for index in indices:
+                        yield self._compile_result(index, manifest)
+        finally:
+            for future in waiting:
+                future.cancel()
+    
+    def _store_request(
+        self,
+        key: str,
+        request: ManifestCompileRequest,
+        resolved_versions: Optional[Dict[str, str]]
+    ) -> DeploymentManifest:
+        """Build and cache the manifest for a batch item."""
+        return self._store(
+            key, request.platform_version, request.suites, request.capabilities,
+            request.configuration, resolved_versions
+        )
+    
+    @staticmethod
+    def _compile_result(index: int, manifest: DeploymentManifest) -> ManifestCompileResult:
+        """Report a compiled batch item."""
+        return ManifestCompileResult(
+            index=index,
+            manifest=manifest,
+            resolved_versions=manifest.metadata.get("resolved_versions") or manifest_components(manifest)
+        )
+    
+    def _catalog(self) -> Optional[Mapping[str, List[Version]]]:
+        """Get the resolver's catalog, or None if there is nothing to resolve against."""
+        if self.resolver is None or not self.resolver.catalog.version_index:
+            return None
+        return self.resolver.catalog.version_index
+    
+    def _catalog_generation(self) -> Optional[int]:
+        """Get the generation of the resolver's catalog, or None if there is nothing to resolve against."""
+        return self.resolver.catalog.generation if self._catalog() is not None else None
+    
+    def _worker_pool(self) -> ProcessPoolExecutor:
+        """Get the batch worker pool, replacing it if the catalog changed since it started."""
+        generation = self.resolver.catalog.generation
+        if self._pool is not None and self._pool_generation != generation:
+            # Resolutions already queued finish against the old snapshot
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        
+        if self._pool is None:
+            snapshot = {key: list(versions) for key, versions in self.resolver.catalog.version_index.items()}
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_compile_worker,
+                initargs=(snapshot, self.resolver.stable_only)
+            )
+            self._pool_generation = generation
+        return self._pool
+    
+    @staticmethod
+    def _requirements(components: Dict[str, str]) -> Dict[str, str]:
+        """Turn ``manifest_components`` into exact catalog requirements."""
+        return {
+            PLATFORM_COMPONENT if component == "platform" else component: f"=={version}"
+            for component, version in components.items()
+        }
+    
+    @staticmethod
+    def _resolved_versions(result: ResolutionResult) -> Dict[str, str]:
+        """Map a resolution back to ``manifest_components`` keys.
+        
+        Raises:
+            ValueError: If no consistent set of versions exists
+        """
+        if not result.is_resolved:
+            raise ValueError(f"Dependency resolution failed: {'; '.join(result.conflicts)}")
+        return {
+            "platform" if key == PLATFORM_COMPONENT else key: version
+            for key, version in result.resolved.items()
+        }
+    
     def get_manifest(self, manifest_id: str) -> Optional[DeploymentManifest]:
         """Get compiled manifest by ID.
         
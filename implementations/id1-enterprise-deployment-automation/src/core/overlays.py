@@ -0,0 +1,295 @@
+"""Layered manifest overlays resolved with structural sharing."""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+from ..models.deployment import DeploymentManifest, ManifestOverlay
+from ..utils.id_generator import new_id
+from .manifest_compiler import ManifestCompiler
+
+
+logger = logging.getLogger(__name__)
+
+
+def merge_shared(base: Mapping[str, Any], override: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Merge an override into a mapping, sharing everything it leaves alone.
+
+    Only the path to each overridden key is copied: an empty override
+    returns ``base`` itself, and nested mappings the override does not
+    touch are the same objects as in ``base``.
+
+    Args:
+        base: Mapping to merge into; never modified
+        override: Keys to set, merged recursively into nested mappings
+
+    Returns:
+        Merged mapping
+    """
+    if not override:
+        return base
+
+    merged = dict(base)
+    for key, value in override.items():
+        current = merged.get(key)
+        if isinstance(value, Mapping) and isinstance(current, Mapping):
+            merged[key] = merge_shared(current, value)
+        else:
+            merged[key] = value
+    return merged
+
+
+class ManifestOverlayStore:
+    """Per-environment and per-instance overlays over compiled manifests.
+
+    Overlays only hold their own overrides. An overlay's manifest is
+    resolved on first use from its parent's resolved manifest, reusing
+    the parent's suite, capability and configuration objects wherever the
+    overlay does not change them, so a fleet of instance manifests costs
+    roughly the size of their overrides. Resolved manifests are kept in an
+    LRU cache and invalidated when an overlay or one of its ancestors
+    changes. Like compiled manifests, they are shared and must not be
+    mutated.
+    """
+
+    def __init__(self, compiler: ManifestCompiler, cache_size: int = 10000):
+        """Initialize the overlay store.
+
+        Args:
+            compiler: Compiler holding the base manifests
+            cache_size: Maximum resolved manifests kept
+        """
+        self.compiler = compiler
+        self.cache_size = cache_size
+
+        self.overlays: Dict[str, ManifestOverlay] = {}
+        self._children: Dict[str, Set[str]] = {}
+        self._by_instance: Dict[str, str] = {}
+        self._resolved: "OrderedDict[str, DeploymentManifest]" = OrderedDict()
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add_overlay(
+        self,
+        parent_id: str,
+        name: Optional[str] = None,
+        instance_id: Optional[str] = None,
+        platform_version: Optional[str] = None,
+        suites: Optional[Dict[str, str]] = None,
+        capabilities: Optional[Dict[str, str]] = None,
+        configuration: Optional[Dict[str, Any]] = None
+    ) -> ManifestOverlay:
+        """Add an overlay on top of a compiled manifest or another overlay.
+
+        Args:
+            parent_id: Base manifest or overlay ID
+            name: Optional overlay name, e.g. the environment
+            instance_id: Instance the overlay configures; replaces any
+                previous overlay for that instance
+            platform_version: Optional platform version override
+            suites: Optional suite version overrides
+            capabilities: Optional capability version overrides
+            configuration: Optional configuration overrides
+
+        Returns:
+            Created overlay
+
+        Raises:
+            ValueError: If the parent does not exist
+        """
+        if parent_id not in self.overlays and self.compiler.get_manifest(parent_id) is None:
+            raise ValueError(f"Unknown manifest or overlay: {parent_id}")
+
+        overlay = ManifestOverlay(
+            id=new_id("overlay"),
+            parent_id=parent_id,
+            name=name,
+            instance_id=instance_id,
+            platform_version=platform_version,
+            suites=suites or {},
+            capabilities=capabilities or {},
+            configuration=configuration or {}
+        )
+
+        self.overlays[overlay.id] = overlay
+        self._children.setdefault(parent_id, set()).add(overlay.id)
+        if instance_id:
+            previous = self._by_instance.get(instance_id)
+            if previous:
+                self.remove_overlay(previous)
+            self._by_instance[instance_id] = overlay.id
+
+        logger.info(f"Added overlay {overlay.id} over {parent_id}")
+        return overlay
+
+    def update_overlay(
+        self,
+        overlay_id: str,
+        platform_version: Optional[str] = None,
+        suites: Optional[Dict[str, str]] = None,
+        capabilities: Optional[Dict[str, str]] = None,
+        configuration: Optional[Dict[str, Any]] = None
+    ) -> ManifestOverlay:
+        """Replace an overlay's overrides.
+
+        Fields left as None keep their current overrides.
+
+        Args:
+            overlay_id: Overlay ID
+            platform_version: Platform version override
+            suites: Suite version overrides
+            capabilities: Capability version overrides
+            configuration: Configuration overrides
+
+        Returns:
+            Updated overlay
+
+        Raises:
+            KeyError: If the overlay does not exist
+        """
+        overlay = self.overlays[overlay_id]
+        updates = {
+            "platform_version": platform_version,
+            "suites": suites,
+            "capabilities": capabilities,
+            "configuration": configuration,
+        }
+        overlay = overlay.model_copy(update={field: value for field, value in updates.items() if value is not None})
+
+        self.overlays[overlay_id] = overlay
+        self._invalidate(overlay_id)
+        return overlay
+
+    def remove_overlay(self, overlay_id: str) -> bool:
+        """Remove an overlay that no other overlay builds on.
+
+        Args:
+            overlay_id: Overlay ID
+
+        Returns:
+            True if removed, False if not found
+
+        Raises:
+            ValueError: If other overlays still apply on top of it
+        """
+        overlay = self.overlays.get(overlay_id)
+        if overlay is None:
+            return False
+        if self._children.get(overlay_id):
+            raise ValueError(f"Overlay {overlay_id} still has overlays applied on top of it")
+
+        del self.overlays[overlay_id]
+        self._children.pop(overlay_id, None)
+        self._children.get(overlay.parent_id, set()).discard(overlay_id)
+        if overlay.instance_id and self._by_instance.get(overlay.instance_id) == overlay_id:
+            del self._by_instance[overlay.instance_id]
+        self._resolved.pop(overlay_id, None)
+        return True
+
+    def resolve(self, overlay_id: str) -> DeploymentManifest:
+        """Resolve an overlay, or return a base manifest, as a full manifest.
+
+        Args:
+            overlay_id: Overlay or compiled manifest ID
+
+        Returns:
+            Resolved manifest, whose ID is the overlay ID
+
+        Raises:
+            KeyError: If neither an overlay nor a manifest has this ID
+        """
+        overlay = self.overlays.get(overlay_id)
+        if overlay is None:
+            manifest = self.compiler.get_manifest(overlay_id)
+            if manifest is None:
+                raise KeyError(overlay_id)
+            return manifest
+
+        manifest = self._resolved.get(overlay_id)
+        if manifest is not None:
+            self.cache_hits += 1
+            self._resolved.move_to_end(overlay_id)
+            return manifest
+
+        self.cache_misses += 1
+        parent = self.resolve(overlay.parent_id)
+
+        # Built without validation so unchanged mappings stay shared with the parent
+        manifest = DeploymentManifest.model_construct(
+            id=overlay.id,
+            version=parent.version,
+            platform_version=overlay.platform_version or parent.platform_version,
+            suites=merge_shared(parent.suites, overlay.suites),
+            capabilities=merge_shared(parent.capabilities, overlay.capabilities),
+            configuration=merge_shared(parent.configuration, overlay.configuration),
+            metadata={
+                "base_manifest_id": parent.metadata.get("base_manifest_id", parent.id),
+                "overlay_ids": parent.metadata.get("overlay_ids", []) + [overlay.id]
+            },
+            created_at=overlay.created_at
+        )
+
+        self._resolved[overlay_id] = manifest
+        if len(self._resolved) > self.cache_size:
+            self._resolved.popitem(last=False)
+        return manifest
+
+    def resolve_for_instance(self, instance_id: str) -> Optional[DeploymentManifest]:
+        """Resolve the manifest configured for an instance.
+
+        Args:
+            instance_id: Instance ID
+
+        Returns:
+            Resolved manifest or None if the instance has no overlay
+        """
+        overlay_id = self._by_instance.get(instance_id)
+        return self.resolve(overlay_id) if overlay_id else None
+
+    def get_overlay(self, overlay_id: str) -> Optional[ManifestOverlay]:
+        """Get overlay by ID.
+
+        Args:
+            overlay_id: Overlay ID
+
+        Returns:
+            Overlay or None if not found
+        """
+        return self.overlays.get(overlay_id)
+
+    def list_overlays(self, parent_id: Optional[str] = None) -> List[ManifestOverlay]:
+        """List overlays.
+
+        Args:
+            parent_id: Optional manifest or overlay ID to list direct overlays of
+
+        Returns:
+            List of overlays
+        """
+        if parent_id is None:
+            return list(self.overlays.values())
+        return [self.overlays[child] for child in self._children.get(parent_id, ())]
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get resolution cache counters.
+
+        Returns:
+            Hits, misses, hit rate, overlays and cached resolved manifests
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+            "overlays": len(self.overlays),
+            "cached": len(self._resolved),
+        }
+
+    def _invalidate(self, overlay_id: str) -> None:
+        """Drop the cached resolutions of an overlay and everything on top of it."""
+        pending = [overlay_id]
+        while pending:
+            current = pending.pop()
+            self._resolved.pop(current, None)
+            pending.extend(self._children.get(current, ()))
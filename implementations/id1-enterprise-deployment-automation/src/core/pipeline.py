@@ -0,0 +1,250 @@
+"""Stage-parallel deployment pipeline."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from ..models.deployment import Deployment, DeploymentManifest
+from .deployment_engine import DEPLOYMENT_STEPS, DeploymentEngine
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _WorkItem:
+    """A deployment travelling through the pipeline."""
+
+    deployment: Deployment
+    manifest: DeploymentManifest
+    future: asyncio.Future
+    enqueued_at: float = 0.0
+
+
+@dataclass
+class StageStats:
+    """Counters for a single pipeline stage."""
+
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+    in_progress: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def occupancy(self) -> float:
+        """Fraction of worker capacity spent processing since the stage started."""
+        elapsed = time.perf_counter() - self.started_at
+        if elapsed <= 0:
+            return 0.0
+        return min(1.0, self.busy_seconds / (elapsed * self.workers))
+
+    def summary(self, queue_depth: int) -> Dict[str, object]:
+        """Return a JSON-friendly summary of the stage."""
+        handled = self.processed + self.failed
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "in_progress": self.in_progress,
+            "queue_depth": queue_depth,
+            "occupancy": round(self.occupancy(), 4),
+            "avg_service_seconds": round(self.busy_seconds / handled, 6) if handled else 0.0,
+            "avg_queue_wait_seconds": round(self.wait_seconds / handled, 6) if handled else 0.0,
+            "max_queue_wait_seconds": round(self.max_wait_seconds, 6),
+        }
+
+
+class DeploymentPipeline:
+    """Runs deployment steps as stages with their own workers and queues.
+
+    Each step in ``DEPLOYMENT_STEPS`` becomes a stage fed by a bounded queue
+    and drained by a pool of workers, so different deployments overlap
+    across stages and fleet throughput is limited by the slowest stage
+    rather than the sum of all steps. A full queue blocks the upstream
+    stage, which propagates backpressure to ``submit``.
+    """
+
+    def __init__(
+        self,
+        engine: DeploymentEngine,
+        workers: Optional[Dict[str, int]] = None,
+        default_workers: int = 4,
+        queue_size: int = 100
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            engine: Deployment engine whose steps are executed
+            workers: Optional worker count per stage name
+            default_workers: Worker count for stages not listed in ``workers``
+            queue_size: Capacity of each stage's input queue
+        """
+        self.engine = engine
+        self.stages: List[str] = list(DEPLOYMENT_STEPS)
+        self.queue_size = queue_size
+        self.worker_counts = {
+            stage: (workers or {}).get(stage, default_workers) for stage in self.stages
+        }
+        for stage, count in self.worker_counts.items():
+            if count < 1:
+                raise ValueError(f"Stage {stage} needs at least one worker")
+
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._in_flight: Dict[str, _WorkItem] = {}
+        self.stats: Dict[str, StageStats] = {}
+
+    @property
+    def running(self) -> bool:
+        """Whether stage workers are running."""
+        return bool(self._tasks)
+
+    async def start(self) -> None:
+        """Start stage workers."""
+        if self.running:
+            return
+
+        for stage in self.stages:
+            self._queues[stage] = asyncio.Queue(maxsize=self.queue_size)
+            self.stats[stage] = StageStats(name=stage, workers=self.worker_counts[stage])
+
+        for position, stage in enumerate(self.stages):
+            for _ in range(self.worker_counts[stage]):
+                self._tasks.append(asyncio.create_task(self._worker(position)))
+
+        logger.info(f"Deployment pipeline started with workers {self.worker_counts}")
+
+    async def stop(self) -> None:
+        """Stop stage workers.
+
+        Unfinished deployments keep their last checkpoint so they can be
+        resumed after a restart; their submitters get a ``RuntimeError``.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        for queue in self._queues.values():
+            while not queue.empty():
+                queue.get_nowait()
+
+        # Covers both queued deployments and those interrupted mid-step
+        for item in self._in_flight.values():
+            if not item.future.done():
+                item.future.set_exception(RuntimeError("Deployment pipeline stopped"))
+                item.future.exception()
+        self._in_flight = {}
+
+        logger.info("Deployment pipeline stopped")
+
+    async def submit(self, deployment: Deployment, manifest: DeploymentManifest) -> Deployment:
+        """Run a deployment through the pipeline.
+
+        Waits for space in the first stage's queue, then for the deployment
+        to leave the last stage. A deployment already executing, in the
+        pipeline or through ``DeploymentEngine.execute_deployment``, is
+        joined rather than run twice; a resumed deployment enters at its
+        first unfinished stage.
+
+        Args:
+            deployment: Deployment record
+            manifest: Deployment manifest
+
+        Returns:
+            Finished deployment record
+        """
+        return await self.engine.coalesce_execution(deployment, lambda: self._submit(deployment, manifest))
+
+    async def _submit(self, deployment: Deployment, manifest: DeploymentManifest) -> Deployment:
+        """Enqueue a deployment and wait for it to leave the last stage."""
+        if not self.running:
+            await self.start()
+
+        if deployment.started_at is None:
+            self.engine.begin_deployment(deployment)
+        item = _WorkItem(
+            deployment=deployment,
+            manifest=manifest,
+            future=asyncio.get_running_loop().create_future()
+        )
+        self._in_flight[deployment.id] = item
+
+        # Resumed deployments skip the stages they already checkpointed
+        remaining = [
+            position for position, stage in enumerate(self.stages)
+            if stage not in deployment.completed_steps
+        ]
+        if not remaining:
+            self.engine.complete_deployment(deployment, manifest)
+            self._resolve(item)
+        else:
+            await self._enqueue(remaining[0], item)
+        return await item.future
+
+    def summary(self) -> List[Dict[str, object]]:
+        """Get per-stage occupancy, throughput and queue-wait figures.
+
+        Returns:
+            One summary dict per stage, in pipeline order
+        """
+        return [
+            self.stats[stage].summary(self._queues[stage].qsize())
+            for stage in self.stages
+            if stage in self.stats
+        ]
+
+    async def _enqueue(self, position: int, item: _WorkItem) -> None:
+        """Put an item on a stage's input queue."""
+        item.enqueued_at = time.perf_counter()
+        await self._queues[self.stages[position]].put(item)
+
+    async def _worker(self, position: int) -> None:
+        """Process items for one stage."""
+        stage = self.stages[position]
+        queue = self._queues[stage]
+        stats = self.stats[stage]
+        is_last = position == len(self.stages) - 1
+
+        while True:
+            item: _WorkItem = await queue.get()
+            picked_up = time.perf_counter()
+            wait = picked_up - item.enqueued_at
+            stats.wait_seconds += wait
+            stats.max_wait_seconds = max(stats.max_wait_seconds, wait)
+            stats.in_progress += 1
+
+            try:
+                await self.engine.run_step(stage, item.deployment, item.manifest)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                stats.failed += 1
+                self.engine.fail_deployment(item.deployment, e)
+                self._resolve(item)
+            else:
+                stats.processed += 1
+                if is_last:
+                    self.engine.complete_deployment(item.deployment, item.manifest)
+                    self._resolve(item)
+                else:
+                    # Blocking on a full downstream queue counts as busy time
+                    await self._enqueue(position + 1, item)
+            finally:
+                stats.in_progress -= 1
+                stats.busy_seconds += time.perf_counter() - picked_up
+                queue.task_done()
+
+    def _resolve(self, item: _WorkItem) -> None:
+        """Record a finished deployment and wake its submitter."""
+        self.engine.finish_deployment(item.deployment)
+        self._in_flight.pop(item.deployment.id, None)
+        if not item.future.done():
+            item.future.set_result(item.deployment)
@@ -0,0 +1,293 @@
+"""Side-effect free fleet deployment planning."""
+
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from ..models.deployment import (
+    DeploymentManifest,
+    PlanAction,
+    PlanGroup,
+    RolloutPlan,
+)
+from ..models.policy import UpdateChannelPolicy
+from ..models.version import VersionPin
+from ..policies.policy_enforcer import PolicyEnforcer
+from ..utils.hashing import manifest_hash
+from .manifest_compiler import component_changes, manifest_components
+from .rollout_scheduler import InstanceSelector
+
+if TYPE_CHECKING:
+    from .deployment_engine import DeploymentEngine
+
+
+logger = logging.getLogger(__name__)
+
+
+PolicyBatchLookup = Callable[[Sequence[str]], Dict[str, UpdateChannelPolicy]]
+PinLookup = Callable[[str], List[VersionPin]]
+
+# Effective state of an instance: (current manifest hash, policy key, pin key)
+StateKey = Tuple[Optional[str], Optional[Hashable], Tuple[Tuple[str, str], ...]]
+
+
+def pin_component(pin: VersionPin) -> str:
+    """Get the component key a version pin applies to.
+
+    Args:
+        pin: Version pin
+
+    Returns:
+        Component key matching ``manifest_components``
+    """
+    if pin.component_type == "platform":
+        return "platform"
+    return f"{pin.component_type}:{pin.component_name}"
+
+
+def pin_key(pins: Optional[Sequence[VersionPin]]) -> Tuple[Tuple[str, str], ...]:
+    """Reduce active pins to sorted (component, pinned version) pairs.
+
+    Args:
+        pins: Active version pins
+
+    Returns:
+        Sorted (component, pinned version) pairs
+    """
+    return tuple(sorted((pin_component(pin), pin.pinned_version) for pin in pins)) if pins else ()
+
+
+async def deployment_blockers(
+    enforcer: PolicyEnforcer,
+    manifest: DeploymentManifest,
+    policy: Optional[UpdateChannelPolicy],
+    pins: Tuple[Tuple[str, str], ...],
+    target: Optional[Dict[str, str]] = None
+) -> List[str]:
+    """Decide what, if anything, blocks deploying a manifest to an instance.
+
+    The planner and the deployment engine both decide through here, so an
+    instance a plan reports as blocked is never deployed.
+
+    Args:
+        enforcer: Policy enforcer
+        manifest: Target manifest
+        policy: Policy of the instance, if any
+        pins: Sorted (component, pinned version) pairs of the instance
+        target: Flattened target components, computed when omitted
+
+    Returns:
+        Blocking pins and policies; empty when the deployment may proceed
+    """
+    if target is None:
+        target = manifest_components(manifest)
+
+    blockers = [
+        f"Pin {component}={pinned_version}"
+        for component, pinned_version in pins
+        if component in target and target[component] != pinned_version
+    ]
+    if policy is not None:
+        allowed, reason = await enforcer.can_deploy(policy, manifest)
+        if not allowed:
+            blockers.append(f"Policy {policy.policy_type.value}: {reason}")
+    return blockers
+
+
+def _policy_key(policy: UpdateChannelPolicy) -> Hashable:
+    """Reduce a policy to the settings that affect a deployment decision."""
+    window = policy.auto_update_maintenance_window
+    return (
+        policy.policy_type,
+        policy.enabled,
+        tuple(sorted(policy.frozen_versions.items())),
+        policy.allow_security_patches,
+        json.dumps(window, sort_keys=True, default=str) if window else None,
+    )
+
+
+class FleetPlanner:
+    """Computes what deploying a manifest to a fleet would do.
+
+    Instances are grouped by effective state (currently deployed manifest,
+    policy settings and active pins) and each distinct state is evaluated
+    once, so planning cost grows with the number of distinct states rather
+    than the fleet size. Planning never creates deployments or mutates
+    policies or pins.
+    """
+
+    def __init__(
+        self,
+        engine: "DeploymentEngine",
+        policy_lookup: Optional[PolicyBatchLookup] = None,
+        pin_lookup: Optional[PinLookup] = None,
+        enforcer: Optional[PolicyEnforcer] = None,
+        overhead_seconds: float = 20.0,
+        seconds_per_component: float = 10.0
+    ):
+        """Initialize the planner.
+
+        Args:
+            engine: Deployment engine holding validation and current instance state
+            policy_lookup: Optional callable mapping instance IDs to their policies
+            pin_lookup: Optional callable returning active pins for an instance
+            enforcer: Optional policy enforcer
+            overhead_seconds: Estimated fixed cost of one deployment
+            seconds_per_component: Estimated cost of each changed component
+        """
+        self.engine = engine
+        self.policy_lookup = policy_lookup
+        self.pin_lookup = pin_lookup
+        self.enforcer = enforcer or PolicyEnforcer()
+        self.overhead_seconds = overhead_seconds
+        self.seconds_per_component = seconds_per_component
+
+    async def plan(
+        self,
+        manifest: DeploymentManifest,
+        instance_selector: InstanceSelector,
+        max_in_flight: int = 50
+    ) -> RolloutPlan:
+        """Plan a fleet deployment without side effects.
+
+        Args:
+            manifest: Deployment manifest
+            instance_selector: Instance IDs, or a callable returning them
+            max_in_flight: Concurrency used for the total duration estimate
+
+        Returns:
+            Plan grouped by effective instance state
+        """
+        started = time.perf_counter()
+
+        if callable(instance_selector):
+            instance_selector = instance_selector()
+        instance_ids = list(dict.fromkeys(instance_selector))
+
+        validation = await self.engine.validator.validate_manifest(manifest)
+        policies = self.policy_lookup(instance_ids) if self.policy_lookup else {}
+
+        members: Dict[StateKey, List[str]] = {}
+        representatives: Dict[Hashable, UpdateChannelPolicy] = {}
+        policy_keys: Dict[str, Hashable] = {}
+        current_manifests = self.engine.current_manifests
+
+        for instance_id in instance_ids:
+            policy = policies.get(instance_id)
+            policy_key = None
+            if policy is not None:
+                policy_key = policy_keys.get(policy.id)
+                if policy_key is None:
+                    policy_key = policy_keys[policy.id] = _policy_key(policy)
+                    representatives.setdefault(policy_key, policy)
+
+            pins = pin_key(self.pin_lookup(instance_id)) if self.pin_lookup else ()
+
+            key = (current_manifests.get(instance_id), policy_key, pins)
+            members.setdefault(key, []).append(instance_id)
+
+        target = manifest_components(manifest)
+        target_hash = manifest_hash(manifest)
+        groups: List[PlanGroup] = []
+        for (current_hash, policy_key, pins), group_ids in members.items():
+            groups.append(await self._plan_group(
+                manifest,
+                target,
+                target_hash,
+                validation.errors if not validation.is_valid else [],
+                current_hash,
+                representatives.get(policy_key) if policy_key is not None else None,
+                pins,
+                group_ids
+            ))
+
+        counts = {action: 0 for action in PlanAction}
+        total_work = 0.0
+        longest = 0.0
+        for group in groups:
+            counts[group.action] += len(group.instance_ids)
+            total_work += group.estimated_seconds * len(group.instance_ids)
+            longest = max(longest, group.estimated_seconds)
+
+        plan = RolloutPlan(
+            manifest_id=manifest.id,
+            manifest_hash=target_hash,
+            total_instances=len(instance_ids),
+            to_update=counts[PlanAction.UPDATE],
+            unchanged=counts[PlanAction.UNCHANGED],
+            blocked=counts[PlanAction.BLOCKED],
+            estimated_total_seconds=round(max(longest, total_work / max_in_flight), 3),
+            planning_seconds=round(time.perf_counter() - started, 6),
+            groups=groups
+        )
+
+        logger.info(
+            f"Planned manifest {manifest.id} for {plan.total_instances} instances in "
+            f"{len(groups)} groups: {plan.to_update} update, {plan.unchanged} unchanged, "
+            f"{plan.blocked} blocked"
+        )
+        return plan
+
+    async def _plan_group(
+        self,
+        manifest: DeploymentManifest,
+        target: Dict[str, str],
+        target_hash: str,
+        validation_errors: List[str],
+        current_hash: Optional[str],
+        policy: Optional[UpdateChannelPolicy],
+        pins: Tuple[Tuple[str, str], ...],
+        instance_ids: List[str]
+    ) -> PlanGroup:
+        """Evaluate one effective state.
+
+        A group already running the target manifest is unchanged without
+        diffing. A group whose current manifest is no longer held in memory
+        is planned as a full deployment and marked with an unknown baseline.
+
+        Args:
+            manifest: Target manifest
+            target: Flattened target components
+            target_hash: Content hash of the target manifest
+            validation_errors: Manifest validation errors, if any
+            current_hash: Hash of the manifest currently deployed to the group
+            policy: Policy representative of the group
+            pins: Sorted (component, pinned version) pairs of the group
+            instance_ids: Instances in the group
+
+        Returns:
+            Plan for the group
+        """
+        if current_hash == target_hash:
+            current = manifest
+            changes = []
+        else:
+            current = self.engine.manifests.get(current_hash) if current_hash else None
+            changes = component_changes(manifest_components(current) if current else {}, target)
+
+        blockers = [f"Validation: {error}" for error in validation_errors]
+        if changes:
+            blockers.extend(await deployment_blockers(self.enforcer, manifest, policy, pins, target))
+
+        if blockers:
+            action = PlanAction.BLOCKED
+        elif changes:
+            action = PlanAction.UPDATE
+        else:
+            action = PlanAction.UNCHANGED
+
+        estimate = 0.0
+        if action == PlanAction.UPDATE:
+            estimate = self.overhead_seconds + self.seconds_per_component * len(changes)
+
+        return PlanGroup(
+            instance_ids=instance_ids,
+            action=action,
+            current_manifest_id=current.id if current else None,
+            baseline_known=current_hash is None or current is not None,
+            policy_type=policy.policy_type.value if policy else None,
+            changes=changes,
+            blockers=blockers,
+            estimated_seconds=estimate
+        )
@@ -0,0 +1,210 @@
+"""Readiness probes against instance agents."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import httpx
+
+from ..utils.single_flight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+# Agent paths for the connectivity, disk space and version probes
+HEALTH_PATH = "/health"
+DISK_PATH = "/disk"
+VERSION_PATH = "/version"
+
+
+@dataclass
+class AgentStatus:
+    """What an instance agent reported during one round of probes."""
+
+    instance_id: str
+    reachable: bool = False
+    free_disk_bytes: Optional[int] = None
+    platform_version: Optional[str] = None
+    failures: List[str] = field(default_factory=list)
+    probed_at: float = field(default_factory=time.monotonic)
+
+
+class ReadinessProber:
+    """Probes instance agents for connectivity, disk space and version.
+
+    The three probes for an instance run concurrently, each bounded by its
+    own timeout, over one pooled HTTP client shared by every probe. Results
+    are cached per instance for a short TTL, and concurrent requests for an
+    instance share a single round of probes, so a rollout wave probed
+    during pre-flight is not probed again when its deployments start.
+    """
+
+    def __init__(
+        self,
+        agent_url: Union[str, Callable[[str], str]],
+        probe_timeout: float = 2.0,
+        cache_ttl: float = 30.0,
+        min_free_disk_bytes: int = 1024 * 1024 * 1024,
+        max_concurrency: int = 200,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """Initialize the prober.
+
+        Args:
+            agent_url: Agent base URL template containing ``{instance_id}``,
+                or a function mapping an instance ID to its agent base URL
+            probe_timeout: Seconds each probe may take
+            cache_ttl: Seconds a probe result is reused for
+            min_free_disk_bytes: Free disk space an instance needs to be ready
+            max_concurrency: Maximum instances probed at once by ``probe_many``
+            transport: Optional HTTP transport, e.g. a stub agent in tests
+        """
+        self.agent_url = agent_url
+        self.probe_timeout = probe_timeout
+        self.cache_ttl = cache_ttl
+        self.min_free_disk_bytes = min_free_disk_bytes
+        self.max_concurrency = max_concurrency
+        self.transport = transport
+
+        self._client: Optional[httpx.AsyncClient] = None
+        self._cache: Dict[str, AgentStatus] = {}
+        self._flights = SingleFlight()
+
+        self.cache_hits = 0
+        self.probes = 0
+
+    async def probe(self, instance_id: str) -> AgentStatus:
+        """Probe an instance, reusing a result younger than the cache TTL.
+
+        Args:
+            instance_id: Instance ID
+
+        Returns:
+            Agent status
+        """
+        cached = self._cache.get(instance_id)
+        if cached is not None and time.monotonic() - cached.probed_at < self.cache_ttl:
+            self.cache_hits += 1
+            return cached
+
+        return await self._flights.do(instance_id, lambda: self._probe(instance_id))
+
+    async def probe_many(self, instance_ids: Iterable[str]) -> Dict[str, AgentStatus]:
+        """Probe a batch of instances, at most ``max_concurrency`` at a time.
+
+        Args:
+            instance_ids: Instance IDs, e.g. a rollout wave
+
+        Returns:
+            Instance ID -> agent status
+        """
+        instance_ids = list(dict.fromkeys(instance_ids))
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def bounded(instance_id: str) -> AgentStatus:
+            async with semaphore:
+                return await self.probe(instance_id)
+
+        statuses = await asyncio.gather(*(bounded(instance_id) for instance_id in instance_ids))
+        return dict(zip(instance_ids, statuses))
+
+    def invalidate(self, instance_id: Optional[str] = None) -> None:
+        """Drop cached results.
+
+        Args:
+            instance_id: Instance to forget; None forgets every instance
+        """
+        if instance_id is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(instance_id, None)
+
+    def stats(self) -> Dict[str, object]:
+        """Get probe counters.
+
+        Returns:
+            Probe rounds run, cache hits and cached instances
+        """
+        return {
+            "probes": self.probes,
+            "cache_hits": self.cache_hits,
+            "cached": len(self._cache),
+        }
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client; a later probe opens a new one."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _probe(self, instance_id: str) -> AgentStatus:
+        """Run one round of probes against an instance's agent."""
+        self.probes += 1
+        base_url = self._base_url(instance_id)
+
+        health, disk, version = await asyncio.gather(
+            self._get(base_url + HEALTH_PATH),
+            self._get(base_url + DISK_PATH),
+            self._get(base_url + VERSION_PATH)
+        )
+
+        status = AgentStatus(instance_id=instance_id)
+        payload, failure = health
+        status.reachable = failure is None
+        if failure:
+            status.failures.append(f"connectivity: {failure}")
+
+        payload, failure = disk
+        if failure:
+            status.failures.append(f"disk: {failure}")
+        elif isinstance(payload.get("free_bytes"), int):
+            status.free_disk_bytes = payload["free_bytes"]
+
+        payload, failure = version
+        if failure:
+            status.failures.append(f"version: {failure}")
+        elif isinstance(payload.get("platform_version"), str):
+            status.platform_version = payload["platform_version"]
+
+        self._cache[instance_id] = status
+        return status
+
+    async def _get(self, url: str) -> Tuple[dict, Optional[str]]:
+        """Fetch a probe endpoint within the probe timeout.
+
+        Returns:
+            Tuple of (JSON body, failure description or None)
+        """
+        try:
+            response = await asyncio.wait_for(self._http().get(url), self.probe_timeout)
+            response.raise_for_status()
+        except asyncio.TimeoutError:
+            return {}, f"timed out after {self.probe_timeout}s"
+        except httpx.HTTPStatusError as e:
+            return {}, f"HTTP {e.response.status_code}"
+        except httpx.HTTPError as e:
+            return {}, str(e) or type(e).__name__
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        return body if isinstance(body, dict) else {}, None
+
+    def _base_url(self, instance_id: str) -> str:
+        """Get an instance's agent base URL."""
+        if callable(self.agent_url):
+            return self.agent_url(instance_id).rstrip("/")
+        return self.agent_url.format(instance_id=instance_id).rstrip("/")
+
+    def _http(self) -> httpx.AsyncClient:
+        """Get the pooled HTTP client, opening it on first use."""
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.max_concurrency * 3,
+                max_keepalive_connections=self.max_concurrency * 3
+            )
+            self._client = httpx.AsyncClient(limits=limits, timeout=self.probe_timeout, transport=self.transport)
+        return self._client
@@ -0,0 +1,520 @@
+"""Tiered retention for deployment records.
+
+Recent and in-flight deployments stay in a bounded in-memory hot set.
+Completed deployments evicted from the hot set are spilled to compressed
+on-disk segments and rehydrated lazily when they are accessed again. The
+oldest segments are dropped once the cold tier is full, so memory and disk
+use stay flat however long the history grows.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import zlib
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from ..models.deployment import Deployment, DeploymentStatus
+
+
+logger = logging.getLogger(__name__)
+
+
+# Deployments in these states are finished and safe to move out of memory
+TERMINAL_STATUSES = frozenset({
+    DeploymentStatus.DEPLOYED,
+    DeploymentStatus.FAILED,
+    DeploymentStatus.ROLLED_BACK,
+    DeploymentStatus.CANCELLED,
+})
+
+_HOT = -1
+
+# Attempts at writing a segment before its records are dropped
+_WRITE_ATTEMPTS = 3
+
+EvictListener = Callable[[List[str]], None]
+
+
+class DeploymentRetentionStore(MutableMapping):
+    """Dict-like deployment store with a bounded hot set and disk spill.
+
+    Only terminal deployments are spilled; active ones are always kept in
+    memory regardless of the hot-set size. Spilled records are buffered and
+    written ``segment_size`` at a time as zlib-compressed JSON lines;
+    inside a running event loop, compression and file I/O happen in a worker
+    thread while the records stay readable from memory, and ``aget`` and
+    ``peek_many`` read spilled segments in a worker thread too. A segment
+    file is deleted once every record in it has been rehydrated or removed.
+    A segment that still cannot be written after a few attempts is dropped
+    like an evicted one, so failed writes do not accumulate in memory.
+
+    Once more than ``cold_size`` deployments are spilled, the oldest
+    segments are dropped together with their location entries, and evict
+    listeners are told which deployments are gone so they can drop their
+    own per-deployment entries.
+    """
+
+    def __init__(
+        self,
+        hot_size: int = 10000,
+        segment_size: int = 256,
+        spill_dir: Optional[str] = None,
+        segment_cache_size: int = 2,
+        cold_size: Optional[int] = 100000
+    ):
+        """Initialize the retention store.
+
+        Args:
+            hot_size: Maximum number of deployments kept in memory
+            segment_size: Number of spilled deployments per on-disk segment
+            spill_dir: Directory for segment files (a temp dir is created lazily if omitted)
+            segment_cache_size: Number of decompressed segments kept for rehydration
+            cold_size: Maximum spilled deployments retained; None keeps all of them
+        """
+        if hot_size < 1:
+            raise ValueError("hot_size must be at least 1")
+        if segment_size < 1:
+            raise ValueError("segment_size must be at least 1")
+        if cold_size is not None and cold_size < 1:
+            raise ValueError("cold_size must be at least 1")
+
+        self.hot_size = hot_size
+        self.segment_size = segment_size
+        self.segment_cache_size = segment_cache_size
+        self.cold_size = cold_size
+        self._spill_dir = spill_dir
+        self._owns_spill_dir = spill_dir is None
+
+        self._hot: "OrderedDict[str, Deployment]" = OrderedDict()
+        # Location of every known deployment: _HOT or a segment number
+        self._locations: Dict[str, int] = {}
+        self._pending: Dict[str, str] = {}
+        # Live records per segment, oldest segment first
+        self._segment_live: Dict[int, int] = {}
+        self._segment_ids: Dict[int, List[str]] = {}
+        self._segment_cache: "OrderedDict[int, Dict[str, str]]" = OrderedDict()
+        # Records of segments still being written by a worker thread
+        self._writing: Dict[int, Dict[str, str]] = {}
+        self._io_tasks: Set[asyncio.Task] = set()
+        self._next_segment = 0
+        self._cold = 0
+        self._evict_listeners: List[EvictListener] = []
+
+        self.spill_count = 0
+        self.rehydrate_count = 0
+        self.segments_written = 0
+        self.evict_count = 0
+        self.write_failures = 0
+
+    # Mapping protocol
+
+    def __getitem__(self, deployment_id: str) -> Deployment:
+        deployment = self.get(deployment_id)
+        if deployment is None:
+            raise KeyError(deployment_id)
+        return deployment
+
+    def __setitem__(self, deployment_id: str, deployment: Deployment) -> None:
+        if self._locations.get(deployment_id, _HOT) != _HOT:
+            self._forget_cold(deployment_id)
+        self._pending.pop(deployment_id, None)
+
+        self._hot[deployment_id] = deployment
+        self._hot.move_to_end(deployment_id)
+        self._locations[deployment_id] = _HOT
+        self._enforce_capacity()
+
+    def __delitem__(self, deployment_id: str) -> None:
+        location = self._locations.pop(deployment_id)
+        if location == _HOT:
+            self._hot.pop(deployment_id, None)
+            self._pending.pop(deployment_id, None)
+        else:
+            self._release(location)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._locations))
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def __contains__(self, deployment_id: object) -> bool:
+        return deployment_id in self._locations
+
+    def get(self, deployment_id: str, default: Optional[Deployment] = None) -> Optional[Deployment]:
+        """Get a deployment, rehydrating it into the hot set if spilled.
+
+        Args:
+            deployment_id: Deployment ID
+            default: Value returned when the deployment is unknown
+
+        Returns:
+            Deployment record or default
+        """
+        return self._get(deployment_id, default, {})
+
+    async def aget(self, deployment_id: str, default: Optional[Deployment] = None) -> Optional[Deployment]:
+        """Get a deployment like ``get``, reading a spilled segment in a worker thread.
+
+        Args:
+            deployment_id: Deployment ID
+            default: Value returned when the deployment is unknown
+
+        Returns:
+            Deployment record or default
+        """
+        fetched = await self._fetch_segments([deployment_id])
+        return self._get(deployment_id, default, fetched)
+
+    def _get(
+        self,
+        deployment_id: str,
+        default: Optional[Deployment],
+        fetched: Dict[int, Dict[str, str]]
+    ) -> Optional[Deployment]:
+        """Get a deployment, reading its segment from ``fetched`` when present."""
+        location = self._locations.get(deployment_id)
+        if location is None:
+            return default
+
+        if location == _HOT:
+            deployment = self._hot.get(deployment_id)
+            if deployment is not None:
+                self._hot.move_to_end(deployment_id)
+                return deployment
+            # Evicted but its segment has not been flushed yet
+            deployment = Deployment.model_validate_json(self._pending.pop(deployment_id))
+        else:
+            deployment = self._load(deployment_id, location, fetched)
+            self._release(location)
+
+        self.rehydrate_count += 1
+        self._hot[deployment_id] = deployment
+        self._locations[deployment_id] = _HOT
+        self._enforce_capacity()
+        return deployment
+
+    def peek(self, deployment_id: str) -> Optional[Deployment]:
+        """Read a deployment without promoting it into the hot set.
+
+        Useful for bulk reads of history that should not evict the
+        working set.
+
+        Args:
+            deployment_id: Deployment ID
+
+        Returns:
+            Deployment record or None if unknown
+        """
+        location = self._locations.get(deployment_id)
+        if location is None:
+            return None
+        if location == _HOT:
+            deployment = self._hot.get(deployment_id)
+            if deployment is not None:
+                return deployment
+            return Deployment.model_validate_json(self._pending[deployment_id])
+        return self._load(deployment_id, location, {})
+
+    async def peek_many(self, deployment_ids: List[str]) -> List[Deployment]:
+        """Read deployments like ``peek``, reading spilled segments in worker threads.
+
+        Args:
+            deployment_ids: Deployment IDs
+
+        Returns:
+            Deployment records in the given order; unknown IDs are skipped
+        """
+        fetched = await self._fetch_segments(deployment_ids)
+        deployments = []
+        for deployment_id in deployment_ids:
+            location = self._locations.get(deployment_id)
+            if location is None:
+                continue
+            if location == _HOT:
+                deployment = self._hot.get(deployment_id)
+                deployments.append(deployment or Deployment.model_validate_json(self._pending[deployment_id]))
+            else:
+                deployments.append(self._load(deployment_id, location, fetched))
+        return deployments
+
+    def is_hot(self, deployment_id: str) -> bool:
+        """Check whether a deployment is currently held in memory.
+
+        Args:
+            deployment_id: Deployment ID
+
+        Returns:
+            True if the deployment is in the hot set
+        """
+        return deployment_id in self._hot
+
+    def ids_in_memory(self) -> List[str]:
+        """Get IDs of deployments currently held in the hot set.
+
+        Returns:
+            Deployment IDs, least recently used first
+        """
+        return list(self._hot)
+
+    def flush(self) -> None:
+        """Write any buffered spilled deployments to a segment.
+
+        Inside a running event loop the segment is written by a worker
+        thread; ``drain`` waits for it.
+        """
+        if not self._pending:
+            return
+
+        segment = self._next_segment
+        self._next_segment += 1
+        records, self._pending = self._pending, {}
+
+        for deployment_id in records:
+            self._locations[deployment_id] = segment
+        self._segment_live[segment] = len(records)
+        self._segment_ids[segment] = list(records)
+        self._cold += len(records)
+        self.segments_written += 1
+
+        # Resolve the path here so worker threads never create the spill dir
+        path = self._segment_path(segment)
+        self._writing[segment] = records
+        if self._in_event_loop():
+            self._start_io(self._write_in_background(segment, path, records))
+        else:
+            self._write_segment(path, records)
+            self._written(segment)
+
+        self._enforce_cold_limit()
+
+    async def drain(self) -> None:
+        """Flush buffered deployments and wait for background segment I/O."""
+        self.flush()
+        while self._io_tasks:
+            await asyncio.gather(*list(self._io_tasks), return_exceptions=True)
+
+    def add_evict_listener(self, listener: EvictListener) -> None:
+        """Register a callback run with the IDs of deployments dropped from the cold tier.
+
+        Args:
+            listener: Callable receiving the evicted deployment IDs
+        """
+        self._evict_listeners.append(listener)
+
+    def stats(self) -> Dict[str, int]:
+        """Get retention counters.
+
+        Returns:
+            Counts of hot, buffered and cold deployments plus spill activity
+        """
+        return {
+            "total": len(self._locations),
+            "hot": len(self._hot),
+            "buffered": len(self._pending),
+            "cold": len(self._locations) - len(self._hot) - len(self._pending),
+            "hot_size": self.hot_size,
+            "segments": len(self._segment_live),
+            "segments_written": self.segments_written,
+            "spills": self.spill_count,
+            "rehydrates": self.rehydrate_count,
+            "evicted": self.evict_count,
+            "write_failures": self.write_failures,
+        }
+
+    def close(self) -> None:
+        """Drop spilled data and remove the spill directory if it was created here."""
+        if self._owns_spill_dir and self._spill_dir and os.path.isdir(self._spill_dir):
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    # Internals
+
+    def _enforce_capacity(self) -> None:
+        """Spill least recently used terminal deployments beyond the hot size."""
+        # Bound the scan so a hot set full of active deployments cannot spin
+        attempts = len(self._hot)
+        while len(self._hot) > self.hot_size and attempts > 0:
+            attempts -= 1
+            deployment_id, deployment = self._hot.popitem(last=False)
+
+            if deployment.status not in TERMINAL_STATUSES:
+                self._hot[deployment_id] = deployment
+                continue
+
+            self._pending[deployment_id] = deployment.model_dump_json()
+            self.spill_count += 1
+
+            if len(self._pending) >= self.segment_size:
+                self.flush()
+
+    def _load(self, deployment_id: str, segment: int, fetched: Dict[int, Dict[str, str]]) -> Deployment:
+        """Load one deployment from a segment, reading the file if it is not in memory."""
+        records = fetched.get(segment) or self._segment_records(segment)
+        if records is None:
+            records = self._read_segment(self._segment_path(segment))
+            self._cache_segment(segment, records)
+        return Deployment.model_validate_json(records[deployment_id])
+
+    async def _fetch_segments(self, deployment_ids: List[str]) -> Dict[int, Dict[str, str]]:
+        """Read the spilled segments holding some deployments in a worker thread."""
+        segments = {self._locations.get(deployment_id, _HOT) for deployment_id in deployment_ids}
+        segments.discard(_HOT)
+
+        fetched: Dict[int, Dict[str, str]] = {}
+        for segment in sorted(segments):
+            records = self._segment_records(segment)
+            if records is None:
+                try:
+                    records = await asyncio.to_thread(self._read_segment, self._segment_path(segment))
+                except FileNotFoundError:
+                    # Released or dropped while other segments were read
+                    continue
+                if segment in self._segment_live:
+                    self._cache_segment(segment, records)
+            fetched[segment] = records
+        return fetched
+
+    def _segment_records(self, segment: int) -> Optional[Dict[str, str]]:
+        """Get a segment's records if they are held in memory."""
+        records = self._writing.get(segment)
+        if records is None:
+            records = self._segment_cache.get(segment)
+            if records is not None:
+                self._segment_cache.move_to_end(segment)
+        return records
+
+    def _cache_segment(self, segment: int, records: Dict[str, str]) -> None:
+        """Keep a decompressed segment for later rehydration."""
+        self._segment_cache[segment] = records
+        while len(self._segment_cache) > self.segment_cache_size:
+            self._segment_cache.popitem(last=False)
+
+    def _forget_cold(self, deployment_id: str) -> None:
+        """Release the on-disk copy of a deployment that is being replaced."""
+        self._release(self._locations[deployment_id])
+
+    def _release(self, segment: int) -> None:
+        """Drop one live reference to a segment, deleting it when unused."""
+        self._cold -= 1
+        remaining = self._segment_live.get(segment, 0) - 1
+        if remaining > 0:
+            self._segment_live[segment] = remaining
+            return
+        self._discard_segment(segment)
+
+    def _enforce_cold_limit(self) -> None:
+        """Drop the oldest segments while too many deployments are spilled."""
+        if self.cold_size is None:
+            return
+
+        while self._cold > self.cold_size and self._segment_live:
+            self._drop_segment(next(iter(self._segment_live)))
+
+    def _drop_segment(self, segment: int) -> None:
+        """Forget a segment and every deployment still stored in it."""
+        evicted = [
+            deployment_id for deployment_id in self._segment_ids.get(segment, ())
+            if self._locations.get(deployment_id) == segment
+        ]
+        for deployment_id in evicted:
+            del self._locations[deployment_id]
+        self._cold -= len(evicted)
+        self.evict_count += len(evicted)
+        self._discard_segment(segment)
+
+        logger.debug(f"Dropped deployment segment {segment} with {len(evicted)} records")
+        for listener in self._evict_listeners:
+            listener(evicted)
+
+    def _discard_segment(self, segment: int) -> None:
+        """Forget a segment and delete its file once it has been written."""
+        self._segment_live.pop(segment, None)
+        self._segment_ids.pop(segment, None)
+        self._segment_cache.pop(segment, None)
+        # A segment still being written is deleted by its writer when it finishes
+        if segment in self._writing:
+            return
+
+        path = self._segment_path(segment)
+        if self._in_event_loop():
+            self._start_io(asyncio.to_thread(self._remove_file, path))
+        else:
+            self._remove_file(path)
+
+    async def _write_in_background(self, segment: int, path: str, records: Dict[str, str]) -> None:
+        """Write a segment in a worker thread, retrying before dropping it."""
+        for attempt in range(1, _WRITE_ATTEMPTS + 1):
+            try:
+                await asyncio.to_thread(self._write_segment, path, records)
+                break
+            except Exception as e:
+                logger.error(f"Failed to write deployment segment {segment} (attempt {attempt}): {str(e)}")
+                if attempt < _WRITE_ATTEMPTS:
+                    # The records stay readable from memory meanwhile
+                    await asyncio.sleep(0.1 * attempt)
+        else:
+            self.write_failures += 1
+            self._writing.pop(segment, None)
+            if segment in self._segment_live:
+                self._drop_segment(segment)
+            else:
+                await asyncio.to_thread(self._remove_file, path)
+            return
+        self._written(segment)
+        if segment not in self._segment_live:
+            await asyncio.to_thread(self._remove_file, path)
+
+    def _written(self, segment: int) -> None:
+        """Serve a segment from disk now that it has been written."""
+        self._writing.pop(segment, None)
+        logger.debug(f"Wrote deployment segment {segment}")
+
+    @staticmethod
+    def _write_segment(path: str, records: Dict[str, str]) -> None:
+        """Compress and write a segment file, one ``<id>\t<json>`` line per record."""
+        payload = "\n".join(f"{deployment_id}\t{record}" for deployment_id, record in records.items())
+        with open(path, "wb") as handle:
+            handle.write(zlib.compress(payload.encode("utf-8")))
+
+    @staticmethod
+    def _read_segment(path: str) -> Dict[str, str]:
+        """Read and decompress a segment file."""
+        with open(path, "rb") as handle:
+            lines = zlib.decompress(handle.read()).decode("utf-8").split("\n")
+        return dict(line.split("\t", 1) for line in lines)
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        """Delete a segment file if it exists."""
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def _start_io(self, coroutine) -> None:
+        """Run background segment I/O, tracked so ``drain`` can wait for it."""
+        task = asyncio.create_task(coroutine)
+        self._io_tasks.add(task)
+        task.add_done_callback(self._io_tasks.discard)
+
+    @staticmethod
+    def _in_event_loop() -> bool:
+        """Check whether the caller runs inside an event loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+
+    def _segment_path(self, segment: int) -> str:
+        """Get the file path of a segment, creating the spill dir on demand."""
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="deployment-spill-")
+        else:
+            os.makedirs(self._spill_dir, exist_ok=True)
+        return os.path.join(self._spill_dir, f"segment-{segment:08d}.jsonl.z")
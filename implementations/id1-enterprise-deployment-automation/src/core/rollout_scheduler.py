@@ -0,0 +1,342 @@
+"""Fleet rollout scheduling with bounded concurrency and wave gating."""
+
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from ..models.deployment import Deployment, DeploymentStatus, DeploymentManifest
+from ..models.policy import UpdateChannelPolicy
+from ..utils.id_generator import new_id
+
+if TYPE_CHECKING:
+    from .deployment_engine import DeploymentEngine
+    from .pipeline import DeploymentPipeline
+
+
+logger = logging.getLogger(__name__)
+
+
+# Canary (one instance), then 10% of the fleet, then everything left
+DEFAULT_WAVE_SIZES: Sequence[Union[int, float]] = (1, 0.10, 1.0)
+
+InstanceSelector = Union[Iterable[str], Callable[[], Iterable[str]]]
+HealthGate = Callable[["WaveResult"], Awaitable[bool]]
+PolicyLookup = Callable[[str], Optional[UpdateChannelPolicy]]
+
+
+@dataclass
+class WaveResult:
+    """Outcome of a single rollout wave."""
+
+    index: int
+    instance_ids: List[str]
+    deployments: List[Deployment] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    durations: List[float] = field(default_factory=list)
+    gate_passed: Optional[bool] = None
+
+    @property
+    def succeeded(self) -> int:
+        """Number of instances deployed successfully."""
+        return len([d for d in self.deployments if d.status == DeploymentStatus.DEPLOYED])
+
+    @property
+    def failed(self) -> int:
+        """Number of instances that failed to deploy."""
+        return len(self.instance_ids) - self.succeeded
+
+    @property
+    def failure_rate(self) -> float:
+        """Fraction of the wave that failed."""
+        if not self.instance_ids:
+            return 0.0
+        return self.failed / len(self.instance_ids)
+
+
+@dataclass
+class RolloutReport:
+    """Summary of a fleet rollout."""
+
+    rollout_id: str
+    manifest_id: str
+    total_instances: int
+    waves: List[WaveResult] = field(default_factory=list)
+    halted: bool = False
+    halt_reason: Optional[str] = None
+    elapsed_seconds: float = 0.0
+
+    @property
+    def durations(self) -> List[float]:
+        """Per-instance deployment durations in seconds across all waves."""
+        return [d for wave in self.waves for d in wave.durations]
+
+    @property
+    def completed(self) -> int:
+        """Number of instances attempted across all waves."""
+        return sum(len(wave.instance_ids) for wave in self.waves)
+
+    @property
+    def succeeded(self) -> int:
+        """Number of instances deployed successfully."""
+        return sum(wave.succeeded for wave in self.waves)
+
+    @property
+    def failed(self) -> int:
+        """Number of instances that failed to deploy."""
+        return sum(wave.failed for wave in self.waves)
+
+    @property
+    def throughput_per_minute(self) -> float:
+        """Deployments attempted per minute of wall-clock time."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.completed / (self.elapsed_seconds / 60.0)
+
+    @property
+    def p50_seconds(self) -> float:
+        """Median per-instance deployment duration."""
+        return percentile(self.durations, 50)
+
+    @property
+    def p99_seconds(self) -> float:
+        """99th percentile per-instance deployment duration."""
+        return percentile(self.durations, 99)
+
+    def summary(self) -> Dict[str, object]:
+        """Return a JSON-friendly summary of the rollout."""
+        return {
+            "rollout_id": self.rollout_id,
+            "manifest_id": self.manifest_id,
+            "total_instances": self.total_instances,
+            "completed": self.completed,
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+            "waves": len(self.waves),
+            "halted": self.halted,
+            "halt_reason": self.halt_reason,
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "throughput_per_minute": round(self.throughput_per_minute, 2),
+            "p50_seconds": round(self.p50_seconds, 4),
+            "p99_seconds": round(self.p99_seconds, 4),
+        }
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Compute a nearest-rank percentile.
+
+    Args:
+        values: Sample values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        Percentile value, or 0.0 for an empty sample
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def plan_waves(
+    instance_ids: Sequence[str],
+    wave_sizes: Sequence[Union[int, float]] = DEFAULT_WAVE_SIZES
+) -> List[List[str]]:
+    """Split a fleet into rollout waves.
+
+    Integer sizes are absolute instance counts, floats are fractions of the
+    whole fleet. The final wave always absorbs whatever is left.
+
+    Args:
+        instance_ids: Ordered instance IDs
+        wave_sizes: Wave size specifications
+
+    Returns:
+        List of waves, each a list of instance IDs
+    """
+    total = len(instance_ids)
+    waves: List[List[str]] = []
+    offset = 0
+
+    for size in wave_sizes:
+        if offset >= total:
+            break
+        if isinstance(size, float):
+            if not 0 < size <= 1:
+                raise ValueError(f"Fractional wave size must be in (0, 1], got {size}")
+            count = max(1, math.ceil(size * total))
+        else:
+            if size < 1:
+                raise ValueError(f"Wave size must be positive, got {size}")
+            count = size
+        waves.append(list(instance_ids[offset:offset + count]))
+        offset += count
+
+    if offset < total:
+        waves.append(list(instance_ids[offset:]))
+
+    return waves
+
+
+def failure_rate_gate(max_failure_rate: float = 0.0) -> HealthGate:
+    """Build a health gate that halts when a wave fails too often.
+
+    Args:
+        max_failure_rate: Highest tolerated failure fraction per wave
+
+    Returns:
+        Health gate coroutine function
+    """
+    async def gate(wave: WaveResult) -> bool:
+        return wave.failure_rate <= max_failure_rate
+
+    return gate
+
+
+class RolloutScheduler:
+    """Runs a manifest across a fleet in gated, concurrency-bounded waves."""
+
+    def __init__(
+        self,
+        engine: "DeploymentEngine",
+        max_in_flight: int = 50,
+        wave_sizes: Sequence[Union[int, float]] = DEFAULT_WAVE_SIZES,
+        health_gate: Optional[HealthGate] = None,
+        policy_lookup: Optional[PolicyLookup] = None,
+        pipeline: Optional["DeploymentPipeline"] = None
+    ):
+        """Initialize the rollout scheduler.
+
+        Args:
+            engine: Deployment engine used for each instance
+            max_in_flight: Maximum concurrent deployments
+            wave_sizes: Wave size specifications (see plan_waves)
+            health_gate: Gate evaluated after each wave; defaults to zero failures
+            policy_lookup: Optional callable returning the policy for an instance
+            pipeline: Optional stage-parallel pipeline to execute deployments on
+        """
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+
+        self.engine = engine
+        self.max_in_flight = max_in_flight
+        self.wave_sizes = wave_sizes
+        self.health_gate = health_gate or failure_rate_gate(0.0)
+        self.policy_lookup = policy_lookup
+        self.pipeline = pipeline
+
+    async def run(
+        self,
+        manifest: DeploymentManifest,
+        instance_selector: InstanceSelector
+    ) -> RolloutReport:
+        """Roll a manifest out to every selected instance.
+
+        Args:
+            manifest: Deployment manifest
+            instance_selector: Instance IDs, or a callable returning them
+
+        Returns:
+            Rollout report with per-wave results and throughput statistics
+        """
+        if callable(instance_selector):
+            instance_selector = instance_selector()
+        # Preserve selector order but drop duplicates
+        instance_ids = list(dict.fromkeys(instance_selector))
+
+        waves = plan_waves(instance_ids, self.wave_sizes)
+        report = RolloutReport(
+            rollout_id=new_id("rollout"),
+            manifest_id=manifest.id,
+            total_instances=len(instance_ids)
+        )
+        semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        logger.info(
+            f"Starting rollout {report.rollout_id} of manifest {manifest.id} to {len(instance_ids)} instances "
+            f"in {len(waves)} waves (max_in_flight={self.max_in_flight})"
+        )
+
+        started = time.perf_counter()
+
+        for index, wave_instances in enumerate(waves):
+            wave = WaveResult(index=index, instance_ids=wave_instances)
+
+            await asyncio.gather(*(
+                self._deploy_one(semaphore, manifest, instance_id, wave, report.rollout_id)
+                for instance_id in wave_instances
+            ))
+            report.waves.append(wave)
+
+            logger.info(
+                f"Rollout wave {index} finished: {wave.succeeded} succeeded, {wave.failed} failed"
+            )
+
+            # No gate after the final wave
+            if index == len(waves) - 1:
+                break
+
+            wave.gate_passed = await self.health_gate(wave)
+            if not wave.gate_passed:
+                report.halted = True
+                report.halt_reason = f"Health gate failed after wave {index}"
+                logger.warning(f"Rollout of manifest {manifest.id} halted: {report.halt_reason}")
+                break
+
+        report.elapsed_seconds = time.perf_counter() - started
+        logger.info(f"Rollout of manifest {manifest.id} finished: {report.summary()}")
+
+        return report
+
+    async def _deploy_one(
+        self,
+        semaphore: asyncio.Semaphore,
+        manifest: DeploymentManifest,
+        instance_id: str,
+        wave: WaveResult,
+        rollout_id: str
+    ) -> None:
+        """Create and execute a deployment for one instance.
+
+        Args:
+            semaphore: Concurrency limiter shared by the rollout
+            manifest: Deployment manifest
+            instance_id: Target instance ID
+            wave: Wave result to record into
+            rollout_id: ID of the rollout
+        """
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                policy = self.policy_lookup(instance_id) if self.policy_lookup else None
+                deployment = await self.engine.create_deployment(
+                    manifest=manifest,
+                    instance_id=instance_id,
+                    policy=policy,
+                    rollout_id=rollout_id
+                )
+                if self.pipeline is not None:
+                    deployment = await self.pipeline.submit(deployment, manifest)
+                else:
+                    deployment = await self.engine.execute_deployment(deployment, manifest)
+                wave.deployments.append(deployment)
+                if deployment.status != DeploymentStatus.DEPLOYED:
+                    wave.errors[instance_id] = deployment.error_message or deployment.status.value
+            except Exception as e:
+                wave.errors[instance_id] = str(e)
+                logger.error(f"Rollout deployment to instance {instance_id} failed: {str(e)}")
+            finally:
+                wave.durations.append(time.perf_counter() - started)
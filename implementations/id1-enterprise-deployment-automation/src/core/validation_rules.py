@@ -0,0 +1,394 @@
+"""Pluggable manifest validation rules run cheapest first."""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Mapping, Optional, Type
+
+from ..models.deployment import DeploymentManifest
+from ..utils.hashing import manifest_hash
+from .manifest_compiler import manifest_components
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RuleContext:
+    """Findings collected while validating one manifest."""
+
+    errors: List[str]
+    warnings: List[str]
+    is_valid_semver: Callable[[str], bool]
+
+
+@dataclass
+class ValidationRule:
+    """A single manifest check.
+
+    Attributes:
+        name: Unique rule name
+        check: Appends errors and warnings for a manifest to the context
+        cost: Relative cost; cheaper rules run first
+        fatal: Skip every later rule when this rule reports an error
+        key: Returns the part of a manifest the rule reads, so manifests
+            with equal keys are known to get the same findings. Rules
+            without a key are assumed to read the whole manifest.
+        description: Human-readable summary
+    """
+
+    name: str
+    check: Callable[[DeploymentManifest, RuleContext], None]
+    cost: float = 1.0
+    fatal: bool = False
+    key: Optional[Callable[[DeploymentManifest], Hashable]] = None
+    description: str = ""
+
+
+@dataclass
+class RuleStats:
+    """Execution counters for a single rule."""
+
+    name: str
+    cost: float
+    fatal: bool
+    runs: int = 0
+    failures: int = 0
+    short_circuits: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def summary(self, engine_seconds: float) -> Dict[str, object]:
+        """Return a JSON-friendly summary of the rule."""
+        return {
+            "rule": self.name,
+            "cost": self.cost,
+            "fatal": self.fatal,
+            "runs": self.runs,
+            "failures": self.failures,
+            "short_circuits": self.short_circuits,
+            "total_seconds": round(self.total_seconds, 6),
+            "avg_seconds": round(self.total_seconds / self.runs, 9) if self.runs else 0.0,
+            "max_seconds": round(self.max_seconds, 6),
+            "share": round(self.total_seconds / engine_seconds, 4) if engine_seconds else 0.0,
+        }
+
+
+class ValidationRuleEngine:
+    """Registry of validation rules, run in order of declared cost.
+
+    Rules run cheapest first (registration order breaks ties). A fatal rule
+    that reports an error stops the run, so expensive rules never see a
+    manifest that has already failed a basic check. Every rule execution is
+    timed, and ``report`` ranks rules by the time they take.
+    """
+
+    def __init__(self, rules: Optional[Iterable[ValidationRule]] = None):
+        """Initialize the engine.
+
+        Args:
+            rules: Rules to register; defaults to the built-in manifest checks
+        """
+        self._rules: Dict[str, ValidationRule] = {}
+        self._ordered: List[ValidationRule] = []
+        self._keys: Optional[List[Callable[[DeploymentManifest], Hashable]]] = []
+        self._stats: Dict[str, RuleStats] = {}
+        self.validations = 0
+        # Bumped whenever the rule set changes so cached results can be invalidated
+        self.generation = 0
+
+        for rule in default_rules() if rules is None else rules:
+            self.register(rule)
+
+    @property
+    def rules(self) -> List[ValidationRule]:
+        """Registered rules in execution order."""
+        return list(self._ordered)
+
+    def register(self, rule: ValidationRule) -> None:
+        """Register a rule.
+
+        Args:
+            rule: Rule to add
+
+        Raises:
+            ValueError: If a rule with the same name is already registered
+        """
+        if rule.name in self._rules:
+            raise ValueError(f"Validation rule {rule.name} is already registered")
+
+        self._rules[rule.name] = rule
+        self._stats[rule.name] = RuleStats(name=rule.name, cost=rule.cost, fatal=rule.fatal)
+        self._reorder()
+        logger.info(f"Registered validation rule {rule.name} (cost {rule.cost})")
+
+    def unregister(self, name: str) -> bool:
+        """Remove a rule.
+
+        Args:
+            name: Rule name
+
+        Returns:
+            True if removed, False if not found
+        """
+        rule = self._rules.pop(name, None)
+        if rule is None:
+            return False
+
+        self._stats.pop(name, None)
+        self._reorder()
+        return True
+
+    def key(self, manifest: DeploymentManifest) -> Hashable:
+        """Get the manifest content the registered rules depend on.
+
+        Args:
+            manifest: Deployment manifest
+
+        Returns:
+            Hashable key; manifests with equal keys validate the same
+        """
+        if self._keys is None:
+            return manifest_hash(manifest)
+        return tuple([key(manifest) for key in self._keys])
+
+    def run(
+        self,
+        manifest: DeploymentManifest,
+        is_valid_semver: Callable[[str], bool]
+    ) -> RuleContext:
+        """Run the rules against a manifest.
+
+        Args:
+            manifest: Deployment manifest
+            is_valid_semver: Predicate for non-empty version strings
+
+        Returns:
+            Collected errors and warnings
+        """
+        context = RuleContext(errors=[], warnings=[], is_valid_semver=is_valid_semver)
+        clock = time.perf_counter
+        self.validations += 1
+
+        for rule in self._ordered:
+            reported = len(context.errors)
+            started = clock()
+            rule.check(manifest, context)
+            elapsed = clock() - started
+
+            stats = self._stats[rule.name]
+            stats.runs += 1
+            stats.total_seconds += elapsed
+            if elapsed > stats.max_seconds:
+                stats.max_seconds = elapsed
+
+            if len(context.errors) > reported:
+                stats.failures += 1
+                if rule.fatal:
+                    stats.short_circuits += 1
+                    break
+
+        return context
+
+    def _reorder(self) -> None:
+        """Recompute the execution order after the rule set changes."""
+        # sorted() is stable, so equal-cost rules keep their registration order
+        self._ordered = sorted(self._rules.values(), key=lambda r: r.cost)
+        if all(rule.key is not None for rule in self._ordered):
+            self._keys = [rule.key for rule in self._ordered]
+        else:
+            self._keys = None
+        self.generation += 1
+
+    def report(self) -> Dict[str, Any]:
+        """Report where validation time goes.
+
+        Returns:
+            Validation count, total rule time and per-rule timing, slowest first
+        """
+        total = sum(stats.total_seconds for stats in self._stats.values())
+        ranked = sorted(self._stats.values(), key=lambda stats: stats.total_seconds, reverse=True)
+        return {
+            "validations": self.validations,
+            "total_seconds": round(total, 6),
+            "rules": [stats.summary(total) for stats in ranked],
+        }
+
+    def reset_stats(self) -> None:
+        """Clear the timing counters."""
+        self.validations = 0
+        for rule in self._rules.values():
+            self._stats[rule.name] = RuleStats(name=rule.name, cost=rule.cost, fatal=rule.fatal)
+
+
+def _int_value(value: Any) -> Optional[int]:
+    """Keep integers, the only values numeric limit rules compare."""
+    return value if isinstance(value, int) else None
+
+
+def _check_required_fields(manifest: DeploymentManifest, context: RuleContext) -> None:
+    if not manifest.id:
+        context.errors.append("Manifest ID is required")
+
+    if not manifest.platform_version:
+        context.errors.append("Platform version is required")
+
+    if not manifest.version:
+        context.errors.append("Manifest version is required")
+
+
+def _check_platform_version(manifest: DeploymentManifest, context: RuleContext) -> None:
+    if manifest.platform_version and not context.is_valid_semver(manifest.platform_version):
+        context.warnings.append(f"Platform version {manifest.platform_version} is not valid semver")
+
+
+def _check_suite_versions(manifest: DeploymentManifest, context: RuleContext) -> None:
+    for suite_name, suite_version in manifest.suites.items():
+        if not suite_version:
+            context.errors.append(f"Suite {suite_name} has empty version")
+        elif not context.is_valid_semver(suite_version):
+            context.warnings.append(f"Suite {suite_name} version {suite_version} is not valid semver")
+
+
+def _check_capability_versions(manifest: DeploymentManifest, context: RuleContext) -> None:
+    for cap_name, cap_version in manifest.capabilities.items():
+        if not cap_version:
+            context.errors.append(f"Capability {cap_name} has empty version")
+        elif not context.is_valid_semver(cap_version):
+            context.warnings.append(f"Capability {cap_name} version {cap_version} is not valid semver")
+
+
+def default_rules() -> List[ValidationRule]:
+    """Build the built-in manifest checks.
+
+    Returns:
+        Required-field and version-format rules
+    """
+    return [
+        ValidationRule(
+            name="required_fields",
+            check=_check_required_fields,
+            cost=1.0,
+            fatal=True,
+            key=lambda m: (bool(m.id), bool(m.platform_version), bool(m.version)),
+            description="Manifest ID, version and platform version are set"
+        ),
+        ValidationRule(
+            name="platform_version_format",
+            check=_check_platform_version,
+            cost=2.0,
+            key=lambda m: m.platform_version,
+            description="Platform version is valid semver"
+        ),
+        ValidationRule(
+            name="suite_versions",
+            check=_check_suite_versions,
+            cost=3.0,
+            key=lambda m: tuple(m.suites.items()),
+            description="Suite versions are set and valid semver"
+        ),
+        ValidationRule(
+            name="capability_versions",
+            check=_check_capability_versions,
+            cost=3.0,
+            key=lambda m: tuple(m.capabilities.items()),
+            description="Capability versions are set and valid semver"
+        ),
+    ]
+
+
+def max_replicas_rule(max_replicas: int, cost: float = 1.5) -> ValidationRule:
+    """Build a rule limiting the ``replicas`` configuration value.
+
+    Args:
+        max_replicas: Largest allowed replica count
+        cost: Relative rule cost
+
+    Returns:
+        Validation rule
+    """
+    def check(manifest: DeploymentManifest, context: RuleContext) -> None:
+        replicas = manifest.configuration.get("replicas")
+        if isinstance(replicas, int) and replicas > max_replicas:
+            context.errors.append(f"Replicas {replicas} exceed the limit of {max_replicas}")
+
+    return ValidationRule(
+        name="max_replicas",
+        check=check,
+        cost=cost,
+        key=lambda m: _int_value(m.configuration.get("replicas")),
+        description=f"At most {max_replicas} replicas"
+    )
+
+
+def forbidden_versions_rule(
+    name: str,
+    components: Mapping[str, str],
+    reason: str,
+    cost: float = 2.5
+) -> ValidationRule:
+    """Build a rule rejecting a combination of component versions.
+
+    Args:
+        name: Rule name
+        components: Component key -> version that may not all be deployed
+            together, using ``platform``, ``suite:<name>`` and
+            ``capability:<name>`` keys
+        reason: Explanation included in the error
+        cost: Relative rule cost
+
+    Returns:
+        Validation rule
+    """
+    forbidden = dict(components)
+
+    def check(manifest: DeploymentManifest, context: RuleContext) -> None:
+        deployed = manifest_components(manifest)
+        if all(deployed.get(component) == version for component, version in forbidden.items()):
+            combination = ", ".join(f"{component}={version}" for component, version in forbidden.items())
+            context.errors.append(f"Forbidden version combination {combination}: {reason}")
+
+    return ValidationRule(
+        name=name,
+        check=check,
+        cost=cost,
+        key=lambda m: tuple(manifest_components(m).get(component) for component in forbidden),
+        description=reason
+    )
+
+
+def configuration_schema_rule(
+    required: Mapping[str, Type],
+    fatal: bool = False,
+    cost: float = 4.0
+) -> ValidationRule:
+    """Build a rule requiring configuration keys of given types.
+
+    Args:
+        required: Configuration key -> expected type
+        fatal: Whether a schema violation stops later rules
+        cost: Relative rule cost
+
+    Returns:
+        Validation rule
+    """
+    schema = dict(required)
+
+    def check(manifest: DeploymentManifest, context: RuleContext) -> None:
+        for key, expected in schema.items():
+            if key not in manifest.configuration:
+                context.errors.append(f"Configuration {key} is required")
+            elif not isinstance(manifest.configuration[key], expected):
+                context.errors.append(f"Configuration {key} must be {expected.__name__}")
+
+    return ValidationRule(
+        name="configuration_schema",
+        check=check,
+        cost=cost,
+        fatal=fatal,
+        key=lambda m: tuple(
+            (key in m.configuration, isinstance(m.configuration.get(key), expected))
+            for key, expected in schema.items()
+        ),
+        description=f"Configuration has {', '.join(schema)}"
+    )
@@ -1,10 +1,14 @@
 """Deployment validation module."""
 
 import logging
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
 from dataclasses import dataclass
 
 from ..models.deployment import DeploymentManifest
+from ..versioning.semver import SemVer
+from .readiness import AgentStatus, ReadinessProber
+from .validation_rules import ValidationRuleEngine
 
 
 logger = logging.getLogger(__name__)
@@ -22,6 +26,29 @@ class ValidationResult:
 class DeploymentValidator:
     """Validates deployments and manifests."""
     
+    def __init__(
+        self,
+        rules: Optional[ValidationRuleEngine] = None,
+        cache_size: int = 10000,
+        prober: Optional[ReadinessProber] = None
+    ):
+        """Initialize the validator.
+        
+        Args:
+            rules: Optional manifest rule engine; defaults to the built-in rules
+            cache_size: Maximum manifest validation results kept by
+                ``validate_many``
+            prober: Optional instance agent prober for readiness checks
+        """
+        self.rules = rules or ValidationRuleEngine()
+        self.prober = prober
+        self.cache_size = cache_size
+        self._results: "OrderedDict[Hashable, ValidationResult]" = OrderedDict()
+        self._rules_generation = self.rules.generation
+        
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
     async def validate_manifest(self, manifest: DeploymentManifest) -> ValidationResult:
         """Validate a deployment manifest.
         
@@ -33,48 +60,115 @@ class DeploymentValidator:
         """
         logger.info(f"Validating manifest {manifest.id}")
         
-        errors = []
-        warnings = []
+        result = self._check_manifest(manifest, self._is_valid_semver)
         
-        # Check required fields
-        if not manifest.id:
-            errors.append("Manifest ID is required")
+        if result.is_valid:
+            logger.info(f"Manifest {manifest.id} validation passed")
+        else:
+            logger.error(f"Manifest {manifest.id} validation failed: {result.errors}")
         
-        if not manifest.platform_version:
-            errors.append("Platform version is required")
+        return result
+    
+    async def validate_many(self, manifests: Iterable[DeploymentManifest]) -> List[ValidationResult]:
+        """Validate many deployment manifests.
         
-        if not manifest.version:
-            errors.append("Manifest version is required")
+        Manifests are deduplicated by content: each distinct manifest is
+        validated once, and its result is cached for later calls. Version
+        strings are checked in a single pass over the distinct versions of
+        every uncached manifest. Results are shared between manifests with
+        the same content and must not be mutated.
         
-        # Check version format
-        if manifest.platform_version and not self._is_valid_semver(manifest.platform_version):
-            warnings.append(f"Platform version {manifest.platform_version} is not valid semver")
+        Args:
+            manifests: Deployment manifests to validate
+            
+        Returns:
+            Validation results in the same order as the manifests
+        """
+        if self._rules_generation != self.rules.generation:
+            # Cached results were produced by a different rule set
+            self._results.clear()
+            self._rules_generation = self.rules.generation
         
-        # Check suites
-        for suite_name, suite_version in manifest.suites.items():
-            if not suite_version:
-                errors.append(f"Suite {suite_name} has empty version")
-            elif not self._is_valid_semver(suite_version):
-                warnings.append(f"Suite {suite_name} version {suite_version} is not valid semver")
+        validated: List[ValidationResult] = []
+        seen: Dict[Hashable, ValidationResult] = {}
+        # Content key -> first manifest with it and the positions it fills
+        pending: Dict[Hashable, Tuple[DeploymentManifest, List[int]]] = {}
         
-        # Check capabilities
-        for cap_name, cap_version in manifest.capabilities.items():
-            if not cap_version:
-                errors.append(f"Capability {cap_name} has empty version")
-            elif not self._is_valid_semver(cap_version):
-                warnings.append(f"Capability {cap_name} version {cap_version} is not valid semver")
+        # Keys are dropped as soon as they are looked up, so a large batch
+        # allocates per distinct manifest rather than per manifest
+        for index, manifest in enumerate(manifests):
+            key = self.rules.key(manifest)
+            result = seen.get(key)
+            if result is None:
+                result = self._results.get(key)
+                if result is not None:
+                    self._results.move_to_end(key)
+                    seen[key] = result
+            if result is None:
+                if key not in pending:
+                    pending[key] = (manifest, [])
+                pending[key][1].append(index)
+            validated.append(result)
         
-        is_valid = len(errors) == 0
+        self.cache_hits += len(validated) - len(pending)
+        self.cache_misses += len(pending)
         
-        if is_valid:
-            logger.info(f"Manifest {manifest.id} validation passed")
-        else:
-            logger.error(f"Manifest {manifest.id} validation failed: {errors}")
+        if pending:
+            versions = set()
+            for manifest, _ in pending.values():
+                versions.add(manifest.platform_version)
+                versions.update(manifest.suites.values())
+                versions.update(manifest.capabilities.values())
+            valid = {version for version in versions if version and self._is_valid_semver(version)}
+            
+            for key, (manifest, indices) in pending.items():
+                result = self._check_manifest(manifest, valid.__contains__)
+                for index in indices:
+                    validated[index] = result
+                self._results[key] = result
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        
+        invalid = sum(1 for result in validated if not result.is_valid)
+        logger.info(
+            f"Validated {len(validated)} manifests ({len(pending)} newly checked, {invalid} invalid)"
+        )
+        return validated
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Get batch validation cache counters.
+        
+        Returns:
+            Hits, misses, hit rate and cached results
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+            "cached": len(self._results),
+        }
+    
+    def _check_manifest(
+        self,
+        manifest: DeploymentManifest,
+        is_valid_semver: Callable[[str], bool]
+    ) -> ValidationResult:
+        """Run the registered rules against a manifest.
+        
+        Args:
+            manifest: Deployment manifest to validate
+            is_valid_semver: Predicate for non-empty version strings
+            
+        Returns:
+            Validation result
+        """
+        context = self.rules.run(manifest, is_valid_semver)
         
         return ValidationResult(
-            is_valid=is_valid,
-            errors=errors,
-            warnings=warnings
+            is_valid=len(context.errors) == 0,
+            errors=context.errors,
+            warnings=context.warnings
         )
     
     async def validate_deployment_readiness(
@@ -93,17 +187,84 @@ class DeploymentValidator:
         """
         logger.info(f"Validating deployment readiness for instance {instance_id}")
         
+        if not self.prober:
+            return ValidationResult(
+                is_valid=True,
+                errors=[],
+                warnings=["Readiness probes are not configured"]
+            )
+        
+        status = await self.prober.probe(instance_id)
+        return self._readiness_result(status, manifest)
+    
+    async def validate_readiness_many(
+        self,
+        instance_ids: Iterable[str],
+        manifest: DeploymentManifest
+    ) -> Dict[str, ValidationResult]:
+        """Validate if a batch of instances, e.g. a rollout wave, is ready.
+        
+        Args:
+            instance_ids: Instance IDs
+            manifest: Deployment manifest
+            
+        Returns:
+            Instance ID -> validation result
+        """
+        instance_ids = list(dict.fromkeys(instance_ids))
+        logger.info(f"Validating deployment readiness for {len(instance_ids)} instances")
+        
+        if not self.prober:
+            return {
+                instance_id: await self.validate_deployment_readiness(instance_id, manifest)
+                for instance_id in instance_ids
+            }
+        
+        statuses = await self.prober.probe_many(instance_ids)
+        return {
+            instance_id: self._readiness_result(status, manifest)
+            for instance_id, status in statuses.items()
+        }
+    
+    def _readiness_result(self, status: AgentStatus, manifest: DeploymentManifest) -> ValidationResult:
+        """Check an agent's probe results against a manifest.
+        
+        Args:
+            status: Probe results for the instance
+            manifest: Deployment manifest
+            
+        Returns:
+            Validation result
+        """
         errors = []
         warnings = []
         
         # Check instance connectivity
-        logger.info(f"Checking connectivity to instance {instance_id}")
+        if not status.reachable:
+            errors.append(f"Instance {status.instance_id} is unreachable")
+            errors.extend(status.failures)
+            return ValidationResult(is_valid=False, errors=errors, warnings=warnings)
         
         # Check available disk space
-        logger.info(f"Checking disk space on instance {instance_id}")
+        required = self.prober.min_free_disk_bytes
+        if status.free_disk_bytes is None:
+            warnings.append(f"Disk space on instance {status.instance_id} is unknown")
+        elif status.free_disk_bytes < required:
+            errors.append(
+                f"Instance {status.instance_id} has {status.free_disk_bytes // (1024 * 1024)} MB free disk, "
+                f"{required // (1024 * 1024)} MB required"
+            )
         
         # Check current version compatibility
-        logger.info(f"Checking version compatibility for instance {instance_id}")
+        current = SemVer.try_parse(status.platform_version)
+        target = SemVer.try_parse(manifest.platform_version)
+        if current is None:
+            warnings.append(f"Platform version of instance {status.instance_id} is unknown")
+        elif target is not None and target < current:
+            warnings.append(
+                f"Instance {status.instance_id} runs platform {status.platform_version}, "
+                f"newer than {manifest.platform_version}"
+            )
         
         return ValidationResult(
             is_valid=len(errors) == 0,
@@ -156,8 +317,4 @@ class DeploymentValidator:
         Returns:
             True if valid semver, False otherwise
         """
-        import re
-        
-        # Basic semver pattern: major.minor.patch
-        pattern = r"^\d+\.\d+\.\d+(-[a-zA-Z0-9]+)?(\+[a-zA-Z0-9]+)?$"
-        return bool(re.match(pattern, version))
+        return SemVer.try_parse(version) is not None
@@ -0,0 +1,10 @@
+"""Deployment and rollback event streaming module."""
+
+from .bus import EventBus, Subscription, TopicFilter, SlowConsumerPolicy
+
+__all__ = [
+    "EventBus",
+    "Subscription",
+    "TopicFilter",
+    "SlowConsumerPolicy",
+]
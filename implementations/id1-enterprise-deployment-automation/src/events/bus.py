@@ -0,0 +1,338 @@
+"""In-process publish/subscribe bus for status events."""
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Deque, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from ..models.event import Event, EventType
+
+
+logger = logging.getLogger(__name__)
+
+
+class SlowConsumerPolicy(str, Enum):
+    """What happens when a subscriber's buffer is full."""
+
+    DROP_OLDEST = "drop_oldest"
+    DISCONNECT = "disconnect"
+
+
+@dataclass(frozen=True)
+class TopicFilter:
+    """Subscription filter; empty fields match everything."""
+
+    instance_ids: FrozenSet[str] = frozenset()
+    rollout_ids: FrozenSet[str] = frozenset()
+    statuses: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def build(
+        cls,
+        instance_ids: Optional[Iterable[str]] = None,
+        rollout_ids: Optional[Iterable[str]] = None,
+        statuses: Optional[Iterable[str]] = None
+    ) -> "TopicFilter":
+        """Build a filter from optional iterables.
+
+        Args:
+            instance_ids: Instance IDs to match
+            rollout_ids: Rollout IDs to match
+            statuses: Status values to match
+
+        Returns:
+            Topic filter
+        """
+        return cls(
+            instance_ids=frozenset(instance_ids or ()),
+            rollout_ids=frozenset(rollout_ids or ()),
+            statuses=frozenset(statuses or ()),
+        )
+
+    def matches(self, event: Event) -> bool:
+        """Check whether an event passes the filter.
+
+        Args:
+            event: Event
+
+        Returns:
+            True if the event matches
+        """
+        return (
+            (not self.instance_ids or event.instance_id in self.instance_ids)
+            and (not self.rollout_ids or event.rollout_id in self.rollout_ids)
+            and (not self.statuses or event.status in self.statuses)
+        )
+
+
+class Subscription:
+    """A subscriber's bounded event buffer.
+
+    Iterate with ``async for`` or call ``get``. When the buffer is full the
+    bus applies the subscription's slow-consumer policy: drop the oldest
+    buffered event (counted in ``dropped``) or close the subscription.
+    """
+
+    def __init__(
+        self,
+        bus: "EventBus",
+        topic: TopicFilter,
+        buffer_size: int,
+        policy: SlowConsumerPolicy
+    ):
+        """Initialize the subscription.
+
+        Args:
+            bus: Owning event bus
+            topic: Topic filter
+            buffer_size: Maximum buffered events
+            policy: Slow-consumer policy
+        """
+        self.bus = bus
+        self.topic = topic
+        self.buffer_size = buffer_size
+        self.policy = policy
+
+        self._buffer: Deque[Event] = deque()
+        self._ready = asyncio.Event()
+        self.closed = False
+        self.close_reason: Optional[str] = None
+        self.delivered = 0
+        self.dropped = 0
+        self._dropped_reported = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered events."""
+        return len(self._buffer)
+
+    def offer(self, event: Event) -> None:
+        """Buffer an event, applying the slow-consumer policy when full.
+
+        Args:
+            event: Event to deliver
+        """
+        if self.closed:
+            return
+
+        if len(self._buffer) >= self.buffer_size:
+            if self.policy == SlowConsumerPolicy.DISCONNECT:
+                logger.warning(f"Disconnecting slow event subscriber ({len(self._buffer)} events buffered)")
+                self.bus.disconnected += 1
+                self.close("slow consumer")
+                return
+            self._buffer.popleft()
+            self.dropped += 1
+
+        self._buffer.append(event)
+        self._ready.set()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Wait for the next event.
+
+        Args:
+            timeout: Optional maximum wait in seconds
+
+        Returns:
+            Next event, or None on timeout or once closed and drained
+        """
+        while not self._buffer:
+            if self.closed:
+                return None
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        self.delivered += 1
+        return self._buffer.popleft()
+
+    def take_dropped(self) -> int:
+        """Get the number of events dropped since the last call.
+
+        Returns:
+            Newly dropped event count
+        """
+        newly_dropped = self.dropped - self._dropped_reported
+        self._dropped_reported = self.dropped
+        return newly_dropped
+
+    def close(self, reason: Optional[str] = None) -> None:
+        """Stop receiving events; buffered events can still be read.
+
+        Args:
+            reason: Optional reason reported to the consumer
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.close_reason = reason
+        self.bus._unsubscribe(self)
+        self._ready.set()
+
+    def __aiter__(self) -> "Subscription":
+        return self
+
+    async def __anext__(self) -> Event:
+        event = await self.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class EventBus:
+    """Fans out status events to filtered subscribers.
+
+    Publishing never blocks: each subscriber has its own bounded buffer, so
+    a stalled consumer only affects itself. Subscriptions filtered by
+    instance or rollout are indexed on that key, so a publish only visits
+    subscribers that can match.
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = 1000,
+        policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST
+    ):
+        """Initialize the bus.
+
+        Args:
+            buffer_size: Default per-subscriber buffer size
+            policy: Default slow-consumer policy
+        """
+        self.buffer_size = buffer_size
+        self.policy = policy
+
+        self._sequence = 0
+        self._wildcard: Set[Subscription] = set()
+        self._by_instance: Dict[str, Set[Subscription]] = {}
+        self._by_rollout: Dict[str, Set[Subscription]] = {}
+
+        self.published = 0
+        self.disconnected = 0
+
+    def subscribe(
+        self,
+        topic: Optional[TopicFilter] = None,
+        buffer_size: Optional[int] = None,
+        policy: Optional[SlowConsumerPolicy] = None
+    ) -> Subscription:
+        """Register a subscriber.
+
+        Args:
+            topic: Optional topic filter (everything when omitted)
+            buffer_size: Optional buffer size override
+            policy: Optional slow-consumer policy override
+
+        Returns:
+            New subscription
+        """
+        subscription = Subscription(
+            self,
+            topic or TopicFilter(),
+            buffer_size or self.buffer_size,
+            policy or self.policy
+        )
+
+        if subscription.topic.instance_ids:
+            for instance_id in subscription.topic.instance_ids:
+                self._by_instance.setdefault(instance_id, set()).add(subscription)
+        elif subscription.topic.rollout_ids:
+            for rollout_id in subscription.topic.rollout_ids:
+                self._by_rollout.setdefault(rollout_id, set()).add(subscription)
+        else:
+            self._wildcard.add(subscription)
+
+        return subscription
+
+    def publish(
+        self,
+        event_type: EventType,
+        subject_id: str,
+        instance_id: str,
+        status: str,
+        rollout_id: Optional[str] = None,
+        **data: Any
+    ) -> Optional[Event]:
+        """Publish a status event to matching subscribers.
+
+        Args:
+            event_type: Event type
+            subject_id: Deployment or rollback ID
+            instance_id: Affected instance ID
+            status: New status
+            rollout_id: Optional rollout ID
+            **data: Additional event details
+
+        Returns:
+            Published event, or None when nobody could receive it
+        """
+        self._sequence += 1
+        self.published += 1
+
+        candidates = self._candidates(instance_id, rollout_id)
+        if not candidates:
+            return None
+
+        event = Event(
+            sequence=self._sequence,
+            type=event_type,
+            subject_id=subject_id,
+            instance_id=instance_id,
+            rollout_id=rollout_id,
+            status=status,
+            data=data
+        )
+        for subscription in candidates:
+            if subscription.topic.matches(event):
+                subscription.offer(event)
+        return event
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of open subscriptions."""
+        indexed = {s for subs in self._by_instance.values() for s in subs}
+        indexed.update(s for subs in self._by_rollout.values() for s in subs)
+        return len(self._wildcard) + len(indexed)
+
+    def stats(self) -> Dict[str, int]:
+        """Get bus counters.
+
+        Returns:
+            Published event, subscriber and disconnect counts
+        """
+        return {
+            "published": self.published,
+            "subscribers": self.subscriber_count,
+            "disconnected": self.disconnected,
+            "buffer_size": self.buffer_size,
+        }
+
+    def _candidates(self, instance_id: str, rollout_id: Optional[str]) -> List[Subscription]:
+        """Collect subscriptions that may match an event."""
+        candidates = list(self._wildcard)
+        candidates.extend(self._by_instance.get(instance_id, ()))
+        if rollout_id is not None:
+            candidates.extend(self._by_rollout.get(rollout_id, ()))
+        return candidates
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a closed subscription from every index."""
+        self._wildcard.discard(subscription)
+        for key in subscription.topic.instance_ids:
+            self._discard(self._by_instance, key, subscription)
+        for key in subscription.topic.rollout_ids:
+            self._discard(self._by_rollout, key, subscription)
+
+    @staticmethod
+    def _discard(index: Dict[str, Set[Subscription]], key: str, subscription: Subscription) -> None:
+        """Remove a subscription from one index bucket."""
+        bucket = index.get(key)
+        if bucket is None:
+            return
+        bucket.discard(subscription)
+        if not bucket:
+            del index[key]
@@ -5,6 +5,7 @@ from .policy import UpdateChannelPolicy, PolicyType
 from .version import Version, VersionPin, VersionConstraint
 from .security import SecurityPatch, PatchStatus
 from .rollback import RollbackRecord, RollbackStatus
+from .event import Event, EventType
 
 __all__ = [
     "Deployment",
@@ -19,4 +20,6 @@ __all__ = [
     "PatchStatus",
     "RollbackRecord",
     "RollbackStatus",
+    "Event",
+    "EventType",
 ]
@@ -3,7 +3,7 @@
 from enum import Enum
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class DeploymentStatus(str, Enum):
@@ -19,6 +19,14 @@ class DeploymentStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class DeploymentPriority(str, Enum):
+    """Admission priority of a deployment request, highest first."""
+    
+    CRITICAL_PATCH = "critical_patch"
+    MANUAL = "manual"
+    AUTO_UPDATE = "auto_update"
+
+
 class DeploymentManifest(BaseModel):
     """Deployment manifest containing version specifications and configurations."""
     
@@ -53,18 +61,82 @@ class DeploymentManifest(BaseModel):
         }
 
 
+class ManifestOverlay(BaseModel):
+    """Partial manifest applied on top of a base manifest or another overlay.
+    
+    Only the fields an overlay sets are overridden; configuration is merged
+    key by key, recursing into nested mappings.
+    """
+    
+    id: str = Field(..., description="Unique overlay identifier")
+    parent_id: str = Field(..., description="Base manifest or overlay this overlay applies to")
+    name: Optional[str] = Field(None, description="Optional name, e.g. the environment")
+    instance_id: Optional[str] = Field(None, description="Instance this overlay configures, if instance-specific")
+    platform_version: Optional[str] = Field(None, description="Platform version override")
+    suites: Dict[str, str] = Field(default_factory=dict, description="Suite version overrides")
+    capabilities: Dict[str, str] = Field(default_factory=dict, description="Capability version overrides")
+    configuration: Dict[str, Any] = Field(default_factory=dict, description="Configuration overrides")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": "overlay-001",
+                "parent_id": "overlay-production",
+                "instance_id": "instance-prod-01",
+                "configuration": {
+                    "replicas": 5,
+                    "features": {"beta_checkout": True}
+                }
+            }
+        }
+
+
+class ComponentChange(BaseModel):
+    """A component version change a deployment would make."""
+    
+    component: str = Field(..., description="Component key (platform, suite:<name> or capability:<name>)")
+    from_version: Optional[str] = Field(None, description="Currently deployed version, if any")
+    to_version: Optional[str] = Field(None, description="Target version; None when the component is removed")
+
+
+class ManifestDelta(BaseModel):
+    """Difference between an instance's current manifest and a target manifest."""
+    
+    base_manifest_id: Optional[str] = Field(None, description="Manifest the delta is against; None means a full deploy")
+    changes: List[ComponentChange] = Field(default_factory=list, description="Changed, added and removed components")
+    configuration_set: Dict[str, Any] = Field(default_factory=dict, description="Configuration keys added or changed")
+    configuration_removed: List[str] = Field(default_factory=list, description="Configuration keys removed")
+    unchanged_components: int = Field(0, description="Components already at the target version")
+    
+    @property
+    def size(self) -> int:
+        """Number of component and configuration changes."""
+        return len(self.changes) + len(self.configuration_set) + len(self.configuration_removed)
+    
+    @property
+    def is_empty(self) -> bool:
+        """Whether the target manifest is already deployed."""
+        return self.size == 0
+
+
 class Deployment(BaseModel):
     """Deployment record representing a deployment operation."""
     
     id: str = Field(..., description="Unique deployment identifier")
     manifest_id: str = Field(..., description="Associated deployment manifest ID")
     instance_id: str = Field(..., description="Target enterprise instance ID")
+    manifest_hash: Optional[str] = Field(None, description="Content hash of the deployed manifest")
+    rollout_id: Optional[str] = Field(None, description="Fleet rollout this deployment is part of")
+    priority: DeploymentPriority = Field(DeploymentPriority.MANUAL, description="Admission priority of the execution")
     status: DeploymentStatus = Field(default=DeploymentStatus.PENDING)
     previous_manifest_id: Optional[str] = Field(None, description="Previous manifest for rollback reference")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
+    completed_steps: List[str] = Field(default_factory=list, description="Steps finished so far, checkpointed after each step")
+    delta: Optional[ManifestDelta] = Field(None, description="Changes against the instance's current manifest, set by the compile step")
     logs: List[str] = Field(default_factory=list, description="Deployment logs")
     
     class Config:
@@ -82,6 +154,14 @@ class Deployment(BaseModel):
         }
 
 
+class DeploymentRef(BaseModel):
+    """Pointer to a deployment, stored under a secondary key so restarts can find it."""
+    
+    id: str = Field(..., description="Secondary key: the deployment ID or the instance ID")
+    deployment_id: str = Field(..., description="Referenced deployment ID")
+    manifest_hash: Optional[str] = Field(None, description="Content hash of the referenced deployment's manifest")
+
+
 class DeploymentRequest(BaseModel):
     """Request model for creating a new deployment."""
     
@@ -89,6 +169,7 @@ class DeploymentRequest(BaseModel):
     instance_id: str = Field(..., description="Target enterprise instance ID")
     dry_run: bool = Field(False, description="Run deployment in dry-run mode")
     skip_validation: bool = Field(False, description="Skip pre-deployment validation")
+    priority: DeploymentPriority = Field(DeploymentPriority.MANUAL, description="Requested admission priority; can lower, never raise, the derived priority")
     
     class Config:
         json_schema_extra = {
@@ -96,7 +177,8 @@ class DeploymentRequest(BaseModel):
                 "manifest_id": "manifest-001",
                 "instance_id": "instance-prod-01",
                 "dry_run": False,
-                "skip_validation": False
+                "skip_validation": False,
+                "priority": "manual"
             }
         }
 
@@ -104,7 +186,7 @@ class DeploymentRequest(BaseModel):
 class DeploymentResponse(BaseModel):
     """Response model for deployment operations."""
     
-    id: str
+    id: Optional[str] = Field(..., description="Deployment ID; None for a dry run, which stores nothing")
     status: DeploymentStatus
     manifest_id: str
     instance_id: str
@@ -112,6 +194,8 @@ class DeploymentResponse(BaseModel):
     started_at: Optional[datetime]
     completed_at: Optional[datetime]
     error_message: Optional[str]
+    dry_run: bool = Field(False, description="Checks ran but nothing was stored or executed")
+    logs: Optional[List[str]] = Field(None, description="Checks performed by a dry run")
     
     class Config:
         json_schema_extra = {
@@ -125,3 +209,255 @@ class DeploymentResponse(BaseModel):
                 "completed_at": "2024-01-30T10:15:00Z"
             }
         }
+
+
+class RolloutRequest(BaseModel):
+    """Request model for rolling a manifest out to a fleet."""
+    
+    manifest_id: str = Field(..., description="Deployment manifest ID")
+    instance_ids: List[str] = Field(..., description="Target enterprise instance IDs")
+    max_in_flight: int = Field(50, ge=1, description="Maximum concurrent deployments")
+    wave_sizes: List[float] = Field(
+        default_factory=lambda: [1, 0.10],
+        description="Wave sizes; values >= 1 are instance counts, values < 1 are fleet fractions. "
+                    "Remaining instances form the final wave"
+    )
+    max_failure_rate: float = Field(0.0, ge=0.0, le=1.0, description="Tolerated failure rate per wave")
+    
+    @field_validator("wave_sizes")
+    @classmethod
+    def check_instance_counts(cls, wave_sizes: List[float]) -> List[float]:
+        """Reject instance counts that are not whole numbers."""
+        for size in wave_sizes:
+            if size >= 1 and size != int(size):
+                raise ValueError(f"Wave sizes of 1 or more are instance counts and must be whole, got {size}")
+        return wave_sizes
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "manifest_id": "manifest-001",
+                "instance_ids": ["instance-prod-01", "instance-prod-02"],
+                "max_in_flight": 50,
+                "wave_sizes": [1, 0.1],
+                "max_failure_rate": 0.0
+            }
+        }
+
+
+class RolloutResponse(BaseModel):
+    """Response model for fleet rollouts."""
+    
+    rollout_id: str
+    manifest_id: str
+    total_instances: int
+    completed: int
+    succeeded: int
+    failed: int
+    waves: int
+    halted: bool
+    halt_reason: Optional[str]
+    elapsed_seconds: float
+    throughput_per_minute: float
+    p50_seconds: float
+    p99_seconds: float
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "rollout_id": "rollout-01HNB6W4Z1R0F3JX8N5A2T6YQE",
+                "manifest_id": "manifest-001",
+                "total_instances": 3000,
+                "completed": 3000,
+                "succeeded": 3000,
+                "failed": 0,
+                "waves": 3,
+                "halted": False,
+                "halt_reason": None,
+                "elapsed_seconds": 95.2,
+                "throughput_per_minute": 1890.75,
+                "p50_seconds": 1.42,
+                "p99_seconds": 3.87
+            }
+        }
+
+
+class PlanAction(str, Enum):
+    """Outcome of a dry-run plan for an instance."""
+    
+    UPDATE = "update"
+    UNCHANGED = "unchanged"
+    BLOCKED = "blocked"
+
+
+class PlanGroup(BaseModel):
+    """Instances sharing the same effective state and therefore the same plan."""
+    
+    instance_ids: List[str] = Field(..., description="Instances in the group")
+    action: PlanAction = Field(..., description="What a deployment would do")
+    current_manifest_id: Optional[str] = Field(None, description="Manifest currently deployed to the group")
+    baseline_known: bool = Field(
+        True,
+        description="False when the group's current manifest is no longer held in memory and changes assume a full deployment"
+    )
+    policy_type: Optional[str] = Field(None, description="Update channel policy type of the group")
+    changes: List[ComponentChange] = Field(default_factory=list, description="Component changes")
+    blockers: List[str] = Field(default_factory=list, description="Policies, pins or validation errors blocking the deployment")
+    estimated_seconds: float = Field(0.0, description="Estimated deployment duration per instance")
+
+
+class RolloutPlan(BaseModel):
+    """Dry-run plan for deploying a manifest across a fleet."""
+    
+    manifest_id: str
+    manifest_hash: str
+    total_instances: int
+    to_update: int
+    unchanged: int
+    blocked: int
+    estimated_total_seconds: float = Field(..., description="Estimated wall-clock time at the requested concurrency")
+    planning_seconds: float = Field(..., description="Time spent computing the plan")
+    groups: List[PlanGroup] = Field(default_factory=list)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "manifest_id": "manifest-002",
+                "manifest_hash": "9f2c4e0b7d...",
+                "total_instances": 3,
+                "to_update": 2,
+                "unchanged": 0,
+                "blocked": 1,
+                "estimated_total_seconds": 30.0,
+                "planning_seconds": 0.0012,
+                "groups": [
+                    {
+                        "instance_ids": ["instance-prod-01", "instance-prod-02"],
+                        "action": "update",
+                        "current_manifest_id": "manifest-001",
+                        "policy_type": "auto_update",
+                        "changes": [
+                            {"component": "suite:commerce", "from_version": "1.5.0", "to_version": "1.6.0"}
+                        ],
+                        "blockers": [],
+                        "estimated_seconds": 30.0
+                    },
+                    {
+                        "instance_ids": ["instance-prod-03"],
+                        "action": "blocked",
+                        "current_manifest_id": "manifest-001",
+                        "policy_type": "manual_approval",
+                        "changes": [
+                            {"component": "suite:commerce", "from_version": "1.5.0", "to_version": "1.6.0"}
+                        ],
+                        "blockers": ["Policy manual_approval: Manual approval required"],
+                        "estimated_seconds": 0.0
+                    }
+                ]
+            }
+        }
+
+
+class RolloutPlanRequest(BaseModel):
+    """Request model for a fleet dry-run plan."""
+    
+    manifest_id: str = Field(..., description="Deployment manifest ID")
+    instance_ids: List[str] = Field(..., description="Target enterprise instance IDs")
+    max_in_flight: int = Field(50, ge=1, description="Concurrency used for the duration estimate")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "manifest_id": "manifest-002",
+                "instance_ids": ["instance-prod-01", "instance-prod-02", "instance-prod-03"],
+                "max_in_flight": 50
+            }
+        }
+
+
+class ManifestCompileRequest(BaseModel):
+    """Inputs for compiling one manifest."""
+    
+    platform_version: str = Field(..., description="Platform version")
+    suites: Dict[str, str] = Field(default_factory=dict, description="Suite name to version mapping")
+    capabilities: Dict[str, str] = Field(default_factory=dict, description="Capability name to version mapping")
+    configuration: Dict[str, Any] = Field(default_factory=dict, description="Deployment configuration")
+
+
+class ManifestBatchRequest(BaseModel):
+    """Request model for compiling many manifests at once."""
+    
+    items: List[ManifestCompileRequest] = Field(..., description="Manifests to compile")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "items": [
+                    {
+                        "platform_version": "2.0.0",
+                        "suites": {"commerce": "1.5.0"},
+                        "capabilities": {"reporting": "1.0.0"},
+                        "configuration": {"replicas": 3}
+                    },
+                    {
+                        "platform_version": "2.0.0",
+                        "suites": {"commerce": "1.6.0"},
+                        "capabilities": {"reporting": "1.0.0"},
+                        "configuration": {"replicas": 5}
+                    }
+                ]
+            }
+        }
+
+
+class ManifestCompileResult(BaseModel):
+    """Outcome of compiling one manifest of a batch."""
+    
+    index: int = Field(..., description="Position of the item in the batch request")
+    manifest: Optional[DeploymentManifest] = Field(None, description="Compiled manifest; None when the item failed")
+    resolved_versions: Dict[str, str] = Field(default_factory=dict, description="Resolved component and dependency versions")
+    error: Optional[str] = Field(None, description="Why the item failed")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "index": 1,
+                "manifest": None,
+                "resolved_versions": {},
+                "error": "Dependency resolution failed: No usable version of capability:reporting satisfies ..."
+            }
+        }
+
+
+class RolloutPreflightRequest(BaseModel):
+    """Request model for probing a rollout wave before it starts."""
+    
+    manifest_id: str = Field(..., description="Compiled deployment manifest ID")
+    instance_ids: List[str] = Field(..., description="Instances in the wave")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "manifest_id": "manifest-002",
+                "instance_ids": ["instance-prod-01", "instance-prod-02", "instance-prod-03"]
+            }
+        }
+
+
+class InstanceReadiness(BaseModel):
+    """Readiness of one instance for a deployment."""
+    
+    instance_id: str = Field(..., description="Instance ID")
+    is_ready: bool = Field(..., description="Whether every readiness probe passed")
+    errors: List[str] = Field(default_factory=list, description="Failed probes")
+    warnings: List[str] = Field(default_factory=list, description="Probe findings that do not block the deployment")
+
+
+class RolloutPreflightResponse(BaseModel):
+    """Readiness of every instance in a rollout wave."""
+    
+    manifest_id: str = Field(..., description="Deployment manifest ID")
+    ready: int = Field(..., description="Number of ready instances")
+    not_ready: int = Field(..., description="Number of instances that are not ready")
+    duration_seconds: float = Field(..., description="Time taken to probe the wave")
+    instances: List[InstanceReadiness] = Field(..., description="Per-instance readiness")
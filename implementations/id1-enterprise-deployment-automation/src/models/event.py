@@ -0,0 +1,46 @@
+"""Event models for push notifications."""
+
+from enum import Enum
+from typing import Optional, Dict, Any
+from datetime import datetime
+from pydantic import BaseModel, Field
+
+
+class EventType(str, Enum):
+    """Event type enumeration."""
+    
+    DEPLOYMENT_STATUS = "deployment.status"
+    ROLLBACK_STATUS = "rollback.status"
+
+
+class Event(BaseModel):
+    """A status transition published on the event bus."""
+    
+    sequence: int = Field(
+        ...,
+        description=(
+            "Bus-wide sequence number, increasing in publish order; filtered subscribers see gaps "
+            "for events they did not match, and dropped events are reported separately"
+        )
+    )
+    type: EventType = Field(..., description="Event type")
+    subject_id: str = Field(..., description="Deployment or rollback ID")
+    instance_id: str = Field(..., description="Affected instance ID")
+    rollout_id: Optional[str] = Field(None, description="Rollout the deployment belongs to")
+    status: str = Field(..., description="New status")
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    data: Dict[str, Any] = Field(default_factory=dict, description="Additional event details")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "sequence": 1042,
+                "type": "deployment.status",
+                "subject_id": "deploy-01HNB6W5J5T3V8K2Q9ZP4M7XCD",
+                "instance_id": "instance-prod-01",
+                "rollout_id": "rollout-01HNB6W4Z1R0F3JX8N5A2T6YQE",
+                "status": "deploying",
+                "timestamp": "2024-01-30T10:05:00Z",
+                "data": {"manifest_id": "manifest-001"}
+            }
+        }
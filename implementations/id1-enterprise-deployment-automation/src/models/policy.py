@@ -21,6 +21,7 @@ class UpdateChannelPolicy(BaseModel):
     instance_id: str = Field(..., description="Associated instance ID")
     policy_type: PolicyType = Field(..., description="Type of update policy")
     enabled: bool = Field(default=True, description="Whether policy is active")
+    priority: int = Field(default=0, description="Precedence among the instance's policies; higher wins before policy type is considered")
     description: Optional[str] = Field(None, description="Policy description")
     
     # Auto-update specific settings
@@ -37,6 +38,7 @@ class UpdateChannelPolicy(BaseModel):
     
     # Common settings
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional metadata")
+    revision: int = Field(default=1, description="Incremented on every update")
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -59,6 +61,7 @@ class PolicyUpdateRequest(BaseModel):
     
     policy_type: Optional[PolicyType] = None
     enabled: Optional[bool] = None
+    priority: Optional[int] = None
     description: Optional[str] = None
     auto_update_schedule: Optional[str] = None
     auto_update_maintenance_window: Optional[Dict[str, Any]] = None
@@ -86,6 +89,7 @@ class PolicyResponse(BaseModel):
     instance_id: str
     policy_type: PolicyType
     enabled: bool
+    priority: int = 0
     description: Optional[str]
     created_at: datetime
     updated_at: datetime
@@ -97,6 +101,7 @@ class PolicyResponse(BaseModel):
                 "instance_id": "instance-prod-01",
                 "policy_type": "manual_approval",
                 "enabled": True,
+                "priority": 0,
                 "description": "Production instance requires manual approval",
                 "created_at": "2024-01-30T10:00:00Z",
                 "updated_at": "2024-01-30T10:00:00Z"
@@ -139,3 +139,31 @@ class VersionCompatibilityResult(BaseModel):
                 "warnings": ["Commerce suite 1.5.0 has known issues with reporting 1.0.0"]
             }
         }
+
+
+class ResolutionResult(BaseModel):
+    """Outcome of resolving version constraints against the catalog."""
+    
+    is_resolved: bool = Field(..., description="Whether a consistent set of versions was found")
+    resolved: Dict[str, str] = Field(default_factory=dict, description="Component key to selected version")
+    conflicts: List[str] = Field(default_factory=list, description="Why no consistent set exists")
+    decisions: int = Field(0, description="Versions tried")
+    backjumps: int = Field(0, description="Conflicts that undid earlier choices")
+    learned: int = Field(0, description="Incompatible version combinations learned")
+    catalog_generation: int = Field(0, description="Catalog generation the result was computed for")
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "is_resolved": True,
+                "resolved": {
+                    "platform:webwaka-platform": "2.0.0",
+                    "suite:commerce": "1.6.2"
+                },
+                "conflicts": [],
+                "decisions": 3,
+                "backjumps": 1,
+                "learned": 1,
+                "catalog_generation": 42
+            }
+        }
@@ -0,0 +1,34 @@
+"""Durable state persistence module."""
+
+from typing import Optional
+
+from .state_store import StateStore, InMemoryStateStore
+from .write_behind import StateWriter
+
+
+def create_state_writer(url: Optional[str]) -> Optional[StateWriter]:
+    """Build a write-behind state writer from a store URL.
+
+    Args:
+        url: ``memory://`` for an in-process store, any SQLAlchemy database
+            URL for a relational store, or None to disable persistence
+
+    Returns:
+        State writer or None when persistence is disabled
+    """
+    if not url:
+        return None
+    if url == "memory://":
+        return StateWriter(InMemoryStateStore())
+
+    # Imported lazily so SQLAlchemy is only needed when a database is configured
+    from .sqlalchemy_store import SQLAlchemyStateStore
+    return StateWriter(SQLAlchemyStateStore(url))
+
+
+__all__ = [
+    "StateStore",
+    "InMemoryStateStore",
+    "StateWriter",
+    "create_state_writer",
+]
@@ -0,0 +1,122 @@
+"""SQLAlchemy-backed state store."""
+
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    delete,
+    event,
+    select,
+)
+
+from .state_store import StateStore, WriteOperation
+
+
+logger = logging.getLogger(__name__)
+
+
+metadata = MetaData()
+
+state_records = Table(
+    "state_records",
+    metadata,
+    Column("kind", String(64), primary_key=True),
+    Column("key", String(128), primary_key=True),
+    Column("payload", Text, nullable=False),
+    Column("updated_at", DateTime, nullable=False, default=datetime.utcnow),
+)
+
+
+class SQLAlchemyStateStore(StateStore):
+    """State store persisting records to a relational database.
+
+    Each write batch is committed in a single transaction, so the cost of a
+    commit (and its fsync) is shared by every record in the batch.
+    """
+
+    def __init__(self, url: str = "sqlite:///./deployment_state.db", **engine_kwargs):
+        """Initialize the store and create the schema if needed.
+
+        Args:
+            url: SQLAlchemy database URL
+            **engine_kwargs: Extra arguments for ``create_engine``
+        """
+        if url.startswith("sqlite"):
+            engine_kwargs.setdefault("connect_args", {"check_same_thread": False})
+
+        self.engine = create_engine(url, **engine_kwargs)
+
+        if url.startswith("sqlite"):
+            event.listen(self.engine, "connect", _configure_sqlite)
+
+        metadata.create_all(self.engine)
+        logger.info(f"State store initialized at {self.engine.url.render_as_string(hide_password=True)}")
+
+    def write_batch(self, operations: Sequence[WriteOperation]) -> None:
+        """Apply a batch of writes in one transaction."""
+        if not operations:
+            return
+
+        now = datetime.utcnow()
+        rows = [
+            {"kind": kind, "key": key, "payload": payload, "updated_at": now}
+            for kind, key, payload in operations
+            if payload is not None
+        ]
+        keys_by_kind: Dict[str, List[str]] = {}
+        for kind, key, _ in operations:
+            keys_by_kind.setdefault(kind, []).append(key)
+
+        with self.engine.begin() as connection:
+            # Upsert as delete-then-insert so the same statements work on every dialect
+            for kind, keys in keys_by_kind.items():
+                connection.execute(
+                    delete(state_records).where(
+                        state_records.c.kind == kind,
+                        state_records.c.key.in_(keys)
+                    )
+                )
+            if rows:
+                connection.execute(state_records.insert(), rows)
+
+    def get(self, kind: str, key: str) -> Optional[str]:
+        """Read a single record."""
+        query = select(state_records.c.payload).where(
+            state_records.c.kind == kind,
+            state_records.c.key == key
+        )
+        with self.engine.connect() as connection:
+            return connection.execute(query).scalar_one_or_none()
+
+    def load(self, kind: str, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """Read the most recent records of a kind."""
+        query = (
+            select(state_records.c.key, state_records.c.payload)
+            .where(state_records.c.kind == kind)
+            .order_by(state_records.c.key.desc())
+        )
+        if limit is not None:
+            query = query.limit(limit)
+
+        with self.engine.connect() as connection:
+            return [(row.key, row.payload) for row in connection.execute(query)]
+
+    def close(self) -> None:
+        """Dispose of pooled connections."""
+        self.engine.dispose()
+
+
+def _configure_sqlite(dbapi_connection, connection_record) -> None:
+    """Use WAL journaling so readers are not blocked by group commits."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.close()
@@ -0,0 +1,89 @@
+"""Pluggable key-value persistence for manager state."""
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# (kind, key, payload); a payload of None deletes the record
+WriteOperation = Tuple[str, str, Optional[str]]
+
+
+class StateStore(ABC):
+    """Durable storage for serialized records grouped by kind.
+
+    Records are opaque serialized payloads keyed by (kind, key). Keys are the
+    time-ordered record IDs, so "most recent N" reads are served in key order.
+    Implementations are synchronous; the write-behind writer calls them from
+    a worker thread.
+    """
+
+    @abstractmethod
+    def write_batch(self, operations: Sequence[WriteOperation]) -> None:
+        """Apply a batch of writes atomically.
+
+        Args:
+            operations: Upserts and deletes to apply in one transaction
+        """
+
+    @abstractmethod
+    def get(self, kind: str, key: str) -> Optional[str]:
+        """Read a single record.
+
+        Args:
+            kind: Record kind
+            key: Record key
+
+        Returns:
+            Serialized payload or None if not found
+        """
+
+    @abstractmethod
+    def load(self, kind: str, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """Read the most recent records of a kind.
+
+        Args:
+            kind: Record kind
+            limit: Optional maximum number of records (highest keys first)
+
+        Returns:
+            List of (key, payload) tuples, newest first
+        """
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class InMemoryStateStore(StateStore):
+    """Process-local state store, mainly for tests and demos."""
+
+    def __init__(self):
+        """Initialize the in-memory store."""
+        self._lock = threading.Lock()
+        self._records: Dict[str, Dict[str, str]] = {}
+        self.batches_written = 0
+
+    def write_batch(self, operations: Sequence[WriteOperation]) -> None:
+        """Apply a batch of writes atomically."""
+        with self._lock:
+            for kind, key, payload in operations:
+                records = self._records.setdefault(kind, {})
+                if payload is None:
+                    records.pop(key, None)
+                else:
+                    records[key] = payload
+            self.batches_written += 1
+
+    def get(self, kind: str, key: str) -> Optional[str]:
+        """Read a single record."""
+        with self._lock:
+            return self._records.get(kind, {}).get(key)
+
+    def load(self, kind: str, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """Read the most recent records of a kind."""
+        with self._lock:
+            records = self._records.get(kind, {})
+            keys = sorted(records, reverse=True)
+            if limit is not None:
+                keys = keys[:limit]
+            return [(key, records[key]) for key in keys]
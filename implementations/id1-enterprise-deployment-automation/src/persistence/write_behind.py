@@ -0,0 +1,228 @@
+"""Write-behind batching in front of a state store."""
+
+import asyncio
+import logging
+from typing import Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .state_store import StateStore, WriteOperation
+
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Sentinel marking a pending delete
+_DELETE = object()
+
+
+class StateWriter:
+    """Buffers record writes and group-commits them in the background.
+
+    ``put`` and ``delete`` only record the latest intended state of a key in
+    memory, so the request path never waits on the database. A background
+    task drains the buffer every ``flush_interval`` seconds, or sooner once
+    ``max_batch`` keys are pending, serializing each model at flush time and
+    committing the whole batch in one transaction on a worker thread.
+    Repeated writes to the same key between flushes collapse into one.
+    """
+
+    def __init__(
+        self,
+        store: StateStore,
+        flush_interval: float = 0.05,
+        max_batch: int = 500
+    ):
+        """Initialize the writer.
+
+        Args:
+            store: Durable state store
+            flush_interval: Maximum delay before buffered writes are committed
+            max_batch: Pending key count that triggers an early flush
+        """
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._pending: Dict[Tuple[str, str], object] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+
+        self.batches_committed = 0
+        self.records_committed = 0
+        self.write_errors = 0
+
+    def put(self, kind: str, record: BaseModel, key: Optional[str] = None) -> None:
+        """Schedule a record upsert.
+
+        Args:
+            kind: Record kind
+            record: Pydantic model to persist
+            key: Optional key (defaults to ``record.id``)
+        """
+        self._pending[(kind, key or record.id)] = record
+        self._notify()
+
+    def delete(self, kind: str, key: str) -> None:
+        """Schedule a record delete.
+
+        Args:
+            kind: Record kind
+            key: Record key
+        """
+        self._pending[(kind, key)] = _DELETE
+        self._notify()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of keys waiting to be committed."""
+        return len(self._pending)
+
+    async def start(self) -> None:
+        """Start the background flush task."""
+        if self._task and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+        logger.info("State writer started")
+
+    async def stop(self) -> None:
+        """Stop the background task after committing everything pending.
+        
+        The task is asked to exit rather than cancelled, so a commit already
+        running on the worker thread finishes before the store can be closed.
+        """
+        if self._task:
+            self._stopping = True
+            self._wakeup.set()
+            try:
+                await self._task
+            finally:
+                self._task = None
+                self._stopping = False
+        await self.flush()
+        logger.info("State writer stopped")
+
+    async def flush(self) -> int:
+        """Commit all pending writes now.
+
+        Returns:
+            Number of records committed
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+
+            pending, self._pending = self._pending, {}
+            operations: List[WriteOperation] = [
+                (kind, key, None if record is _DELETE else record.model_dump_json())
+                for (kind, key), record in pending.items()
+            ]
+
+            try:
+                await asyncio.to_thread(self.store.write_batch, operations)
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(f"Failed to commit {len(operations)} state records: {str(e)}")
+                # Re-queue without clobbering anything written since
+                for item_key, record in pending.items():
+                    self._pending.setdefault(item_key, record)
+                raise
+
+            self.batches_committed += 1
+            self.records_committed += len(operations)
+            return len(operations)
+
+    def load(self, kind: str, model: Type[ModelT], limit: Optional[int] = None) -> List[ModelT]:
+        """Load the most recent records of a kind.
+
+        Args:
+            kind: Record kind
+            model: Pydantic model class to parse into
+            limit: Optional maximum number of records
+
+        Returns:
+            Parsed records, oldest first
+        """
+        return [record for _, record in self.load_keyed(kind, model, limit)]
+
+    def load_keyed(
+        self,
+        kind: str,
+        model: Type[ModelT],
+        limit: Optional[int] = None
+    ) -> List[Tuple[str, ModelT]]:
+        """Load the most recent records of a kind along with their keys.
+
+        Args:
+            kind: Record kind
+            model: Pydantic model class to parse into
+            limit: Optional maximum number of records
+
+        Returns:
+            List of (key, record) tuples, oldest first
+        """
+        rows = self.store.load(kind, limit)
+        return [(key, model.model_validate_json(payload)) for key, payload in reversed(rows)]
+
+    def get(self, kind: str, key: str, model: Type[ModelT]) -> Optional[ModelT]:
+        """Read a single record, preferring a pending unflushed write.
+
+        Args:
+            kind: Record kind
+            key: Record key
+            model: Pydantic model class to parse into
+
+        Returns:
+            Parsed record or None if not found
+        """
+        pending = self._pending.get((kind, key))
+        if pending is _DELETE:
+            return None
+        if pending is not None:
+            return pending
+
+        payload = self.store.get(kind, key)
+        return model.model_validate_json(payload) if payload is not None else None
+
+    def stats(self) -> Dict[str, int]:
+        """Get writer counters.
+
+        Returns:
+            Pending, committed and error counts
+        """
+        return {
+            "pending": len(self._pending),
+            "batches_committed": self.batches_committed,
+            "records_committed": self.records_committed,
+            "write_errors": self.write_errors,
+        }
+
+    def _notify(self) -> None:
+        """Wake the flush task early when a full batch is pending."""
+        if self._wakeup is not None and len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    async def _run(self) -> None:
+        """Background loop committing pending writes."""
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception:
+                # Already logged; keep the loop alive and retry on the next tick
+                if not self._stopping:
+                    await asyncio.sleep(self.flush_interval)
+
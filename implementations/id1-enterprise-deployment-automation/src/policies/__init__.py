@@ -2,8 +2,17 @@
 
 from .policy_manager import PolicyManager
 from .policy_enforcer import PolicyEnforcer
+from .auto_updates import AutoUpdateScheduler
+from .cron import CronError, CronSchedule
+from .maintenance_windows import MaintenanceSchedule, MaintenanceWindowError, MaintenanceWindowIndex
 
 __all__ = [
     "PolicyManager",
     "PolicyEnforcer",
+    "MaintenanceSchedule",
+    "MaintenanceWindowError",
+    "MaintenanceWindowIndex",
+    "AutoUpdateScheduler",
+    "CronSchedule",
+    "CronError",
 ]
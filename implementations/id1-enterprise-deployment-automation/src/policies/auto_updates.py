@@ -0,0 +1,310 @@
+"""Cron-driven auto-update scheduling for auto-update policies."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from ..models.policy import PolicyType, UpdateChannelPolicy
+from .cron import CronError, CronSchedule
+
+if TYPE_CHECKING:
+    from .maintenance_windows import MaintenanceWindowIndex
+    from .policy_manager import PolicyManager
+
+
+logger = logging.getLogger(__name__)
+
+# Receives the instances due in one tick and the time of the tick
+FireCallback = Callable[[List[str], datetime], Awaitable[Any]]
+
+# Cached next fire times kept before the cache is cleared
+_NEXT_FIRE_CACHE_SIZE = 10000
+
+
+class AutoUpdateScheduler:
+    """Fires rollouts on the cron schedules of auto-update policies.
+
+    The next fire time of every enabled auto-update policy with an
+    ``auto_update_schedule`` is kept in a min-heap, and the scheduler
+    sleeps until the earliest one; a policy change only wakes it when it
+    adds an earlier fire time. When it wakes, every instance due by then is
+    batched into a single ``on_fire`` call, run in its own task.
+
+    Cron expressions are parsed when a policy changes, and the next fire
+    time after a tick is computed once per distinct expression, so policies
+    sharing a schedule cost a heap operation each rather than a cron
+    evaluation. Entries left in the heap by changed or deleted policies
+    are skipped when popped. With a maintenance window index, a policy
+    that comes due outside its window is deferred to the window's next
+    opening instead of firing.
+    """
+
+    def __init__(
+        self,
+        on_fire: FireCallback,
+        policy_manager: Optional["PolicyManager"] = None,
+        clock: Optional[Callable[[], datetime]] = None,
+        windows: Optional["MaintenanceWindowIndex"] = None
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            on_fire: Coroutine function rolling out to the due instances
+            policy_manager: Optional manager whose policies are scheduled
+                and kept in sync through its change notifications; due
+                instances whose effective policy is another one are skipped
+            clock: Optional function returning the current UTC time
+            windows: Optional maintenance window index; due instances
+                outside their policy's window fire when it next opens
+        """
+        self.on_fire = on_fire
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+        self.windows = windows
+
+        # Policy ID -> (cron schedule, instance ID, heap entry sequence)
+        self._entries: Dict[str, Tuple[CronSchedule, str, int]] = {}
+        # (fire time as epoch seconds, entry sequence, policy ID)
+        self._heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        # (cron expression, minute) -> next fire time after that minute
+        self._next_fires: Dict[Tuple[str, float], Optional[float]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._rollouts: Set[asyncio.Task] = set()
+
+        self.wakeups = 0
+        self.batches = 0
+        self.instances_fired = 0
+        self.deferred = 0
+
+        self.policy_manager = policy_manager
+        if policy_manager:
+            for policy in policy_manager.policies.values():
+                self._on_policy_change(policy)
+            policy_manager.add_listener(self._on_policy_change)
+
+    @property
+    def running(self) -> bool:
+        """Whether the scheduling loop is running."""
+        return self._task is not None
+
+    def set_policy(self, policy: UpdateChannelPolicy, now: Optional[datetime] = None) -> None:
+        """Schedule a policy, replacing its earlier schedule.
+
+        Disabled policies, other policy types and policies without a
+        schedule are removed.
+
+        Args:
+            policy: Update channel policy
+            now: Optional moment to schedule from; defaults to the clock
+
+        Raises:
+            CronError: If the schedule is invalid
+        """
+        self.remove_policy(policy.id)
+        if not (policy.enabled and policy.policy_type == PolicyType.AUTO_UPDATE and policy.auto_update_schedule):
+            return
+
+        cron = CronSchedule.parse(policy.auto_update_schedule)
+        fire_at = self._next_fire(cron, (now or self.clock()).timestamp())
+        if fire_at is None:
+            return
+
+        sequence = next(self._sequence)
+        self._entries[policy.id] = (cron, policy.instance_id, sequence)
+        if not self._heap or fire_at < self._heap[0][0]:
+            self._wakeup.set()
+        heapq.heappush(self._heap, (fire_at, sequence, policy.id))
+
+    def remove_policy(self, policy_id: str) -> None:
+        """Stop scheduling a policy.
+
+        Args:
+            policy_id: Policy ID
+        """
+        if self._entries.pop(policy_id, None) is None:
+            return
+        # Drop stale entries once they make up most of the heap
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            live = {sequence for _, _, sequence in self._entries.values()}
+            self._heap = [entry for entry in self._heap if entry[1] in live]
+            heapq.heapify(self._heap)
+
+    def next_fire_time(self) -> Optional[datetime]:
+        """Get the earliest scheduled fire time.
+
+        Returns:
+            UTC fire time, or None if nothing is scheduled
+        """
+        self._drop_stale()
+        if not self._heap:
+            return None
+        return datetime.fromtimestamp(self._heap[0][0], timezone.utc)
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[str]:
+        """Take every instance due by a moment and schedule their next fires.
+
+        Fires missed while the scheduler was not running are collapsed into
+        this one; next fire times are computed from ``now``. A policy whose
+        maintenance window is closed is rescheduled for when it opens; one
+        whose window never opens again is skipped until its next cron fire.
+
+        Args:
+            now: Optional moment; defaults to the clock
+
+        Returns:
+            Due instance IDs, without duplicates
+        """
+        now = now or self.clock()
+        moment = now.timestamp()
+        due: Dict[str, None] = {}
+        rescheduled: List[Tuple[float, int, str]] = []
+
+        while self._heap and self._heap[0][0] <= moment:
+            _, sequence, policy_id = heapq.heappop(self._heap)
+            entry = self._entries.get(policy_id)
+            if entry is None or entry[2] != sequence:
+                continue
+            cron, instance_id, _ = entry
+            deferred_to = None
+            if self._applies(policy_id, instance_id):
+                opens_at = self._window_opens(policy_id, now)
+                if opens_at is None or opens_at > moment:
+                    self.deferred += 1
+                    deferred_to = opens_at
+                else:
+                    due[instance_id] = None
+
+            fire_at = deferred_to or self._next_fire(cron, moment)
+            if fire_at is None:
+                del self._entries[policy_id]
+                continue
+            sequence = next(self._sequence)
+            self._entries[policy_id] = (cron, instance_id, sequence)
+            rescheduled.append((fire_at, sequence, policy_id))
+
+        # Re-heapifying once is cheaper than pushing a large batch one by one
+        if len(rescheduled) > len(self._heap) // 4:
+            self._heap.extend(rescheduled)
+            heapq.heapify(self._heap)
+        else:
+            for item in rescheduled:
+                heapq.heappush(self._heap, item)
+
+        return list(due)
+
+    async def start(self) -> None:
+        """Start the scheduling loop."""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Auto-update scheduler started with {len(self._entries)} scheduled policies")
+
+    async def stop(self) -> None:
+        """Stop the scheduling loop and cancel rollouts it started."""
+        tasks = list(self._rollouts)
+        if self._task is not None:
+            tasks.append(self._task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        self._rollouts.clear()
+
+    def stats(self) -> Dict[str, object]:
+        """Get scheduler counters.
+
+        Returns:
+            Scheduled policies, heap size, next fire time, wakeups, batches
+            and instances fired
+        """
+        next_fire = self.next_fire_time()
+        return {
+            "policies": len(self._entries),
+            "heap_size": len(self._heap),
+            "next_fire_at": next_fire.isoformat() if next_fire else None,
+            "wakeups": self.wakeups,
+            "batches": self.batches,
+            "instances_fired": self.instances_fired,
+            "deferred": self.deferred,
+        }
+
+    async def _run(self) -> None:
+        """Sleep until the earliest fire time, then fire what is due."""
+        while True:
+            tick = self.clock()
+            instance_ids = self.pop_due(tick)
+            if instance_ids:
+                self._fire(instance_ids, tick)
+
+            self._wakeup.clear()
+            next_fire = self.next_fire_time()
+            timeout = None if next_fire is None else max(0.0, (next_fire - self.clock()).total_seconds())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeups += 1
+
+    def _fire(self, instance_ids: List[str], tick: datetime) -> None:
+        """Start one rollout for a tick's due instances."""
+        self.batches += 1
+        self.instances_fired += len(instance_ids)
+        logger.info(f"Auto-update tick at {tick.isoformat()}: {len(instance_ids)} instances due")
+
+        async def rollout() -> None:
+            try:
+                await self.on_fire(instance_ids, tick)
+            except Exception as e:
+                logger.error(f"Auto-update rollout at {tick.isoformat()} failed: {str(e)}")
+
+        task = asyncio.create_task(rollout())
+        self._rollouts.add(task)
+        task.add_done_callback(self._rollouts.discard)
+
+    def _next_fire(self, cron: CronSchedule, after: float) -> Optional[float]:
+        """Get a cron expression's next fire time, shared across policies."""
+        key = (cron.expression, after - after % 60)
+        if key not in self._next_fires:
+            if len(self._next_fires) >= _NEXT_FIRE_CACHE_SIZE:
+                self._next_fires.clear()
+            fire_at = cron.next_after(datetime.fromtimestamp(after, timezone.utc))
+            self._next_fires[key] = fire_at.timestamp() if fire_at else None
+        return self._next_fires[key]
+
+    def _drop_stale(self) -> None:
+        """Pop heap entries of policies changed or removed since they were pushed."""
+        while self._heap:
+            _, sequence, policy_id = self._heap[0]
+            entry = self._entries.get(policy_id)
+            if entry is not None and entry[2] == sequence:
+                return
+            heapq.heappop(self._heap)
+
+    def _window_opens(self, policy_id: str, now: datetime) -> Optional[float]:
+        """Get when a policy may next fire given its maintenance window, or None if never."""
+        if self.windows is None:
+            return now.timestamp()
+        opens_at = self.windows.next_open(policy_id, now)
+        return opens_at.timestamp() if opens_at else None
+
+    def _applies(self, policy_id: str, instance_id: str) -> bool:
+        """Check a policy is still the one that applies to its instance."""
+        if self.policy_manager is None:
+            return True
+        effective = self.policy_manager.get_instance_policy(instance_id)
+        return effective is not None and effective.id == policy_id
+
+    def _on_policy_change(self, policy: UpdateChannelPolicy) -> None:
+        """Keep the schedule in step with the policy manager."""
+        if self.policy_manager.get_policy(policy.id) is not policy:
+            self.remove_policy(policy.id)
+            return
+        try:
+            self.set_policy(policy)
+        except CronError as e:
+            # Only reachable for policies loaded from state before schedules were validated
+            logger.warning(f"Ignoring auto-update schedule of policy {policy.id}: {e}")
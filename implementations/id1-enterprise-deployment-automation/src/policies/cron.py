@@ -0,0 +1,166 @@
+"""Cron expressions for auto-update schedules."""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
+
+
+_MONTHS = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+_DAYS = {name: number for number, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+_MACROS = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+
+# Expressions such as "0 0 30 2 *" never match; stop looking after this long
+_SEARCH_YEARS = 5
+
+
+class CronError(ValueError):
+    """Raised for a cron expression that cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class CronSchedule:
+    """A parsed five-field cron expression, evaluated in UTC.
+
+    Fields are minute, hour, day of month, month and day of week, each
+    ``*``, a number, a range (``1-5``), a list (``1,15``) or a step
+    (``*/15``, ``0-30/10``). Months and weekdays also accept names, and
+    ``@hourly``, ``@daily``, ``@weekly``, ``@monthly`` and ``@yearly``
+    are shorthands. As in cron, when both day of month and day of week
+    are restricted a day matching either one fires.
+    """
+
+    expression: str
+    minutes: Tuple[int, ...]
+    hours: FrozenSet[int]
+    days: FrozenSet[int]
+    months: FrozenSet[int]
+    weekdays: FrozenSet[int]
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expression: str) -> "CronSchedule":
+        """Parse a cron expression; parsed expressions are shared.
+
+        Args:
+            expression: Cron expression
+
+        Returns:
+            Parsed schedule
+
+        Raises:
+            CronError: If the expression is invalid
+        """
+        if not isinstance(expression, str):
+            raise CronError("Cron expression must be a string")
+        return _parse(" ".join(expression.split()))
+
+    def next_after(self, after: datetime) -> Optional[datetime]:
+        """Get the first fire time strictly after a moment.
+
+        Args:
+            after: Timezone-aware moment
+
+        Returns:
+            UTC fire time, or None if the expression never fires
+        """
+        at = after.astimezone(timezone.utc).replace(second=0, microsecond=0, tzinfo=None) + timedelta(minutes=1)
+        limit = at.replace(year=at.year + _SEARCH_YEARS, month=1, day=1)
+
+        # Skip whole months, days and hours that cannot match before scanning minutes
+        while at < limit:
+            if at.month not in self.months:
+                at = (at.replace(day=1) + timedelta(days=32)).replace(day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(at):
+                at = at.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if at.hour not in self.hours:
+                at = at.replace(minute=0) + timedelta(hours=1)
+                continue
+            position = bisect_left(self.minutes, at.minute)
+            if position == len(self.minutes):
+                at = at.replace(minute=0) + timedelta(hours=1)
+                continue
+            return at.replace(minute=self.minutes[position], tzinfo=timezone.utc)
+        return None
+
+    def _day_matches(self, at: datetime) -> bool:
+        """Check the day of month and day of week fields."""
+        in_days = at.day in self.days
+        # Cron counts weekdays from Sunday
+        in_weekdays = (at.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+
+@lru_cache(maxsize=4096)
+def _parse(expression: str) -> CronSchedule:
+    """Parse a whitespace-normalized cron expression."""
+    fields = _MACROS.get(expression.lower(), expression).split(" ")
+    if len(fields) != 5:
+        raise CronError(f"Cron expression must have 5 fields: {expression!r}")
+
+    minute, hour, day, month, weekday = fields
+    weekdays = frozenset(value % 7 for value in _parse_field(weekday, 0, 7, _DAYS))
+    return CronSchedule(
+        expression=expression,
+        minutes=tuple(sorted(_parse_field(minute, 0, 59))),
+        hours=frozenset(_parse_field(hour, 0, 23)),
+        days=frozenset(_parse_field(day, 1, 31)),
+        months=frozenset(_parse_field(month, 1, 12, _MONTHS)),
+        weekdays=weekdays,
+        any_day=day == "*",
+        any_weekday=weekday == "*"
+    )
+
+
+def _parse_field(field: str, low: int, high: int, names: Optional[dict] = None) -> FrozenSet[int]:
+    """Parse one cron field into the values it matches."""
+    values = set()
+    for part in field.split(","):
+        spec, _, step = part.partition("/")
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            first, _, last = spec.partition("-")
+            start, end = _parse_value(first, low, high, names), _parse_value(last, low, high, names)
+        else:
+            start = _parse_value(spec, low, high, names)
+            end = high if step else start
+
+        try:
+            increment = int(step) if step else 1
+        except ValueError:
+            raise CronError(f"Invalid cron step: {part!r}")
+        if increment < 1 or start > end:
+            raise CronError(f"Invalid cron range: {part!r}")
+        values.update(range(start, end + 1, increment))
+    return frozenset(values)
+
+
+def _parse_value(value: str, low: int, high: int, names: Optional[dict]) -> int:
+    """Parse a cron number or name within a field's bounds."""
+    if names and value.lower() in names:
+        return names[value.lower()]
+    try:
+        number = int(value)
+    except ValueError:
+        raise CronError(f"Invalid cron value: {value!r}")
+    if not low <= number <= high:
+        raise CronError(f"Cron value {number} is outside {low}-{high}")
+    return number
@@ -0,0 +1,408 @@
+"""Recurring maintenance windows and an index of their open intervals."""
+
+import heapq
+import logging
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Mapping, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from ..models.policy import UpdateChannelPolicy
+
+if TYPE_CHECKING:
+    from .policy_manager import PolicyManager
+
+
+logger = logging.getLogger(__name__)
+
+_WEEKDAYS = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+# How far ahead to look for open intervals before giving up
+_SEARCH_DAYS = 400
+
+# (start, end) as UTC epoch seconds
+Interval = Tuple[float, float]
+
+
+class MaintenanceWindowError(ValueError):
+    """Raised for a maintenance window configuration that cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class RecurringWindow:
+    """A weekly time range in a schedule's local time."""
+
+    weekdays: FrozenSet[int]
+    start_minute: int
+    end_minute: int
+
+    @property
+    def crosses_midnight(self) -> bool:
+        """Whether the window ends on the day after it starts."""
+        return self.end_minute <= self.start_minute
+
+
+@dataclass(frozen=True)
+class MaintenanceSchedule:
+    """Parsed maintenance windows of a policy.
+
+    Configuration format (``auto_update_maintenance_window``)::
+
+        {
+            "timezone": "Europe/London",
+            "windows": [{"days": ["sat", "sun"], "start": "02:00", "end": "04:00"}],
+            "blackout_dates": ["2024-12-24", "2024-12-25"]
+        }
+
+    A single window may also be given inline (``days``/``start``/``end`` at
+    the top level). Days default to every day, the timezone to UTC. A
+    window whose end is not after its start runs past midnight, and no
+    window opens on a blackout date (in the schedule's timezone).
+    """
+
+    tz: ZoneInfo
+    windows: Tuple[RecurringWindow, ...]
+    blackout_dates: FrozenSet[date]
+
+    @classmethod
+    def parse(cls, config: Mapping[str, Any]) -> "MaintenanceSchedule":
+        """Parse a maintenance window configuration.
+
+        Args:
+            config: Maintenance window configuration
+
+        Returns:
+            Parsed schedule
+
+        Raises:
+            MaintenanceWindowError: If the configuration is invalid
+        """
+        if not isinstance(config, Mapping):
+            raise MaintenanceWindowError("Maintenance window must be an object")
+
+        try:
+            tz = ZoneInfo(config.get("timezone") or "UTC")
+        except (ZoneInfoNotFoundError, ValueError):
+            raise MaintenanceWindowError(f"Unknown timezone: {config.get('timezone')}")
+
+        raw_windows = config.get("windows")
+        if raw_windows is None:
+            raw_windows = [config] if "start" in config or "end" in config else []
+        if not raw_windows:
+            raise MaintenanceWindowError("Maintenance window has no windows")
+
+        blackout_dates = set()
+        for value in config.get("blackout_dates", []):
+            try:
+                blackout_dates.add(date.fromisoformat(str(value)))
+            except ValueError:
+                raise MaintenanceWindowError(f"Invalid blackout date: {value}")
+
+        return cls(
+            tz=tz,
+            windows=tuple(_parse_window(window) for window in raw_windows),
+            blackout_dates=frozenset(blackout_dates)
+        )
+
+    def contains(self, at: datetime) -> bool:
+        """Check whether a window is open at a moment.
+
+        Args:
+            at: Timezone-aware moment
+
+        Returns:
+            True if a window is open
+        """
+        day = at.astimezone(self.tz).date()
+        return any(start <= at < end for start, end in self._day_intervals(day - timedelta(days=1)) + self._day_intervals(day))
+
+    def open_intervals(self, after: datetime, count: int) -> List[Tuple[datetime, datetime]]:
+        """Compute the next open intervals.
+
+        Args:
+            after: Timezone-aware moment; an interval open at this moment is
+                included with its real start
+            count: Maximum intervals returned
+
+        Returns:
+            Up to ``count`` non-overlapping (start, end) UTC intervals in order
+        """
+        intervals: List[Tuple[datetime, datetime]] = []
+        day = after.astimezone(self.tz).date() - timedelta(days=1)
+        for _ in range(_SEARCH_DAYS):
+            intervals.extend(interval for interval in self._day_intervals(day) if interval[1] > after)
+            # Windows of later days never start before those already found
+            if len(intervals) > count + len(self.windows):
+                break
+            day += timedelta(days=1)
+
+        intervals.sort()
+        merged: List[Tuple[datetime, datetime]] = []
+        for start, end in intervals:
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged[:count]
+
+    def _day_intervals(self, day: date) -> List[Tuple[datetime, datetime]]:
+        """Get the UTC intervals of the windows opening on a local date."""
+        if day in self.blackout_dates:
+            return []
+
+        weekday = day.weekday()
+        midnight = datetime(day.year, day.month, day.day, tzinfo=self.tz)
+        intervals = []
+        for window in self.windows:
+            if weekday not in window.weekdays:
+                continue
+            end_minute = window.end_minute + (24 * 60 if window.crosses_midnight else 0)
+            # Offsets are wall-clock time, then converted, so windows follow DST
+            start = (midnight + timedelta(minutes=window.start_minute)).astimezone(timezone.utc)
+            end = (midnight + timedelta(minutes=end_minute)).astimezone(timezone.utc)
+            if end > start:
+                intervals.append((start, end))
+        return intervals
+
+
+def _parse_window(window: Any) -> RecurringWindow:
+    """Parse one ``{"days", "start", "end"}`` window."""
+    if not isinstance(window, Mapping):
+        raise MaintenanceWindowError("Each maintenance window must be an object")
+
+    days = window.get("days")
+    if days is None:
+        weekdays = frozenset(range(7))
+    else:
+        weekdays = frozenset(_parse_weekday(day) for day in days)
+        if not weekdays:
+            raise MaintenanceWindowError("Maintenance window has no days")
+
+    start = _parse_minute(window.get("start", "00:00"))
+    end = _parse_minute(window.get("end", "24:00"))
+    if start == end:
+        raise MaintenanceWindowError("Maintenance window start and end are equal")
+    if start == 24 * 60:
+        raise MaintenanceWindowError("Maintenance window cannot start at 24:00")
+    return RecurringWindow(weekdays=weekdays, start_minute=start, end_minute=end)
+
+
+def _parse_weekday(day: Any) -> int:
+    """Parse a weekday name ("mon", "Monday") or number (0 = Monday)."""
+    if isinstance(day, int) and 0 <= day <= 6:
+        return day
+    weekday = _WEEKDAYS.get(str(day)[:3].lower())
+    if weekday is None:
+        raise MaintenanceWindowError(f"Invalid weekday: {day}")
+    return weekday
+
+
+def _parse_minute(value: Any) -> int:
+    """Parse "HH:MM" into minutes after midnight; "24:00" is allowed."""
+    try:
+        hours, minutes = (int(part) for part in str(value).split(":"))
+    except ValueError:
+        raise MaintenanceWindowError(f"Invalid time: {value}")
+    if not (0 <= hours <= 24 and 0 <= minutes < 60) or (hours == 24 and minutes):
+        raise MaintenanceWindowError(f"Invalid time: {value}")
+    return hours * 60 + minutes
+
+
+class MaintenanceWindowIndex:
+    """Precomputed open maintenance intervals of every policy with a window.
+
+    The next few open intervals of each policy are computed when the policy
+    changes and kept in one list sorted by start time, so whether a policy
+    is open, when it next opens, and which instances are open right now are
+    binary searches rather than evaluations of every policy's schedule.
+    A policy's intervals are recomputed once time passes the start of the
+    last one. Policies without a maintenance window are always open and
+    are not indexed.
+    """
+
+    def __init__(self, policy_manager: Optional["PolicyManager"] = None, intervals_per_policy: int = 8):
+        """Initialize the index.
+
+        Args:
+            policy_manager: Optional manager whose policies are indexed and
+                kept in sync through its change notifications
+            intervals_per_policy: Open intervals precomputed per policy
+        """
+        self.intervals_per_policy = intervals_per_policy
+
+        self._schedules: Dict[str, MaintenanceSchedule] = {}
+        self._instances: Dict[str, str] = {}
+        self._by_policy: Dict[str, List[Interval]] = {}
+        # Every precomputed (start, end, policy ID), sorted
+        self._intervals: List[Tuple[float, float, str]] = []
+        self._longest = 0.0
+        # (time a policy's intervals run out, policy ID); stale entries are skipped
+        self._horizons: List[Tuple[float, str]] = []
+
+        self.policy_manager = policy_manager
+        if policy_manager:
+            for policy in policy_manager.policies.values():
+                self._on_policy_change(policy)
+            policy_manager.add_listener(self._on_policy_change)
+
+    def set_policy(self, policy: UpdateChannelPolicy, now: Optional[datetime] = None) -> None:
+        """Index a policy's maintenance windows, replacing earlier ones.
+
+        Disabled policies and policies without a window are removed.
+
+        Args:
+            policy: Update channel policy
+            now: Optional moment to compute intervals from; defaults to now
+
+        Raises:
+            MaintenanceWindowError: If the window configuration is invalid
+        """
+        self.remove_policy(policy.id)
+        if not policy.enabled or not policy.auto_update_maintenance_window:
+            return
+
+        self._schedules[policy.id] = MaintenanceSchedule.parse(policy.auto_update_maintenance_window)
+        self._instances[policy.id] = policy.instance_id
+        self._compute(policy.id, now or datetime.now(timezone.utc))
+
+    def remove_policy(self, policy_id: str) -> None:
+        """Drop a policy from the index.
+
+        Args:
+            policy_id: Policy ID
+        """
+        self._schedules.pop(policy_id, None)
+        self._instances.pop(policy_id, None)
+        for start, end in self._by_policy.pop(policy_id, ()):
+            position = bisect_left(self._intervals, (start, end, policy_id))
+            del self._intervals[position]
+
+    def is_open(self, policy_id: str, at: Optional[datetime] = None) -> bool:
+        """Check whether a policy's maintenance window is open.
+
+        Args:
+            policy_id: Policy ID
+            at: Optional timezone-aware moment; defaults to now
+
+        Returns:
+            True if open, or if the policy has no indexed window
+        """
+        schedule = self._schedules.get(policy_id)
+        if schedule is None:
+            return True
+
+        at = at or datetime.now(timezone.utc)
+        moment = at.timestamp()
+        self._refresh(moment)
+        intervals = self._by_policy[policy_id]
+        position = bisect_right(intervals, (moment, float("inf"))) - 1
+        if position >= 0 and intervals[position][1] > moment:
+            return True
+        if not intervals or moment >= intervals[-1][1]:
+            # Past the precomputed horizon, e.g. a query far in the future
+            return schedule.contains(at)
+        return False
+
+    def next_open(self, policy_id: str, at: Optional[datetime] = None) -> Optional[datetime]:
+        """Get when a policy's maintenance window next opens.
+
+        Args:
+            policy_id: Policy ID
+            at: Optional timezone-aware moment; defaults to now
+
+        Returns:
+            ``at`` if the window is open, the next opening time, or None if
+            the schedule never opens again
+        """
+        at = at or datetime.now(timezone.utc)
+        schedule = self._schedules.get(policy_id)
+        if schedule is None:
+            return at
+
+        moment = at.timestamp()
+        self._refresh(moment)
+        intervals = self._by_policy[policy_id]
+        position = bisect_right(intervals, (moment, float("inf"))) - 1
+        if position >= 0 and intervals[position][1] > moment:
+            return at
+        if position + 1 < len(intervals):
+            return datetime.fromtimestamp(intervals[position + 1][0], timezone.utc)
+
+        upcoming = schedule.open_intervals(at, 1)
+        if not upcoming:
+            return None
+        return max(upcoming[0][0], at)
+
+    def open_instances(self, at: Optional[datetime] = None) -> List[str]:
+        """List instances whose policy's maintenance window is open.
+
+        Only instances with an indexed window are listed.
+
+        Args:
+            at: Optional timezone-aware moment; defaults to now
+
+        Returns:
+            Instance IDs
+        """
+        moment = (at or datetime.now(timezone.utc)).timestamp()
+        self._refresh(moment)
+        # Only intervals starting within the longest interval length can still be open
+        low = bisect_left(self._intervals, (moment - self._longest,))
+        high = bisect_right(self._intervals, (moment, float("inf")))
+        return [
+            self._instances[policy_id]
+            for start, end, policy_id in self._intervals[low:high]
+            if end > moment
+        ]
+
+    def __contains__(self, policy_id: str) -> bool:
+        """Check whether a policy has an indexed maintenance window."""
+        return policy_id in self._schedules
+
+    def stats(self) -> Dict[str, int]:
+        """Get index sizes.
+
+        Returns:
+            Indexed policies and precomputed intervals
+        """
+        return {"policies": len(self._schedules), "intervals": len(self._intervals)}
+
+    def _compute(self, policy_id: str, after: datetime) -> None:
+        """Precompute a policy's next open intervals."""
+        for start, end in self._by_policy.pop(policy_id, ()):
+            del self._intervals[bisect_left(self._intervals, (start, end, policy_id))]
+
+        upcoming = self._schedules[policy_id].open_intervals(after, self.intervals_per_policy)
+        intervals = [(start.timestamp(), end.timestamp()) for start, end in upcoming]
+        self._by_policy[policy_id] = intervals
+        for start, end in intervals:
+            self._longest = max(self._longest, end - start)
+            position = bisect_left(self._intervals, (start, end, policy_id))
+            self._intervals.insert(position, (start, end, policy_id))
+        if intervals:
+            # Recompute once the last interval starts, or ends if it already started
+            last_start, last_end = intervals[-1]
+            horizon = last_start if last_start > after.timestamp() else last_end
+            heapq.heappush(self._horizons, (horizon, policy_id))
+
+    def _refresh(self, moment: float) -> None:
+        """Recompute policies whose precomputed intervals are used up."""
+        while self._horizons and self._horizons[0][0] <= moment:
+            horizon, policy_id = heapq.heappop(self._horizons)
+            intervals = self._by_policy.get(policy_id)
+            if not intervals or horizon not in intervals[-1]:
+                continue
+            self._compute(policy_id, datetime.fromtimestamp(moment, timezone.utc))
+
+    def _on_policy_change(self, policy: UpdateChannelPolicy) -> None:
+        """Keep the index in step with the policy manager."""
+        if self.policy_manager.get_policy(policy.id) is not policy:
+            self.remove_policy(policy.id)
+            return
+        try:
+            self.set_policy(policy)
+        except MaintenanceWindowError as e:
+            # Only reachable for policies loaded from state before windows were validated
+            logger.warning(f"Ignoring maintenance window of policy {policy.id}: {e}")
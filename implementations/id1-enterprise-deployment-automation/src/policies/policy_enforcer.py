@@ -1,18 +1,154 @@
 """Policy enforcement logic."""
 
 import logging
-from typing import Optional, Tuple
-from datetime import datetime
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+from datetime import datetime, timezone
 
 from ..models.policy import UpdateChannelPolicy, PolicyType
 from ..models.deployment import DeploymentManifest
+from ..utils.hashing import manifest_hash
+from .maintenance_windows import MaintenanceSchedule, MaintenanceWindowError, MaintenanceWindowIndex
+from .policy_manager import PolicyManager
 
 
 logger = logging.getLogger(__name__)
 
+# (allowed, reason)
+Decision = Tuple[bool, Optional[str]]
+
+ALLOWED: Decision = (True, None)
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    """A policy reduced to what deployment decisions read.
+
+    Frozen versions are split into platform and per-suite lookups once, so
+    a decision is a few dictionary lookups with no key building.
+    """
+
+    policy_id: str
+    revision: int
+    enabled: bool
+    policy_type: PolicyType
+    frozen_platform: Optional[str]
+    frozen_suites: Dict[str, str]
+    allow_security_patches: bool
+    maintenance_window: Optional[MaintenanceSchedule]
+    window_error: Optional[str] = None
+
+    @classmethod
+    def compile(cls, policy: UpdateChannelPolicy) -> "CompiledPolicy":
+        """Compile a policy.
+
+        Args:
+            policy: Update channel policy
+
+        Returns:
+            Compiled policy
+        """
+        schedule = None
+        window_error = None
+        if policy.auto_update_maintenance_window:
+            try:
+                schedule = MaintenanceSchedule.parse(policy.auto_update_maintenance_window)
+            except MaintenanceWindowError as e:
+                window_error = str(e)
+        
+        return cls(
+            policy_id=policy.id,
+            revision=policy.revision,
+            enabled=policy.enabled,
+            policy_type=policy.policy_type,
+            frozen_platform=policy.frozen_versions.get("platform"),
+            frozen_suites={
+                key[len("suite:"):]: version
+                for key, version in policy.frozen_versions.items()
+                if key.startswith("suite:") and version
+            },
+            allow_security_patches=policy.allow_security_patches,
+            maintenance_window=schedule,
+            window_error=window_error
+        )
+
+    def decide(self, manifest: DeploymentManifest, is_security_patch: bool = False) -> Decision:
+        """Decide whether a manifest may deploy, ignoring maintenance windows.
+
+        Args:
+            manifest: Deployment manifest
+            is_security_patch: Whether this is a security patch deployment
+
+        Returns:
+            Tuple of (allowed, reason)
+        """
+        if not self.enabled:
+            return False, "Policy is disabled"
+
+        if self.policy_type == PolicyType.AUTO_UPDATE:
+            return ALLOWED
+
+        if self.policy_type == PolicyType.MANUAL_APPROVAL:
+            # Manual approval requires explicit approval (checked elsewhere)
+            return False, "Manual approval required"
+
+        if self.policy_type == PolicyType.FROZEN:
+            # Security patches are allowed if configured
+            if is_security_patch and self.allow_security_patches:
+                return ALLOWED
+
+            if manifest.platform_version != self.frozen_platform:
+                return False, "Platform version does not match frozen version"
+
+            frozen_suites = self.frozen_suites
+            for suite_name, suite_version in manifest.suites.items():
+                frozen_version = frozen_suites.get(suite_name)
+                if frozen_version and suite_version != frozen_version:
+                    return False, f"Suite {suite_name} version does not match frozen version"
+
+            return ALLOWED
+
+        return False, "Unknown policy type"
+
 
 class PolicyEnforcer:
-    """Enforces update channel policies."""
+    """Enforces update channel policies.
+    
+    Policies are compiled into ``CompiledPolicy`` decision structures on
+    first use. With a policy manager, ``can_deploy_many`` decides a whole
+    fleet at once and caches decisions per (policy revision, manifest
+    hash); the manager's updates drop exactly the changed policy's
+    compiled form and decisions.
+    """
+    
+    def __init__(
+        self,
+        policy_manager: Optional[PolicyManager] = None,
+        max_manifests_per_policy: int = 8,
+        windows: Optional[MaintenanceWindowIndex] = None
+    ):
+        """Initialize the policy enforcer.
+        
+        Args:
+            policy_manager: Optional manager to look up instance policies
+                and receive policy changes from
+            max_manifests_per_policy: Decisions kept per policy, one per
+                manifest
+            windows: Optional index of precomputed maintenance intervals
+        """
+        self.policy_manager = policy_manager
+        self.windows = windows
+        self.max_manifests_per_policy = max_manifests_per_policy
+        
+        self._compiled: Dict[str, CompiledPolicy] = {}
+        # Policy ID -> (manifest hash, is security patch) -> decision
+        self._decisions: Dict[str, Dict[Tuple[str, bool], Decision]] = {}
+        
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        if policy_manager:
+            policy_manager.add_listener(self.invalidate)
     
     async def can_deploy(
         self,
@@ -32,110 +168,136 @@ class PolicyEnforcer:
         """
         logger.info(f"Checking deployment against policy {policy.id}")
         
-        if not policy.enabled:
-            return False, "Policy is disabled"
-        
-        if policy.policy_type == PolicyType.AUTO_UPDATE:
-            return await self._check_auto_update(policy, manifest)
-        
-        elif policy.policy_type == PolicyType.MANUAL_APPROVAL:
-            return await self._check_manual_approval(policy, manifest)
-        
-        elif policy.policy_type == PolicyType.FROZEN:
-            return await self._check_frozen(policy, manifest, is_security_patch)
-        
-        return False, "Unknown policy type"
+        compiled = self.compile(policy)
+        return await self._apply_window(compiled, compiled.decide(manifest, is_security_patch))
     
-    async def _check_auto_update(
+    async def can_deploy_many(
         self,
-        policy: UpdateChannelPolicy,
-        manifest: DeploymentManifest
-    ) -> Tuple[bool, Optional[str]]:
-        """Check auto-update policy.
+        manifest: DeploymentManifest,
+        instance_ids: Iterable[str],
+        is_security_patch: bool = False
+    ) -> Dict[str, Decision]:
+        """Check if a manifest may deploy to each of many instances.
+        
+        Instances without an enabled policy are allowed. Decisions are
+        cached per policy revision and manifest hash, so checking the same
+        manifest again (e.g. a plan followed by the rollout) only evaluates
+        policies that changed in between.
         
         Args:
-            policy: Auto-update policy
             manifest: Deployment manifest
+            instance_ids: Instance IDs
+            is_security_patch: Whether this is a security patch deployment
             
         Returns:
-            Tuple of (allowed, reason)
+            Instance ID -> (allowed, reason)
+            
+        Raises:
+            RuntimeError: If the enforcer has no policy manager
         """
-        logger.info(f"Checking auto-update policy {policy.id}")
+        if self.policy_manager is None:
+            raise RuntimeError("can_deploy_many requires a policy manager")
         
-        # Check maintenance window if configured
-        if policy.auto_update_maintenance_window:
-            is_in_window = await self._is_in_maintenance_window(
-                policy.auto_update_maintenance_window
-            )
-            if not is_in_window:
-                return False, "Not in maintenance window"
+        instance_ids = list(instance_ids)
+        policies = self.policy_manager.get_instance_policies(instance_ids)
+        key = (manifest_hash(manifest), is_security_patch)
         
-        return True, None
+        decisions: Dict[str, Decision] = {}
+        for instance_id in instance_ids:
+            policy = policies.get(instance_id)
+            if policy is None:
+                decisions[instance_id] = ALLOWED
+                continue
+            
+            compiled = self.compile(policy)
+            cached = self._decisions.setdefault(policy.id, {})
+            decision = cached.get(key)
+            if decision is None:
+                self.cache_misses += 1
+                decision = compiled.decide(manifest, is_security_patch)
+                if len(cached) >= self.max_manifests_per_policy:
+                    cached.pop(next(iter(cached)))
+                cached[key] = decision
+            else:
+                self.cache_hits += 1
+            decisions[instance_id] = await self._apply_window(compiled, decision)
+        
+        denied = sum(1 for allowed, _ in decisions.values() if not allowed)
+        logger.info(f"Checked {len(decisions)} instances against their policies ({denied} denied)")
+        return decisions
     
-    async def _check_manual_approval(
-        self,
-        policy: UpdateChannelPolicy,
-        manifest: DeploymentManifest
-    ) -> Tuple[bool, Optional[str]]:
-        """Check manual approval policy.
+    def compile(self, policy: UpdateChannelPolicy) -> CompiledPolicy:
+        """Get the compiled form of a policy, compiling it if it changed.
         
         Args:
-            policy: Manual approval policy
-            manifest: Deployment manifest
+            policy: Update channel policy
             
         Returns:
-            Tuple of (allowed, reason)
+            Compiled policy
         """
-        logger.info(f"Checking manual approval policy {policy.id}")
+        compiled = self._compiled.get(policy.id)
+        if compiled is None or compiled.revision != policy.revision:
+            compiled = CompiledPolicy.compile(policy)
+            self._compiled[policy.id] = compiled
+            self._decisions.pop(policy.id, None)
+        return compiled
+    
+    def invalidate(self, policy: UpdateChannelPolicy) -> None:
+        """Drop a policy's compiled form and cached decisions.
         
-        # Manual approval requires explicit approval (checked elsewhere)
-        return False, "Manual approval required"
+        Args:
+            policy: Changed or deleted policy
+        """
+        self._compiled.pop(policy.id, None)
+        self._decisions.pop(policy.id, None)
     
-    async def _check_frozen(
-        self,
-        policy: UpdateChannelPolicy,
-        manifest: DeploymentManifest,
-        is_security_patch: bool = False
-    ) -> Tuple[bool, Optional[str]]:
-        """Check frozen policy.
+    def cache_stats(self) -> Dict[str, object]:
+        """Get decision cache counters.
+        
+        Returns:
+            Hits, misses, hit rate and compiled policies
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_rate": round(self.cache_hits / lookups, 4) if lookups else 0.0,
+            "compiled": len(self._compiled),
+        }
+    
+    async def _apply_window(self, compiled: CompiledPolicy, decision: Decision) -> Decision:
+        """Deny an allowed auto-update decision outside its maintenance window.
+        
+        Windows depend on the time of the check, so they are evaluated on
+        every call and never cached.
         
         Args:
-            policy: Frozen policy
-            manifest: Deployment manifest
-            is_security_patch: Whether this is a security patch
+            compiled: Compiled policy
+            decision: Decision ignoring maintenance windows
             
         Returns:
             Tuple of (allowed, reason)
         """
-        logger.info(f"Checking frozen policy {policy.id}")
-        
-        # Security patches are allowed if configured
-        if is_security_patch and policy.allow_security_patches:
-            return True, None
-        
-        # Check if versions match frozen versions
-        if manifest.platform_version != policy.frozen_versions.get("platform"):
-            return False, "Platform version does not match frozen version"
-        
-        for suite_name, suite_version in manifest.suites.items():
-            frozen_version = policy.frozen_versions.get(f"suite:{suite_name}")
-            if frozen_version and suite_version != frozen_version:
-                return False, f"Suite {suite_name} version does not match frozen version"
-        
-        return True, None
+        if not decision[0] or compiled.policy_type != PolicyType.AUTO_UPDATE:
+            return decision
+        if compiled.window_error:
+            return False, f"Invalid maintenance window: {compiled.window_error}"
+        if compiled.maintenance_window and not await self._is_in_maintenance_window(compiled):
+            return False, "Not in maintenance window"
+        return decision
     
-    async def _is_in_maintenance_window(self, window_config: dict) -> bool:
-        """Check if current time is in maintenance window.
+    async def _is_in_maintenance_window(self, compiled: CompiledPolicy) -> bool:
+        """Check if current time is in the policy's maintenance window.
         
         Args:
-            window_config: Maintenance window configuration
+            compiled: Compiled policy with a maintenance window
             
         Returns:
             True if in window, False otherwise
         """
-        # Implementation would check against configured maintenance windows
-        # For now, return True to allow deployment
-        return True
+        if self.windows is not None and compiled.policy_id in self.windows:
+            return self.windows.is_open(compiled.policy_id)
+        return compiled.maintenance_window.contains(datetime.now(timezone.utc))
     
     async def enforce_security_patch(
         self,
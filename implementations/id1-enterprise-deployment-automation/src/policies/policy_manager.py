@@ -1,21 +1,67 @@
 """Policy management for update channels."""
 
+import asyncio
 import logging
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List, Sequence
 from datetime import datetime
 
 from ..models.policy import UpdateChannelPolicy, PolicyType
+from ..persistence.write_behind import StateWriter
+from ..utils.id_generator import new_id
+from .cron import CronSchedule
+from .maintenance_windows import MaintenanceSchedule
 
 
 logger = logging.getLogger(__name__)
 
+# Among an instance's policies of equal priority, the most restrictive type wins
+POLICY_TYPE_PRECEDENCE = {
+    PolicyType.FROZEN: 2,
+    PolicyType.MANUAL_APPROVAL: 1,
+    PolicyType.AUTO_UPDATE: 0,
+}
+
+
+def policy_precedence(policy: UpdateChannelPolicy) -> tuple:
+    """Get the sort key ranking an instance's policies; the highest applies.
+    
+    Policies are ranked by explicit priority, then by type (frozen over
+    manual approval over auto-update), then by creation time and ID so the
+    order is always deterministic.
+    
+    Args:
+        policy: Policy
+        
+    Returns:
+        Comparable precedence key
+    """
+    return (policy.priority, POLICY_TYPE_PRECEDENCE[policy.policy_type], policy.created_at, policy.id)
+
 
 class PolicyManager:
     """Manages update channel policies for instances."""
     
-    def __init__(self):
-        """Initialize the policy manager."""
+    def __init__(self, state: Optional[StateWriter] = None):
+        """Initialize the policy manager.
+        
+        Args:
+            state: Optional write-behind writer for durable state
+        """
+        self.state = state
         self.policies: Dict[str, UpdateChannelPolicy] = {}
+        # Instance ID -> its policies, highest precedence first
+        self._by_instance: Dict[str, List[UpdateChannelPolicy]] = {}
+        # Instance ID -> the enabled policy that applies to it
+        self._effective: Dict[str, UpdateChannelPolicy] = {}
+        self._listeners: List[Callable[[UpdateChannelPolicy], None]] = []
+    
+    def add_listener(self, listener: Callable[[UpdateChannelPolicy], None]) -> None:
+        """Register a callback run after a policy is created, loaded, updated or deleted.
+        
+        Args:
+            listener: Called with the changed policy
+        """
+        self._listeners.append(listener)
     
     async def create_policy(
         self,
@@ -34,10 +80,14 @@ class PolicyManager:
             
         Returns:
             Created policy
+            
+        Raises:
+            MaintenanceWindowError: If the maintenance window is invalid
+            CronError: If the auto-update schedule is invalid
         """
         logger.info(f"Creating {policy_type} policy for instance {instance_id}")
         
-        policy_id = f"policy-{datetime.utcnow().timestamp()}"
+        policy_id = new_id("policy")
         
         policy = UpdateChannelPolicy(
             id=policy_id,
@@ -46,8 +96,16 @@ class PolicyManager:
             description=description,
             **kwargs
         )
+        if policy.auto_update_maintenance_window:
+            MaintenanceSchedule.parse(policy.auto_update_maintenance_window)
+        if policy.auto_update_schedule:
+            CronSchedule.parse(policy.auto_update_schedule)
         
         self.policies[policy_id] = policy
+        self._index(policy)
+        self._notify(policy)
+        if self.state:
+            self.state.put("policy", policy)
         logger.info(f"Policy {policy_id} created successfully")
         
         return policy
@@ -65,6 +123,10 @@ class PolicyManager:
             
         Returns:
             Updated policy or None if not found
+            
+        Raises:
+            MaintenanceWindowError: If the new maintenance window is invalid
+            CronError: If the new auto-update schedule is invalid
         """
         logger.info(f"Updating policy {policy_id}")
         
@@ -73,13 +135,25 @@ class PolicyManager:
             logger.warning(f"Policy {policy_id} not found")
             return None
         
+        if updates.get("auto_update_maintenance_window"):
+            MaintenanceSchedule.parse(updates["auto_update_maintenance_window"])
+        if updates.get("auto_update_schedule"):
+            CronSchedule.parse(updates["auto_update_schedule"])
+        
+        self._unindex(policy)
+        
         # Update fields
         for key, value in updates.items():
             if hasattr(policy, key):
                 setattr(policy, key, value)
         
         policy.updated_at = datetime.utcnow()
+        policy.revision += 1
         self.policies[policy_id] = policy
+        self._index(policy)
+        self._notify(policy)
+        if self.state:
+            self.state.put("policy", policy)
         
         logger.info(f"Policy {policy_id} updated successfully")
         return policy
@@ -96,13 +170,35 @@ class PolicyManager:
         logger.info(f"Deleting policy {policy_id}")
         
         if policy_id in self.policies:
-            del self.policies[policy_id]
+            policy = self.policies.pop(policy_id)
+            self._unindex(policy)
+            self._notify(policy)
+            if self.state:
+                self.state.delete("policy", policy_id)
             logger.info(f"Policy {policy_id} deleted successfully")
             return True
         
         logger.warning(f"Policy {policy_id} not found")
         return False
     
+    async def load_state(self) -> int:
+        """Load all policies from durable storage.
+        
+        Returns:
+            Number of policies loaded
+        """
+        if not self.state:
+            return 0
+        
+        policies = await asyncio.to_thread(self.state.load, "policy", UpdateChannelPolicy)
+        for policy in policies:
+            self.policies[policy.id] = policy
+            self._index(policy)
+            self._notify(policy)
+        
+        logger.info(f"Loaded {len(policies)} policies from state store")
+        return len(policies)
+    
     def get_policy(self, policy_id: str) -> Optional[UpdateChannelPolicy]:
         """Get policy by ID.
         
@@ -115,7 +211,10 @@ class PolicyManager:
         return self.policies.get(policy_id)
     
     def get_instance_policy(self, instance_id: str) -> Optional[UpdateChannelPolicy]:
-        """Get policy for an instance.
+        """Get the policy that applies to an instance.
+        
+        When an instance has several enabled policies, the one with the
+        highest precedence applies (see ``policy_precedence``).
         
         Args:
             instance_id: Instance ID
@@ -123,20 +222,74 @@ class PolicyManager:
         Returns:
             Policy or None if not found
         """
-        for policy in self.policies.values():
-            if policy.instance_id == instance_id and policy.enabled:
-                return policy
-        return None
+        return self._effective.get(instance_id)
+    
+    def get_instance_policies(self, instance_ids: Sequence[str]) -> Dict[str, UpdateChannelPolicy]:
+        """Get the applicable policies for many instances.
+        
+        Args:
+            instance_ids: Instance IDs
+            
+        Returns:
+            Mapping of instance ID to policy for instances that have one
+        """
+        effective = self._effective
+        return {instance_id: effective[instance_id] for instance_id in instance_ids if instance_id in effective}
     
     def list_policies(self, instance_id: Optional[str] = None) -> List[UpdateChannelPolicy]:
         """List policies.
         
         Args:
-            instance_id: Optional instance ID to filter by
+            instance_id: Optional instance ID to filter by; its policies are
+                returned highest precedence first
             
         Returns:
             List of policies
         """
         if instance_id:
-            return [p for p in self.policies.values() if p.instance_id == instance_id]
+            return list(self._by_instance.get(instance_id, ()))
         return list(self.policies.values())
+    
+    def _index(self, policy: UpdateChannelPolicy) -> None:
+        """Add a policy to its instance's index entry.
+        
+        Args:
+            policy: Policy to index
+        """
+        policies = self._by_instance.setdefault(policy.instance_id, [])
+        policies.append(policy)
+        policies.sort(key=policy_precedence, reverse=True)
+        self._refresh_effective(policy.instance_id)
+    
+    def _unindex(self, policy: UpdateChannelPolicy) -> None:
+        """Remove a policy from its instance's index entry.
+        
+        Args:
+            policy: Policy to remove
+        """
+        policies = self._by_instance.get(policy.instance_id, [])
+        policies[:] = [p for p in policies if p.id != policy.id]
+        if not policies:
+            self._by_instance.pop(policy.instance_id, None)
+        self._refresh_effective(policy.instance_id)
+    
+    def _refresh_effective(self, instance_id: str) -> None:
+        """Recompute which policy applies to an instance.
+        
+        Args:
+            instance_id: Instance ID
+        """
+        policy = next((p for p in self._by_instance.get(instance_id, ()) if p.enabled), None)
+        if policy is None:
+            self._effective.pop(instance_id, None)
+        else:
+            self._effective[instance_id] = policy
+    
+    def _notify(self, policy: UpdateChannelPolicy) -> None:
+        """Tell listeners a policy changed.
+        
+        Args:
+            policy: Changed policy
+        """
+        for listener in self._listeners:
+            listener(policy)
@@ -1,11 +1,16 @@
 """Rollback management for deployments."""
 
+import asyncio
 import logging
 from typing import Optional, Dict, List
 from datetime import datetime
 
 from ..models.rollback import RollbackRecord, RollbackStatus, ManifestVersion, RollbackHistory
 from ..models.deployment import DeploymentManifest
+from ..models.event import EventType
+from ..events.bus import EventBus
+from ..persistence.write_behind import StateWriter
+from ..utils.id_generator import new_id
 
 
 logger = logging.getLogger(__name__)
@@ -14,8 +19,15 @@ logger = logging.getLogger(__name__)
 class RollbackManager:
     """Manages rollback operations."""
     
-    def __init__(self):
-        """Initialize the rollback manager."""
+    def __init__(self, state: Optional[StateWriter] = None, events: Optional[EventBus] = None):
+        """Initialize the rollback manager.
+        
+        Args:
+            state: Optional write-behind writer for durable state
+            events: Optional event bus notified of status transitions
+        """
+        self.state = state
+        self.events = events
         self.rollbacks: Dict[str, RollbackRecord] = {}
         self.manifest_history: Dict[str, List[ManifestVersion]] = {}
     
@@ -41,7 +53,7 @@ class RollbackManager:
         """
         logger.info(f"Initiating rollback for instance {instance_id} from {from_manifest_id} to {to_manifest_id}")
         
-        rollback_id = f"rollback-{datetime.utcnow().timestamp()}"
+        rollback_id = new_id("rollback")
         
         rollback = RollbackRecord(
             id=rollback_id,
@@ -54,6 +66,9 @@ class RollbackManager:
         )
         
         self.rollbacks[rollback_id] = rollback
+        if self.state:
+            self.state.put("rollback", rollback)
+        self._publish(rollback)
         logger.info(f"Rollback {rollback_id} initiated successfully")
         
         return rollback
@@ -71,6 +86,7 @@ class RollbackManager:
         
         rollback.status = RollbackStatus.IN_PROGRESS
         rollback.started_at = datetime.utcnow()
+        self._publish(rollback)
         
         try:
             # Step 1: Validate rollback feasibility
@@ -104,8 +120,28 @@ class RollbackManager:
             logger.error(f"Rollback {rollback.id} failed: {str(e)}")
         
         self.rollbacks[rollback.id] = rollback
+        if self.state:
+            self.state.put("rollback", rollback)
+        self._publish(rollback)
         return rollback
     
+    def _publish(self, rollback: RollbackRecord) -> None:
+        """Announce a rollback's current status on the event bus.
+        
+        Args:
+            rollback: Rollback record
+        """
+        if self.events:
+            self.events.publish(
+                EventType.ROLLBACK_STATUS,
+                subject_id=rollback.id,
+                instance_id=rollback.instance_id,
+                status=rollback.status.value,
+                from_manifest_id=rollback.from_manifest_id,
+                to_manifest_id=rollback.to_manifest_id,
+                error_message=rollback.error_message
+            )
+    
     async def record_manifest_version(
         self,
         instance_id: str,
@@ -115,6 +151,26 @@ class RollbackManager:
     ) -> ManifestVersion:
         """Record a manifest version in history.
         
+        Args:
+            instance_id: Instance ID
+            manifest: Deployment manifest
+            deployment_id: Associated deployment ID
+            status: Deployment status
+            
+        Returns:
+            Manifest version record
+        """
+        return self.add_manifest_version(instance_id, manifest, deployment_id, status)
+    
+    def add_manifest_version(
+        self,
+        instance_id: str,
+        manifest: DeploymentManifest,
+        deployment_id: str,
+        status: str
+    ) -> ManifestVersion:
+        """Record a manifest version in history without awaiting.
+        
         Args:
             instance_id: Instance ID
             manifest: Deployment manifest
@@ -138,14 +194,58 @@ class RollbackManager:
             self.manifest_history[instance_id] = []
         
         self.manifest_history[instance_id].insert(0, manifest_version)
+        if self.state:
+            self.state.put("manifest_history", manifest_version, key=f"{instance_id}/{deployment_id}")
         
         # Keep only last 100 versions
         if len(self.manifest_history[instance_id]) > 100:
+            if self.state:
+                for dropped in self.manifest_history[instance_id][100:]:
+                    self.state.delete("manifest_history", f"{instance_id}/{dropped.deployment_id}")
             self.manifest_history[instance_id] = self.manifest_history[instance_id][:100]
         
         logger.info(f"Manifest version {manifest.id} recorded successfully")
         return manifest_version
     
+    def current_version(self, instance_id: str) -> Optional[ManifestVersion]:
+        """Get the most recent successfully deployed manifest version.
+        
+        Args:
+            instance_id: Instance ID
+            
+        Returns:
+            Manifest version or None if nothing was deployed
+        """
+        for manifest_version in self.manifest_history.get(instance_id, ()):
+            if manifest_version.status == "deployed":
+                return manifest_version
+        return None
+    
+    async def load_state(self, rollback_limit: Optional[int] = 10000) -> int:
+        """Load recent rollbacks and manifest history from durable storage.
+        
+        Args:
+            rollback_limit: Maximum number of most recent rollbacks to load
+            
+        Returns:
+            Number of records loaded
+        """
+        if not self.state:
+            return 0
+        
+        rollbacks = await asyncio.to_thread(self.state.load, "rollback", RollbackRecord, rollback_limit)
+        for rollback in rollbacks:
+            self.rollbacks[rollback.id] = rollback
+        
+        history = await asyncio.to_thread(self.state.load_keyed, "manifest_history", ManifestVersion)
+        for key, manifest_version in history:
+            instance_id = key.rsplit("/", 1)[0]
+            # Newest first, matching record_manifest_version
+            self.manifest_history.setdefault(instance_id, []).insert(0, manifest_version)
+        
+        logger.info(f"Loaded {len(rollbacks)} rollbacks and {len(history)} manifest versions from state store")
+        return len(rollbacks) + len(history)
+    
     async def get_rollback_history(self, instance_id: str) -> RollbackHistory:
         """Get rollback history for an instance.
         
@@ -6,6 +6,7 @@ from datetime import datetime
 
 from ..models.security import SecurityPatch, SeverityLevel
 from ..models.policy import UpdateChannelPolicy, PolicyType
+from .patch_manager import patch_affects
 
 
 logger = logging.getLogger(__name__)
@@ -63,7 +64,7 @@ class PatchEnforcer:
         logger.info(f"Validating prerequisites for patch {patch.id}")
         
         # Check if current version is affected
-        if current_version not in patch.affected_versions:
+        if not patch_affects(patch, current_version):
             return False, f"Current version {current_version} is not affected by this patch"
         
         # Check dependencies
@@ -1,20 +1,50 @@
 """Security patch management."""
 
+import asyncio
 import logging
 from typing import Optional, Dict, List
 from datetime import datetime
 
 from ..models.security import SecurityPatch, PatchApplication, PatchStatus, SeverityLevel
+from ..persistence.write_behind import StateWriter
+from ..utils.id_generator import new_id
+from ..versioning.semver import SemVer
 
 
 logger = logging.getLogger(__name__)
 
 
+def patch_affects(patch: SecurityPatch, version: str) -> bool:
+    """Check whether a patch applies to a component version.
+    
+    Versions are compared by semantic version precedence, so "1.9.0" matches
+    "1.9.0+build.7"; strings that are not versions must match exactly.
+    
+    Args:
+        patch: Security patch
+        version: Component version
+        
+    Returns:
+        True if the version is one the patch affects
+    """
+    if version in patch.affected_versions:
+        return True
+    wanted = SemVer.try_parse(version)
+    if wanted is None:
+        return False
+    return any(SemVer.try_parse(affected) == wanted for affected in patch.affected_versions)
+
+
 class PatchManager:
     """Manages security patches."""
     
-    def __init__(self):
-        """Initialize the patch manager."""
+    def __init__(self, state: Optional[StateWriter] = None):
+        """Initialize the patch manager.
+        
+        Args:
+            state: Optional write-behind writer for durable state
+        """
+        self.state = state
         self.patches: Dict[str, SecurityPatch] = {}
         self.applications: Dict[str, PatchApplication] = {}
         self.patch_index: Dict[str, List[SecurityPatch]] = {}
@@ -27,6 +57,46 @@ class PatchManager:
         """
         logger.info(f"Registering patch {patch.id}: {patch.component_name} {patch.patched_version}")
         
+        self._index_patch(patch)
+        if self.state:
+            self.state.put("security_patch", patch)
+        
+        logger.info(f"Patch {patch.id} registered successfully")
+    
+    async def load_state(self, application_limit: Optional[int] = 10000) -> int:
+        """Load patches and recent patch applications from durable storage.
+        
+        Args:
+            application_limit: Maximum number of most recent applications to load
+            
+        Returns:
+            Number of records loaded
+        """
+        if not self.state:
+            return 0
+        
+        patches = await asyncio.to_thread(self.state.load, "security_patch", SecurityPatch)
+        for patch in patches:
+            self._index_patch(patch)
+        
+        applications = await asyncio.to_thread(
+            self.state.load,
+            "patch_application",
+            PatchApplication,
+            application_limit
+        )
+        for application in applications:
+            self.applications[application.id] = application
+        
+        logger.info(f"Loaded {len(patches)} patches and {len(applications)} applications from state store")
+        return len(patches) + len(applications)
+    
+    def _index_patch(self, patch: SecurityPatch) -> None:
+        """Add a patch to the lookup indexes.
+        
+        Args:
+            patch: Security patch
+        """
         self.patches[patch.id] = patch
         
         # Index by component
@@ -35,8 +105,6 @@ class PatchManager:
             self.patch_index[component_key] = []
         
         self.patch_index[component_key].append(patch)
-        
-        logger.info(f"Patch {patch.id} registered successfully")
     
     async def get_available_patches(
         self,
@@ -58,7 +126,7 @@ class PatchManager:
         patches = self.patch_index.get(component_key, [])
         
         if current_version:
-            patches = [p for p in patches if current_version in p.affected_versions]
+            patches = [p for p in patches if patch_affects(p, current_version)]
         
         return patches
     
@@ -91,7 +159,7 @@ class PatchManager:
             logger.error(f"Patch {patch_id} not found")
             raise ValueError(f"Patch {patch_id} not found")
         
-        app_id = f"app-{datetime.utcnow().timestamp()}"
+        app_id = new_id("app")
         
         application = PatchApplication(
             id=app_id,
@@ -103,6 +171,8 @@ class PatchManager:
         )
         
         self.applications[app_id] = application
+        if self.state:
+            self.state.put("patch_application", application)
         
         logger.info(f"Patch {patch_id} applied to instance {instance_id}")
         return application
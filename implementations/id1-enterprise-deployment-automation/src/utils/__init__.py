@@ -0,0 +1,16 @@
+"""Shared utilities for Enterprise Deployment Automation."""
+
+from .id_generator import IdGenerator, new_id, id_timestamp, id_lower_bound
+from .hashing import content_hash, manifest_hash, payload_hash
+from .single_flight import SingleFlight
+
+__all__ = [
+    "IdGenerator",
+    "new_id",
+    "id_timestamp",
+    "id_lower_bound",
+    "content_hash",
+    "manifest_hash",
+    "payload_hash",
+    "SingleFlight",
+]
@@ -0,0 +1,409 @@
+"""Compact binary encoding for records.
+
+The format is msgpack-style: one tag byte per value, with small integers,
+strings, arrays and maps packed into the tag itself. It differs in three
+ways that matter for our records:
+
+* Models are schema-aware. A model's field names are written once per
+  payload as a schema definition; each instance is then just its field
+  values in schema order.
+* Strings of up to 64 characters (map keys, field names, enum values,
+  IDs, versions) are interned. The first occurrence defines a string and
+  later occurrences reference it by index, so the values and keys that
+  repeat across a list of records cost two bytes each.
+* Datetimes are native values (microseconds since the epoch) rather than
+  ISO strings.
+
+Every payload starts with ``MAGIC`` and the format version. Decoding
+checks the version, and models are rebuilt by field name through pydantic
+validation, so records written by an older schema still load after
+fields are added.
+
+The encoder is pure Python: payloads are much smaller than JSON, but
+encoding and decoding cost more CPU than pydantic-core's JSON, so the
+state writer and the deployment spill segments store JSON.
+``benchmarks/serialization.py`` measures both.
+"""
+
+import struct
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+FORMAT_VERSION = 1
+
+# Leads every payload, so anything else is rejected before decoding
+MAGIC = b"\xc1WD"
+
+_NIL = 0xc0
+_FALSE = 0xc2
+_TRUE = 0xc3
+_BIN = 0xc4
+_FLOAT = 0xcb
+_INT = 0xd0
+_KEY_DEF = 0xd4
+_KEY_REF = 0xd5
+_DATETIME = 0xd6
+_DATETIME_TZ = 0xd7
+_MODEL = 0xd8
+_STR = 0xd9
+_ARRAY = 0xdc
+_MAP = 0xde
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_TZ = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_INTERN_MAX = 64
+_DOUBLE = struct.Struct(">d")
+
+
+class CodecError(ValueError):
+    """Raised when a value cannot be encoded or a payload cannot be decoded."""
+
+
+def encode(value: Any) -> bytes:
+    """Encode a model, a list of models or plain data.
+
+    Args:
+        value: Pydantic models, dicts, lists, tuples, strings, numbers,
+            booleans, None, bytes, enums and datetimes, nested freely
+
+    Returns:
+        Binary payload
+
+    Raises:
+        CodecError: If a value has an unsupported type
+    """
+    encoder = _Encoder()
+    encoder.out += MAGIC
+    encoder.out.append(FORMAT_VERSION)
+    encoder.write(value)
+    return bytes(encoder.out)
+
+
+def decode(payload: bytes, model: Optional[Type[ModelT]] = None) -> Any:
+    """Decode a payload produced by ``encode``.
+
+    Args:
+        payload: Binary payload
+        model: Optional model class; an encoded model, or each model of an
+            encoded list, is validated into it
+
+    Returns:
+        Decoded value; encoded models decode to dicts when ``model`` is omitted
+
+    Raises:
+        CodecError: If the payload is not in a supported format
+    """
+    if payload[:len(MAGIC)] != MAGIC:
+        raise CodecError("Not a binary-encoded payload")
+    version = payload[len(MAGIC)] if len(payload) > len(MAGIC) else None
+    if version != FORMAT_VERSION:
+        raise CodecError(f"Unsupported binary format version: {version}")
+
+    decoder = _Decoder(payload, len(MAGIC) + 1)
+    try:
+        value = decoder.read()
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise CodecError(f"Truncated or corrupt payload: {str(e)}") from e
+    if decoder.pos != len(payload):
+        raise CodecError("Trailing data after payload")
+
+    if model is None:
+        return value
+    if isinstance(value, list):
+        return [model.model_validate(item) for item in value]
+    return model.model_validate(value)
+
+
+class _Encoder:
+    """Single-payload encoder holding the intern and schema tables."""
+
+    __slots__ = ("out", "keys", "schemas")
+
+    def __init__(self):
+        self.out = bytearray()
+        self.keys: Dict[str, int] = {}
+        self.schemas: Dict[type, tuple] = {}
+
+    def write(self, value: Any) -> None:
+        writer = _WRITERS.get(type(value))
+        if writer is None:
+            writer = _WRITERS[type(value)] = _writer_for(type(value))
+        writer(self, value)
+
+    def write_uint(self, value: int) -> None:
+        out = self.out
+        while value > 0x7f:
+            out.append((value & 0x7f) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def write_int(self, value: int) -> None:
+        if 0 <= value <= 0x7f:
+            self.out.append(value)
+        elif -32 <= value < 0:
+            self.out.append(value & 0xff)
+        else:
+            self.out.append(_INT)
+            # Zigzag so small negative numbers stay short
+            self.write_uint(value * 2 if value >= 0 else -value * 2 - 1)
+
+    def write_str(self, value: str) -> None:
+        # Short strings (keys, statuses, versions, IDs) repeat across records and are interned
+        if len(value) <= _INTERN_MAX:
+            index = self.keys.get(value)
+            if index is not None:
+                if index < 0x80:
+                    self.out += bytes((_KEY_REF, index))
+                else:
+                    self.out.append(_KEY_REF)
+                    self.write_uint(index)
+                return
+            self.keys[value] = len(self.keys)
+            data = value.encode("utf-8")
+            self.out.append(_KEY_DEF)
+            self.write_uint(len(data))
+            self.out += data
+            return
+
+        data = value.encode("utf-8")
+        self.out.append(_STR)
+        self.write_uint(len(data))
+        self.out += data
+
+    def write_map(self, value: Dict[Any, Any]) -> None:
+        size = len(value)
+        if size < 16:
+            self.out.append(0x80 | size)
+        else:
+            self.out.append(_MAP)
+            self.write_uint(size)
+        write = self.write
+        for key, item in value.items():
+            write(key)
+            write(item)
+
+    def write_array(self, value: Any) -> None:
+        size = len(value)
+        if size < 16:
+            self.out.append(0x90 | size)
+        else:
+            self.out.append(_ARRAY)
+            self.write_uint(size)
+        write = self.write
+        for item in value:
+            write(item)
+
+    def write_datetime(self, value: datetime) -> None:
+        if value.tzinfo is None:
+            self.out.append(_DATETIME)
+            micros = (value - _EPOCH) // _MICROSECOND
+        else:
+            self.out.append(_DATETIME_TZ)
+            micros = (value - _EPOCH_TZ) // _MICROSECOND
+        self.write_uint(micros * 2 if micros >= 0 else -micros * 2 - 1)
+        if value.tzinfo is not None:
+            offset = int(value.utcoffset().total_seconds())
+            self.write_uint(offset * 2 if offset >= 0 else -offset * 2 - 1)
+
+    def write_model(self, value: BaseModel) -> None:
+        schema = self.schemas.get(type(value))
+        self.out.append(_MODEL)
+        if schema is None:
+            fields = tuple(type(value).model_fields)
+            schema = self.schemas[type(value)] = (len(self.schemas), fields)
+            self.write_uint(schema[0])
+            self.write_uint(len(fields))
+            for name in fields:
+                self.write_str(name)
+        else:
+            self.write_uint(schema[0])
+
+        attributes = value.__dict__
+        write = self.write
+        for name in schema[1]:
+            write(attributes.get(name))
+
+
+def _write_none(encoder: _Encoder, value: None) -> None:
+    encoder.out.append(_NIL)
+
+
+def _write_bool(encoder: _Encoder, value: bool) -> None:
+    encoder.out.append(_TRUE if value else _FALSE)
+
+
+def _write_float(encoder: _Encoder, value: float) -> None:
+    encoder.out.append(_FLOAT)
+    encoder.out += _DOUBLE.pack(value)
+
+
+def _write_bytes(encoder: _Encoder, value: bytes) -> None:
+    data = bytes(value)
+    encoder.out.append(_BIN)
+    encoder.write_uint(len(data))
+    encoder.out += data
+
+
+def _write_enum(encoder: _Encoder, value: Enum) -> None:
+    encoder.write(value.value)
+
+
+def _write_collection(encoder: _Encoder, value: Any) -> None:
+    encoder.write_array(list(value))
+
+
+def _writer_for(kind: type) -> Callable[[_Encoder, Any], None]:
+    """Pick the writer for a type not seen before; the choice is cached per type."""
+    if issubclass(kind, BaseModel):
+        return _Encoder.write_model
+    if issubclass(kind, Enum):
+        return _write_enum
+    for base, writer in _BASE_WRITERS:
+        if issubclass(kind, base):
+            return writer
+    raise CodecError(f"Cannot encode value of type {kind.__name__}")
+
+
+# Checked in order, so bool comes before int and datetime before anything broader
+_BASE_WRITERS = (
+    (bool, _write_bool),
+    (int, lambda encoder, value: encoder.write_int(int(value))),
+    (float, lambda encoder, value: _write_float(encoder, float(value))),
+    (str, lambda encoder, value: encoder.write_str(str(value))),
+    (datetime, _Encoder.write_datetime),
+    ((bytes, bytearray, memoryview), _write_bytes),
+    (dict, _Encoder.write_map),
+    ((list, tuple), _Encoder.write_array),
+    ((set, frozenset), _write_collection),
+)
+
+_WRITERS: Dict[type, Callable[[_Encoder, Any], None]] = {
+    str: _Encoder.write_str,
+    int: _Encoder.write_int,
+    type(None): _write_none,
+    bool: _write_bool,
+    float: _write_float,
+    dict: _Encoder.write_map,
+    list: _Encoder.write_array,
+    tuple: _Encoder.write_array,
+    datetime: _Encoder.write_datetime,
+    bytes: _write_bytes,
+}
+
+
+class _Decoder:
+    """Single-payload decoder holding the intern and schema tables."""
+
+    __slots__ = ("data", "pos", "keys", "schemas")
+
+    def __init__(self, data: bytes, pos: int):
+        self.data = data
+        self.pos = pos
+        self.keys: List[str] = []
+        self.schemas: List[tuple] = []
+
+    def read(self) -> Any:
+        data = self.data
+        pos = self.pos
+        tag = data[pos]
+
+        # Interned references dominate record payloads, so they take the fast path
+        if tag == _KEY_REF:
+            index = data[pos + 1]
+            if index < 0x80:
+                self.pos = pos + 2
+                return self.keys[index]
+            self.pos = pos + 1
+            return self.keys[self.read_uint()]
+
+        self.pos = pos + 1
+        if tag <= 0x7f:
+            return tag
+        if tag >= 0xe0:
+            return tag - 0x100
+        if tag >= 0xa0 and tag <= 0xbf:
+            return self.read_bytes(tag & 0x1f).decode("utf-8")
+        if tag == _KEY_DEF:
+            key = self.read_bytes(self.read_uint()).decode("utf-8")
+            self.keys.append(key)
+            return key
+        if tag <= 0x8f:
+            return self.read_map(tag & 0x0f)
+        if tag <= 0x9f:
+            return [self.read() for _ in range(tag & 0x0f)]
+        if tag == _NIL:
+            return None
+        if tag == _TRUE:
+            return True
+        if tag == _FALSE:
+            return False
+        if tag == _MODEL:
+            return self.read_model()
+        if tag == _INT:
+            return self.read_zigzag()
+        if tag == _STR:
+            return self.read_bytes(self.read_uint()).decode("utf-8")
+        if tag == _MAP:
+            return self.read_map(self.read_uint())
+        if tag == _ARRAY:
+            return [self.read() for _ in range(self.read_uint())]
+        if tag == _DATETIME:
+            return _EPOCH + timedelta(microseconds=self.read_zigzag())
+        if tag == _DATETIME_TZ:
+            moment = _EPOCH_TZ + timedelta(microseconds=self.read_zigzag())
+            return moment.astimezone(timezone(timedelta(seconds=self.read_zigzag())))
+        if tag == _FLOAT:
+            value = _DOUBLE.unpack_from(self.data, self.pos)[0]
+            self.pos += 8
+            return value
+        if tag == _BIN:
+            return self.read_bytes(self.read_uint())
+        raise CodecError(f"Unknown tag 0x{tag:02x} at offset {self.pos - 1}")
+
+    def read_uint(self) -> int:
+        data = self.data
+        result = 0
+        shift = 0
+        while True:
+            byte = data[self.pos]
+            self.pos += 1
+            result |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+    def read_zigzag(self) -> int:
+        value = self.read_uint()
+        return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+    def read_bytes(self, size: int) -> bytes:
+        end = self.pos + size
+        if end > len(self.data):
+            raise CodecError("Truncated payload")
+        chunk = self.data[self.pos:end]
+        self.pos = end
+        return chunk
+
+    def read_map(self, size: int) -> Dict[Any, Any]:
+        read = self.read
+        result = {}
+        for _ in range(size):
+            key = read()
+            result[key] = read()
+        return result
+
+    def read_model(self) -> Dict[str, Any]:
+        index = self.read_uint()
+        if index == len(self.schemas):
+            self.schemas.append(tuple(self.read() for _ in range(self.read_uint())))
+        elif index > len(self.schemas):
+            raise CodecError(f"Reference to undefined schema {index}")
+        read = self.read
+        return {name: read() for name in self.schemas[index]}
@@ -0,0 +1,52 @@
+"""Stable content hashing for models."""
+
+import hashlib
+import json
+from typing import AbstractSet, Any, Optional
+
+from pydantic import BaseModel
+
+
+# Fields that record when a manifest object was built, not what it deploys
+MANIFEST_VOLATILE_FIELDS = frozenset({"created_at"})
+
+
+def content_hash(model: BaseModel, exclude: Optional[AbstractSet[str]] = None) -> str:
+    """Compute a SHA-256 digest of a model's canonical JSON form.
+
+    Keys are sorted and whitespace is stripped, so two models with equal
+    field values always hash the same regardless of dict insertion order.
+
+    Args:
+        model: Pydantic model to hash
+        exclude: Optional top-level field names to leave out
+
+    Returns:
+        Hex-encoded digest
+    """
+    return payload_hash(model.model_dump(mode="json", exclude=set(exclude) if exclude else None))
+
+
+def payload_hash(payload: Any) -> str:
+    """Compute a SHA-256 digest of a JSON-compatible value's canonical form.
+
+    Args:
+        payload: Dicts, lists and scalars; other values are hashed via ``str``
+
+    Returns:
+        Hex-encoded digest
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def manifest_hash(manifest: BaseModel) -> str:
+    """Compute the content hash of a deployment manifest.
+
+    Args:
+        manifest: Deployment manifest
+
+    Returns:
+        Hex-encoded digest that ignores the manifest's creation timestamp
+    """
+    return content_hash(manifest, MANIFEST_VOLATILE_FIELDS)
@@ -0,0 +1,69 @@
+"""In-flight call deduplication."""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Collapses concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the call; callers arriving while it is
+    still running wait for the same result (or exception) instead of
+    repeating the work. The key is released as soon as the call finishes,
+    so later calls run afresh.
+    """
+
+    def __init__(self):
+        """Initialize the call registry."""
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.executed = 0
+        self.shared = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call for a key is running.
+
+        Args:
+            key: Call key
+
+        Returns:
+            True if a call is in flight
+        """
+        return key in self._calls
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Run a call, or join the one already in flight for the key.
+
+        Args:
+            key: Call key
+            call: Zero-argument coroutine function doing the work
+
+        Returns:
+            Result of the shared call
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            self.shared += 1
+            # Shield so a cancelled follower does not cancel the leader's result
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executed += 1
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Followers re-raise it; don't warn when there are none
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._calls.pop(key, None)
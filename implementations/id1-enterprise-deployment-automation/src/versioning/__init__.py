@@ -1,9 +1,16 @@
 """Version management and pinning module."""
 
+from .resolver import ConstraintError, DependencyResolver, StaticCatalog
+from .semver import InvalidVersionError, SemVer
 from .version_manager import VersionManager
 from .version_pinner import VersionPinner
 
 __all__ = [
+    "ConstraintError",
+    "DependencyResolver",
+    "InvalidVersionError",
+    "SemVer",
+    "StaticCatalog",
     "VersionManager",
     "VersionPinner",
 ]
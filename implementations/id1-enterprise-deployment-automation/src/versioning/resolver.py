@@ -0,0 +1,666 @@
+"""Constraint-solving dependency resolution over the version catalog."""
+
+import bisect
+import heapq
+import logging
+import operator
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import (
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Set,
+    Tuple,
+)
+
+from ..models.version import ResolutionResult, Version, VersionConstraint
+from .semver import InvalidVersionError, SemVer
+
+
+logger = logging.getLogger(__name__)
+
+
+# ``SemVer.key``: ordered like the versions themselves
+VersionKey = Tuple
+Clause = Tuple[Callable[[VersionKey, VersionKey], bool], VersionKey]
+Clauses = Tuple[Clause, ...]
+
+_OPERATORS = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+}
+
+_CLAUSE = re.compile(r"^\s*(>=|<=|==|!=|>|<|=)?\s*(v?[0-9][0-9A-Za-z.\-+]*)\s*$")
+
+_ROOT = ""
+
+
+class VersionCatalog(Protocol):
+    """Anything exposing versions by component key and a change counter."""
+
+    version_index: Mapping[str, List[Version]]
+    generation: int
+
+
+class StaticCatalog:
+    """A fixed catalog built from a component key -> versions mapping."""
+
+    def __init__(self, versions: Mapping[str, List[Version]]):
+        """Initialize the catalog.
+
+        Args:
+            versions: Versions by component key (``<type>:<name>``)
+        """
+        self.version_index = versions
+        self.generation = 0
+
+
+class ConstraintError(ValueError):
+    """Raised for a constraint string that cannot be parsed."""
+
+
+@lru_cache(maxsize=4096)
+def parse_constraint(constraint: str) -> Clauses:
+    """Parse a constraint such as ``>=1.5.0,<2.0.0``.
+
+    A bare version means an exact match and ``*`` (or an empty string)
+    allows every version.
+
+    Args:
+        constraint: Comma-separated comparison clauses
+
+    Returns:
+        Clauses that must all hold
+
+    Raises:
+        ConstraintError: If a clause is malformed
+    """
+    clauses = []
+    for part in constraint.split(","):
+        if part.strip() in ("", "*"):
+            continue
+        match = _CLAUSE.match(part)
+        try:
+            bound = SemVer.coerce(match.group(2)) if match else None
+        except InvalidVersionError:
+            bound = None
+        if bound is None:
+            raise ConstraintError(f"Invalid version constraint clause: {part.strip()!r}")
+        clauses.append((_OPERATORS[match.group(1) or "=="], bound.key))
+    return tuple(clauses)
+
+
+def _bounds(clauses: Clauses) -> Tuple[Optional[VersionKey], bool, Optional[VersionKey], bool, Set[VersionKey]]:
+    """Reduce clauses to (lower, lower inclusive, upper, upper inclusive, excluded)."""
+    lower: Optional[VersionKey] = None
+    lower_inclusive = True
+    upper: Optional[VersionKey] = None
+    upper_inclusive = True
+    excluded: Set[VersionKey] = set()
+
+    for compare, bound in clauses:
+        if compare is operator.ne:
+            excluded.add(bound)
+            continue
+        if compare in (operator.ge, operator.gt, operator.eq):
+            inclusive = compare is not operator.gt
+            if lower is None or bound > lower or (bound == lower and not inclusive):
+                lower, lower_inclusive = bound, inclusive
+        if compare in (operator.le, operator.lt, operator.eq):
+            inclusive = compare is not operator.lt
+            if upper is None or bound < upper or (bound == upper and not inclusive):
+                upper, upper_inclusive = bound, inclusive
+    return lower, lower_inclusive, upper, upper_inclusive, excluded
+
+
+def _allows(clauses: Clauses, key: VersionKey) -> bool:
+    """Check whether a version key satisfies every clause."""
+    for compare, bound in clauses:
+        if not compare(key, bound):
+            return False
+    return True
+
+
+# A decided component takes part in a conflict either through the
+# constraints its dependencies impose ("d", dependencies) or through its
+# version falling outside a constraint ("x", constraint, clauses). Both hold for
+# every version alike in that respect, so one nogood covers many versions.
+Term = Tuple[str, Hashable]
+
+# A learned nogood: (component, term) facts that cannot all hold at once
+Nogood = FrozenSet[Tuple[str, Term]]
+
+
+class _Candidate(NamedTuple):
+    """One version of a component, prepared for solving."""
+
+    key: VersionKey
+    version_string: str
+    requires: Tuple[Tuple[str, str, Clauses], ...]
+    dependency_term: Term
+
+    def holds(self, term: Term) -> bool:
+        """Check whether this version satisfies a nogood term."""
+        if term[0] == "x":
+            return not _allows(term[2], self.key)
+        return term == self.dependency_term
+
+
+@dataclass(frozen=True)
+class _Requirement:
+    """A constraint on a component and who imposed it."""
+
+    source: str
+    constraint: str
+    clauses: Clauses
+
+
+class _Solver:
+    """Backtracking search with conflict-directed backjumping and nogood learning.
+
+    Components are decided dependencies first, each taking its newest
+    version allowed by the root constraints, the dependencies of already
+    decided components and the nogoods learned so far; a version whose own
+    dependencies cannot be met is rejected up front. When a component has
+    no allowed version, the facts that ruled its versions out form a
+    nogood together with the decision that made it required. It is
+    recorded so that combination is never tried again, and the search
+    jumps straight back to the most recent decision in it.
+    Nogoods are stated in terms of dependency sets and version ranges, so
+    one conflict rules out every version alike in that respect rather than
+    a single version.
+    """
+
+    def __init__(self, resolver: "DependencyResolver", roots: Dict[str, List[_Requirement]]):
+        self.resolver = resolver
+        self.requirements: Dict[str, List[_Requirement]] = {key: list(reqs) for key, reqs in roots.items()}
+        self.required: Dict[str, int] = {key: 1 for key in roots}
+        self.order: Dict[str, int] = {}
+        self.heap: List[Tuple[int, str]] = []
+        self.assigned: Dict[str, _Candidate] = {}
+        self.trail: List[str] = []
+        self.level: Dict[str, int] = {}
+        self.imposed: Dict[str, List[str]] = {}
+        self.nogoods: Dict[Tuple[str, Term], List[Nogood]] = {}
+        self.range_terms: Dict[str, Set[Term]] = {}
+        self.reasons: Dict[Nogood, str] = {}
+
+        self.decisions = 0
+        self.backjumps = 0
+        self.learned = 0
+
+        self._rank(sorted(roots))
+        for key in roots:
+            self._discover(key)
+
+    def solve(self) -> Tuple[Optional[Dict[str, str]], List[str]]:
+        """Run the search.
+
+        Returns:
+            (component key -> version, []) on success, or (None, conflicts)
+        """
+        while True:
+            component = self._next_component()
+            if component is None:
+                return {key: candidate.version_string for key, candidate in self.assigned.items()}, []
+
+            candidate, conflict = self._choose(component)
+            if candidate is not None:
+                self._assign(component, candidate)
+                continue
+
+            if not conflict:
+                return None, self._explain(component)
+            self._learn(component, conflict)
+            self._discover(component)
+            self.backjumps += 1
+            self._undo_to(max(self.level[key] for key, _ in conflict))
+
+    def _rank(self, roots: List[str]) -> None:
+        """Order components so dependencies are decided before their dependents.
+
+        A dependent's versions are then checked directly against decided
+        dependencies, and a conflict is learned as a version range of the
+        dependency that every other dependent can reuse. Cycles are broken
+        arbitrarily.
+        """
+        postorder: List[str] = []
+        visited: Set[str] = set()
+        for root in roots:
+            if root in visited:
+                continue
+            visited.add(root)
+            stack = [(root, iter(self.resolver._dependency_targets(root)))]
+            while stack:
+                component, targets = stack[-1]
+                for target in targets:
+                    if target not in visited:
+                        visited.add(target)
+                        stack.append((target, iter(self.resolver._dependency_targets(target))))
+                        break
+                else:
+                    postorder.append(component)
+                    stack.pop()
+
+        for rank, component in enumerate(postorder):
+            self.order[component] = rank
+
+    def _discover(self, component: str) -> None:
+        """Queue a required component for a decision."""
+        if component not in self.order:
+            self.order[component] = len(self.order)
+        heapq.heappush(self.heap, (self.order[component], component))
+
+    def _next_component(self) -> Optional[str]:
+        """Pop the earliest-discovered component that still needs a decision."""
+        while self.heap:
+            _, component = heapq.heappop(self.heap)
+            if component not in self.assigned and self.required.get(component):
+                return component
+        return None
+
+    def _choose(self, component: str) -> Tuple[Optional[_Candidate], Set[Tuple[str, Term]]]:
+        """Find the newest allowed version, or the facts that rule them all out."""
+        candidates = self.resolver._candidates(component)
+        requirements = self.requirements.get(component, ())
+        conflict: Set[Tuple[str, Term]] = set()
+
+        # The conflict only arises while the component is required, so the
+        # decision requiring it belongs to it unless the request does
+        required_by = self._required_by(requirements)
+        if required_by is not None:
+            conflict.add(required_by)
+        if not candidates:
+            return None, conflict
+
+        # Versions declaring the same dependencies pass or fail the dependency checks together
+        dependency_blockers: Dict[Term, Optional[FrozenSet[Tuple[str, Term]]]] = {}
+        # ...and the same nogoods, given which learned ranges they fall outside
+        range_terms = tuple(self.range_terms.get(component, ()))
+        nogood_blockers: Dict[Tuple, Optional[FrozenSet[Tuple[str, Term]]]] = {}
+        for candidate in candidates:
+            blocker = self._requirement_blocker(candidate, requirements)
+            if blocker is None:
+                term = candidate.dependency_term
+                if term not in dependency_blockers:
+                    dependency_blockers[term] = self._dependency_blocker(candidate)
+                blocker = dependency_blockers[term]
+            if blocker is None:
+                pattern = (candidate.dependency_term, tuple(candidate.holds(term) for term in range_terms))
+                if pattern not in nogood_blockers:
+                    nogood_blockers[pattern] = self._nogood_blocker(component, candidate)
+                blocker = nogood_blockers[pattern]
+            if blocker is None:
+                self.decisions += 1
+                return candidate, conflict
+            conflict.update(blocker)
+        return None, conflict
+
+    # Each blocker check returns the facts ruling a candidate out, or None if
+    # it passes. A candidate ruled out by nothing that can be undone (a root
+    # constraint, a missing dependency or a single-fact nogood) gets the
+    # empty set.
+
+    def _requirement_blocker(
+        self,
+        candidate: _Candidate,
+        requirements: Iterable[_Requirement]
+    ) -> Optional[FrozenSet[Tuple[str, Term]]]:
+        """Check a candidate against the constraints imposed on its component."""
+        blocker: Optional[str] = None
+        for requirement in requirements:
+            if _allows(requirement.clauses, candidate.key):
+                continue
+            if requirement.source == _ROOT:
+                return frozenset()
+            if blocker is None or self.level[requirement.source] < self.level[blocker]:
+                blocker = requirement.source
+        return frozenset((self._dependency_fact(blocker),)) if blocker is not None else None
+
+    def _dependency_blocker(self, candidate: _Candidate) -> Optional[FrozenSet[Tuple[str, Term]]]:
+        """Check a candidate's dependencies against decided components, then look ahead.
+
+        A dependency on an undecided component must leave it at least one
+        version, so a choice that can only fail later is rejected now.
+        """
+        blocker: Optional[Tuple[str, Term]] = None
+        undecided = []
+        for target, constraint, clauses in candidate.requires:
+            decided = self.assigned.get(target)
+            if decided is None:
+                undecided.append((target, clauses))
+            elif not _allows(clauses, decided.key):
+                if blocker is None or self.level[target] < self.level[blocker[0]]:
+                    blocker = (target, ("x", constraint, clauses))
+        if blocker is not None:
+            return frozenset((blocker,))
+
+        for target, clauses in undecided:
+            existing = self.requirements.get(target, ())
+            combined = clauses + tuple(clause for req in existing for clause in req.clauses)
+            if not self.resolver._any_allowed(target, combined):
+                return frozenset(self._dependency_fact(req.source) for req in existing if req.source != _ROOT)
+        return None
+
+    def _nogood_blocker(self, component: str, candidate: _Candidate) -> Optional[FrozenSet[Tuple[str, Term]]]:
+        """Check a candidate against the learned nogoods."""
+        for nogood in self._nogoods_for(component, candidate):
+            if all(
+                candidate.holds(term) if key == component
+                else key in self.assigned and self.assigned[key].holds(term)
+                for key, term in nogood
+            ):
+                return frozenset(fact for fact in nogood if fact[0] != component)
+        return None
+
+    def _nogoods_for(self, component: str, candidate: _Candidate) -> Iterable[Nogood]:
+        """Get the learned nogoods that mention a candidate version."""
+        yield from self.nogoods.get((component, candidate.dependency_term), ())
+        for term in self.range_terms.get(component, ()):
+            if candidate.holds(term):
+                yield from self.nogoods.get((component, term), ())
+
+    def _required_by(self, requirements: Iterable[_Requirement]) -> Optional[Tuple[str, Term]]:
+        """Get the earliest decision requiring a component, or None if the request does."""
+        sources = [req.source for req in requirements]
+        if _ROOT in sources:
+            return None
+        return self._dependency_fact(min(sources, key=self.level.__getitem__))
+
+    def _dependency_fact(self, component: str) -> Tuple[str, Term]:
+        """Describe a decided component's part in a conflict by its dependencies."""
+        return (component, self.assigned[component].dependency_term)
+
+    def _assign(self, component: str, candidate: _Candidate) -> None:
+        """Decide a component's version and impose its dependencies."""
+        self.assigned[component] = candidate
+        self.level[component] = len(self.trail)
+        self.trail.append(component)
+
+        imposed = []
+        for target, constraint, clauses in candidate.requires:
+            self.requirements.setdefault(target, []).append(_Requirement(component, constraint, clauses))
+            self.required[target] = self.required.get(target, 0) + 1
+            imposed.append(target)
+            if target not in self.assigned:
+                self._discover(target)
+        self.imposed[component] = imposed
+
+    def _learn(self, component: str, conflict: Set[Tuple[str, Term]]) -> None:
+        """Record the conflicting facts as a nogood."""
+        nogood: Nogood = frozenset(conflict)
+        if nogood in self.reasons:
+            return
+        self.reasons[nogood] = f"leaves {component} without a compatible version"
+        for fact in nogood:
+            self.nogoods.setdefault(fact, []).append(nogood)
+            if fact[1][0] == "x":
+                self.range_terms.setdefault(fact[0], set()).add(fact[1])
+        self.learned += 1
+
+    def _undo_to(self, level: int) -> None:
+        """Undo every decision at or after a trail position."""
+        while len(self.trail) > level:
+            component = self.trail.pop()
+            del self.assigned[component]
+            del self.level[component]
+            for target in self.imposed.pop(component, ()):
+                self.required[target] -= 1
+                requirements = self.requirements[target]
+                for index in range(len(requirements) - 1, -1, -1):
+                    if requirements[index].source == component:
+                        del requirements[index]
+                        break
+            if self.required.get(component):
+                self._discover(component)
+
+    def _explain(self, component: str) -> List[str]:
+        """Describe why a component has no usable version."""
+        requirements = self.requirements.get(component, [])
+        candidates = self.resolver._candidates(component)
+
+        if not candidates:
+            required_by = ", ".join(sorted({req.source or "the request" for req in requirements}))
+            return [f"{component} has no available versions (required by {required_by})"]
+
+        constraints = ", ".join(
+            f"{req.constraint} ({'requested' if req.source == _ROOT else 'required by ' + req.source})"
+            for req in requirements
+        )
+        conflicts = [f"No usable version of {component} satisfies {constraints or 'its dependencies'}"]
+
+        ruled_out: Dict[str, List[str]] = {}
+        for candidate in candidates:
+            if not all(_allows(req.clauses, candidate.key) for req in requirements):
+                continue
+            for nogood in self._nogoods_for(component, candidate):
+                if len(nogood) == 1:
+                    ruled_out.setdefault(self.reasons[nogood], []).append(candidate.version_string)
+            for target, constraint, clauses in candidate.requires:
+                if not self.resolver._candidates(target):
+                    reason = f"requires {target} {constraint}, which has no versions"
+                elif not self.resolver._any_allowed(target, clauses):
+                    reason = f"requires {target} {constraint}, which no available version satisfies"
+                else:
+                    continue
+                ruled_out.setdefault(reason, []).append(candidate.version_string)
+
+        for reason, versions in ruled_out.items():
+            listed = ", ".join(versions[:3]) + (f" and {len(versions) - 3} more" if len(versions) > 3 else "")
+            conflicts.append(f"{component} {listed}: {reason}")
+        return conflicts
+
+
+class DependencyResolver:
+    """Finds the newest consistent set of versions for a set of constraints.
+
+    Each version's ``dependencies`` map component names (or
+    ``<type>:<name>`` keys) to constraints, and every dependency of a
+    selected version must be selected at a version satisfying it. Results
+    are memoized per (constraint set, catalog generation), so repeated
+    resolutions are free until the catalog changes.
+    """
+
+    def __init__(
+        self,
+        catalog: VersionCatalog,
+        stable_only: bool = True,
+        cache_size: int = 1024
+    ):
+        """Initialize the resolver.
+
+        Args:
+            catalog: Version catalog, e.g. a ``VersionManager``
+            stable_only: Only select versions marked stable
+            cache_size: Maximum memoized resolutions
+        """
+        self.catalog = catalog
+        self.stable_only = stable_only
+        self.cache_size = cache_size
+
+        self._cache: "OrderedDict[Tuple, ResolutionResult]" = OrderedDict()
+        self._generation: Optional[int] = None
+        self._components: Dict[str, List[_Candidate]] = {}
+        self._targets: Dict[str, List[str]] = {}
+        self._keys: Dict[str, List[VersionKey]] = {}
+        self._requires: Dict[Tuple[Tuple[str, str], ...], Tuple[Tuple[Tuple[str, str, Clauses], ...], Term]] = {}
+        self._names: Optional[Dict[str, str]] = None
+
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def resolve(self, constraints: Iterable[VersionConstraint]) -> ResolutionResult:
+        """Resolve constraints to the newest consistent versions.
+
+        Args:
+            constraints: Root constraints
+
+        Returns:
+            Resolution; ``conflicts`` explains a failure
+
+        Raises:
+            ConstraintError: If a constraint string is malformed
+        """
+        return self.resolve_requirements({
+            f"{constraint.component_type}:{constraint.component_name}": constraint.constraint
+            for constraint in constraints
+        })
+
+    def resolve_requirements(self, requirements: Mapping[str, str]) -> ResolutionResult:
+        """Resolve component key -> constraint requirements.
+
+        Args:
+            requirements: Constraint per ``<type>:<name>`` component key
+
+        Returns:
+            Resolution; ``conflicts`` explains a failure
+
+        Raises:
+            ConstraintError: If a constraint string is malformed
+        """
+        self._sync_generation()
+        cache_key = (frozenset(requirements.items()), self._generation)
+
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            self.cache_hits += 1
+            return cached.model_copy(deep=True)
+        self.cache_misses += 1
+
+        roots = {
+            component: [_Requirement(_ROOT, constraint, self._clauses(constraint))]
+            for component, constraint in requirements.items()
+        }
+        solver = _Solver(self, roots)
+        resolved, conflicts = solver.solve()
+
+        result = ResolutionResult(
+            is_resolved=resolved is not None,
+            resolved=dict(sorted(resolved.items())) if resolved is not None else {},
+            conflicts=conflicts,
+            decisions=solver.decisions,
+            backjumps=solver.backjumps,
+            learned=solver.learned,
+            catalog_generation=self._generation
+        )
+        if conflicts:
+            logger.warning(f"Dependency resolution failed: {'; '.join(conflicts)}")
+
+        self._cache[cache_key] = result
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return result.model_copy(deep=True)
+
+    def cache_stats(self) -> Dict[str, int]:
+        """Get memoization counters.
+
+        Returns:
+            Hits, misses and cached entries
+        """
+        return {"hits": self.cache_hits, "misses": self.cache_misses, "entries": len(self._cache)}
+
+    def _sync_generation(self) -> None:
+        """Drop prepared components and results built for an older catalog."""
+        generation = self.catalog.generation
+        if generation != self._generation:
+            self._generation = generation
+            self._components.clear()
+            self._targets.clear()
+            self._keys.clear()
+            self._requires.clear()
+            self._names = None
+            self._cache.clear()
+
+    def _candidates(self, component: str) -> List[_Candidate]:
+        """Get a component's selectable versions, newest first."""
+        candidates = self._components.get(component)
+        if candidates is None:
+            versions = self.catalog.version_index.get(component, ())
+            prepared = (self._prepare(v) for v in versions if v.is_stable or not self.stable_only)
+            candidates = sorted(
+                (candidate for candidate in prepared if candidate is not None),
+                key=lambda candidate: candidate.key,
+                reverse=True
+            )
+            self._components[component] = candidates
+        return candidates
+
+    def _any_allowed(self, component: str, clauses: Clauses) -> bool:
+        """Check whether any version of a component satisfies every clause."""
+        keys = self._keys.get(component)
+        if keys is None:
+            keys = self._keys[component] = [candidate.key for candidate in reversed(self._candidates(component))]
+
+        lower, lower_inclusive, upper, upper_inclusive, excluded = _bounds(clauses)
+        start = 0
+        if lower is not None:
+            start = bisect.bisect_left(keys, lower) if lower_inclusive else bisect.bisect_right(keys, lower)
+        end = len(keys)
+        if upper is not None:
+            end = bisect.bisect_right(keys, upper) if upper_inclusive else bisect.bisect_left(keys, upper)
+        if not excluded:
+            return start < end
+        return any(keys[index] not in excluded for index in range(start, end))
+
+    def _dependency_targets(self, component: str) -> List[str]:
+        """Get every component any version of a component depends on."""
+        targets = self._targets.get(component)
+        if targets is None:
+            targets = sorted({target for candidate in self._candidates(component) for target, _, _ in candidate.requires})
+            self._targets[component] = targets
+        return targets
+
+    def _prepare(self, version: Version) -> Optional[_Candidate]:
+        """Parse a catalog version for the solver; None if its version string is invalid."""
+        try:
+            key = SemVer.coerce(version.version_string).key
+        except InvalidVersionError:
+            logger.warning(f"Ignoring version {version.id} with invalid version string {version.version_string!r}")
+            return None
+
+        # Consecutive releases usually declare the same dependencies, so parse each set once
+        declared = tuple(version.dependencies.items())
+        prepared = self._requires.get(declared)
+        if prepared is None:
+            requires = tuple(sorted(
+                (
+                    (self._component_key(dependency), constraint, self._clauses(constraint))
+                    for dependency, constraint in declared
+                ),
+                key=lambda requirement: requirement[:2]
+            ))
+            prepared = (requires, ("d", tuple((target, constraint) for target, constraint, _ in requires)))
+            self._requires[declared] = prepared
+        return _Candidate(key, version.version_string, *prepared)
+
+    def _component_key(self, dependency: str) -> str:
+        """Map a dependency name to its ``<type>:<name>`` component key."""
+        if ":" in dependency:
+            return dependency
+        if self._names is None:
+            names: Dict[str, str] = {}
+            for key in self.catalog.version_index:
+                names.setdefault(key.split(":", 1)[-1], key)
+            self._names = names
+        return self._names.get(dependency, dependency)
+
+    @staticmethod
+    def _clauses(constraint: str) -> Clauses:
+        """Parse a constraint string."""
+        return parse_constraint(constraint)
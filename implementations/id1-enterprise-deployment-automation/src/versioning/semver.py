@@ -0,0 +1,211 @@
+"""Parsed semantic versions shared by every component that compares versions."""
+
+import re
+import weakref
+from functools import lru_cache
+from typing import Any, Optional, Tuple
+
+
+# Semantic Versioning 2.0.0, https://semver.org
+_SEMVER = re.compile(
+    r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)"
+    r"(?:-((?:0|[1-9]\d*|\d*[A-Za-z-][0-9A-Za-z-]*)(?:\.(?:0|[1-9]\d*|\d*[A-Za-z-][0-9A-Za-z-]*))*))?"
+    r"(?:\+([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?$"
+)
+
+# Lenient form for constraints and legacy catalogs: "v" prefix and missing minor/patch
+_PARTIAL = re.compile(
+    r"^\s*v?(\d+)(?:\.(\d+))?(?:\.(\d+))?"
+    r"(?:-([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?"
+    r"(?:\+([0-9A-Za-z-]+(?:\.[0-9A-Za-z-]+)*))?\s*$"
+)
+
+# Every live SemVer, so equal versions parsed from different strings share one object
+_interned: "weakref.WeakValueDictionary[Tuple, SemVer]" = weakref.WeakValueDictionary()
+
+
+class InvalidVersionError(ValueError):
+    """Raised for a string that is not a semantic version."""
+
+
+class SemVer:
+    """Immutable semantic version ordered by SemVer 2.0.0 precedence.
+
+    Instances are interned and parsing is cached, so parsing the same
+    string twice returns the same object. ``key`` is a plain tuple with the
+    same ordering as the versions; sort large collections with
+    ``key=lambda v: v.key`` (or by the key of their parsed version string)
+    to compare tuples rather than call comparison methods.
+    """
+
+    __slots__ = ("major", "minor", "patch", "prerelease", "build", "key", "__weakref__")
+
+    def __init__(
+        self,
+        major: int,
+        minor: int = 0,
+        patch: int = 0,
+        prerelease: Tuple[str, ...] = (),
+        build: Tuple[str, ...] = ()
+    ):
+        """Initialize a version.
+
+        Args:
+            major: Major version
+            minor: Minor version
+            patch: Patch version
+            prerelease: Dot-separated pre-release identifiers, e.g. ("rc", "1")
+            build: Dot-separated build metadata, ignored for precedence
+        """
+        set_field = object.__setattr__
+        set_field(self, "major", major)
+        set_field(self, "minor", minor)
+        set_field(self, "patch", patch)
+        set_field(self, "prerelease", tuple(prerelease))
+        set_field(self, "build", tuple(build))
+        # Releases rank above their pre-releases; numeric identifiers rank
+        # below alphanumeric ones and compare numerically
+        set_field(self, "key", (
+            major,
+            minor,
+            patch,
+            0 if prerelease else 1,
+            tuple((0, int(part), "") if part.isdigit() else (1, 0, part) for part in prerelease)
+        ))
+
+    @classmethod
+    def parse(cls, text: str) -> "SemVer":
+        """Parse a strict semantic version such as ``1.2.3-rc.1+build.5``.
+
+        Args:
+            text: Version string
+
+        Returns:
+            Interned version
+
+        Raises:
+            InvalidVersionError: If the string is not a semantic version
+        """
+        return _parse(text)
+
+    @classmethod
+    def try_parse(cls, text: Any) -> Optional["SemVer"]:
+        """Parse a strict semantic version, or return None if it is not one."""
+        if not isinstance(text, str):
+            return None
+        try:
+            return _parse(text)
+        except InvalidVersionError:
+            return None
+
+    @classmethod
+    def coerce(cls, text: str) -> "SemVer":
+        """Parse a version leniently, accepting ``v1.2`` for ``1.2.0``.
+
+        Args:
+            text: Version string; missing minor and patch count as 0
+
+        Returns:
+            Interned version
+
+        Raises:
+            InvalidVersionError: If the string does not start like a version
+        """
+        return _coerce(text)
+
+    @property
+    def is_prerelease(self) -> bool:
+        """Whether this is a pre-release version."""
+        return bool(self.prerelease)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("SemVer is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("SemVer is immutable")
+
+    def __reduce__(self):
+        return (_intern_args, (self.major, self.minor, self.patch, self.prerelease, self.build))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self.key == other.key
+
+    def __ne__(self, other: object) -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self.key != other.key
+
+    def __lt__(self, other: "SemVer") -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self.key < other.key
+
+    def __le__(self, other: "SemVer") -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self.key <= other.key
+
+    def __gt__(self, other: "SemVer") -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self.key > other.key
+
+    def __ge__(self, other: "SemVer") -> bool:
+        if not isinstance(other, SemVer):
+            return NotImplemented
+        return self.key >= other.key
+
+    def __hash__(self) -> int:
+        return hash(self.key)
+
+    def __str__(self) -> str:
+        text = f"{self.major}.{self.minor}.{self.patch}"
+        if self.prerelease:
+            text += "-" + ".".join(self.prerelease)
+        if self.build:
+            text += "+" + ".".join(self.build)
+        return text
+
+    def __repr__(self) -> str:
+        return f"SemVer('{self}')"
+
+
+def _intern_args(
+    major: int,
+    minor: int,
+    patch: int,
+    prerelease: Tuple[str, ...],
+    build: Tuple[str, ...]
+) -> SemVer:
+    """Get the interned version with these parts."""
+    identity = (major, minor, patch, prerelease, build)
+    version = _interned.get(identity)
+    if version is None:
+        version = SemVer(major, minor, patch, prerelease, build)
+        version = _interned.setdefault(identity, version)
+    return version
+
+
+def _split(identifiers: Optional[str]) -> Tuple[str, ...]:
+    """Split dot-separated identifiers."""
+    return tuple(identifiers.split(".")) if identifiers else ()
+
+
+@lru_cache(maxsize=65536)
+def _parse(text: str) -> SemVer:
+    match = _SEMVER.match(text)
+    if not match:
+        raise InvalidVersionError(f"Invalid semantic version: {text!r}")
+    major, minor, patch, prerelease, build = match.groups()
+    return _intern_args(int(major), int(minor), int(patch), _split(prerelease), _split(build))
+
+
+@lru_cache(maxsize=65536)
+def _coerce(text: str) -> SemVer:
+    match = _PARTIAL.match(text)
+    if not match:
+        raise InvalidVersionError(f"Invalid version: {text!r}")
+    major, minor, patch, prerelease, build = match.groups()
+    return _intern_args(int(major), int(minor or 0), int(patch or 0), _split(prerelease), _split(build))
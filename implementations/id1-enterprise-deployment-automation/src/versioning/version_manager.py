@@ -1,10 +1,13 @@
 """Version management for deployments."""
 
+import asyncio
 import logging
 from typing import Optional, Dict, List
 from datetime import datetime
 
 from ..models.version import Version, VersionConstraint
+from ..persistence.write_behind import StateWriter
+from .semver import SemVer
 
 
 logger = logging.getLogger(__name__)
@@ -13,20 +16,60 @@ logger = logging.getLogger(__name__)
 class VersionManager:
     """Manages available versions and compatibility."""
     
-    def __init__(self):
-        """Initialize the version manager."""
+    def __init__(self, state: Optional[StateWriter] = None):
+        """Initialize the version manager.
+        
+        Args:
+            state: Optional write-behind writer for durable state
+        """
+        self.state = state
         self.versions: Dict[str, Version] = {}
         self.version_index: Dict[str, List[Version]] = {}
+        # Bumped on every catalog change so cached resolutions can be invalidated
+        self.generation = 0
     
     async def register_version(self, version: Version) -> None:
         """Register a new version.
         
         Args:
             version: Version to register
+            
+        Raises:
+            InvalidVersionError: If the version string is not a semantic version
         """
+        SemVer.parse(version.version_string)
         logger.info(f"Registering version {version.id}: {version.component_name} {version.version_string}")
         
+        self._index_version(version)
+        if self.state:
+            self.state.put("version", version)
+        
+        logger.info(f"Version {version.id} registered successfully")
+    
+    async def load_state(self) -> int:
+        """Load all registered versions from durable storage.
+        
+        Returns:
+            Number of versions loaded
+        """
+        if not self.state:
+            return 0
+        
+        versions = await asyncio.to_thread(self.state.load, "version", Version)
+        for version in versions:
+            self._index_version(version)
+        
+        logger.info(f"Loaded {len(versions)} versions from state store")
+        return len(versions)
+    
+    def _index_version(self, version: Version) -> None:
+        """Add a version to the lookup indexes.
+        
+        Args:
+            version: Version to index
+        """
         self.versions[version.id] = version
+        self.generation += 1
         
         # Index by component
         component_key = f"{version.component_type}:{version.component_name}"
@@ -37,11 +80,9 @@ class VersionManager:
         
         # Sort by version (newest first)
         self.version_index[component_key].sort(
-            key=lambda v: self._parse_version(v.version_string),
+            key=lambda v: self._version_key(v.version_string),
             reverse=True
         )
-        
-        logger.info(f"Version {version.id} registered successfully")
     
     async def get_available_versions(
         self,
@@ -106,7 +147,7 @@ class VersionManager:
         
         # Get platform version
         platform_versions = await self.get_available_versions("platform", "webwaka-platform")
-        platform_ver = next((v for v in platform_versions if v.version_string == platform_version), None)
+        platform_ver = self._find_version(platform_versions, platform_version)
         
         if not platform_ver:
             incompatibilities.append(f"Platform version {platform_version} not found")
@@ -115,7 +156,7 @@ class VersionManager:
         # Check suite compatibility
         for suite_name, suite_version in suite_versions.items():
             suite_versions_list = await self.get_available_versions("suite", suite_name)
-            suite_ver = next((v for v in suite_versions_list if v.version_string == suite_version), None)
+            suite_ver = self._find_version(suite_versions_list, suite_version)
             
             if not suite_ver:
                 incompatibilities.append(f"Suite {suite_name} version {suite_version} not found")
@@ -127,7 +168,7 @@ class VersionManager:
         # Check capability compatibility
         for cap_name, cap_version in capability_versions.items():
             cap_versions_list = await self.get_available_versions("capability", cap_name)
-            cap_ver = next((v for v in cap_versions_list if v.version_string == cap_version), None)
+            cap_ver = self._find_version(cap_versions_list, cap_version)
             
             if not cap_ver:
                 incompatibilities.append(f"Capability {cap_name} version {cap_version} not found")
@@ -136,20 +177,33 @@ class VersionManager:
         
         return is_compatible, incompatibilities, warnings
     
-    def _parse_version(self, version_string: str) -> tuple:
-        """Parse semantic version string.
+    def _version_key(self, version_string: str) -> tuple:
+        """Get the precedence key of a version string.
+        
+        Args:
+            version_string: Version string (e.g., "1.2.3-rc.1")
+            
+        Returns:
+            SemVer precedence key; versions loaded from state that are not
+            semantic versions sort below every valid one
+        """
+        version = SemVer.try_parse(version_string)
+        return version.key if version else (-1,)
+    
+    def _find_version(self, versions: List[Version], version_string: str) -> Optional[Version]:
+        """Find the version with the same precedence as a version string.
         
         Args:
-            version_string: Version string (e.g., "1.2.3")
+            versions: Versions to search
+            version_string: Version string, build metadata is ignored
             
         Returns:
-            Tuple of version components for comparison
+            Matching version or None
         """
-        try:
-            parts = version_string.split(".")
-            return tuple(int(p) for p in parts[:3])
-        except (ValueError, IndexError):
-            return (0, 0, 0)
+        wanted = SemVer.try_parse(version_string)
+        if wanted is None:
+            return next((v for v in versions if v.version_string == version_string), None)
+        return next((v for v in versions if SemVer.try_parse(v.version_string) == wanted), None)
     
     def get_version(self, version_id: str) -> Optional[Version]:
         """Get version by ID.
@@ -1,10 +1,14 @@
 """Version pinning for locking component versions."""
 
+import asyncio
 import logging
 from typing import Optional, Dict, List
 from datetime import datetime
 
 from ..models.version import VersionPin
+from ..persistence.write_behind import StateWriter
+from ..utils.id_generator import new_id
+from .semver import SemVer
 
 
 logger = logging.getLogger(__name__)
@@ -13,8 +17,13 @@ logger = logging.getLogger(__name__)
 class VersionPinner:
     """Manages version pins for instances."""
     
-    def __init__(self):
-        """Initialize the version pinner."""
+    def __init__(self, state: Optional[StateWriter] = None):
+        """Initialize the version pinner.
+        
+        Args:
+            state: Optional write-behind writer for durable state
+        """
+        self.state = state
         self.pins: Dict[str, VersionPin] = {}
         self.instance_pins: Dict[str, List[VersionPin]] = {}
     
@@ -39,10 +48,14 @@ class VersionPinner:
             
         Returns:
             Created version pin
+            
+        Raises:
+            InvalidVersionError: If the pinned version is not a semantic version
         """
+        pinned_version = str(SemVer.parse(pinned_version))
         logger.info(f"Pinning {component_type} {component_name} to {pinned_version} for instance {instance_id}")
         
-        pin_id = f"pin-{datetime.utcnow().timestamp()}"
+        pin_id = new_id("pin")
         
         pin = VersionPin(
             id=pin_id,
@@ -61,6 +74,9 @@ class VersionPinner:
         
         self.instance_pins[instance_id].append(pin)
         
+        if self.state:
+            self.state.put("version_pin", pin)
+        
         logger.info(f"Version pin {pin_id} created successfully")
         return pin
     
@@ -81,6 +97,8 @@ class VersionPinner:
             return False
         
         del self.pins[pin_id]
+        if self.state:
+            self.state.delete("version_pin", pin_id)
         
         if pin.instance_id in self.instance_pins:
             self.instance_pins[pin.instance_id] = [
@@ -90,6 +108,23 @@ class VersionPinner:
         logger.info(f"Version pin {pin_id} removed successfully")
         return True
     
+    async def load_state(self) -> int:
+        """Load all version pins from durable storage.
+        
+        Returns:
+            Number of pins loaded
+        """
+        if not self.state:
+            return 0
+        
+        pins = await asyncio.to_thread(self.state.load, "version_pin", VersionPin)
+        for pin in pins:
+            self.pins[pin.id] = pin
+            self.instance_pins.setdefault(pin.instance_id, []).append(pin)
+        
+        logger.info(f"Loaded {len(pins)} version pins from state store")
+        return len(pins)
+    
     async def get_pinned_version(
         self,
         instance_id: str,
@@ -143,6 +178,21 @@ class VersionPinner:
         
         return active_pins
     
+    def get_active_pins(self, instance_id: str) -> List[VersionPin]:
+        """Get unexpired pins for an instance without removing expired ones.
+        
+        Args:
+            instance_id: Instance ID
+            
+        Returns:
+            List of active version pins
+        """
+        now = datetime.utcnow()
+        return [
+            pin for pin in self.instance_pins.get(instance_id, [])
+            if not (pin.expires_at and pin.expires_at < now)
+        ]
+    
     def get_pin(self, pin_id: str) -> Optional[VersionPin]:
         """Get pin by ID.
         
@@ -0,0 +1,28 @@
+"""Integration tests for dry-run deployment requests."""
+
+from fastapi.testclient import TestClient
+
+from src.api.server import create_app
+
+
+def test_dry_run_is_marked_and_not_stored():
+    """Test a dry run answers 200 with no ID, unlike a real create."""
+    with TestClient(create_app()) as client:
+        response = client.post(
+            "/api/v1/deployments",
+            json={"manifest_id": "manifest-dry-run", "instance_id": "instance-dry-run", "dry_run": True}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["dry_run"] is True
+        assert body["id"] is None
+        assert body["logs"]
+
+        response = client.post(
+            "/api/v1/deployments",
+            json={"manifest_id": "manifest-dry-run", "instance_id": "instance-dry-run"}
+        )
+        assert response.status_code == 201
+        body = response.json()
+        assert body["dry_run"] is False
+        assert client.get(f"/api/v1/deployments/{body['id']}").status_code == 200
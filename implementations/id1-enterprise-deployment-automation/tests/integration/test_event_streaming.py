@@ -0,0 +1,24 @@
+"""Integration tests for event streaming endpoints."""
+
+from fastapi.testclient import TestClient
+
+from src.api.server import create_app
+
+
+def test_websocket_receives_filtered_deployment_events():
+    """Test a WebSocket subscriber is pushed status transitions for its instance."""
+    with TestClient(create_app()) as client:
+        with client.websocket_connect("/api/v1/events/ws?instance_id=instance-ws-01") as websocket:
+            for instance_id in ["instance-ws-02", "instance-ws-01"]:
+                response = client.post(
+                    "/api/v1/deployments",
+                    json={"manifest_id": "manifest-ws", "instance_id": instance_id}
+                )
+                assert response.status_code == 201
+            
+            event = websocket.receive_json()
+            assert event["type"] == "deployment.status"
+            assert event["instance_id"] == "instance-ws-01"
+            assert event["status"] == "pending"
+            
+            assert client.get("/api/v1/events/stats").json()["subscribers"] == 1
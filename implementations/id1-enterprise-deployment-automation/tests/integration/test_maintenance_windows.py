@@ -0,0 +1,35 @@
+"""Integration tests for maintenance windows in deployment decisions."""
+
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from src.api.routes import deployments
+from src.api.server import create_app
+
+
+def test_plan_blocks_auto_update_instances_outside_their_window():
+    """Test policy windows set through the API gate rollout plans."""
+    today = datetime.now(timezone.utc).date()
+    window = {
+        "start": "00:00",
+        "end": "23:59",
+        "blackout_dates": [(today + timedelta(days=offset)).isoformat() for offset in (-1, 0, 1)],
+    }
+    
+    with TestClient(create_app()) as client:
+        policy = client.post(
+            "/api/v1/policies",
+            params={"instance_id": "instance-window-01", "policy_type": "auto_update"}
+        ).json()
+        response = client.put(f"/api/v1/policies/{policy['id']}", json={"auto_update_maintenance_window": window})
+        assert response.status_code == 200
+        assert policy["id"] in deployments.maintenance_windows
+        assert deployments.deployment_engine.enforcer.windows is deployments.maintenance_windows
+        
+        plan = client.post(
+            "/api/v1/rollouts/plan",
+            json={"manifest_id": "manifest-window", "instance_ids": ["instance-window-01"]}
+        ).json()
+        assert plan["blocked"] == 1
+        assert plan["groups"][0]["blockers"] == ["Policy auto_update: Not in maintenance window"]
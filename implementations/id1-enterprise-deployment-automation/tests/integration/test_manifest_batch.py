@@ -0,0 +1,28 @@
+"""Integration tests for the bulk manifest compilation endpoint."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from src.api.server import create_app
+
+
+def test_batch_compile_streams_one_result_per_item():
+    """Test each item of a batch is compiled and reported on its own line."""
+    with TestClient(create_app()) as client:
+        response = client.post(
+            "/api/v1/manifests:batch",
+            json={"items": [
+                {"platform_version": "2.0.0", "suites": {"commerce": "1.5.0"}},
+                {"platform_version": ""},
+            ]}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        results = {item["index"]: item for item in map(json.loads, response.text.splitlines())}
+        assert results[1]["error"] == "Platform version is required"
+
+        manifest = results[0]["manifest"]
+        assert manifest["suites"] == {"commerce": "1.5.0"}
+        assert client.get(f"/api/v1/manifests/{manifest['id']}").json()["id"] == manifest["id"]
@@ -0,0 +1,32 @@
+"""Integration tests for the rollout pre-flight endpoint."""
+
+import json
+
+from fastapi.testclient import TestClient
+
+from src.api.server import create_app
+
+
+def test_preflight_reports_every_instance():
+    """Test pre-flight returns readiness per instance of a compiled manifest."""
+    with TestClient(create_app()) as client:
+        response = client.post(
+            "/api/v1/manifests:batch",
+            json={"items": [{"platform_version": "2.0.0", "suites": {"commerce": "1.5.0"}}]}
+        )
+        manifest_id = json.loads(response.text.splitlines()[0])["manifest"]["id"]
+
+        response = client.post(
+            "/api/v1/rollouts/preflight",
+            json={"manifest_id": manifest_id, "instance_ids": ["instance-01", "instance-02"]}
+        )
+        assert response.status_code == 200
+        report = response.json()
+        assert report["ready"] == 2
+        assert [instance["instance_id"] for instance in report["instances"]] == ["instance-01", "instance-02"]
+
+        response = client.post(
+            "/api/v1/rollouts/preflight",
+            json={"manifest_id": "manifest-missing", "instance_ids": ["instance-01"]}
+        )
+        assert response.status_code == 404
@@ -0,0 +1,14 @@
+"""Integration tests for the validation stats endpoint."""
+
+from fastapi.testclient import TestClient
+
+from src.api.server import create_app
+
+
+def test_validation_stats_report_rule_timings():
+    """Test the validation stats endpoint lists every rule."""
+    with TestClient(create_app()) as client:
+        report = client.get("/api/v1/deployments/validation/stats").json()
+
+        assert {"required_fields", "suite_versions"} <= {entry["rule"] for entry in report["rules"]}
+        assert "hit_rate" in report["cache"]
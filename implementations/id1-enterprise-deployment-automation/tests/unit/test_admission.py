@@ -0,0 +1,140 @@
+"""Unit tests for deployment admission control."""
+
+import asyncio
+
+import pytest
+
+from src.core.admission import (
+    SECURITY_PATCH_METADATA_KEY,
+    AdmissionController,
+    AdmissionRejected,
+    deployment_priority,
+)
+from src.core.deployment_engine import DeploymentEngine
+from src.models.deployment import DeploymentManifest, DeploymentPriority
+from src.models.policy import PolicyType, UpdateChannelPolicy
+
+
+@pytest.mark.asyncio
+async def test_freed_slots_go_to_highest_priority_first():
+    """Test critical patches overtake queued routine submissions."""
+    controller = AdmissionController(max_concurrent=1, max_queue=10)
+    order = []
+    release = asyncio.Event()
+    
+    async def submit(priority, name, hold=False):
+        async with controller.slot(priority):
+            order.append(name)
+            if hold:
+                await release.wait()
+    
+    first = asyncio.create_task(submit(DeploymentPriority.MANUAL, "first", hold=True))
+    await asyncio.sleep(0)
+    queued = [
+        asyncio.create_task(submit(DeploymentPriority.AUTO_UPDATE, "auto")),
+        asyncio.create_task(submit(DeploymentPriority.MANUAL, "manual")),
+        asyncio.create_task(submit(DeploymentPriority.CRITICAL_PATCH, "critical")),
+    ]
+    await asyncio.sleep(0)
+    assert controller.queue_depth == 3
+    
+    release.set()
+    await asyncio.gather(first, *queued)
+    
+    assert order == ["first", "critical", "manual", "auto"]
+    stats = controller.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["priorities"]["auto_update"]["admitted"] == 1
+    assert stats["priorities"]["auto_update"]["wait_max_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_per_priority_caps_and_full_queue_rejection():
+    """Test caps bound each priority and a full queue rejects with a retry hint."""
+    controller = AdmissionController(
+        max_concurrent=4,
+        priority_caps={DeploymentPriority.AUTO_UPDATE: 1},
+        max_queue=1
+    )
+    release = asyncio.Event()
+    
+    async def hold(priority):
+        async with controller.slot(priority):
+            await release.wait()
+    
+    running = asyncio.create_task(hold(DeploymentPriority.AUTO_UPDATE))
+    queued = asyncio.create_task(hold(DeploymentPriority.AUTO_UPDATE))
+    await asyncio.sleep(0)
+    
+    # Auto-update is at its cap, but manual work still has room
+    async with controller.slot(DeploymentPriority.MANUAL):
+        assert controller.stats()["priorities"]["manual"]["running"] == 1
+    
+    with pytest.raises(AdmissionRejected) as rejected:
+        async with controller.slot(DeploymentPriority.AUTO_UPDATE):
+            pass
+    assert rejected.value.retry_after >= 1
+    assert controller.rejected[DeploymentPriority.AUTO_UPDATE] == 1
+    
+    release.set()
+    await asyncio.gather(running, queued)
+    assert controller.running == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_already_dispatched():
+    """Test cancelling a waiter that a release already dropped from the queue."""
+    controller = AdmissionController(max_concurrent=1)
+    held = controller.slot(DeploymentPriority.MANUAL)
+    await held.__aenter__()
+    
+    async def hold():
+        async with controller.slot(DeploymentPriority.MANUAL):
+            pass
+    
+    waiting = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    assert controller.queue_depth == 1
+    
+    # The release dispatches past the cancelled waiter before it wakes up
+    waiting.cancel()
+    await held.__aexit__(None, None, None)
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    
+    assert controller.running == 0
+    assert controller.queue_depth == 0
+
+
+def test_priority_is_derived_from_the_deployment():
+    """Test security patches and auto-update policies set the priority."""
+    manifest = DeploymentManifest(id="manifest-001", version="1.0.0", platform_version="2.0.0")
+    patch = manifest.model_copy(update={"metadata": {SECURITY_PATCH_METADATA_KEY: True}})
+    auto = UpdateChannelPolicy(id="policy-001", instance_id="instance-001", policy_type=PolicyType.AUTO_UPDATE)
+    
+    assert deployment_priority(patch, auto) == DeploymentPriority.CRITICAL_PATCH
+    assert deployment_priority(manifest, auto) == DeploymentPriority.AUTO_UPDATE
+    assert deployment_priority(manifest) == DeploymentPriority.MANUAL
+    
+    # Clients can lower the priority but not claim a critical patch
+    assert deployment_priority(manifest, requested=DeploymentPriority.CRITICAL_PATCH) == DeploymentPriority.MANUAL
+    assert deployment_priority(patch, requested=DeploymentPriority.AUTO_UPDATE) == DeploymentPriority.AUTO_UPDATE
+
+
+@pytest.mark.asyncio
+async def test_executions_hold_admission_slots():
+    """Test rollouts run their deployments inside admission slots."""
+    controller = AdmissionController(max_concurrent=2)
+    engine = DeploymentEngine(admission=controller)
+    running = []
+    
+    async def deploy(deployment, manifest):
+        running.append(controller.running)
+    
+    engine.step_handlers["deploy"] = deploy
+    manifest = DeploymentManifest(id="manifest-001", version="1.0.0", platform_version="2.0.0")
+    report = await engine.rollout(manifest, [f"instance-{i:03d}" for i in range(6)], max_in_flight=6)
+    
+    assert report.succeeded == 6
+    assert running and max(running) <= 2 and min(running) >= 1
+    assert controller.stats()["priorities"]["manual"]["admitted"] == 6
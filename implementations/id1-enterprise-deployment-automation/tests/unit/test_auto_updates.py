@@ -0,0 +1,126 @@
+"""Unit tests for cron-driven auto-updates."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.models.policy import PolicyType
+from src.policies.auto_updates import AutoUpdateScheduler
+from src.policies.cron import CronError, CronSchedule
+from src.policies.maintenance_windows import MaintenanceWindowIndex
+from src.policies.policy_manager import PolicyManager
+
+
+def utc(*args):
+    """Build a UTC datetime."""
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_cron_next_fire_times():
+    """Test steps, names, shorthands and the day-of-month/day-of-week rule."""
+    assert CronSchedule.parse("*/15 * * * *").next_after(utc(2024, 1, 1, 10, 7)) == utc(2024, 1, 1, 10, 15)
+    assert CronSchedule.parse("0 2 * * sat,sun").next_after(utc(2024, 1, 1, 10, 7)) == utc(2024, 1, 6, 2, 0)
+    assert CronSchedule.parse("@hourly").next_after(utc(2024, 12, 31, 23, 30)) == utc(2025, 1, 1, 0, 0)
+    assert CronSchedule.parse("0 0 29 feb *").next_after(utc(2024, 3, 1)) == utc(2028, 2, 29)
+    # Either restricted day field matches: the 1st or any Monday
+    assert CronSchedule.parse("0 9 1 * mon").next_after(utc(2024, 1, 2)) == utc(2024, 1, 8, 9, 0)
+    assert CronSchedule.parse("0 0 30 2 *").next_after(utc(2024, 1, 1)) is None
+
+    for expression in ("* * * *", "60 * * * *", "*/0 * * * *", "5-1 * * * *", "0 0 * * someday"):
+        with pytest.raises(CronError):
+            CronSchedule.parse(expression)
+
+
+@pytest.mark.asyncio
+async def test_due_policies_fire_in_one_batch():
+    """Test 100k policies are scheduled quickly and due instances are batched."""
+    manager = PolicyManager()
+    for i in range(100000):
+        await manager.create_policy(
+            instance_id=f"instance-{i:06d}",
+            policy_type=PolicyType.AUTO_UPDATE,
+            auto_update_schedule="0 * * * *" if i % 2 else "30 2 * * *"
+        )
+    now = utc(2030, 1, 1, 0, 10)
+
+    started = time.perf_counter()
+    scheduler = AutoUpdateScheduler(lambda instance_ids, tick: asyncio.sleep(0), manager, clock=lambda: now)
+    assert time.perf_counter() - started < 5.0
+    assert scheduler.next_fire_time() == utc(2030, 1, 1, 1, 0)
+    assert scheduler.pop_due(now) == []
+
+    hourly = scheduler.pop_due(utc(2030, 1, 1, 1, 0))
+    assert len(hourly) == 50000
+    assert scheduler.next_fire_time() == utc(2030, 1, 1, 2, 0)
+
+    # A frozen policy takes over one instance, another stops auto-updating
+    await manager.create_policy(instance_id="instance-000001", policy_type=PolicyType.FROZEN, frozen_versions={})
+    disabled = manager.get_instance_policy("instance-000003")
+    await manager.update_policy(disabled.id, enabled=False)
+
+    due = scheduler.pop_due(utc(2030, 1, 1, 2, 45))
+    assert len(due) == 100000 - 2
+    assert "instance-000001" not in due and "instance-000003" not in due
+    assert scheduler.stats()["policies"] == 100000 - 1
+
+
+@pytest.mark.asyncio
+async def test_scheduler_sleeps_until_the_next_fire_time():
+    """Test the loop wakes for due fires and policy changes, not to poll."""
+    manager = PolicyManager()
+    fired = []
+    started = time.monotonic()
+    # Simulated time starting just before a minute boundary
+    base = utc(2030, 1, 1, 11, 59, 59, 800000)
+    clock = lambda: base + timedelta(seconds=time.monotonic() - started)
+
+    async def on_fire(instance_ids, tick):
+        fired.append((sorted(instance_ids), tick))
+
+    scheduler = AutoUpdateScheduler(on_fire, manager, clock=clock)
+    for i in range(3):
+        await manager.create_policy(
+            instance_id=f"instance-{i}", policy_type=PolicyType.AUTO_UPDATE, auto_update_schedule="0 12 * * *"
+        )
+    await scheduler.start()
+    await asyncio.sleep(0.5)
+    await scheduler.stop()
+
+    assert fired == [(["instance-0", "instance-1", "instance-2"], fired[0][1])]
+    assert fired[0][1] >= utc(2030, 1, 1, 12, 0)
+    assert scheduler.stats()["batches"] == 1
+    # Woken by the first policy change and the fire, then asleep until tomorrow
+    assert scheduler.wakeups <= 3
+    assert scheduler.next_fire_time() == utc(2030, 1, 2, 12, 0)
+
+
+@pytest.mark.asyncio
+async def test_fires_outside_maintenance_windows_wait_for_them_to_open():
+    """Test a cron fire outside the policy's window is deferred to its opening."""
+    manager = PolicyManager()
+    windows = MaintenanceWindowIndex(manager)
+    now = utc(2030, 1, 4, 9, 30)
+    scheduler = AutoUpdateScheduler(lambda instance_ids, tick: asyncio.sleep(0), manager, clock=lambda: now, windows=windows)
+    
+    weekend = await manager.create_policy(
+        instance_id="instance-weekend",
+        policy_type=PolicyType.AUTO_UPDATE,
+        auto_update_schedule="0 * * * *",
+        auto_update_maintenance_window={"days": ["sat"], "start": "02:00", "end": "04:00"}
+    )
+    await manager.create_policy(
+        instance_id="instance-always", policy_type=PolicyType.AUTO_UPDATE, auto_update_schedule="0 * * * *"
+    )
+    windows.set_policy(weekend, now=now)
+    
+    # Friday: only the instance without a window fires
+    assert scheduler.pop_due(utc(2030, 1, 4, 10, 0)) == ["instance-always"]
+    assert scheduler.stats()["deferred"] == 1
+    
+    # 2030-01-05 is a Saturday; the deferred fire waits for the window
+    assert sorted(scheduler.pop_due(utc(2030, 1, 5, 1, 0))) == ["instance-always"]
+    assert sorted(scheduler.pop_due(utc(2030, 1, 5, 2, 0))) == ["instance-always", "instance-weekend"]
+    assert sorted(scheduler.pop_due(utc(2030, 1, 5, 3, 0))) == ["instance-always", "instance-weekend"]
+    assert scheduler.pop_due(utc(2030, 1, 5, 4, 0)) == ["instance-always"]
@@ -0,0 +1,82 @@
+"""Unit tests for the binary record encoding."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.models.deployment import (
+    ComponentChange,
+    Deployment,
+    DeploymentManifest,
+    DeploymentStatus,
+    ManifestDelta
+)
+from src.models.rollback import RollbackRecord, RollbackStatus
+from src.utils.codec import FORMAT_VERSION, MAGIC, CodecError, decode, encode
+
+
+def sample_deployment(index: int) -> Deployment:
+    """Create a finished deployment record."""
+    return Deployment(
+        id=f"deploy-{index:04d}",
+        manifest_id="manifest-001",
+        instance_id=f"instance-{index}",
+        manifest_hash="ab" * 32,
+        status=DeploymentStatus.DEPLOYED,
+        started_at=datetime(2024, 1, 30, 10, 5),
+        completed_at=datetime(2024, 1, 30, 10, 15, tzinfo=timezone.utc),
+        completed_steps=["compile", "validate", "deploy", "health_check"],
+        delta=ManifestDelta(
+            changes=[ComponentChange(component="suite:commerce", from_version="1.5.0", to_version="1.6.0")],
+            configuration_set={"replicas": 3, "ratio": 0.5, "flags": {"beta": True, "limit": -40000}}
+        ),
+        logs=["Starting manifest compilation", "Updating suite:commerce 1.5.0 -> 1.6.0"]
+    )
+
+
+def test_records_round_trip():
+    """Test manifests, deployments and rollbacks decode to equal models."""
+    manifest = DeploymentManifest(
+        id="manifest-001",
+        version="1.0.0",
+        platform_version="2.0.0",
+        suites={"commerce": "1.5.0"},
+        configuration={"notes": "x" * 500, "raw": [None, 1.25, "é"]}
+    )
+    rollback = RollbackRecord(
+        id="rollback-001",
+        instance_id="instance-1",
+        from_manifest_id="manifest-002",
+        to_manifest_id="manifest-001",
+        status=RollbackStatus.COMPLETED
+    )
+
+    for record in [manifest, sample_deployment(1), rollback]:
+        payload = encode(record)
+        assert payload.startswith(MAGIC + bytes([FORMAT_VERSION]))
+        assert decode(payload, type(record)) == record
+
+
+def test_lists_share_interned_keys_and_values():
+    """Test a list of records is far smaller than the same records as JSON."""
+    deployments = [sample_deployment(index) for index in range(200)]
+
+    payload = encode(deployments)
+
+    assert decode(payload, Deployment) == deployments
+    assert len(payload) * 4 < sum(len(deployment.model_dump_json()) for deployment in deployments)
+
+
+def test_rejects_unknown_versions_and_corrupt_payloads():
+    """Test decoding fails loudly instead of misreading a payload."""
+    payload = encode(sample_deployment(1))
+
+    with pytest.raises(CodecError, match="version"):
+        decode(MAGIC + bytes([FORMAT_VERSION + 1]) + payload[len(MAGIC) + 1:])
+    with pytest.raises(CodecError):
+        decode(payload[:-5])
+    with pytest.raises(CodecError):
+        decode(b'{"id": "deploy-1"}')
+    with pytest.raises(CodecError):
+        encode({"value": object()})
+
@@ -1,11 +1,13 @@
 """Unit tests for deployment engine."""
 
+import asyncio
 import pytest
 from datetime import datetime
 
 from src.core.deployment_engine import DeploymentEngine
 from src.core.validator import DeploymentValidator
-from src.models.deployment import DeploymentManifest, DeploymentStatus
+from src.rollback.rollback_manager import RollbackManager
+from src.models.deployment import DeploymentManifest, DeploymentStatus, RolloutRequest
 
 
 @pytest.fixture
@@ -48,7 +50,7 @@ async def test_get_deployment(deployment_engine, sample_manifest):
         instance_id="instance-001"
     )
     
-    retrieved = deployment_engine.get_deployment(deployment.id)
+    retrieved = await deployment_engine.get_deployment(deployment.id)
     
     assert retrieved is not None
     assert retrieved.id == deployment.id
@@ -68,10 +70,10 @@ async def test_list_deployments(deployment_engine, sample_manifest):
         instance_id="instance-002"
     )
     
-    all_deployments = deployment_engine.list_deployments()
+    all_deployments = await deployment_engine.list_deployments()
     assert len(all_deployments) == 2
     
-    instance_deployments = deployment_engine.list_deployments("instance-001")
+    instance_deployments = await deployment_engine.list_deployments("instance-001")
     assert len(instance_deployments) == 1
     assert instance_deployments[0].instance_id == "instance-001"
 
@@ -106,3 +108,168 @@ async def test_deployment_validation_failure(deployment_engine):
             manifest=invalid_manifest,
             instance_id="instance-001"
         )
+
+
+@pytest.mark.asyncio
+async def test_rollout_runs_all_waves(deployment_engine, sample_manifest):
+    """Test fleet rollout across canary, percentage and remainder waves."""
+    instance_ids = [f"instance-{i:03d}" for i in range(40)]
+    
+    report = await deployment_engine.rollout(
+        manifest=sample_manifest,
+        instance_selector=instance_ids,
+        max_in_flight=8
+    )
+    
+    assert [len(w.instance_ids) for w in report.waves] == [1, 4, 35]
+    assert report.succeeded == 40
+    assert report.halted is False
+    assert report.throughput_per_minute > 0
+    assert report.p99_seconds >= report.p50_seconds
+
+
+@pytest.mark.asyncio
+async def test_rollout_halts_on_failed_health_gate(deployment_engine, sample_manifest):
+    """Test rollout stops after a wave when the health gate fails."""
+    async def failing_gate(wave):
+        return False
+    
+    report = await deployment_engine.rollout(
+        manifest=sample_manifest,
+        instance_selector=lambda: [f"instance-{i:03d}" for i in range(20)],
+        wave_sizes=(1, 0.5),
+        health_gate=failing_gate
+    )
+    
+    assert report.halted is True
+    assert len(report.waves) == 1
+    assert report.completed == 1
+
+
+@pytest.mark.asyncio
+async def test_list_deployments_by_status_and_limit(deployment_engine, sample_manifest):
+    """Test indexed lookups by status and most recent N per instance."""
+    created = []
+    for i in range(5):
+        created.append(await deployment_engine.create_deployment(
+            manifest=sample_manifest.model_copy(update={"version": f"1.0.{i}"}),
+            instance_id="instance-001"
+        ))
+    
+    await deployment_engine.execute_deployment(created[0], sample_manifest)
+    
+    deployed = await deployment_engine.list_deployments(status=DeploymentStatus.DEPLOYED)
+    assert [d.id for d in deployed] == [created[0].id]
+    assert deployment_engine.count_deployments(DeploymentStatus.PENDING) == 4
+    
+    recent = await deployment_engine.list_deployments("instance-001", limit=2)
+    assert [d.id for d in recent] == [created[3].id, created[4].id]
+    
+    pending = await deployment_engine.list_deployments(
+        "instance-001",
+        status=DeploymentStatus.PENDING,
+        limit=10
+    )
+    assert created[0].id not in [d.id for d in pending]
+    assert len(pending) == 4
+
+
+@pytest.mark.asyncio
+async def test_duplicate_requests_attach_to_running_deployment(deployment_engine, sample_manifest):
+    """Test duplicate submissions share one deployment while it is unfinished."""
+    calls = 0
+    original = deployment_engine.validator.validate_manifest
+    
+    async def counting_validate(manifest):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return await original(manifest)
+    
+    deployment_engine.validator.validate_manifest = counting_validate
+    
+    # Same content built separately, as a retried request would be
+    duplicate_manifest = sample_manifest.model_copy(update={"created_at": datetime(2024, 1, 1)})
+    concurrent = await asyncio.gather(
+        deployment_engine.create_deployment(sample_manifest, "instance-001"),
+        deployment_engine.create_deployment(duplicate_manifest, "instance-001"),
+        deployment_engine.create_deployment(sample_manifest, "instance-002")
+    )
+    assert concurrent[0].id == concurrent[1].id
+    assert concurrent[0].id != concurrent[2].id
+    assert calls == 2
+    
+    retried = await deployment_engine.create_deployment(sample_manifest, "instance-001")
+    assert retried.id == concurrent[0].id
+    
+    results = await asyncio.gather(
+        deployment_engine.execute_deployment(concurrent[0], sample_manifest),
+        deployment_engine.execute_deployment(retried, sample_manifest)
+    )
+    assert results[0] is results[1]
+    assert results[0].logs.count("Deployment completed successfully") == 1
+    assert deployment_engine.coalesced_count == 3
+    
+    # Once finished, the next request starts a fresh deployment
+    fresh = await deployment_engine.create_deployment(sample_manifest, "instance-001")
+    assert fresh.id != concurrent[0].id
+
+
+@pytest.mark.asyncio
+async def test_completion_records_history_after_manifest_eviction(sample_manifest):
+    """Test rollback history is recorded even if the manifest left the cache mid-flight."""
+    rollback_manager = RollbackManager()
+    engine = DeploymentEngine(rollback_manager=rollback_manager, max_manifests=1)
+    
+    deployment = await engine.create_deployment(sample_manifest, "instance-001")
+    other = sample_manifest.model_copy(update={"id": "manifest-002", "platform_version": "2.1.0"})
+    await engine.create_deployment(other, "instance-002")
+    assert deployment.manifest_hash not in engine.manifests
+    
+    await engine.execute_deployment(deployment, sample_manifest)
+    
+    assert deployment.status == DeploymentStatus.DEPLOYED
+    assert rollback_manager.current_version("instance-001").deployment_id == deployment.id
+    assert engine.current_manifest("instance-001") is sample_manifest
+
+
+@pytest.mark.asyncio
+async def test_deploy_applies_only_the_manifest_delta(sample_manifest):
+    """Test a follow-up deployment only applies what changed since the last one."""
+    rollback_manager = RollbackManager()
+    engine = DeploymentEngine(rollback_manager=rollback_manager)
+    applied = []
+    
+    async def record_deploy(deployment, manifest):
+        applied.append([change.component for change in deployment.delta.changes])
+    
+    engine.step_handlers["deploy"] = record_deploy
+    
+    first = await engine.create_deployment(sample_manifest, "instance-001")
+    await engine.execute_deployment(first, sample_manifest)
+    assert first.delta.base_manifest_id is None
+    assert rollback_manager.current_version("instance-001").deployment_id == first.id
+    
+    patched = sample_manifest.model_copy(update={
+        "id": "manifest-002",
+        "capabilities": {"reporting": "1.0.1"},
+        "configuration": {"replicas": 3}
+    })
+    second = await engine.create_deployment(patched, "instance-001")
+    await engine.execute_deployment(second, patched)
+    
+    assert second.status == DeploymentStatus.DEPLOYED
+    assert second.previous_manifest_id == "manifest-001"
+    assert second.delta.configuration_set == {"replicas": 3}
+    assert second.delta.unchanged_components == 2
+    assert applied == [["platform", "suite:commerce", "capability:reporting"], ["capability:reporting"]]
+    assert "Updating capability:reporting 1.0.0 -> 1.0.1" in second.logs
+
+
+def test_rollout_request_rejects_fractional_instance_counts():
+    """Test wave sizes of 1 or more must be whole instance counts."""
+    request = RolloutRequest(manifest_id="manifest-001", instance_ids=["instance-01"], wave_sizes=[2, 0.25, 1.0])
+    assert request.wave_sizes == [2, 0.25, 1]
+
+    with pytest.raises(ValueError, match="whole"):
+        RolloutRequest(manifest_id="manifest-001", instance_ids=["instance-01"], wave_sizes=[1.5])
@@ -0,0 +1,93 @@
+"""Unit tests for the deployment event bus."""
+
+import pytest
+
+from src.core.deployment_engine import DeploymentEngine
+from src.events import EventBus, SlowConsumerPolicy, TopicFilter
+from src.models.deployment import DeploymentManifest
+from src.models.event import EventType
+from src.rollback.rollback_manager import RollbackManager
+
+
+@pytest.fixture
+def sample_manifest():
+    """Create sample deployment manifest."""
+    return DeploymentManifest(
+        id="manifest-001",
+        version="1.0.0",
+        platform_version="2.0.0",
+        suites={"commerce": "1.5.0"},
+        capabilities={"reporting": "1.0.0"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_engine_and_rollbacks_publish_filtered_transitions(sample_manifest):
+    """Test subscribers only see transitions matching their topic filter."""
+    bus = EventBus()
+    engine = DeploymentEngine(events=bus)
+    rollbacks = RollbackManager(events=bus)
+    
+    watched = bus.subscribe(TopicFilter.build(instance_ids=["instance-001"]))
+    finished = bus.subscribe(TopicFilter.build(statuses=["deployed", "failed"]))
+    
+    deployment = await engine.create_deployment(sample_manifest, "instance-001")
+    other = await engine.create_deployment(sample_manifest, "instance-002")
+    await engine.execute_deployment(deployment, sample_manifest)
+    await engine.execute_deployment(other, sample_manifest)
+    rollback = await rollbacks.initiate_rollback("instance-001", "manifest-001", "manifest-000")
+    
+    statuses = []
+    while watched.pending:
+        event = await watched.get()
+        statuses.append((event.type, event.status))
+    assert statuses == [
+        (EventType.DEPLOYMENT_STATUS, "pending"),
+        (EventType.DEPLOYMENT_STATUS, "compiling"),
+        (EventType.DEPLOYMENT_STATUS, "deploying"),
+        (EventType.DEPLOYMENT_STATUS, "deployed"),
+        (EventType.ROLLBACK_STATUS, "pending"),
+    ]
+    
+    done = [await finished.get(timeout=0.1), await finished.get(timeout=0.1)]
+    assert [e.subject_id for e in done] == [deployment.id, other.id]
+    assert await finished.get(timeout=0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_rollout_events_carry_rollout_id(sample_manifest):
+    """Test a rollout subscriber receives events for every deployment in it."""
+    bus = EventBus()
+    engine = DeploymentEngine(events=bus)
+    everything = bus.subscribe()
+    
+    report = await engine.rollout(sample_manifest, ["instance-001", "instance-002"])
+    
+    events = [await everything.get() for _ in range(everything.pending)]
+    assert len(events) == 8
+    assert {e.rollout_id for e in events} == {report.rollout_id}
+    
+    by_rollout = bus.subscribe(TopicFilter.build(rollout_ids=[report.rollout_id]))
+    bus.publish(EventType.DEPLOYMENT_STATUS, "deploy-x", "instance-003", "pending", rollout_id="rollout-other")
+    bus.publish(EventType.DEPLOYMENT_STATUS, "deploy-y", "instance-003", "pending", rollout_id=report.rollout_id)
+    assert (await by_rollout.get()).subject_id == "deploy-y"
+    assert by_rollout.pending == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_policies():
+    """Test full buffers drop the oldest events or disconnect the subscriber."""
+    bus = EventBus(buffer_size=2)
+    lossy = bus.subscribe()
+    strict = bus.subscribe(policy=SlowConsumerPolicy.DISCONNECT)
+    
+    for index in range(3):
+        bus.publish(EventType.DEPLOYMENT_STATUS, f"deploy-{index}", "instance-001", "pending")
+    
+    assert lossy.take_dropped() == 1
+    assert [(await lossy.get()).subject_id for _ in range(2)] == ["deploy-1", "deploy-2"]
+    
+    assert strict.closed and strict.close_reason == "slow consumer"
+    assert strict.pending == 2
+    assert bus.stats()["disconnected"] == 1
+    assert bus.subscriber_count == 1
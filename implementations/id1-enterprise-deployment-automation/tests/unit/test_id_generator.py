@@ -0,0 +1,36 @@
+"""Unit tests for the time-ordered ID generator."""
+
+from datetime import datetime, timedelta
+
+from src.utils.id_generator import IdGenerator, id_timestamp, id_lower_bound, is_valid_id
+
+
+def test_ids_are_unique_and_monotonic():
+    """Test IDs generated in a burst never collide and sort in creation order."""
+    generator = IdGenerator()
+    
+    ids = [generator.new_id("deploy") for _ in range(10000)]
+    
+    assert len(set(ids)) == len(ids)
+    assert ids == sorted(ids)
+
+
+def test_id_timestamp_round_trip():
+    """Test the creation time can be recovered from an ID."""
+    before = datetime.utcnow() - timedelta(milliseconds=1)
+    identifier = IdGenerator().new_id("policy")
+    after = datetime.utcnow() + timedelta(milliseconds=1)
+    
+    assert is_valid_id(identifier, prefix="policy")
+    assert before <= id_timestamp(identifier) <= after
+
+
+def test_id_lower_bound_supports_range_scans():
+    """Test lower bounds split IDs by creation time."""
+    generator = IdGenerator()
+    earlier = generator.new_id("deploy")
+    boundary = id_lower_bound("deploy", id_timestamp(earlier) + timedelta(milliseconds=1))
+    later = generator.new_id("deploy")
+    
+    assert earlier < boundary
+    assert later > earlier
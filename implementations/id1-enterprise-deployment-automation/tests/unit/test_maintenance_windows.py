@@ -0,0 +1,103 @@
+"""Unit tests for maintenance windows."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.models.deployment import DeploymentManifest
+from src.models.policy import PolicyType
+from src.policies.maintenance_windows import MaintenanceSchedule, MaintenanceWindowError, MaintenanceWindowIndex
+from src.policies.policy_enforcer import PolicyEnforcer
+from src.policies.policy_manager import PolicyManager
+
+
+OVERNIGHT = {
+    "timezone": "America/New_York",
+    "windows": [{"days": ["sat"], "start": "22:00", "end": "02:00"}],
+    "blackout_dates": ["2024-12-28"],
+}
+
+
+def utc(*args):
+    """Build a UTC datetime."""
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_schedule_handles_midnight_timezones_and_blackouts():
+    """Test overnight windows in a local timezone, across DST and blackout dates."""
+    schedule = MaintenanceSchedule.parse(OVERNIGHT)
+
+    # Saturday 2024-06-15 22:00 EDT is 02:00 UTC on Sunday
+    assert schedule.contains(utc(2024, 6, 16, 2, 30))
+    assert schedule.contains(utc(2024, 6, 16, 5, 59))
+    assert not schedule.contains(utc(2024, 6, 16, 6, 0))
+    assert not schedule.contains(utc(2024, 6, 15, 2, 30))
+    # Winter time, and a blackout Saturday
+    assert schedule.contains(utc(2024, 12, 22, 3, 0))
+    assert not schedule.contains(utc(2024, 12, 29, 3, 0))
+
+    intervals = schedule.open_intervals(utc(2024, 12, 16), 2)
+    assert intervals == [
+        (utc(2024, 12, 22, 3), utc(2024, 12, 22, 7)),
+        (utc(2025, 1, 5, 3), utc(2025, 1, 5, 7)),
+    ]
+
+    for config in ({"start": "02:00", "end": "02:00"}, {"timezone": "Mars/Base", "start": "01:00"},
+                   {"days": ["someday"], "start": "01:00"}, {"windows": []}):
+        with pytest.raises(MaintenanceWindowError):
+            MaintenanceSchedule.parse(config)
+
+
+@pytest.mark.asyncio
+async def test_index_tracks_policy_changes():
+    """Test the index answers from precomputed intervals and follows policy updates."""
+    manager = PolicyManager()
+    index = MaintenanceWindowIndex(manager, intervals_per_policy=2)
+    weekend = await manager.create_policy(instance_id="instance-weekend", policy_type=PolicyType.AUTO_UPDATE)
+    await manager.create_policy(instance_id="instance-always", policy_type=PolicyType.AUTO_UPDATE)
+    await manager.update_policy(weekend.id, auto_update_maintenance_window={"days": ["sat", "sun"], "start": "02:00", "end": "04:00"})
+    assert weekend.id in index
+    assert index.stats() == {"policies": 1, "intervals": 2}
+
+    # 2030-01-05 is a Saturday
+    index.set_policy(weekend, now=utc(2030, 1, 1))
+    assert index.is_open(weekend.id, utc(2030, 1, 5, 3))
+    assert not index.is_open(weekend.id, utc(2030, 1, 5, 5))
+    assert index.open_instances(utc(2030, 1, 5, 3)) == ["instance-weekend"]
+    assert index.open_instances(utc(2030, 1, 5, 5)) == []
+    assert index.next_open(weekend.id, utc(2030, 1, 5, 5)) == utc(2030, 1, 6, 2)
+    # Past the precomputed intervals, which are recomputed from there
+    assert index.is_open(weekend.id, utc(2030, 1, 12, 3))
+    assert index.next_open(weekend.id, utc(2030, 1, 13, 5)) == utc(2030, 1, 19, 2)
+    assert index.is_open("policy-without-window")
+
+    with pytest.raises(MaintenanceWindowError):
+        await manager.update_policy(weekend.id, auto_update_maintenance_window={"start": "25:00"})
+
+    await manager.update_policy(weekend.id, auto_update_maintenance_window=None)
+    assert weekend.id not in index
+    assert index.stats() == {"policies": 0, "intervals": 0}
+
+
+@pytest.mark.asyncio
+async def test_enforcer_denies_auto_updates_outside_the_window():
+    """Test auto-updates are only allowed while the window is open."""
+    manager = PolicyManager()
+    enforcer = PolicyEnforcer(manager)
+    policy = await manager.create_policy(instance_id="instance-001", policy_type=PolicyType.AUTO_UPDATE)
+    target = DeploymentManifest(id="manifest-1", version="1.0.0", platform_version="2.0.0", suites={}, capabilities={})
+    now = datetime.now(timezone.utc)
+
+    closed = {"start": f"{(now.hour + 2) % 24:02d}:00", "end": f"{(now.hour + 3) % 24:02d}:00"}
+    await manager.update_policy(policy.id, auto_update_maintenance_window=closed)
+    assert await enforcer.can_deploy(policy, target) == (False, "Not in maintenance window")
+
+    await manager.update_policy(policy.id, auto_update_maintenance_window={"start": "00:00", "end": "24:00"})
+    assert await enforcer.can_deploy(policy, target) == (True, None)
+
+    # Legacy configurations that bypassed validation deny rather than fail open
+    policy.auto_update_maintenance_window = {"start": "nope"}
+    policy.revision += 1
+    allowed, reason = await enforcer.can_deploy(policy, target)
+    assert not allowed
+    assert reason.startswith("Invalid maintenance window")
@@ -0,0 +1,131 @@
+"""Unit tests for the manifest compiler."""
+
+from datetime import datetime
+
+import pytest
+
+from src.core.manifest_compiler import ManifestCompiler
+from src.models.deployment import ManifestCompileRequest
+from src.models.version import Version
+from src.versioning.resolver import DependencyResolver, StaticCatalog
+
+
+def version(component_type, name, version_string, dependencies=None):
+    """Build a catalog version."""
+    return Version(
+        id=f"{component_type}-{name}-{version_string}",
+        component_type=component_type,
+        component_name=name,
+        version_string=version_string,
+        release_date=datetime(2024, 1, 1),
+        dependencies=dependencies or {}
+    )
+
+
+@pytest.mark.asyncio
+async def test_identical_inputs_share_one_compiled_manifest():
+    """Test manifests are deduplicated by the content hash of their inputs."""
+    compiler = ManifestCompiler()
+    suites = {"commerce": "1.5.0", "mlas": "1.2.0"}
+
+    first = await compiler.compile_manifest("2.0.0", suites, {"reporting": "1.0.0"}, {"replicas": 3})
+    # Same content in a different key order is the same manifest
+    second = await compiler.compile_manifest(
+        "2.0.0", {"mlas": "1.2.0", "commerce": "1.5.0"}, {"reporting": "1.0.0"}, {"replicas": 3}
+    )
+    other = await compiler.compile_manifest("2.0.0", suites, {"reporting": "1.0.0"}, {"replicas": 5})
+
+    assert second is first
+    assert other.id != first.id
+    assert compiler.cache_stats() == {"hits": 1, "misses": 2, "hit_rate": 0.3333, "manifests": 2}
+
+    # Mutating the caller's inputs does not alter the cached manifest
+    suites["commerce"] = "9.9.9"
+    assert first.suites["commerce"] == "1.5.0"
+    assert compiler.get_manifest_by_hash(first.metadata["content_hash"]) is first
+
+
+def catalog_compiler():
+    """Build a compiler over a small catalog with one conflicting suite version."""
+    available = {
+        "platform:webwaka-platform": [version("platform", "webwaka-platform", "2.0.0")],
+        "suite:commerce": [
+            version("suite", "commerce", "1.5.0", {"reporting": ">=1.0.0"}),
+            version("suite", "commerce", "1.6.0", {"reporting": ">=2.0.0"}),
+        ],
+        "capability:reporting": [
+            version("capability", "reporting", "1.0.0"),
+            version("capability", "reporting", "1.1.0"),
+        ],
+    }
+    return ManifestCompiler(DependencyResolver(StaticCatalog(available)), max_workers=2)
+
+
+@pytest.mark.asyncio
+async def test_compile_many_reports_per_item_results():
+    """Test a batch resolves in worker processes and fails items individually."""
+    compiler = catalog_compiler()
+    good = ManifestCompileRequest(platform_version="2.0.0", suites={"commerce": "1.5.0"})
+    requests = [
+        good,
+        ManifestCompileRequest(platform_version="2.0.0", suites={"commerce": "1.6.0"}),
+        ManifestCompileRequest(platform_version=""),
+        good,
+    ]
+
+    try:
+        results = [result async for result in compiler.compile_many(requests)]
+    finally:
+        await compiler.stop()
+    by_index = {result.index: result for result in results}
+
+    assert sorted(by_index) == [0, 1, 2, 3]
+    assert by_index[0].resolved_versions == {
+        "platform": "2.0.0",
+        "suite:commerce": "1.5.0",
+        "capability:reporting": "1.1.0"
+    }
+    assert by_index[3].manifest is by_index[0].manifest
+    assert by_index[1].manifest is None
+    assert "capability:reporting" in by_index[1].error
+    assert by_index[2].error == "Platform version is required"
+
+
+@pytest.mark.asyncio
+async def test_single_and_batch_compiles_agree():
+    """Test resolving single compiles match batches and cached items skip the pool."""
+    compiler = catalog_compiler()
+
+    # Single compiles only resolve when asked to
+    unresolved = await compiler.compile_manifest("2.0.0", {"commerce": "1.5.0", "unlisted": "1.0.0"}, {})
+    assert "resolved_versions" not in unresolved.metadata
+
+    single = await compiler.compile_manifest("2.0.0", {"commerce": "1.5.0"}, {}, resolve=True)
+    assert single.metadata["resolved_versions"]["capability:reporting"] == "1.1.0"
+    with pytest.raises(ValueError, match="capability:reporting"):
+        await compiler.compile_manifest("2.0.0", {"commerce": "1.6.0"}, {}, resolve=True)
+
+    request = ManifestCompileRequest(platform_version="2.0.0", suites={"commerce": "1.5.0"})
+    results = [result async for result in compiler.compile_many([request, request])]
+
+    assert [result.manifest for result in results] == [single, single]
+    assert results[0].resolved_versions == single.metadata["resolved_versions"]
+    # Nothing was left to resolve, so no worker pool was started
+    assert compiler._pool is None
+    await compiler.stop()
+
+
+@pytest.mark.asyncio
+async def test_catalog_changes_recompile_resolved_manifests():
+    """Test a resolved manifest is not reused once the catalog changes."""
+    compiler = catalog_compiler()
+    catalog = compiler.resolver.catalog
+
+    before = await compiler.compile_manifest("2.0.0", {"commerce": "1.5.0"}, {}, resolve=True)
+    catalog.version_index["capability:reporting"].append(version("capability", "reporting", "1.2.0"))
+    catalog.generation += 1
+    after = await compiler.compile_manifest("2.0.0", {"commerce": "1.5.0"}, {}, resolve=True)
+
+    assert after is not before
+    assert after.metadata["resolved_versions"]["capability:reporting"] == "1.2.0"
+    assert after.metadata["content_hash"] != before.metadata["content_hash"]
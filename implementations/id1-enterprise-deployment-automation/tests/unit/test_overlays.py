@@ -0,0 +1,96 @@
+"""Unit tests for layered manifest overlays."""
+
+import copy
+import tracemalloc
+
+import pytest
+
+from src.core.manifest_compiler import ManifestCompiler
+from src.core.overlays import ManifestOverlayStore
+from src.utils.hashing import manifest_hash
+
+
+async def production_store():
+    """Build a store with a base manifest and a production overlay."""
+    compiler = ManifestCompiler()
+    base = await compiler.compile_manifest(
+        "2.0.0",
+        {"commerce": "1.5.0"},
+        {"reporting": "1.0.0"},
+        {
+            "replicas": 2,
+            "features": {"beta_checkout": False, "dark_mode": True},
+            "limits": {f"quota_{i}": {"soft": i, "hard": i * 2} for i in range(200)}
+        }
+    )
+    store = ManifestOverlayStore(compiler)
+    production = store.add_overlay(base.id, name="production", configuration={"replicas": 3})
+    return store, base, production
+
+
+@pytest.mark.asyncio
+async def test_overlays_resolve_with_structural_sharing():
+    """Test instance manifests merge their overrides and share the rest."""
+    store, base, production = await production_store()
+    overlay = store.add_overlay(
+        production.id,
+        instance_id="instance-01",
+        capabilities={"reporting": "1.1.0"},
+        configuration={"features": {"beta_checkout": True}}
+    )
+
+    manifest = store.resolve_for_instance("instance-01")
+    parent = store.resolve(production.id)
+
+    assert manifest.id == overlay.id
+    assert manifest.capabilities == {"reporting": "1.1.0"}
+    assert manifest.configuration["replicas"] == 3
+    assert manifest.configuration["features"] == {"beta_checkout": True, "dark_mode": True}
+    assert manifest.metadata == {"base_manifest_id": base.id, "overlay_ids": [production.id, overlay.id]}
+    assert manifest.suites is base.suites
+    assert manifest.configuration["limits"] is base.configuration["limits"]
+    assert parent.configuration["features"] == {"beta_checkout": False, "dark_mode": True}
+
+    # Resolved manifests hash and serialize like any other manifest
+    assert manifest_hash(manifest) != manifest_hash(parent)
+    assert store.resolve(overlay.id) is manifest
+    assert store.cache_stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_updating_an_overlay_invalidates_everything_on_top_of_it():
+    """Test cached resolutions of an overlay and its descendants are dropped on update."""
+    store, _, production = await production_store()
+    store.add_overlay(production.id, instance_id="instance-01", configuration={"features": {"dark_mode": False}})
+    assert store.resolve_for_instance("instance-01").configuration["replicas"] == 3
+
+    store.update_overlay(production.id, configuration={"replicas": 4})
+
+    manifest = store.resolve_for_instance("instance-01")
+    assert manifest.configuration["replicas"] == 4
+    assert manifest.configuration["features"] == {"beta_checkout": False, "dark_mode": False}
+
+    with pytest.raises(ValueError):
+        store.remove_overlay(production.id)
+
+
+@pytest.mark.asyncio
+async def test_instance_manifests_cost_about_their_overrides():
+    """Test a fleet of resolved instance manifests is far smaller than deep copies."""
+    store, _, production = await production_store()
+    parent = store.resolve(production.id)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    manifests = [
+        store.resolve(store.add_overlay(production.id, instance_id=f"instance-{i}", configuration={"replicas": i}).id)
+        for i in range(1000)
+    ]
+    shared = tracemalloc.get_traced_memory()[0] - before
+    copies = [parent.model_copy(deep=True) for _ in range(1000)]
+    copied = tracemalloc.get_traced_memory()[0] - before - shared
+    tracemalloc.stop()
+
+    assert manifests[10].configuration["replicas"] == 10
+    assert len(copies) == len(manifests)
+    assert shared * 10 < copied
@@ -0,0 +1,108 @@
+"""Unit tests for the stage-parallel deployment pipeline."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.core.deployment_engine import DeploymentEngine
+from src.core.pipeline import DeploymentPipeline
+from src.models.deployment import DeploymentManifest, DeploymentStatus
+
+
+@pytest.fixture
+def sample_manifest():
+    """Create sample deployment manifest."""
+    return DeploymentManifest(
+        id="manifest-001",
+        version="1.0.0",
+        platform_version="2.0.0",
+        suites={"commerce": "1.5.0"},
+        capabilities={"reporting": "1.0.0"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_overlaps_slow_stage(sample_manifest):
+    """Test deployments overlap in a slow stage that has several workers."""
+    async def slow_health_check(deployment, manifest):
+        await asyncio.sleep(0.05)
+
+    engine = DeploymentEngine(step_handlers={"health_check": slow_health_check})
+    pipeline = DeploymentPipeline(engine, workers={"health_check": 8}, default_workers=1)
+
+    deployments = [
+        await engine.create_deployment(sample_manifest, f"instance-{i:03d}")
+        for i in range(8)
+    ]
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        pipeline.submit(deployment, sample_manifest) for deployment in deployments
+    ))
+    elapsed = time.perf_counter() - started
+    await pipeline.stop()
+
+    assert all(d.status == DeploymentStatus.DEPLOYED for d in results)
+    # Sequential execution would take at least 8 * 0.05s
+    assert elapsed < 0.3
+
+    stages = {stage["stage"]: stage for stage in pipeline.summary()}
+    assert list(stages) == ["compile", "validate", "deploy", "health_check"]
+    assert all(stage["processed"] == 8 for stage in stages.values())
+    assert stages["health_check"]["avg_service_seconds"] >= 0.05
+    assert stages["health_check"]["queue_depth"] == 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_step_failure(sample_manifest):
+    """Test a failing step fails the deployment without stalling the stage."""
+    async def flaky_deploy(deployment, manifest):
+        if deployment.instance_id == "instance-bad":
+            raise RuntimeError("agent unreachable")
+
+    engine = DeploymentEngine(step_handlers={"deploy": flaky_deploy})
+    pipeline = DeploymentPipeline(engine, default_workers=1)
+
+    bad = await engine.create_deployment(sample_manifest, "instance-bad")
+    good = await engine.create_deployment(sample_manifest, "instance-good")
+
+    results = await asyncio.gather(
+        pipeline.submit(bad, sample_manifest),
+        pipeline.submit(good, sample_manifest)
+    )
+    await pipeline.stop()
+
+    assert results[0].status == DeploymentStatus.FAILED
+    assert results[0].error_message == "agent unreachable"
+    assert results[1].status == DeploymentStatus.DEPLOYED
+
+    stages = {stage["stage"]: stage for stage in pipeline.summary()}
+    assert stages["deploy"]["failed"] == 1
+    assert stages["health_check"]["processed"] == 1
+    assert engine.count_deployments(DeploymentStatus.FAILED) == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_and_engine_share_one_execution(sample_manifest):
+    """Test a deployment executed on both paths at once runs its steps once."""
+    calls = []
+
+    async def slow_deploy(deployment, manifest):
+        calls.append(deployment.id)
+        await asyncio.sleep(0.05)
+
+    engine = DeploymentEngine(step_handlers={"deploy": slow_deploy})
+    pipeline = DeploymentPipeline(engine, default_workers=1)
+    deployment = await engine.create_deployment(sample_manifest, "instance-001")
+
+    results = await asyncio.gather(
+        pipeline.submit(deployment, sample_manifest),
+        engine.execute_deployment(deployment, sample_manifest),
+        pipeline.submit(deployment, sample_manifest)
+    )
+    await pipeline.stop()
+
+    assert calls == [deployment.id]
+    assert all(result.status == DeploymentStatus.DEPLOYED for result in results)
+    assert engine.coalesced_count == 2
@@ -0,0 +1,140 @@
+"""Unit tests for the fleet dry-run planner."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.core.deployment_engine import DeploymentEngine
+from src.models.deployment import DeploymentManifest, PlanAction
+from src.models.policy import PolicyType
+from src.policies.policy_manager import PolicyManager
+from src.versioning.version_pinner import VersionPinner
+
+
+def make_manifest(commerce_version: str) -> DeploymentManifest:
+    """Create a manifest differing only in the commerce suite version."""
+    return DeploymentManifest(
+        id=f"manifest-{commerce_version}",
+        version="1.0.0",
+        platform_version="2.0.0",
+        suites={"commerce": commerce_version},
+        capabilities={"reporting": "1.0.0"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_plan_groups_instances_and_reports_blockers():
+    """Test the plan reports changes, pins and policies per effective state."""
+    engine = DeploymentEngine()
+    policies = PolicyManager()
+    pinner = VersionPinner()
+    current = make_manifest("1.5.0")
+    
+    for instance_id in ["instance-001", "instance-002", "instance-003", "instance-004"]:
+        deployment = await engine.create_deployment(current, instance_id)
+        await engine.execute_deployment(deployment, current)
+    
+    await policies.create_policy("instance-002", PolicyType.MANUAL_APPROVAL)
+    await pinner.pin_version("instance-003", "suite", "commerce", "1.5.0")
+    await pinner.pin_version(
+        "instance-004", "suite", "commerce", "1.4.0",
+        expires_at=datetime.utcnow() - timedelta(days=1)
+    )
+    
+    plan = await engine.plan_rollout(
+        make_manifest("1.6.0"),
+        ["instance-001", "instance-002", "instance-003", "instance-004", "instance-new"],
+        policy_lookup=policies.get_instance_policies,
+        pin_lookup=pinner.get_active_pins
+    )
+    
+    by_instance = {i: g for g in plan.groups for i in g.instance_ids}
+    assert (plan.to_update, plan.blocked, plan.unchanged) == (3, 2, 0)
+    
+    # Expired pins do not count, so instance-004 shares instance-001's state
+    assert by_instance["instance-001"] is by_instance["instance-004"]
+    assert by_instance["instance-001"].action == PlanAction.UPDATE
+    assert [c.component for c in by_instance["instance-001"].changes] == ["suite:commerce"]
+    
+    assert by_instance["instance-002"].blockers == ["Policy manual_approval: Manual approval required"]
+    assert by_instance["instance-003"].blockers == ["Pin suite:commerce=1.5.0"]
+    assert len(by_instance["instance-new"].changes) == 3
+    
+    # Planning leaves no trace
+    assert len(engine.deployments) == 4
+    assert len(pinner.pins) == 2
+    
+    unchanged = await engine.plan_rollout(current, ["instance-001"])
+    assert unchanged.unchanged == 1
+    assert unchanged.estimated_total_seconds == 0
+
+
+@pytest.mark.asyncio
+async def test_plan_scales_with_distinct_states():
+    """Test a 10k instance fleet is planned well under a second."""
+    engine = DeploymentEngine()
+    policies = PolicyManager()
+    instance_ids = [f"instance-{i:05d}" for i in range(10000)]
+    
+    deployed = make_manifest("1.5.0")
+    engine.manifests["current"] = deployed
+    for index, instance_id in enumerate(instance_ids):
+        engine.current_manifests[instance_id] = "current"
+        policy_type = PolicyType.AUTO_UPDATE if index % 2 else PolicyType.MANUAL_APPROVAL
+        await policies.create_policy(instance_id, policy_type)
+    
+    plan = await engine.plan_rollout(
+        make_manifest("1.6.0"),
+        instance_ids,
+        policy_lookup=policies.get_instance_policies,
+        max_in_flight=100
+    )
+    
+    assert len(plan.groups) == 2
+    assert plan.to_update == 5000
+    assert plan.blocked == 5000
+    assert plan.planning_seconds < 1.0
+
+
+@pytest.mark.asyncio
+async def test_rollout_deploys_exactly_what_the_plan_allows():
+    """Test instances the plan blocks are not deployed by the rollout."""
+    pinner = VersionPinner()
+    engine = DeploymentEngine(pin_lookup=pinner.get_active_pins)
+    policies = PolicyManager()
+    instance_ids = ["instance-001", "instance-002", "instance-003"]
+    
+    await policies.create_policy("instance-002", PolicyType.MANUAL_APPROVAL)
+    await pinner.pin_version("instance-003", "suite", "commerce", "1.5.0")
+    
+    manifest = make_manifest("1.6.0")
+    plan = await engine.plan_rollout(manifest, instance_ids, policy_lookup=policies.get_instance_policies)
+    report = await engine.rollout(manifest, instance_ids, policy_lookup=policies.get_instance_policy)
+    
+    blocked = {i for g in plan.groups if g.action == PlanAction.BLOCKED for i in g.instance_ids}
+    deployed = {d.instance_id for wave in report.waves for d in wave.deployments}
+    assert blocked == {"instance-002", "instance-003"}
+    assert deployed == {"instance-001"}
+
+
+@pytest.mark.asyncio
+async def test_plan_handles_evicted_current_manifests():
+    """Test an evicted current manifest is reported instead of guessed."""
+    engine = DeploymentEngine(max_manifests=1)
+    current = make_manifest("1.5.0")
+    deployment = await engine.create_deployment(current, "instance-001")
+    await engine.execute_deployment(deployment, current)
+    
+    # Deploying another manifest elsewhere evicts instance-001's
+    other = make_manifest("1.7.0")
+    deployment = await engine.create_deployment(other, "instance-002")
+    await engine.execute_deployment(deployment, other)
+    assert len(engine.manifests) == 1
+    
+    unchanged = await engine.plan_rollout(make_manifest("1.5.0"), ["instance-001"])
+    assert unchanged.unchanged == 1
+    assert unchanged.groups[0].baseline_known
+    
+    update = await engine.plan_rollout(make_manifest("1.6.0"), ["instance-001"])
+    assert update.to_update == 1
+    assert not update.groups[0].baseline_known
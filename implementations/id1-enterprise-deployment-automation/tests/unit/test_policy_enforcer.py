@@ -0,0 +1,78 @@
+"""Unit tests for policy enforcement."""
+
+import time
+
+import pytest
+
+from src.models.deployment import DeploymentManifest
+from src.models.policy import PolicyType
+from src.policies.policy_enforcer import PolicyEnforcer
+from src.policies.policy_manager import PolicyManager
+
+
+def manifest(platform_version="2.0.0", commerce="1.5.0"):
+    """Build a manifest."""
+    return DeploymentManifest(
+        id="manifest-1",
+        version="1.0.0",
+        platform_version=platform_version,
+        suites={"commerce": commerce},
+        capabilities={}
+    )
+
+
+@pytest.mark.asyncio
+async def test_frozen_policy_decisions():
+    """Test frozen policies only allow their versions, or permitted security patches."""
+    manager = PolicyManager()
+    enforcer = PolicyEnforcer(manager)
+    policy = await manager.create_policy(
+        instance_id="instance-001",
+        policy_type=PolicyType.FROZEN,
+        frozen_versions={"platform": "2.0.0", "suite:commerce": "1.5.0"}
+    )
+
+    assert await enforcer.can_deploy(policy, manifest()) == (True, None)
+    assert await enforcer.can_deploy(policy, manifest(commerce="1.6.0")) == (
+        False, "Suite commerce version does not match frozen version"
+    )
+    assert await enforcer.can_deploy(policy, manifest(platform_version="2.1.0"), is_security_patch=True) == (True, None)
+
+    await manager.update_policy(policy.id, enabled=False)
+    assert await enforcer.can_deploy(policy, manifest()) == (False, "Policy is disabled")
+
+
+@pytest.mark.asyncio
+async def test_can_deploy_many_caches_until_a_policy_changes():
+    """Test fleet decisions are cached per policy revision and manifest."""
+    manager = PolicyManager()
+    enforcer = PolicyEnforcer(manager)
+    instance_ids = [f"instance-{i:05d}" for i in range(10000)]
+    for i, instance_id in enumerate(instance_ids):
+        if i % 2:
+            await manager.create_policy(instance_id=instance_id, policy_type=PolicyType.AUTO_UPDATE)
+        else:
+            await manager.create_policy(
+                instance_id=instance_id,
+                policy_type=PolicyType.FROZEN,
+                frozen_versions={"platform": "2.0.0", "suite:commerce": "1.5.0"}
+            )
+    target = manifest(commerce="1.6.0")
+
+    started = time.perf_counter()
+    decisions = await enforcer.can_deploy_many(target, instance_ids + ["instance-unmanaged"])
+    elapsed = time.perf_counter() - started
+
+    assert sum(allowed for allowed, _ in decisions.values()) == 5001
+    assert decisions["instance-unmanaged"] == (True, None)
+    assert elapsed < 1.0
+
+    frozen = manager.get_instance_policy("instance-00000")
+    await manager.update_policy(frozen.id, frozen_versions={"platform": "2.0.0", "suite:commerce": "1.6.0"})
+
+    decisions = await enforcer.can_deploy_many(target, instance_ids)
+    assert decisions["instance-00000"] == (True, None)
+    assert decisions["instance-00002"][0] is False
+    # Only the updated policy was evaluated again
+    assert enforcer.cache_stats()["misses"] == 10001
+    assert enforcer.cache_stats()["hits"] == 9999
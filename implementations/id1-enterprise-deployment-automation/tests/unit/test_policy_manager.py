@@ -112,3 +112,37 @@ async def test_list_policies(policy_manager):
     instance_policies = policy_manager.list_policies("instance-001")
     assert len(instance_policies) == 1
     assert instance_policies[0].instance_id == "instance-001"
+
+
+@pytest.mark.asyncio
+async def test_instance_policy_precedence(policy_manager):
+    """Test the most restrictive enabled policy applies unless priority says otherwise."""
+    auto = await policy_manager.create_policy(
+        instance_id="instance-001",
+        policy_type=PolicyType.AUTO_UPDATE
+    )
+    frozen = await policy_manager.create_policy(
+        instance_id="instance-001",
+        policy_type=PolicyType.FROZEN
+    )
+    manual = await policy_manager.create_policy(
+        instance_id="instance-001",
+        policy_type=PolicyType.MANUAL_APPROVAL
+    )
+    
+    assert policy_manager.get_instance_policy("instance-001").id == frozen.id
+    assert [p.id for p in policy_manager.list_policies("instance-001")] == [frozen.id, manual.id, auto.id]
+    
+    await policy_manager.update_policy(frozen.id, enabled=False)
+    assert policy_manager.get_instance_policy("instance-001").id == manual.id
+    
+    await policy_manager.update_policy(auto.id, priority=10)
+    assert policy_manager.get_instance_policies(["instance-001", "instance-002"]) == {"instance-001": auto}
+    
+    # Moving a policy to another instance re-indexes both instances
+    await policy_manager.update_policy(auto.id, instance_id="instance-002")
+    assert policy_manager.get_instance_policy("instance-001").id == manual.id
+    assert policy_manager.get_instance_policy("instance-002").id == auto.id
+    
+    await policy_manager.delete_policy(manual.id)
+    assert policy_manager.get_instance_policy("instance-001") is None
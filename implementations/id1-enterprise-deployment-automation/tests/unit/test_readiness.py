@@ -0,0 +1,95 @@
+"""Unit tests for instance readiness probing."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.core.readiness import ReadinessProber
+from src.core.validator import DeploymentValidator
+from src.models.deployment import DeploymentManifest
+
+
+GB = 1024 * 1024 * 1024
+
+
+def stub_agent(latency=0.0, slow=(), free_bytes=None, versions=None):
+    """Build a transport answering like an instance agent."""
+    requests = []
+
+    async def handler(request):
+        instance_id = request.url.host.split(".")[0]
+        requests.append((instance_id, request.url.path))
+        await asyncio.sleep(5.0 if instance_id in slow else latency)
+
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"status": "ok"})
+        if request.url.path == "/disk":
+            return httpx.Response(200, json={"free_bytes": (free_bytes or {}).get(instance_id, 50 * GB)})
+        return httpx.Response(200, json={"platform_version": (versions or {}).get(instance_id, "2.0.0")})
+
+    return httpx.MockTransport(handler), requests
+
+
+def manifest():
+    """Build a manifest."""
+    return DeploymentManifest(
+        id="manifest-1",
+        version="1.0.0",
+        platform_version="2.0.0",
+        suites={},
+        capabilities={}
+    )
+
+
+@pytest.mark.asyncio
+async def test_readiness_reports_failed_probes():
+    """Test timeouts, low disk space and downgrades are reported."""
+    transport, _ = stub_agent(
+        slow={"instance-slow"},
+        free_bytes={"instance-full": GB // 2},
+        versions={"instance-newer": "2.1.0"}
+    )
+    prober = ReadinessProber("http://{instance_id}.agents.test", probe_timeout=0.1, transport=transport)
+    validator = DeploymentValidator(prober=prober)
+
+    results = await validator.validate_readiness_many(
+        ["instance-ok", "instance-slow", "instance-full", "instance-newer"], manifest()
+    )
+    await prober.aclose()
+
+    assert results["instance-ok"].is_valid
+    assert results["instance-ok"].warnings == []
+    assert not results["instance-slow"].is_valid
+    assert "connectivity: timed out after 0.1s" in results["instance-slow"].errors
+    assert results["instance-full"].errors == ["Instance instance-full has 512 MB free disk, 1024 MB required"]
+    assert results["instance-newer"].is_valid
+    assert "newer than 2.0.0" in results["instance-newer"].warnings[0]
+
+
+@pytest.mark.asyncio
+async def test_probes_a_large_wave_concurrently_and_caches_results():
+    """Test 1,000 instances are probed in seconds and reused within the TTL."""
+    transport, requests = stub_agent(latency=0.05)
+    prober = ReadinessProber("http://{instance_id}.agents.test", transport=transport)
+    validator = DeploymentValidator(prober=prober)
+    wave = [f"instance-{i:04d}" for i in range(1000)]
+
+    started = time.perf_counter()
+    results = await validator.validate_readiness_many(wave, manifest())
+    elapsed = time.perf_counter() - started
+
+    assert all(result.is_valid for result in results.values())
+    assert len(requests) == 3000
+    assert elapsed < 5.0
+
+    await validator.validate_deployment_readiness("instance-0001", manifest())
+    await validator.validate_readiness_many(wave[:10], manifest())
+    assert len(requests) == 3000
+    assert prober.stats()["cache_hits"] == 11
+
+    prober.invalidate("instance-0001")
+    await validator.validate_deployment_readiness("instance-0001", manifest())
+    assert len(requests) == 3003
+    await prober.aclose()
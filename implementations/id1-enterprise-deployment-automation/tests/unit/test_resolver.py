@@ -0,0 +1,225 @@
+"""Unit tests for the dependency resolver."""
+
+import itertools
+import random
+import time
+from datetime import datetime
+
+import pytest
+
+from src.core.manifest_compiler import ManifestCompiler
+from src.models.deployment import DeploymentManifest
+from src.models.version import Version, VersionConstraint
+from src.versioning.resolver import ConstraintError, DependencyResolver, StaticCatalog, parse_constraint
+from src.versioning.semver import SemVer
+from src.versioning.version_manager import VersionManager
+
+
+def version(component_type, name, version_string, dependencies=None):
+    """Build a catalog version."""
+    return Version(
+        id=f"{component_type}-{name}-{version_string}",
+        component_type=component_type,
+        component_name=name,
+        version_string=version_string,
+        release_date=datetime(2024, 1, 1),
+        dependencies=dependencies or {}
+    )
+
+
+def catalog(*versions):
+    """Index versions by component key."""
+    index = {}
+    for v in versions:
+        index.setdefault(f"{v.component_type}:{v.component_name}", []).append(v)
+    return index
+
+
+def test_backtracks_to_the_newest_consistent_versions():
+    """Test a conflicting newest version is abandoned for an older one."""
+    resolver = DependencyResolver(StaticCatalog(catalog(
+        version("suite", "commerce", "1.5.0", {"core": ">=2.0.0", "reporting": ">=2.0.0"}),
+        version("suite", "commerce", "1.6.0", {"core": ">=3.0.0", "reporting": "<2.0.0"}),
+        version("capability", "core", "2.0.0"),
+        version("capability", "core", "3.0.0", {"reporting": ">=2.0.0"}),
+        version("capability", "reporting", "1.0.0"),
+        version("capability", "reporting", "2.0.0"),
+    )))
+
+    result = resolver.resolve([
+        VersionConstraint(component_type="suite", component_name="commerce", constraint=">=1.5.0,<2.0.0")
+    ])
+
+    assert result.is_resolved
+    assert result.resolved == {
+        "suite:commerce": "1.5.0",
+        "capability:core": "3.0.0",
+        "capability:reporting": "2.0.0"
+    }
+    assert result.backjumps >= 1
+
+
+def test_reports_conflicting_constraints():
+    """Test an unsatisfiable request names the constraints that conflict."""
+    resolver = DependencyResolver(StaticCatalog(catalog(
+        version("suite", "commerce", "1.5.0", {"core": ">=3.0.0"}),
+        version("capability", "core", "2.0.0"),
+        version("capability", "core", "3.0.0"),
+    )))
+
+    result = resolver.resolve_requirements({"suite:commerce": "*", "capability:core": "<3.0.0"})
+
+    assert not result.is_resolved
+    assert result.resolved == {}
+    assert any("capability:core" in conflict and "suite:commerce" in conflict for conflict in result.conflicts)
+
+    with pytest.raises(ConstraintError):
+        resolver.resolve_requirements({"suite:commerce": ">=one"})
+
+
+def test_conflicts_only_hold_while_the_component_is_required():
+    """Test a conflict learned under one dependent does not outlive it."""
+    resolver = DependencyResolver(StaticCatalog(catalog(
+        version("capability", "api", "4.0.0", {"worker": "!=1.0.0"}),
+        version("capability", "api", "2.0.0"),
+        version("capability", "worker", "4.0.0", {"api": "==1.0.0"}),
+    )))
+
+    result = resolver.resolve_requirements({"capability:api": "<=4.0.0"})
+
+    assert result.is_resolved
+    assert result.resolved == {"capability:api": "2.0.0"}
+
+
+def satisfies(constraint, version_string):
+    """Check a version against a constraint string."""
+    key = SemVer.coerce(version_string).key
+    return all(compare(key, bound) for compare, bound in parse_constraint(constraint))
+
+
+def consistent(index, requirements, selected):
+    """Check a selection meets the requirements and every selected dependency."""
+    wanted = list(requirements.items())
+    for key, version_string in selected.items():
+        chosen = next(v for v in index[key] if v.version_string == version_string)
+        wanted.extend((f"capability:{name}", constraint) for name, constraint in chosen.dependencies.items())
+    return all(key in selected and satisfies(constraint, selected[key]) for key, constraint in wanted)
+
+
+def test_agrees_with_exhaustive_search_on_random_catalogs():
+    """Test the resolver fails exactly when no selection of versions is consistent."""
+    names = ["c0", "c1", "c2", "c3"]
+    version_strings = ["1.0.0", "2.0.0", "3.0.0", "4.0.0"]
+    operators = ["==", "!=", ">=", "<=", ">", "<"]
+
+    for seed in range(1500):
+        rng = random.Random(seed)
+        constraint = lambda: f"{rng.choice(operators)}{rng.choice(version_strings)}" if rng.random() < 0.85 else "*"
+        index = catalog(*(
+            version("capability", name, version_string, {
+                target: constraint() for target in names if target != name and rng.random() < 0.3
+            })
+            for name in names
+            for version_string in rng.sample(version_strings, rng.randint(0, 3))
+        ))
+        requirements = {f"capability:{name}": constraint() for name in rng.sample(names, rng.randint(1, 2))}
+
+        result = DependencyResolver(StaticCatalog(index)).resolve_requirements(requirements)
+
+        keys = sorted(index)
+        selections = (
+            {key: choice for key, choice in zip(keys, choices) if choice}
+            for choices in itertools.product(*([None] + [v.version_string for v in index[key]] for key in keys))
+        )
+        solvable = any(consistent(index, requirements, selected) for selected in selections)
+        assert result.is_resolved == solvable, (seed, requirements, result.conflicts)
+        if result.is_resolved:
+            assert consistent(index, requirements, result.resolved), seed
+
+
+@pytest.mark.asyncio
+async def test_memoizes_until_the_catalog_changes():
+    """Test results are memoized per constraint set and catalog generation."""
+    manager = VersionManager()
+    await manager.register_version(version("suite", "commerce", "1.5.0"))
+    resolver = DependencyResolver(manager)
+
+    first = resolver.resolve_requirements({"suite:commerce": ">=1.0.0"})
+    second = resolver.resolve_requirements({"suite:commerce": ">=1.0.0"})
+    assert second == first
+    assert resolver.cache_stats()["hits"] == 1
+
+    await manager.register_version(version("suite", "commerce", "1.6.0"))
+    third = resolver.resolve_requirements({"suite:commerce": ">=1.0.0"})
+    assert third.resolved == {"suite:commerce": "1.6.0"}
+    assert third.catalog_generation > first.catalog_generation
+
+
+@pytest.mark.asyncio
+async def test_compiler_resolves_manifest_dependencies():
+    """Test the compiler pins manifest versions and resolves what they need."""
+    compiler = ManifestCompiler()
+    manifest = DeploymentManifest(
+        id="manifest-1",
+        version="1.0.0",
+        platform_version="2.0.0",
+        suites={"commerce": "1.5.0"},
+        capabilities={}
+    )
+    available = catalog(
+        version("platform", "webwaka-platform", "2.0.0"),
+        version("platform", "webwaka-platform", "2.1.0"),
+        version("suite", "commerce", "1.5.0", {"webwaka-platform": ">=2.1.0"}),
+        version("capability", "reporting", "1.0.0"),
+        version("capability", "reporting", "1.1.0"),
+    )
+
+    # The manifest pins the platform below what commerce needs
+    with pytest.raises(ValueError, match="webwaka-platform"):
+        await compiler.resolve_dependencies(manifest, available)
+
+    available["suite:commerce"] = [
+        version("suite", "commerce", "1.5.0", {"webwaka-platform": ">=2.0.0", "reporting": "<1.1.0"})
+    ]
+    resolved = await compiler.resolve_dependencies(manifest, available)
+
+    assert resolved == {
+        "platform": "2.0.0",
+        "suite:commerce": "1.5.0",
+        "capability:reporting": "1.0.0"
+    }
+
+
+def test_resolves_large_catalog_quickly():
+    """Test a 500 component x 200 version catalog resolves in milliseconds once warm."""
+    index = {}
+    for i in range(500):
+        versions = []
+        for j in range(200):
+            major = j // 20
+            dependencies = {
+                f"c{k}": f">={max(major - 1, 0)}.0.0,<{major + 1}.0.0"
+                for k in range(max(i - 3, 0), i)
+            }
+            versions.append(version("capability", f"c{i}", f"{major}.{j % 20}.0", dependencies))
+        index[f"capability:c{i}"] = versions
+    resolver = DependencyResolver(StaticCatalog(index))
+    requirements = {key: "*" for key in index}
+
+    # The first resolution prepares the catalog once per generation
+    assert resolver.resolve_requirements(requirements).is_resolved
+
+    requirements["capability:c499"] = "<9.0.0"
+    started = time.perf_counter()
+    result = resolver.resolve_requirements(requirements)
+    elapsed = time.perf_counter() - started
+
+    assert result.is_resolved
+    assert result.resolved["capability:c499"] == "8.19.0"
+    # The lowered cap propagates down the dependency chain
+    assert result.resolved["capability:c0"] == "8.19.0"
+    assert elapsed < 1.0
+
+    started = time.perf_counter()
+    resolver.resolve_requirements(requirements)
+    assert time.perf_counter() - started < 0.05
@@ -0,0 +1,144 @@
+"""Unit tests for tiered deployment retention."""
+
+import threading
+
+import pytest
+
+from src.core.retention import DeploymentRetentionStore
+from src.models.deployment import Deployment, DeploymentStatus
+from src.utils.id_generator import new_id
+
+
+def make_deployment(status=DeploymentStatus.DEPLOYED):
+    """Create a deployment record with a few log lines."""
+    return Deployment(
+        id=new_id("deploy"),
+        manifest_id="manifest-001",
+        instance_id="instance-001",
+        status=status,
+        logs=["Starting manifest compilation", "Deployment completed successfully"]
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a small retention store spilling into a temp directory."""
+    return DeploymentRetentionStore(hot_size=4, segment_size=2, spill_dir=str(tmp_path))
+
+
+def test_hot_set_stays_bounded(store):
+    """Test completed deployments spill once the hot set is full."""
+    deployments = [make_deployment() for _ in range(20)]
+    for deployment in deployments:
+        store[deployment.id] = deployment
+    
+    stats = store.stats()
+    assert stats["hot"] == 4
+    assert stats["total"] == 20
+    assert stats["spills"] == 16
+    assert stats["segments_written"] == 8
+
+
+def test_spilled_deployment_rehydrates_on_access(store):
+    """Test a spilled deployment is loaded back with its logs intact."""
+    first = make_deployment()
+    store[first.id] = first
+    for _ in range(10):
+        filler = make_deployment()
+        store[filler.id] = filler
+    
+    assert not store.is_hot(first.id)
+    
+    restored = store.get(first.id)
+    
+    assert restored.id == first.id
+    assert restored.logs == first.logs
+    assert store.is_hot(first.id)
+    assert store.stats()["rehydrates"] == 1
+
+
+def test_active_deployments_are_never_spilled(store):
+    """Test in-flight deployments stay in memory beyond the hot size."""
+    active = [make_deployment(DeploymentStatus.DEPLOYING) for _ in range(6)]
+    for deployment in active:
+        store[deployment.id] = deployment
+    
+    assert all(store.is_hot(d.id) for d in active)
+    assert store.stats()["spills"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cold_tier_is_bounded_and_evictions_leave_the_index(tmp_path):
+    """Test the oldest segments are dropped, with their index entries, off the event loop."""
+    from src.core.deployment_engine import DeploymentEngine
+    
+    store = DeploymentRetentionStore(hot_size=4, segment_size=2, spill_dir=str(tmp_path), cold_size=6)
+    engine = DeploymentEngine(retention=store)
+    deployments = [make_deployment() for _ in range(40)]
+    for deployment in deployments:
+        engine.finish_deployment(deployment)
+    
+    # Spilled records stay readable while their segments are written in the background
+    assert store.peek(deployments[30].id).id == deployments[30].id
+    await store.drain()
+    
+    stats = store.stats()
+    assert stats["total"] == 10
+    assert stats["cold"] == 6
+    assert stats["evicted"] == 30
+    assert len(list(tmp_path.iterdir())) == 3
+    assert len(engine.index) == 10
+    assert (await engine.list_deployments(instance_id="instance-001"))[0].id == deployments[30].id
+    assert await engine.get_deployment(deployments[0].id) is None
+
+
+@pytest.mark.asyncio
+async def test_async_reads_load_segments_in_a_worker_thread(tmp_path, monkeypatch):
+    """Test aget and peek_many never read segment files on the event loop."""
+    store = DeploymentRetentionStore(hot_size=2, segment_size=2, spill_dir=str(tmp_path), segment_cache_size=1)
+    deployments = [make_deployment() for _ in range(10)]
+    for deployment in deployments:
+        store[deployment.id] = deployment
+    await store.drain()
+
+    threads = []
+    read_segment = store._read_segment
+
+    def record_thread(path):
+        threads.append(threading.current_thread())
+        return read_segment(path)
+
+    monkeypatch.setattr(store, "_read_segment", record_thread)
+
+    listed = await store.peek_many([deployment.id for deployment in deployments])
+    assert [deployment.id for deployment in listed] == [deployment.id for deployment in deployments]
+    assert not store.is_hot(deployments[0].id)
+    assert (await store.aget(deployments[0].id)).id == deployments[0].id
+    assert store.is_hot(deployments[0].id)
+    assert threads and threading.main_thread() not in threads
+
+
+@pytest.mark.asyncio
+async def test_failed_segment_writes_are_retried_then_dropped(tmp_path, monkeypatch):
+    """Test a segment that cannot be written is dropped instead of held in memory."""
+    store = DeploymentRetentionStore(hot_size=2, segment_size=2, spill_dir=str(tmp_path))
+    attempts = []
+
+    def fail(path, records):
+        attempts.append(path)
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(store, "_write_segment", fail)
+    evicted = []
+    store.add_evict_listener(evicted.extend)
+    deployments = [make_deployment() for _ in range(4)]
+    for deployment in deployments:
+        store[deployment.id] = deployment
+    await store.drain()
+
+    assert len(attempts) == 3
+    assert evicted == [deployment.id for deployment in deployments[:2]]
+    stats = store.stats()
+    assert stats["write_failures"] == 1
+    assert stats["total"] == 2
+    assert store.get(deployments[0].id) is None
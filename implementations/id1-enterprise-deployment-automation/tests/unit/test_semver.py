@@ -0,0 +1,105 @@
+"""Unit tests for semantic versions."""
+
+import pickle
+from datetime import datetime
+
+import pytest
+
+from src.core.validator import DeploymentValidator
+from src.models.security import SecurityPatch, SeverityLevel
+from src.models.version import Version
+from src.security.patch_manager import PatchManager
+from src.versioning.semver import InvalidVersionError, SemVer
+from src.versioning.version_manager import VersionManager
+from src.versioning.version_pinner import VersionPinner
+
+
+def test_precedence_follows_the_specification():
+    """Test the precedence example from the SemVer 2.0.0 specification."""
+    ordered = [
+        "1.0.0-alpha",
+        "1.0.0-alpha.1",
+        "1.0.0-alpha.beta",
+        "1.0.0-beta",
+        "1.0.0-beta.2",
+        "1.0.0-beta.11",
+        "1.0.0-rc.1",
+        "1.0.0",
+        "1.0.1",
+        "1.10.0",
+    ]
+    versions = [SemVer.parse(text) for text in ordered]
+
+    assert sorted(reversed(versions)) == versions
+    assert sorted(reversed(versions), key=lambda v: v.key) == versions
+    assert SemVer.parse("1.0.0+build.1") == SemVer.parse("1.0.0")
+    assert SemVer.parse("1.0.0-rc.1").is_prerelease
+
+
+def test_versions_are_interned_and_immutable():
+    """Test parsing returns shared immutable objects."""
+    version = SemVer.parse("2.3.4-rc.1")
+
+    assert SemVer.parse("2.3.4-rc.1") is version
+    assert SemVer.coerce("v2.3.4-rc.1") is version
+    assert pickle.loads(pickle.dumps(version)) is version
+    assert str(SemVer.coerce("v2")) == "2.0.0"
+
+    with pytest.raises(AttributeError):
+        version.major = 3
+
+    for invalid in ("1.2", "01.2.3", "1.2.3-", "1.2.3-01", "v1.2.3"):
+        with pytest.raises(InvalidVersionError):
+            SemVer.parse(invalid)
+        assert not DeploymentValidator()._is_valid_semver(invalid)
+    assert DeploymentValidator()._is_valid_semver("1.2.3-rc.1+build.5")
+
+
+@pytest.mark.asyncio
+async def test_version_manager_orders_prereleases_below_releases():
+    """Test the catalog keeps pre-releases below their release."""
+    manager = VersionManager()
+    for version_string in ("2.0.0-rc.2", "2.0.0", "2.0.0-rc.10", "1.9.0"):
+        await manager.register_version(Version(
+            id=f"platform-{version_string}",
+            component_type="platform",
+            component_name="webwaka-platform",
+            version_string=version_string,
+            release_date=datetime(2024, 1, 1)
+        ))
+
+    versions = await manager.get_available_versions("platform", "webwaka-platform")
+    assert [v.version_string for v in versions] == ["2.0.0", "2.0.0-rc.10", "2.0.0-rc.2", "1.9.0"]
+
+    compatible, _, _ = await manager.check_compatibility("2.0.0+build.3", {}, {})
+    assert compatible
+
+    with pytest.raises(ValueError):
+        await manager.register_version(Version(
+            id="platform-latest",
+            component_type="platform",
+            component_name="webwaka-platform",
+            version_string="latest",
+            release_date=datetime(2024, 1, 1)
+        ))
+    with pytest.raises(ValueError):
+        await VersionPinner().pin_version("instance-001", "suite", "commerce", "1.5")
+
+
+@pytest.mark.asyncio
+async def test_patches_match_by_version_precedence():
+    """Test affected versions match regardless of build metadata."""
+    manager = PatchManager()
+    await manager.register_patch(SecurityPatch(
+        id="patch-001",
+        component_type="platform",
+        component_name="webwaka-platform",
+        affected_versions=["1.9.0", "1.9.1"],
+        patched_version="1.9.2",
+        severity=SeverityLevel.HIGH,
+        description="Fix",
+        release_date=datetime(2024, 1, 30)
+    ))
+
+    assert len(await manager.get_available_patches("platform", "webwaka-platform", "1.9.1+build.4")) == 1
+    assert await manager.get_available_patches("platform", "webwaka-platform", "1.9.10") == []
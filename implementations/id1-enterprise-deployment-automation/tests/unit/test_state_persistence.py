@@ -0,0 +1,213 @@
+"""Unit tests for durable state persistence."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.core.deployment_engine import DeploymentEngine
+from src.models.deployment import DeploymentManifest, DeploymentStatus
+from src.models.policy import PolicyType
+from src.persistence import StateWriter, InMemoryStateStore
+from src.persistence.sqlalchemy_store import SQLAlchemyStateStore
+from src.policies.policy_manager import PolicyManager
+
+
+@pytest.fixture
+def sample_manifest():
+    """Create sample deployment manifest."""
+    return DeploymentManifest(
+        id="manifest-001",
+        version="1.0.0",
+        platform_version="2.0.0",
+        suites={"commerce": "1.5.0"},
+        capabilities={"reporting": "1.0.0"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_writes_are_coalesced_into_one_batch(sample_manifest):
+    """Test repeated updates between flushes commit as a single batch."""
+    store = InMemoryStateStore()
+    writer = StateWriter(store)
+    engine = DeploymentEngine(state=writer)
+    
+    deployment = await engine.create_deployment(sample_manifest, "instance-001")
+    await engine.execute_deployment(deployment, sample_manifest)
+    
+    assert store.batches_written == 0
+    # The deployment, its manifest, the instance's current deployment and
+    # the delete of its in-flight reference
+    assert await writer.flush() == 4
+    assert store.batches_written == 1
+
+
+@pytest.mark.asyncio
+async def test_state_survives_restart_with_sqlite(tmp_path, sample_manifest):
+    """Test deployments and policies reload from SQLite after a restart."""
+    url = f"sqlite:///{tmp_path / 'state.db'}"
+    
+    writer = StateWriter(SQLAlchemyStateStore(url))
+    await writer.start()
+    engine = DeploymentEngine(state=writer)
+    policy_manager = PolicyManager(state=writer)
+    
+    deployment = await engine.create_deployment(sample_manifest, "instance-001")
+    await engine.execute_deployment(deployment, sample_manifest)
+    policy = await policy_manager.create_policy("instance-001", PolicyType.FROZEN)
+    await writer.stop()
+    
+    restarted_writer = StateWriter(SQLAlchemyStateStore(url))
+    restarted_engine = DeploymentEngine(state=restarted_writer)
+    restarted_policies = PolicyManager(state=restarted_writer)
+    
+    assert await restarted_engine.load_state() == 1
+    assert await restarted_policies.load_state() == 1
+    
+    restored = await restarted_engine.get_deployment(deployment.id)
+    assert restored.status == DeploymentStatus.DEPLOYED
+    assert (await restarted_engine.list_deployments("instance-001"))[0].id == deployment.id
+    assert restarted_policies.get_policy(policy.id).policy_type == PolicyType.FROZEN
+
+
+@pytest.mark.asyncio
+async def test_get_deployment_falls_back_to_store(sample_manifest):
+    """Test deployments outside the loaded working set are read on demand."""
+    store = InMemoryStateStore()
+    writer = StateWriter(store)
+    engine = DeploymentEngine(state=writer)
+    
+    first = await engine.create_deployment(sample_manifest, "instance-001")
+    await engine.execute_deployment(first, sample_manifest)
+    await engine.create_deployment(sample_manifest, "instance-002")
+    await writer.flush()
+    
+    restarted = DeploymentEngine(state=StateWriter(store))
+    assert await restarted.load_state(limit=1) == 1
+    
+    assert (await restarted.get_deployment(first.id)).instance_id == "instance-001"
+
+
+@pytest.mark.asyncio
+async def test_load_state_reads_only_referenced_manifests(sample_manifest):
+    """Test a restart decodes the manifests of the loaded deployments, not every stored one."""
+    class CountingStore(InMemoryStateStore):
+        def __init__(self):
+            super().__init__()
+            self.reads = []
+        
+        def get(self, kind, key):
+            self.reads.append(kind)
+            return super().get(kind, key)
+        
+        def load(self, kind, limit=None):
+            self.reads.append(f"load:{kind}")
+            return super().load(kind, limit)
+    
+    store = CountingStore()
+    writer = StateWriter(store)
+    engine = DeploymentEngine(state=writer)
+    for version in ("1.5.0", "1.6.0", "1.7.0"):
+        manifest = sample_manifest.model_copy(update={"suites": {"commerce": version}})
+        deployment = await engine.create_deployment(manifest, "instance-001")
+        await engine.execute_deployment(deployment, manifest)
+    await writer.flush()
+    
+    restarted = DeploymentEngine(state=StateWriter(store))
+    assert await restarted.load_state(limit=1) == 1
+    
+    assert "load:manifest" not in store.reads
+    assert store.reads.count("manifest") == 1
+    assert restarted.current_manifest("instance-001").suites == {"commerce": "1.7.0"}
+
+
+@pytest.mark.asyncio
+async def test_load_state_finds_old_in_flight_deployments_and_instance_manifests(sample_manifest):
+    """Test unfinished deployments and current manifests outside the recent window survive a restart."""
+    store = InMemoryStateStore()
+    writer = StateWriter(store)
+    engine = DeploymentEngine(state=writer)
+    
+    deployed = await engine.create_deployment(sample_manifest, "instance-old")
+    await engine.execute_deployment(deployed, sample_manifest)
+    interrupted = await engine.create_deployment(sample_manifest, "instance-stuck")
+    engine._set_status(interrupted, DeploymentStatus.DEPLOYING)
+    interrupted.started_at = interrupted.created_at
+    engine._persist(interrupted)
+    for i in range(5):
+        deployment = await engine.create_deployment(sample_manifest, f"instance-{i:03d}")
+        await engine.execute_deployment(deployment, sample_manifest)
+    await writer.flush()
+    
+    restarted = DeploymentEngine(state=StateWriter(store))
+    assert await restarted.load_state(limit=2) == 3
+    
+    assert restarted.current_manifest("instance-old").id == sample_manifest.id
+    resumed = await restarted.resume_deployments()
+    assert [deployment.id for deployment in resumed] == [interrupted.id]
+    assert resumed[0].status == DeploymentStatus.DEPLOYED
+
+
+@pytest.mark.asyncio
+async def test_interrupted_deployment_resumes_from_checkpoint(sample_manifest):
+    """Test a restart resumes a deployment after its last finished step."""
+    store = InMemoryStateStore()
+    writer = StateWriter(store)
+    deploy_reached = asyncio.Event()
+    
+    async def hang_in_health_check(deployment, manifest):
+        deploy_reached.set()
+        await asyncio.Event().wait()
+    
+    engine = DeploymentEngine(state=writer, step_handlers={"health_check": hang_in_health_check})
+    deployment = await engine.create_deployment(sample_manifest, "instance-001")
+    
+    # Simulate a crash while the health check is running
+    task = asyncio.create_task(engine.execute_deployment(deployment, sample_manifest))
+    await deploy_reached.wait()
+    await writer.flush()
+    task.cancel()
+    
+    ran = []
+    
+    async def record(deployment, manifest):
+        ran.append(deployment.id)
+    
+    restarted = DeploymentEngine(
+        state=StateWriter(store),
+        step_handlers={step: record for step in ("compile", "validate", "deploy", "health_check")}
+    )
+    await restarted.load_state()
+    resumed = await restarted.resume_deployments()
+    
+    assert [d.id for d in resumed] == [deployment.id]
+    assert resumed[0].status == DeploymentStatus.DEPLOYED
+    assert resumed[0].completed_steps == ["compile", "validate", "deploy", "health_check"]
+    # Only the interrupted step ran again
+    assert ran == [deployment.id]
+    assert restarted.current_manifest("instance-001").id == sample_manifest.id
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_an_in_flight_commit(sample_manifest):
+    """Test stopping the writer lets a running commit finish instead of cancelling it."""
+    class SlowStore(InMemoryStateStore):
+        def write_batch(self, operations):
+            time.sleep(0.2)
+            super().write_batch(operations)
+            self.finished_at = time.monotonic()
+    
+    store = SlowStore()
+    writer = StateWriter(store, flush_interval=0.01)
+    await writer.start()
+    engine = DeploymentEngine(state=writer)
+    deployment = await engine.create_deployment(sample_manifest, "instance-001")
+    
+    # Let the background task start committing, then stop mid-commit
+    await asyncio.sleep(0.05)
+    await writer.stop()
+    stopped_at = time.monotonic()
+    
+    assert store.finished_at <= stopped_at
+    assert writer.stats()["write_errors"] == 0
+    assert await asyncio.to_thread(writer.get, "deployment", deployment.id, type(deployment)) is not None
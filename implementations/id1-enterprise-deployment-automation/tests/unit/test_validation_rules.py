@@ -0,0 +1,82 @@
+"""Unit tests for the validation rule engine."""
+
+import pytest
+
+from src.core.validation_rules import (
+    ValidationRule,
+    ValidationRuleEngine,
+    configuration_schema_rule,
+    default_rules,
+    forbidden_versions_rule,
+    max_replicas_rule,
+)
+from src.core.validator import DeploymentValidator
+from src.models.deployment import DeploymentManifest
+
+
+def manifest(platform_version="2.0.0", configuration=None):
+    """Build a manifest."""
+    return DeploymentManifest(
+        id="manifest-1",
+        version="1.0.0",
+        platform_version=platform_version,
+        suites={"commerce": "1.5.0"},
+        capabilities={},
+        configuration=configuration or {}
+    )
+
+
+def test_rules_run_cheapest_first_and_stop_on_fatal_errors():
+    """Test execution order follows cost and fatal errors skip later rules."""
+    calls = []
+
+    def expensive(m, context):
+        calls.append("expensive")
+
+    engine = ValidationRuleEngine(default_rules() + [
+        ValidationRule(name="expensive", check=expensive, cost=100.0),
+        max_replicas_rule(10),
+    ])
+
+    assert [rule.name for rule in engine.rules][:2] == ["required_fields", "max_replicas"]
+    assert engine.rules[-1].name == "expensive"
+
+    context = engine.run(manifest(platform_version=""), lambda version: True)
+    assert context.errors == ["Platform version is required"]
+    assert calls == []
+
+    engine.run(manifest(), lambda version: True)
+    assert calls == ["expensive"]
+
+    report = engine.report()
+    assert report["validations"] == 2
+    by_rule = {entry["rule"]: entry for entry in report["rules"]}
+    assert by_rule["required_fields"]["runs"] == 2
+    assert by_rule["required_fields"]["short_circuits"] == 1
+    assert by_rule["expensive"]["runs"] == 1
+
+    with pytest.raises(ValueError):
+        engine.register(max_replicas_rule(5))
+
+
+@pytest.mark.asyncio
+async def test_org_rules_and_cache_invalidation():
+    """Test org rules report errors and changing the rules drops cached results."""
+    validator = DeploymentValidator()
+    large = manifest(configuration={"replicas": 50})
+
+    assert (await validator.validate_many([large]))[0].is_valid
+
+    validator.rules.register(max_replicas_rule(10))
+    validator.rules.register(forbidden_versions_rule(
+        "commerce_on_platform_2", {"platform": "2.0.0", "suite:commerce": "1.5.0"}, "Known data loss"
+    ))
+    validator.rules.register(configuration_schema_rule({"replicas": int, "region": str}))
+
+    result = (await validator.validate_many([large]))[0]
+    assert result.errors == [
+        "Replicas 50 exceed the limit of 10",
+        "Forbidden version combination platform=2.0.0, suite:commerce=1.5.0: Known data loss",
+        "Configuration region is required",
+    ]
+    assert await validator.validate_manifest(large) == result
@@ -0,0 +1,58 @@
+"""Unit tests for the deployment validator."""
+
+import time
+
+import pytest
+
+from src.core.validator import DeploymentValidator
+from src.models.deployment import DeploymentManifest
+
+
+def manifest(index, platform_version="2.0.0", suites=None):
+    """Build an instance manifest."""
+    return DeploymentManifest(
+        id=f"manifest-{index}",
+        version="1.0.0",
+        platform_version=platform_version,
+        suites=suites if suites is not None else {"commerce": "1.5.0"},
+        capabilities={"reporting": "1.0.0"}
+    )
+
+
+@pytest.mark.asyncio
+async def test_validate_many_matches_single_validation():
+    """Test batch results equal per-manifest results, in input order."""
+    validator = DeploymentValidator()
+    manifests = [
+        manifest(1),
+        manifest(2, platform_version="2.0"),
+        manifest(3, suites={"commerce": ""}),
+        manifest(4),
+    ]
+
+    results = await validator.validate_many(manifests)
+
+    assert results == [await validator.validate_manifest(m) for m in manifests]
+    assert results[0] is results[3]
+    assert results[1].warnings == ["Platform version 2.0 is not valid semver"]
+    assert not results[2].is_valid
+
+    await validator.validate_many([manifest(5)])
+    assert validator.cache_stats()["misses"] == 3
+    assert validator.cache_stats()["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_validate_many_handles_a_large_fleet_quickly():
+    """Test 50k mostly identical manifests validate well under a second."""
+    validator = DeploymentValidator()
+    manifests = [manifest(i, suites={"commerce": f"1.{i % 100}.0"}) for i in range(50000)]
+
+    started = time.perf_counter()
+    results = await validator.validate_many(manifests)
+    elapsed = time.perf_counter() - started
+
+    assert len(results) == 50000
+    assert all(result.is_valid for result in results)
+    assert validator.cache_stats()["misses"] == 100
+    assert elapsed < 0.5
@@ -9,6 +9,7 @@ from ..models.access_control import (
     AccessGrant,
     AccessRequestStatus
 )
+from ..utils.id_generator import new_id
 
 
 logger = logging.getLogger(__name__)
@@ -21,8 +22,6 @@ class AccessManager:
         """Initialize the access manager."""
         self.requests: Dict[str, AccessRequest] = {}
         self.grants: Dict[str, AccessGrant] = {}
-        self.request_counter = 0
-        self.grant_counter = 0
     
     async def create_access_request(
         self,
@@ -50,8 +49,7 @@ class AccessManager:
         """
         logger.info(f"Creating access request for {requester_id} to {data_id}")
         
-        self.request_counter += 1
-        request_id = f"access-req-{self.request_counter:03d}"
+        request_id = new_id("access-req")
         
         request = AccessRequest(
             id=request_id,
@@ -125,8 +123,7 @@ class AccessManager:
         self.requests[request_id] = request
         
         # Create access grant
-        self.grant_counter += 1
-        grant_id = f"grant-{self.grant_counter:03d}"
+        grant_id = new_id("grant")
         
         grant = AccessGrant(
             id=grant_id,
@@ -5,6 +5,7 @@ from typing import Dict, List, Optional
 from datetime import datetime
 
 from ..models.access_control import AccessAuditLog
+from ..utils.id_generator import new_id
 
 
 logger = logging.getLogger(__name__)
@@ -16,7 +17,6 @@ class AuditLogger:
     def __init__(self):
         """Initialize the audit logger."""
         self.audit_logs: Dict[str, AccessAuditLog] = {}
-        self.log_counter = 0
     
     async def log_access_action(
         self,
@@ -48,8 +48,7 @@ class AuditLogger:
         """
         logger.info(f"Logging {action} for {user_id} on {data_id}")
         
-        self.log_counter += 1
-        log_id = f"audit-{self.log_counter:05d}"
+        log_id = new_id("audit")
         
         log_entry = AccessAuditLog(
             id=log_id,
@@ -96,7 +95,8 @@ class AuditLogger:
         Returns:
             List of audit logs
         """
-        logs = list(self.audit_logs.values())
+        # Log IDs are time-ordered, so reversed insertion order is newest first
+        logs = list(reversed(self.audit_logs.values()))
         
         if user_id:
             logs = [l for l in logs if l.user_id == user_id]
@@ -105,8 +105,6 @@ class AuditLogger:
         if action:
             logs = [l for l in logs if l.action == action]
         
-        # Sort by timestamp descending
-        logs.sort(key=lambda l: l.timestamp, reverse=True)
         return logs
     
     def get_user_audit_trail(self, user_id: str) -> List[AccessAuditLog]:
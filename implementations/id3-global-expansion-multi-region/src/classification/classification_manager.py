@@ -5,6 +5,7 @@ from typing import Optional, List, Dict
 from datetime import datetime
 
 from ..models.classification import DataClassification, ClassificationLevel
+from ..utils.id_generator import new_id
 
 
 logger = logging.getLogger(__name__)
@@ -17,7 +18,6 @@ class ClassificationManager:
         """Initialize the classification manager."""
         self.classifications: Dict[str, DataClassification] = {}
         self.data_classifications: Dict[str, str] = {}  # data_id -> classification_id
-        self.classification_counter = 0
     
     async def classify_data(
         self,
@@ -49,8 +49,7 @@ class ClassificationManager:
         """
         logger.info(f"Classifying data {data_id} as {classification_level}")
         
-        self.classification_counter += 1
-        classification_id = f"class-{self.classification_counter:03d}"
+        classification_id = new_id("class")
         
         classification = DataClassification(
             id=classification_id,
@@ -5,6 +5,7 @@ from typing import Optional, List, Dict
 from datetime import datetime
 
 from ..models.residency import ResidencyPolicy, ResidencyMode, ResidencyPolicyType
+from ..utils.id_generator import new_id
 
 
 logger = logging.getLogger(__name__)
@@ -16,7 +17,6 @@ class ResidencyManager:
     def __init__(self):
         """Initialize the residency manager."""
         self.policies: Dict[str, ResidencyPolicy] = {}
-        self.policy_counter = 0
     
     async def create_policy(
         self,
@@ -40,8 +40,7 @@ class ResidencyManager:
         """
         logger.info(f"Creating residency policy: {name}")
         
-        self.policy_counter += 1
-        policy_id = f"policy-{self.policy_counter:03d}"
+        policy_id = new_id("policy")
         
         policy = ResidencyPolicy(
             id=policy_id,
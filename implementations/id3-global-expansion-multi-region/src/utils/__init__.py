@@ -0,0 +1,10 @@
+"""Shared utilities for Global Expansion & Multi-Region system."""
+
+from .id_generator import IdGenerator, new_id, id_timestamp, id_lower_bound
+
+__all__ = [
+    "IdGenerator",
+    "new_id",
+    "id_timestamp",
+    "id_lower_bound",
+]
@@ -0,0 +1,177 @@
+"""Time-ordered, collision-free identifier generation.
+
+Identifiers are ULIDs (48-bit millisecond timestamp followed by 80 bits of
+randomness, Crockford base32 encoded) behind a type prefix, for example
+``deploy-01HNB6W5J5T3V8K2Q9ZP4M7XCD``. Identifiers from one generator are
+strictly increasing, so plain string order is creation order and stores can
+answer time-range and "latest N" queries from key order alone.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+
+
+CROCKFORD_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+ULID_LENGTH = 26
+
+_TIMESTAMP_BITS = 48
+_RANDOM_BITS = 80
+_MAX_TIMESTAMP = (1 << _TIMESTAMP_BITS) - 1
+_MAX_RANDOM = (1 << _RANDOM_BITS) - 1
+_DECODE_MAP = {char: index for index, char in enumerate(CROCKFORD_ALPHABET)}
+
+
+def _encode(value: int) -> str:
+    """Encode a 128-bit integer as a 26 character Crockford base32 string."""
+    chars = []
+    for _ in range(ULID_LENGTH):
+        chars.append(CROCKFORD_ALPHABET[value & 0x1F])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+def _decode(text: str) -> int:
+    """Decode a 26 character Crockford base32 string to an integer."""
+    if len(text) != ULID_LENGTH:
+        raise ValueError(f"Invalid ULID length: {text!r}")
+    value = 0
+    for char in text.upper():
+        try:
+            value = (value << 5) | _DECODE_MAP[char]
+        except KeyError:
+            raise ValueError(f"Invalid ULID character {char!r} in {text!r}") from None
+    return value
+
+
+class IdGenerator:
+    """Generates monotonic ULID-based identifiers.
+
+    Within a single millisecond (or if the wall clock steps backwards) the
+    random component of the previous identifier is incremented, so
+    identifiers never repeat and never sort out of creation order.
+    """
+
+    def __init__(self):
+        """Initialize the generator."""
+        self._lock = threading.Lock()
+        self._last_timestamp = -1
+        self._last_random = 0
+
+    def _next(self) -> Tuple[int, int]:
+        """Reserve the next (timestamp, randomness) pair."""
+        timestamp = time.time_ns() // 1_000_000
+
+        with self._lock:
+            if timestamp <= self._last_timestamp:
+                timestamp = self._last_timestamp
+                randomness = self._last_random + 1
+                if randomness > _MAX_RANDOM:
+                    # Random space for this millisecond exhausted; borrow the next one
+                    timestamp += 1
+                    randomness = int.from_bytes(os.urandom(10), "big") >> 1
+            else:
+                # Keep the top bit clear so increments within a millisecond have headroom
+                randomness = int.from_bytes(os.urandom(10), "big") >> 1
+
+            self._last_timestamp = timestamp
+            self._last_random = randomness
+
+        return timestamp, randomness
+
+    def new_ulid(self) -> str:
+        """Generate a bare ULID string.
+
+        Returns:
+            26 character ULID
+        """
+        timestamp, randomness = self._next()
+        return _encode((timestamp << _RANDOM_BITS) | randomness)
+
+    def new_id(self, prefix: str) -> str:
+        """Generate a prefixed identifier.
+
+        Args:
+            prefix: Type prefix (e.g., "deploy")
+
+        Returns:
+            Identifier of the form ``<prefix>-<ULID>``
+        """
+        return f"{prefix}-{self.new_ulid()}"
+
+
+_default_generator = IdGenerator()
+
+
+def new_id(prefix: str) -> str:
+    """Generate a prefixed identifier from the process-wide generator.
+
+    Args:
+        prefix: Type prefix (e.g., "deploy")
+
+    Returns:
+        Identifier of the form ``<prefix>-<ULID>``
+    """
+    return _default_generator.new_id(prefix)
+
+
+def _split(identifier: str) -> str:
+    """Return the ULID part of a prefixed identifier."""
+    return identifier.rsplit("-", 1)[-1]
+
+
+def id_timestamp(identifier: str) -> datetime:
+    """Extract the creation time embedded in an identifier.
+
+    Args:
+        identifier: Prefixed identifier or bare ULID
+
+    Returns:
+        Naive UTC creation time (millisecond precision)
+
+    Raises:
+        ValueError: If the identifier does not end in a valid ULID
+    """
+    timestamp = _decode(_split(identifier)) >> _RANDOM_BITS
+    return datetime.fromtimestamp(timestamp / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+
+def id_lower_bound(prefix: str, moment: datetime) -> str:
+    """Build the smallest identifier that could be created at a given time.
+
+    Every identifier with the same prefix created at or after ``moment``
+    compares greater than or equal to the result, which makes it usable as
+    a range-scan boundary over sorted keys.
+
+    Args:
+        prefix: Type prefix
+        moment: Point in time (naive values are treated as UTC)
+
+    Returns:
+        Boundary identifier
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    timestamp = min(max(int(moment.timestamp() * 1000), 0), _MAX_TIMESTAMP)
+    return f"{prefix}-{_encode(timestamp << _RANDOM_BITS)}"
+
+
+def is_valid_id(identifier: str, prefix: Optional[str] = None) -> bool:
+    """Check whether a string is a well-formed generated identifier.
+
+    Args:
+        identifier: Identifier to check
+        prefix: Optional required prefix
+
+    Returns:
+        True if valid, False otherwise
+    """
+    if prefix is not None and not identifier.startswith(f"{prefix}-"):
+        return False
+    try:
+        _decode(_split(identifier))
+    except ValueError:
+        return False
+    return True
@@ -0,0 +1,34 @@
+"""Unit tests for access manager."""
+
+import pytest
+from src.access_control.access_manager import AccessManager
+from src.models.access_control import AccessRequestStatus
+
+
+@pytest.fixture
+def manager():
+    """Create access manager instance."""
+    return AccessManager()
+
+
+@pytest.mark.asyncio
+async def test_create_and_approve_access_request(manager):
+    """Test an approved request produces a grant with a unique ID."""
+    request = await manager.create_access_request(
+        requester_id="user-123",
+        data_id="data-456",
+        source_region="us-east-1",
+        target_region="eu-west-1",
+        access_type="read",
+        reason="Customer support investigation"
+    )
+    
+    assert request.id.startswith("access-req-")
+    assert request.status == AccessRequestStatus.PENDING
+    
+    grant = await manager.approve_access_request(request.id, approver_id="user-999")
+    
+    assert grant.id.startswith("grant-")
+    assert grant.request_id == request.id
+    assert manager.get_access_request(request.id).status == AccessRequestStatus.APPROVED
+    assert manager.list_access_grants("user-123") == [grant]
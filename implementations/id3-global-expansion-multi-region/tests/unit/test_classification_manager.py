@@ -22,7 +22,7 @@ async def test_classify_data(manager):
         pii_present=True
     )
     
-    assert classification.id == "class-001"
+    assert classification.id.startswith("class-")
     assert classification.data_id == "data-12345"
     assert classification.classification_level == ClassificationLevel.IDENTITY
     assert classification.pii_present is True
@@ -21,7 +21,7 @@ async def test_create_policy(manager):
         allowed_regions=["eu-west-1", "eu-central-1"]
     )
     
-    assert policy.id == "policy-001"
+    assert policy.id.startswith("policy-")
     assert policy.name == "EU Data Residency"
     assert policy.residency_mode == ResidencyMode.REGIONAL
     assert policy.enabled is True